@@ -16,10 +16,13 @@ from .services.github_service import GitHubService
 from .services.image_service import ImageProcessingService
 from .services.conversation_memory_manager import ConversationMemoryManager
 from .services.url_validator import get_url_validator
-from .db.vector_client import VectorClient
+from .db.vector_backend import create_vector_client
+from .db.milvus_pool import MilvusClientPool
 from .utils.config import load_config
+from .utils.github_rate_limiter import PRIORITY_INTERACTIVE
 from .services import IngestionService
 from .services.rag_graph import build_graph
+from .services.retrieval_router import RetrievalRouter
 
 # Import new SOLID monitoring architecture
 from .monitoring import get_monitoring_service
@@ -37,6 +40,8 @@ class AskRequest(BaseModel):
     summary: Optional[Dict] = None  # Conversation summary from previous interactions
     max_history_tokens: Optional[int] = 4000  # Configurable token limit
     enable_summarization: Optional[bool] = True  # Enable/disable auto-summarization
+    sources: Optional[List[str]] = None  # Restrict retrieval to intents: docs, issues, wiki, diagrams
+    repositories: Optional[List[str]] = None  # Restrict retrieval to these repositories (owner/repo)
 
 # Get monitoring service (Singleton)
 monitoring = get_monitoring_service()
@@ -52,13 +57,14 @@ ingestion_service = None
 rag = None
 conversation_memory_manager = None
 url_validator = None
+retrieval_router = None
 services_initialized = False
 
 def initialize_services():
     """Initialize all services lazily to speed up startup time."""
     global config, vector_client, llm_service, github_service, image_service
     global context_manager, ingestion_service, rag, conversation_memory_manager
-    global url_validator, services_initialized
+    global url_validator, retrieval_router, services_initialized
 
     if services_initialized:
         return
@@ -71,15 +77,11 @@ def initialize_services():
     # Initialize services with timeout handling
     try:
         # Initialize vector client with connection retry
-        monitoring.log_info("Initializing Milvus vector client...", logger_type='app')
-        vector_client = VectorClient(
-            uri=config["MILVUS_URI"],
-            token=config["MILVUS_TOKEN"],
-            collection_name=config["MILVUS_COLLECTION_NAME"],
-            dimension=config.get("MILVUS_DIMENSION", 1536),
-            metric=config.get("MILVUS_METRIC", "COSINE")
-        )
-        monitoring.log_info("Milvus vector client initialized", logger_type='app')
+        monitoring.log_info(f"Initializing vector client ({config['VECTOR_BACKEND']})...", logger_type='app')
+        vector_client = create_vector_client(config)
+        if isinstance(getattr(vector_client, "client", None), MilvusClientPool):
+            monitoring.register_milvus_pool(vector_client.client)
+        monitoring.log_info("Vector client initialized", logger_type='app')
     except Exception as e:
         monitoring.log_error(f"Failed to initialize Milvus: {e}", logger_type='app')
         # Continue without Milvus for basic health checks
@@ -91,6 +93,7 @@ def initialize_services():
             api_key=config["AZURE_OPENAI_KEY"],
             deployment=config["AZURE_OPENAI_DEPLOYMENT"],
             api_version=config.get("AZURE_OPENAI_API_VERSION") or "2024-02-15-preview",
+            embedding_dimensions=config.get("EMBEDDING_DIMENSIONS"),
         )
 
         # Allow separate embeddings deployment if provided
@@ -102,7 +105,7 @@ def initialize_services():
         monitoring.log_error(f"Failed to initialize LLM service: {e}", logger_type='app')
 
     try:
-        github_service = GitHubService(token=config.get("GITHUB_TOKEN"))
+        github_service = GitHubService(token=config.get("GITHUB_TOKEN"), priority=PRIORITY_INTERACTIVE)
 
         # Initialize image processing service (optional)
         if config.get("GOOGLE_VISION_API_KEY"):
@@ -150,6 +153,10 @@ def initialize_services():
         else:
             monitoring.log_info("URL validation disabled", logger_type='app')
 
+        # Initialize retrieval routing (intent -> source type partitions)
+        infer_retrieval_intent = os.getenv("ENABLE_INTENT_ROUTING", "true").lower() == "true"
+        retrieval_router = RetrievalRouter(infer_intent=infer_retrieval_intent)
+
         # Register health checkers
         if vector_client:
             monitoring.register_health_checker(MilvusHealthChecker(vector_client))
@@ -173,6 +180,8 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     monitoring.log_info("FastAPI application shutting down...", logger_type='app')
+    if isinstance(getattr(vector_client, "client", None), MilvusClientPool):
+        vector_client.client.close()
 
 # Create FastAPI app with lifespan
 app = FastAPI(
@@ -350,9 +359,10 @@ async def ask_ai(request: AskRequest):
 
             enriched_query = f"{chr(10).join(context_parts)}\nCurrent question: {question}"
 
-        # 3. Retrieve context from vector DB
+        # 3. Retrieve context from vector DB (embedding and Milvus calls block, so run them off the event loop)
         search_start = time.time()
-        similar_rows = context_manager.retrieve_by_text(enriched_query, top_k=10)
+        scope = retrieval_router.route(question, request.sources, request.repositories) if retrieval_router else None
+        similar_rows = await asyncio.to_thread(context_manager.retrieve_by_text, enriched_query, top_k=10, scope=scope)
         search_duration = time.time() - search_start
         monitoring.record_vector_search(search_duration, len(similar_rows))
 
@@ -641,9 +651,10 @@ async def ask_ai_stream(request: AskRequest):
 
             enriched_query = f"{chr(10).join(context_parts)}\nCurrent question: {question}"
 
-        # 3. Retrieve context from vector DB
+        # 3. Retrieve context from vector DB (embedding and Milvus calls block, so run them off the event loop)
         search_start = time.time()
-        similar_rows = context_manager.retrieve_by_text(enriched_query, top_k=10)
+        scope = retrieval_router.route(question, request.sources, request.repositories) if retrieval_router else None
+        similar_rows = await asyncio.to_thread(context_manager.retrieve_by_text, enriched_query, top_k=10, scope=scope)
         search_duration = time.time() - search_start
         monitoring.record_vector_search(search_duration, len(similar_rows))
 
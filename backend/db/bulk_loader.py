@@ -0,0 +1,328 @@
+"""
+Columnar bulk loader for Milvus.
+
+Row-by-row writers build one dict and one list of Python floats per vector.
+For full re-indexes the loader instead keeps embeddings as float32 numpy
+matrices, stages them to disk in column files and loads them afterwards:
+
+- "upsert" (default): staged files are read back in bounded slices
+  (memory-mapped for .npy, record batches for parquet) and upserted through
+  VectorClient.upsert_batch, so memory use is bounded by one slice instead of
+  the whole corpus and re-runs stay idempotent (IDs from utils.vector_ids).
+- "bulk_insert": staged parquet files are imported server-side with Milvus
+  bulk insert. Each staged file is first rewritten into an import file with
+  the collection's columns (MilvusSchemaManager.prepare_rows: declared
+  scalar fields, their defaults, and the ingested_at write time replicas
+  sync from). The staging directory must be visible to Milvus (for example
+  a mounted bucket of its object storage) under remote_dir. Bulk insert does
+  not replace existing primary keys, so use it to fill an empty collection.
+
+Staged batches are written as parquet when pyarrow is installed (id, vector
+and a '$meta' JSON column, the layout Milvus imports into the dynamic field),
+otherwise as id.npy, vector.npy and meta.jsonl.
+"""
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from utils.logger import get_logger
+except ImportError:
+    import logging
+    def get_logger(name):
+        return logging.getLogger(name)
+
+try:
+    from utils.vector_ids import metadata_chunk_id
+except ImportError:
+    from ..utils.vector_ids import metadata_chunk_id
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = get_logger(__name__)
+
+DEFAULT_ROWS_PER_FILE = 50000  # Rows per staged batch file
+DEFAULT_INSERT_BATCH_ROWS = 1000  # Rows per upsert request when loading
+BULK_INSERT_POLL_INTERVAL = 5.0  # Seconds between bulk insert status checks
+
+MODE_UPSERT = "upsert"
+MODE_BULK_INSERT = "bulk_insert"
+
+
+class MilvusBulkLoader:
+    """Stages embeddings as columnar batch files and loads them into Milvus."""
+
+    def __init__(
+        self,
+        vector_client,
+        staging_dir: Optional[str] = None,
+        rows_per_file: int = DEFAULT_ROWS_PER_FILE,
+        insert_batch_rows: int = DEFAULT_INSERT_BATCH_ROWS,
+        file_format: Optional[str] = None
+    ):
+        """
+        Initialize the loader.
+
+        Args:
+            vector_client: VectorClient of the target collection
+            staging_dir: Directory for staged batch files (a temporary directory if None)
+            rows_per_file: Rows buffered in memory before a batch file is written
+            insert_batch_rows: Rows per upsert request in "upsert" mode
+            file_format: "parquet" or "npy" (parquet when pyarrow is installed)
+        """
+        if file_format is None:
+            file_format = "parquet" if pa is not None else "npy"
+        if file_format == "parquet" and pa is None:
+            raise RuntimeError("pyarrow not installed. Install with: pip install pyarrow")
+        if file_format not in ("parquet", "npy"):
+            raise ValueError(f"Unknown staging format: {file_format}")
+
+        self.vector_client = vector_client
+        self.rows_per_file = rows_per_file
+        self.insert_batch_rows = insert_batch_rows
+        self.file_format = file_format
+
+        self._owns_staging_dir = staging_dir is None
+        self.staging_dir = Path(staging_dir or tempfile.mkdtemp(prefix="milvus-bulk-"))
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+
+        self.dimension: Optional[int] = None
+        self.staged_files: List[Path] = []
+        self.rows_added = 0
+        self._ids: List[int] = []
+        self._vectors: List[np.ndarray] = []
+        self._metas: List[str] = []
+        self._buffered = 0
+
+    def add(self, contents: List[str], vectors: np.ndarray, metadatas: List[Dict[str, Any]]) -> List[int]:
+        """
+        Buffer a batch of embeddings, writing a batch file when the buffer is full.
+
+        Args:
+            contents: Chunk texts
+            vectors: float32 matrix of shape (len(contents), dimension)
+            metadatas: Metadata dict per chunk
+
+        Returns:
+            Deterministic IDs of the added rows
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(contents) or len(metadatas) != len(contents):
+            raise ValueError("Need one vector row and one metadata dict per content")
+        if not len(contents):
+            return []
+        if self.dimension is None:
+            self.dimension = vectors.shape[1]
+        elif vectors.shape[1] != self.dimension:
+            raise ValueError(f"Vector dimension {vectors.shape[1]} does not match {self.dimension}")
+
+        ids = [metadata_chunk_id(content, meta) for content, meta in zip(contents, metadatas)]
+        self._ids.extend(ids)
+        self._vectors.append(vectors)
+        self._metas.extend(
+            json.dumps({**meta, "content": content}, ensure_ascii=False, default=str)
+            for content, meta in zip(contents, metadatas)
+        )
+        self._buffered += len(ids)
+        self.rows_added += len(ids)
+
+        if self._buffered >= self.rows_per_file:
+            self.stage()
+        return ids
+
+    def stage(self) -> Optional[Path]:
+        """Write the buffered rows to a batch file and clear the buffer."""
+        if not self._buffered:
+            return None
+
+        ids = np.array(self._ids, dtype=np.int64)
+        vectors = np.concatenate(self._vectors) if len(self._vectors) > 1 else self._vectors[0]
+        name = f"batch-{len(self.staged_files):05d}"
+
+        if self.file_format == "parquet":
+            path = self.staging_dir / f"{name}.parquet"
+            offsets = np.arange(0, len(ids) * self.dimension + 1, self.dimension, dtype=np.int32)
+            table = pa.table({
+                "id": pa.array(ids, type=pa.int64()),
+                "vector": pa.ListArray.from_arrays(pa.array(offsets), pa.array(vectors.ravel(), type=pa.float32())),
+                "$meta": pa.array(self._metas, type=pa.string()),
+            })
+            pq.write_table(table, path)
+        else:
+            path = self.staging_dir / name
+            path.mkdir(exist_ok=True)
+            np.save(path / "id.npy", ids)
+            np.save(path / "vector.npy", vectors)
+            with open(path / "meta.jsonl", "w", encoding="utf-8") as f:
+                for meta in self._metas:
+                    f.write(meta + "\n")
+
+        self.staged_files.append(path)
+        logger.info(f"📦 Staged {len(ids)} rows to {path.name}")
+
+        self._ids, self._vectors, self._metas = [], [], []
+        self._buffered = 0
+        return path
+
+    def load(self, mode: str = MODE_UPSERT, remote_dir: Optional[str] = None, timeout: float = 3600.0) -> int:
+        """
+        Stage any buffered rows and load all staged files into Milvus.
+
+        Args:
+            mode: "upsert" (client-side column slices) or "bulk_insert" (server-side import)
+            remote_dir: Path of the staging directory as seen by Milvus ("bulk_insert" only)
+            timeout: Seconds to wait for each bulk insert task
+
+        Returns:
+            Number of rows loaded
+        """
+        self.stage()
+        if mode == MODE_UPSERT:
+            loaded = sum(self._upsert_file(path) for path in self.staged_files)
+        elif mode == MODE_BULK_INSERT:
+            loaded = self._bulk_insert(remote_dir, timeout)
+        else:
+            raise ValueError(f"Unknown load mode: {mode}")
+
+        logger.info(f"✓ Loaded {loaded} rows from {len(self.staged_files)} staged file(s)")
+        return loaded
+
+    def _iter_slices(self, path: Path) -> Iterator[Tuple[np.ndarray, np.ndarray, List[str]]]:
+        """Read a staged file in slices of insert_batch_rows rows: (ids, vectors, meta JSON strings)."""
+        if path.suffix == ".parquet":
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=self.insert_batch_rows):
+                ids = batch.column("id").to_numpy()
+                vectors = batch.column("vector").flatten().to_numpy().reshape(len(ids), -1)
+                yield ids, vectors, batch.column("$meta").to_pylist()
+            return
+
+        ids = np.load(path / "id.npy")
+        vectors = np.load(path / "vector.npy", mmap_mode="r")
+        with open(path / "meta.jsonl", encoding="utf-8") as f:
+            for start in range(0, len(ids), self.insert_batch_rows):
+                slice_ids = ids[start:start + self.insert_batch_rows]
+                yield slice_ids, vectors[start:start + len(slice_ids)], [next(f) for _ in slice_ids]
+
+    def _upsert_file(self, path: Path) -> int:
+        """Upsert one staged file through the vector client."""
+        loaded = 0
+        for ids, vectors, metas in self._iter_slices(path):
+            items = []
+            for row_id, vector, meta_json in zip(ids.tolist(), vectors, metas):
+                meta = json.loads(meta_json)
+                items.append({"id": row_id, "vector": vector, "content": meta.pop("content", ""), "metadata": meta})
+            self.vector_client.upsert_batch(items)
+            loaded += len(items)
+        logger.info(f"  💾 Upserted {loaded} rows from {path.name}")
+        return loaded
+
+    def import_columns(self, metas: List[str]) -> Dict[str, List[Any]]:
+        """
+        Scalar columns of staged rows as the collection stores them.
+
+        Args:
+            metas: '$meta' JSON strings of staged rows (content and metadata)
+
+        Returns:
+            Dict mapping each declared scalar field to its values, plus a
+            '$meta' column with the remaining keys for the dynamic field
+        """
+        schema, collection_name = self.vector_client.schema, self.vector_client.collection_name
+        rows = schema.prepare_rows(collection_name, [json.loads(meta) for meta in metas])
+        declared = schema.declared_fields(collection_name)
+
+        columns: Dict[str, List[Any]] = {}
+        for scalar_field in schema.spec.scalar_fields:
+            if scalar_field.name in declared:
+                columns[scalar_field.name] = [row.pop(scalar_field.name) for row in rows]
+        columns["$meta"] = [json.dumps(row, ensure_ascii=False, default=str) for row in rows]
+        return columns
+
+    def _write_import_file(self, path: Path) -> Path:
+        """Rewrite a staged parquet file with the collection's columns, slice by slice."""
+        declared = {f.name: f for f in self.vector_client.schema.spec.scalar_fields}
+        target = path.with_name(f"import-{path.name}")
+        writer = None
+        try:
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=self.insert_batch_rows):
+                columns = {"id": batch.column("id"), "vector": batch.column("vector")}
+                for name, values in self.import_columns(batch.column("$meta").to_pylist()).items():
+                    dtype = pa.int64() if name in declared and declared[name].dtype == "INT64" else pa.string()
+                    columns[name] = pa.array(values, type=dtype)
+                table = pa.table(columns)
+                if writer is None:
+                    writer = pq.ParquetWriter(target, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        return target
+
+    def _bulk_insert(self, remote_dir: Optional[str], timeout: float) -> int:
+        """Import the staged parquet files with Milvus bulk insert and wait for the tasks."""
+        if self.file_format != "parquet":
+            raise RuntimeError("Bulk insert needs parquet staging files (install pyarrow)")
+        schema, collection_name = self.vector_client.schema, self.vector_client.collection_name
+        if schema.vector_dtype(collection_name) == "float16" or schema.search_field(collection_name)[1]:
+            raise RuntimeError(
+                "Bulk insert stages float32 full vectors only; load FLOAT16_VECTOR and two-stage collections in upsert mode"
+            )
+
+        from pymilvus import BulkInsertState, connections, utility
+
+        # Written just before the import so that ingested_at is as late as possible;
+        # rows a replica's watermark sync misses are picked up by its reconciliation
+        import_files = [self._write_import_file(path) for path in self.staged_files]
+        alias = f"bulk-{id(self)}"
+        connections.connect(alias=alias, uri=self.vector_client.uri, token=self.vector_client.token)
+        try:
+            remote_root = remote_dir.rstrip("/") if remote_dir else str(self.staging_dir)
+            tasks = [
+                utility.do_bulk_insert(
+                    collection_name=self.vector_client.collection_name,
+                    files=[f"{remote_root}/{path.name}"],
+                    using=alias
+                )
+                for path in import_files
+            ]
+
+            loaded = 0
+            for task_id, path in zip(tasks, self.staged_files):
+                deadline = time.time() + timeout
+                while True:
+                    state = utility.get_bulk_insert_state(task_id=task_id, using=alias)
+                    if state.state == BulkInsertState.ImportCompleted:
+                        loaded += state.row_count
+                        logger.info(f"  💾 Imported {state.row_count} rows from {path.name}")
+                        break
+                    if state.state in (BulkInsertState.ImportFailed, BulkInsertState.ImportFailedAndCleaned):
+                        raise RuntimeError(f"Bulk insert of {path.name} failed: {state.failed_reason}")
+                    if time.time() > deadline:
+                        raise TimeoutError(f"Bulk insert of {path.name} did not finish within {timeout}s")
+                    time.sleep(BULK_INSERT_POLL_INTERVAL)
+            return loaded
+        finally:
+            connections.disconnect(alias)
+            for path in import_files:
+                path.unlink(missing_ok=True)
+
+    def cleanup(self):
+        """Delete the staged files (and the staging directory if the loader created it)."""
+        for path in self.staged_files:
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+        self.staged_files = []
+        if self._owns_staging_dir:
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
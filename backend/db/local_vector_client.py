@@ -0,0 +1,638 @@
+"""
+Embedded in-process vector backend.
+
+Implements the VectorClient surface (upsert, search, metadata queries,
+deletes) without a Milvus server, for offline development, tests, local
+benchmarks and edge deployments:
+
+- Vectors live in a memory-mapped float32 matrix (vectors.f32), one row per
+  slot, grown by doubling. Slots of deleted rows are reused.
+- Rows (id, slot, content, metadata) live in sqlite (rows.sqlite). The
+  fields the ingestion paths filter on (source_type, repository, file_path,
+  file_sha) are indexed columns; other metadata keys are matched with
+  json_extract.
+- Search is an exact BLAS matrix-vector product over the live (or
+  filter-selected) slots. When hnswlib is installed and the collection
+  holds at least hnsw_threshold rows, unfiltered and broadly filtered
+  searches use an HNSW graph instead, persisted next to the matrix.
+- With quantization "float16" or "int8" (utils.quantization), exact
+  searches score an in-memory quantized copy of the matrix and rescore the
+  best top_k * rescore_factor candidates on the float32 rows, so only those
+  rows are read from the memory map.
+- With search_dimension (utils.embedding_dimensions), that first pass
+  scores re-normalized Matryoshka prefixes of the vectors instead, alone or
+  quantized, and the candidates are rescored on the full vectors.
+
+Scores follow Milvus: similarity for COSINE and IP, squared distance for L2.
+Row IDs are the same deterministic IDs VectorClient uses (utils.vector_ids),
+so data can be moved between backends and re-ingestion stays idempotent.
+"""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from utils.logger import get_logger
+except ImportError:
+    import logging
+    def get_logger(name):
+        return logging.getLogger(name)
+
+try:
+    from utils.vector_ids import metadata_chunk_id
+except ImportError:
+    from ..utils.vector_ids import metadata_chunk_id
+
+try:
+    from utils.quantization import (
+        QUANTIZATION_INT8, QUANTIZATION_NONE, QUANTIZATIONS, ScalarQuantizer, approximate_scores, quantize,
+        top_positions
+    )
+except ImportError:
+    from ..utils.quantization import (
+        QUANTIZATION_INT8, QUANTIZATION_NONE, QUANTIZATIONS, ScalarQuantizer, approximate_scores, quantize,
+        top_positions
+    )
+
+try:
+    from utils.embedding_dimensions import truncate_embeddings
+except ImportError:
+    from ..utils.embedding_dimensions import truncate_embeddings
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+logger = get_logger(__name__)
+
+INDEXED_COLUMNS = ("source_type", "repository", "file_path", "file_sha")  # Filterable sqlite columns
+INITIAL_CAPACITY = 1024  # Slots allocated for a new collection
+DEFAULT_HNSW_THRESHOLD = 50000  # Rows from which searches use HNSW (when hnswlib is installed)
+HNSW_MIN_CANDIDATE_SHARE = 0.1  # Filtered searches selecting fewer rows than this share run exact
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_DEFAULT_EF = 64
+DEFAULT_RESCORE_FACTOR = 4  # Quantized candidates rescored per result
+INT8_REFIT_GROWTH = 2.0  # Refit the int8 quantizer once the collection grew by this factor since the last fit
+
+
+class LocalVectorClient:
+    """In-process vector store with the VectorClient interface."""
+
+    def __init__(
+        self,
+        path: str,
+        collection_name: str,
+        dimension: Optional[int] = None,
+        metric: str = "COSINE",
+        hnsw_threshold: int = DEFAULT_HNSW_THRESHOLD,
+        quantization: str = QUANTIZATION_NONE,
+        rescore_factor: int = DEFAULT_RESCORE_FACTOR,
+        search_dimension: Optional[int] = None,
+        **kwargs  # Accept VectorClient arguments (uri, token) for drop-in use
+    ):
+        """
+        Open or create a local collection.
+
+        Args:
+            path: Directory holding local collections
+            collection_name: Collection name (a subdirectory of path)
+            dimension: Vector dimension (taken from the first insert if None)
+            metric: COSINE, IP or L2
+            hnsw_threshold: Row count from which searches use HNSW (requires hnswlib)
+            quantization: "none", "float16" or "int8" copy used for the first pass of exact searches
+            rescore_factor: Quantized candidates rescored on float32 rows per result (1 = no rescoring)
+            search_dimension: Prefix length scored in the first pass of exact searches (None = full vectors)
+        """
+        self.collection_name = collection_name
+        self.root = Path(path) / collection_name
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.hnsw_threshold = hnsw_threshold
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        self.quantization = quantization
+        self.rescore_factor = rescore_factor
+        self.search_dimension = search_dimension or None
+        self._lock = threading.RLock()
+
+        self._info_path = self.root / "collection.json"
+        info = json.loads(self._info_path.read_text()) if self._info_path.exists() else {}
+        self.dimension = info.get("dimension") or dimension
+        self.metric = (info.get("metric") or metric).upper()
+        if self.metric not in ("COSINE", "IP", "L2"):
+            raise ValueError(f"Unsupported metric: {self.metric}")
+        if self.search_dimension and self.dimension and self.search_dimension >= self.dimension:
+            raise ValueError(f"search_dimension {self.search_dimension} must be below the dimension {self.dimension}")
+        self._capacity = info.get("capacity", 0)
+        self._generation = info.get("generation", 0)  # Bumped on every write; tags the saved HNSW graph
+
+        self._db = sqlite3.connect(str(self.root / "rows.sqlite"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS rows ("
+            "id INTEGER PRIMARY KEY, slot INTEGER NOT NULL UNIQUE, content TEXT, "
+            + ", ".join(f"{column} TEXT" for column in INDEXED_COLUMNS)
+            + ", metadata TEXT)"
+        )
+        for column in INDEXED_COLUMNS:
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS rows_{column} ON rows ({column})")
+        self._db.commit()
+
+        self._vectors: Optional[np.memmap] = None
+        self._alive = np.zeros(self._capacity, dtype=bool)
+        self._hnsw = None
+        self._hnsw_generation = -1
+        self._codes: Optional[np.ndarray] = None  # First-pass copy of the matrix, built on first search
+        self._quantizer: Optional[ScalarQuantizer] = None
+        self._quantizer_rows = 0  # Live rows the int8 quantizer was fitted on
+        if self.dimension:
+            self._open_vectors()
+        slots = [slot for (slot,) in self._db.execute("SELECT slot FROM rows")]
+        self._alive[slots] = True
+        self._size = max(slots) + 1 if slots else 0  # High-water mark of used slots
+        self._free = sorted(set(range(self._size)) - set(slots), reverse=True)
+        self._load_hnsw()
+
+        logger.info(f"Opened local vector collection '{collection_name}' at {self.root} ({len(slots)} rows)")
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _open_vectors(self):
+        """Map the vector file, creating it with INITIAL_CAPACITY slots if needed."""
+        vectors_path = self.root / "vectors.f32"
+        if not self._capacity:
+            self._capacity = INITIAL_CAPACITY
+            self._alive = np.zeros(self._capacity, dtype=bool)
+        if not vectors_path.exists() or vectors_path.stat().st_size < self._capacity * self.dimension * 4:
+            with open(vectors_path, "ab") as f:
+                f.truncate(self._capacity * self.dimension * 4)
+        self._vectors = np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(self._capacity, self.dimension))
+        self._save_info()
+
+    def _grow(self, needed: int):
+        """Double the capacity until `needed` slots fit."""
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self._capacity:
+            return
+        self._vectors.flush()
+        self._vectors = None
+        self._capacity = capacity
+        self._alive = np.concatenate([self._alive, np.zeros(capacity - len(self._alive), dtype=bool)])
+        self._open_vectors()
+        if self._codes is not None:
+            self._codes = np.concatenate([self._codes, np.zeros((capacity - len(self._codes), self._codes.shape[1]),
+                                                                dtype=self._codes.dtype)])
+        if self._hnsw is not None:
+            self._hnsw.resize_index(capacity)
+
+    def _save_info(self):
+        self._info_path.write_text(json.dumps({
+            "dimension": self.dimension,
+            "metric": self.metric,
+            "capacity": self._capacity,
+            "generation": self._generation,
+        }))
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        """Unit-normalize rows for COSINE (stored vectors and queries); other metrics are unchanged."""
+        if self.metric != "COSINE":
+            return vectors
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+    def _ensure_collection(self, dimension: Optional[int] = None):
+        """Fix the dimension on first use, mirroring VectorClient._ensure_collection."""
+        if self._vectors is None:
+            if not (self.dimension or dimension):
+                raise ValueError("Local collection is empty and dimension is unknown")
+            self.dimension = int(self.dimension or dimension)
+            self._open_vectors()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def insert_embedding(self, content: str, vector: List[float], metadata: Optional[Dict[str, Any]] = None):
+        """Upsert a single embedding (see upsert_batch for the ID scheme)."""
+        return self.upsert_batch([{"content": content, "vector": vector, "metadata": metadata or {}}])[0]
+
+    def insert_embeddings_batch(self, items: List[Dict[str, Any]]):
+        """Insert multiple embeddings in batch (an upsert, like VectorClient's)."""
+        return self.upsert_batch(items)
+
+    def upsert_batch(self, items: List[Dict[str, Any]]) -> List[int]:
+        """Upsert embeddings under deterministic IDs.
+
+        Args:
+            items: List of dicts with keys 'content', 'vector', and optional 'metadata' and 'id'
+
+        Returns:
+            IDs of the upserted entities, in item order
+        """
+        if not items:
+            return []
+
+        vectors = np.asarray([item["vector"] for item in items], dtype=np.float32)
+        self._ensure_collection(dimension=vectors.shape[1])
+        if vectors.shape[1] != self.dimension:
+            raise ValueError(f"Vector dimension {vectors.shape[1]} does not match {self.dimension}")
+        vectors = self._normalize(vectors)
+
+        doc_ids = []
+        latest: Dict[int, int] = {}  # id -> item position; the last item of a repeated ID wins
+        for position, item in enumerate(items):
+            meta = item.get("metadata") or {}
+            doc_id = item.get("id")
+            if doc_id is None:
+                doc_id = metadata_chunk_id(item["content"], meta)
+            doc_ids.append(int(doc_id))
+            latest[int(doc_id)] = position
+
+        with self._lock:
+            existing = dict(self._select(
+                f"SELECT id, slot FROM rows WHERE id IN ({','.join('?' * len(latest))})", list(latest)
+            ))
+            new_count = len(latest) - len(existing)
+            self._grow(self._size + max(new_count - len(self._free), 0))
+
+            rows = []
+            slots = []
+            for doc_id, position in latest.items():
+                slot = existing.get(doc_id)
+                if slot is None:
+                    if self._free:
+                        slot = self._free.pop()
+                    else:
+                        slot = self._size
+                        self._size += 1
+                self._vectors[slot] = vectors[position]
+                self._alive[slot] = True
+                slots.append(slot)
+
+                meta = items[position].get("metadata") or {}
+                rows.append((
+                    doc_id, slot, items[position]["content"],
+                    *(None if meta.get(column) is None else str(meta[column]) for column in INDEXED_COLUMNS),
+                    json.dumps(meta, ensure_ascii=False, default=str)
+                ))
+
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO rows (id, slot, content, {', '.join(INDEXED_COLUMNS)}, metadata) "
+                f"VALUES ({','.join('?' * (4 + len(INDEXED_COLUMNS)))})",
+                rows
+            )
+            self._db.commit()
+            self._vectors.flush()
+            self._touch()
+
+            if self._codes is not None:
+                self._codes[slots] = quantize(self._first_pass_rows(self._vectors[slots]), self.quantization,
+                                              self._quantizer)
+            if self._hnsw is not None:
+                for slot in slots:
+                    try:
+                        self._hnsw.unmark_deleted(slot)
+                    except RuntimeError:
+                        pass  # Not a deleted label
+                self._hnsw.add_items(self._vectors[slots], np.asarray(slots))
+
+        logger.info(f"Upserted {len(latest)} embeddings into local collection")
+        return doc_ids
+
+    def _delete_where(self, where: str, params: Sequence[Any]) -> int:
+        """Delete the rows matching a WHERE clause and free their slots."""
+        with self._lock:
+            slots = [slot for (slot,) in self._select(f"SELECT slot FROM rows WHERE {where}", params)]
+            if not slots:
+                return 0
+            self._db.execute(f"DELETE FROM rows WHERE {where}", list(params))
+            self._db.commit()
+            self._alive[slots] = False
+            self._free = sorted(set(self._free) | set(slots), reverse=True)
+            if self._hnsw is not None:
+                for slot in slots:
+                    self._hnsw.mark_deleted(slot)
+            self._touch()
+            return len(slots)
+
+    def delete_file_chunks(self, repository: str, file_path: str):
+        """Delete all chunks for a specific file."""
+        deleted = self._delete_where("repository = ? AND file_path = ?", [repository, file_path])
+        logger.info(f"Deleted {deleted} old chunks for {file_path}")
+
+    def delete_stale_file_chunks(self, repository: str, file_path: str, file_sha: str):
+        """Delete the chunks of earlier versions of a file (see VectorClient.delete_stale_file_chunks)."""
+        deleted = self._delete_where(
+            "repository = ? AND file_path = ? AND (file_sha IS NULL OR file_sha != ?)",
+            [repository, file_path, file_sha]
+        )
+        logger.info(f"Deleted {deleted} stale chunks for {file_path}")
+
+    def delete_repository(self, repository: str, source_type: Optional[str] = None):
+        """Delete all chunks of a repository, optionally only those of one source type."""
+        metadata_filter = {"repository": repository}
+        if source_type:
+            metadata_filter["source_type"] = source_type
+        where, params = self._build_where(metadata_filter)
+        deleted = self._delete_where(where, params)
+        logger.info(f"Deleted {deleted} chunks of {repository}" + (f" ({source_type})" if source_type else ""))
+
+    def delete_by_ids(self, ids: List[int]):
+        """Delete entities by primary key."""
+        if ids:
+            self._delete_where(f"id IN ({','.join('?' * len(ids))})", [int(i) for i in ids])
+
+    def _touch(self):
+        """Record a write, invalidating a saved HNSW graph."""
+        self._generation += 1
+        self._save_info()
+        if self._hnsw is not None:
+            self._hnsw_generation = self._generation
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _select(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple]:
+        with self._lock:
+            return self._db.execute(sql, list(params)).fetchall()
+
+    def _build_where(self, metadata_filter: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        """SQL WHERE clause for a VectorClient-style metadata filter dict."""
+        conditions = []
+        params: List[Any] = []
+        for key, value in metadata_filter.items():
+            if key == "id":
+                column = "id"
+            elif key in INDEXED_COLUMNS or key == "content":
+                column = key
+            else:
+                column = f"json_extract(metadata, '$.\"{key}\"')"
+
+            if isinstance(value, dict) and "$eq" in value:
+                value = value["$eq"]
+            elif isinstance(value, dict) and "$in" in value:
+                value = list(value["$in"])
+
+            if isinstance(value, (list, tuple)):
+                values = [str(v) if key in INDEXED_COLUMNS else v for v in value]
+                conditions.append(f"{column} IN ({','.join('?' * len(values))})")
+                params.extend(values)
+            else:
+                conditions.append(f"{column} = ?")
+                params.append(str(value) if key in INDEXED_COLUMNS else value)
+        return (" AND ".join(conditions) if conditions else "1"), params
+
+    def _rows_by_slot(self, slots: List[int]) -> Dict[int, Tuple]:
+        if not slots:
+            return {}
+        rows = self._select(
+            f"SELECT slot, id, content, metadata FROM rows WHERE slot IN ({','.join('?' * len(slots))})", slots
+        )
+        return {row[0]: row[1:] for row in rows}
+
+    def query_similar(
+        self,
+        vector: List[float],
+        top_k: int = 5,
+        source_types: Optional[List[str]] = None,
+        repositories: Optional[List[str]] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+        consistency_level: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Query for similar vectors (same arguments and result format as VectorClient.query_similar).
+
+        search_params may carry {"params": {"ef": ...}} for HNSW searches;
+        consistency_level is accepted for compatibility (local reads are
+        always consistent).
+        """
+        self._ensure_collection(dimension=len(vector))
+        query = self._normalize(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+
+        scope = {}
+        if source_types:
+            scope["source_type"] = list(source_types)
+        if repositories:
+            scope["repository"] = list(repositories)
+
+        with self._lock:
+            candidates = None
+            if scope:
+                where, params = self._build_where(scope)
+                candidates = np.asarray([slot for (slot,) in self._select(f"SELECT slot FROM rows WHERE {where}", params)],
+                                        dtype=np.int64)
+                if not len(candidates):
+                    return []
+
+            alive_count = int(self._alive[:self._size].sum())
+            if self._use_hnsw(alive_count, candidates):
+                slots, scores = self._search_hnsw(query, top_k, candidates, search_params)
+            else:
+                slots, scores = self._search_exact(query, top_k, candidates)
+            rows = self._rows_by_slot(slots)
+
+        results = []
+        for slot, score in zip(slots, scores):
+            if slot not in rows:
+                continue
+            doc_id, content, metadata_json = rows[slot]
+            results.append({
+                "content": content or "",
+                "score": float(score),
+                "id": doc_id,
+                "metadata": json.loads(metadata_json or "{}")
+            })
+        return results
+
+    def _scores(self, vectors: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Milvus-style scores: similarity for COSINE/IP, squared distance for L2."""
+        if self.metric == "L2":
+            return ((vectors - query) ** 2).sum(axis=1)
+        return vectors @ query
+
+    def _search_exact(self, query: np.ndarray, top_k: int, candidates: Optional[np.ndarray]) -> Tuple[List[int], List[float]]:
+        """Brute-force search over all live slots or the candidate slots."""
+        if self.quantization != QUANTIZATION_NONE or self.search_dimension:
+            return self._search_two_pass(query, top_k, candidates)
+        if candidates is None:
+            scores = self._scores(self._vectors[:self._size], query)
+            slots = np.arange(self._size)
+            live = self._alive[:self._size]
+            scores, slots = scores[live], slots[live]
+        else:
+            slots = candidates
+            scores = self._scores(self._vectors[slots], query)
+        if not len(slots):
+            return [], []
+
+        ranked = scores if self.metric == "L2" else -scores
+        k = min(top_k, len(slots))
+        best = np.argpartition(ranked, k - 1)[:k]
+        best = best[np.argsort(ranked[best])]
+        return slots[best].tolist(), scores[best].tolist()
+
+    def _first_pass_rows(self, vectors: np.ndarray) -> np.ndarray:
+        """Rows (or a query) as scored in the first pass: re-normalized prefixes with search_dimension."""
+        if not self.search_dimension:
+            return vectors
+        return truncate_embeddings(vectors, self.search_dimension, normalize=self.metric == "COSINE")
+
+    def _ensure_codes(self):
+        """Build the first-pass copy of the matrix (again, for int8, once the data outgrew its quantizer)."""
+        alive_count = int(self._alive[:self._size].sum())
+        if self._codes is not None and not (
+            self.quantization == QUANTIZATION_INT8 and alive_count > self._quantizer_rows * INT8_REFIT_GROWTH
+        ):
+            return
+        live = np.flatnonzero(self._alive[:self._size])
+        if self.quantization == QUANTIZATION_INT8:
+            sample = self._vectors[live] if len(live) else np.zeros((1, self.dimension), dtype=np.float32)
+            self._quantizer = ScalarQuantizer.fit(self._first_pass_rows(sample))
+            self._quantizer_rows = len(live)
+        self._codes = quantize(self._first_pass_rows(self._vectors[:self._capacity]), self.quantization,
+                               self._quantizer)
+        logger.info(f"Built {self.quantization} copy of {len(live)} local vectors"
+                    + (f" ({self.search_dimension}-dimensional prefixes)" if self.search_dimension else ""))
+
+    def _search_two_pass(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        candidates: Optional[np.ndarray]
+    ) -> Tuple[List[int], List[float]]:
+        """Score the first-pass copy, then rescore the best candidates on the full float32 rows."""
+        self._ensure_codes()
+        first_pass_query = self._first_pass_rows(query)
+        if candidates is None:
+            slots = np.flatnonzero(self._alive[:self._size])
+            scores = approximate_scores(self._codes[:self._size], first_pass_query, self.quantization, self.metric,
+                                        self._quantizer)[slots]
+        else:
+            slots = candidates
+            scores = approximate_scores(self._codes[slots], first_pass_query, self.quantization, self.metric,
+                                        self._quantizer)
+        if not len(slots):
+            return [], []
+
+        if self.rescore_factor <= 1:
+            best = top_positions(scores, top_k, self.metric)
+            return slots[best].tolist(), scores[best].tolist()
+
+        rescored_slots = np.sort(slots[top_positions(scores, top_k * self.rescore_factor, self.metric)])
+        rescored = self._scores(self._vectors[rescored_slots], query)
+        best = top_positions(rescored, top_k, self.metric)
+        return rescored_slots[best].tolist(), rescored[best].tolist()
+
+    # ------------------------------------------------------------------
+    # HNSW
+    # ------------------------------------------------------------------
+
+    def _use_hnsw(self, alive_count: int, candidates: Optional[np.ndarray]) -> bool:
+        """Whether a search should use the HNSW graph (building it on first need)."""
+        if hnswlib is None or alive_count < self.hnsw_threshold:
+            return False
+        if candidates is not None and len(candidates) < alive_count * HNSW_MIN_CANDIDATE_SHARE:
+            return False  # Few candidates: exact search is cheaper and cannot miss
+        if self._hnsw is None:
+            self._build_hnsw()
+        return True
+
+    def _hnsw_space(self) -> str:
+        return "l2" if self.metric == "L2" else "ip"  # COSINE vectors are stored normalized
+
+    def _build_hnsw(self):
+        slots = np.flatnonzero(self._alive[:self._size])
+        index = hnswlib.Index(space=self._hnsw_space(), dim=self.dimension)
+        index.init_index(max_elements=self._capacity, ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+        if len(slots):
+            index.add_items(self._vectors[slots], slots)
+        self._hnsw = index
+        self._hnsw_generation = self._generation
+        logger.info(f"Built HNSW graph over {len(slots)} local vectors")
+
+    def _load_hnsw(self):
+        """Load the saved HNSW graph if it matches the stored data."""
+        graph_path = self.root / "hnsw.bin"
+        tag_path = self.root / "hnsw.json"
+        if hnswlib is None or self._vectors is None or not graph_path.exists() or not tag_path.exists():
+            return
+        if json.loads(tag_path.read_text()).get("generation") != self._generation:
+            return  # Written to since the graph was saved; rebuilt on first need
+        index = hnswlib.Index(space=self._hnsw_space(), dim=self.dimension)
+        index.load_index(str(graph_path), max_elements=self._capacity)
+        self._hnsw = index
+        self._hnsw_generation = self._generation
+
+    def _search_hnsw(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        candidates: Optional[np.ndarray],
+        search_params: Optional[Dict[str, Any]]
+    ) -> Tuple[List[int], List[float]]:
+        ef = ((search_params or {}).get("params") or {}).get("ef", HNSW_DEFAULT_EF)
+        self._hnsw.set_ef(max(int(ef), top_k))
+        allowed = None
+        if candidates is not None:
+            allowed_set = set(candidates.tolist())
+            allowed = lambda label: label in allowed_set
+        k = min(top_k, len(candidates) if candidates is not None else int(self._alive.sum()))
+        labels, distances = self._hnsw.knn_query(query, k=k, filter=allowed)
+        slots = labels[0].tolist()
+        # hnswlib returns 1 - ip for "ip" and squared distance for "l2"
+        scores = distances[0] if self.metric == "L2" else 1.0 - distances[0]
+        return slots, scores.tolist()
+
+    # ------------------------------------------------------------------
+    # Metadata queries
+    # ------------------------------------------------------------------
+
+    def query_by_metadata(self, metadata_filter: Dict[str, Any], top_k: int = 1) -> List[Dict[str, Any]]:
+        """Query entities by metadata filter."""
+        where, params = self._build_where(metadata_filter)
+        rows = self._select(f"SELECT id, metadata FROM rows WHERE {where} LIMIT ?", params + [top_k])
+        return [{"id": doc_id, "metadata": json.loads(metadata_json or "{}")} for doc_id, metadata_json in rows]
+
+    def exists(self, metadata_filter: Dict[str, Any]) -> bool:
+        """Check whether any entity matches a metadata filter."""
+        where, params = self._build_where(metadata_filter)
+        return bool(self._select(f"SELECT 1 FROM rows WHERE {where} LIMIT 1", params))
+
+    def get_ids(self, metadata_filter: Dict[str, Any], limit: int = 16384) -> List[Any]:
+        """Get the IDs of entities matching a metadata filter."""
+        where, params = self._build_where(metadata_filter)
+        return [doc_id for (doc_id,) in self._select(f"SELECT id FROM rows WHERE {where} LIMIT ?", params + [limit])]
+
+    def count(self, metadata_filter: Optional[Dict[str, Any]] = None) -> int:
+        """Count entities matching a metadata filter (all entities if None)."""
+        where, params = self._build_where(metadata_filter or {})
+        return self._select(f"SELECT COUNT(*) FROM rows WHERE {where}", params)[0][0]
+
+    def file_already_processed(self, repository: str, file_path: str, file_sha: str) -> bool:
+        """Check if a file with the same SHA was already processed."""
+        exists = self.exists({"repository": repository, "file_path": file_path, "file_sha": file_sha})
+        if exists:
+            logger.info(f"File already processed: {file_path} (SHA: {file_sha[:8]})")
+        return exists
+
+    def test_connection(self) -> bool:
+        """Local collections are always reachable."""
+        return True
+
+    def close(self):
+        """Flush vectors, save the HNSW graph and close sqlite."""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+            if self._hnsw is not None and self._hnsw_generation == self._generation:
+                self._hnsw.save_index(str(self.root / "hnsw.bin"))
+                (self.root / "hnsw.json").write_text(json.dumps({"generation": self._generation}))
+            self._db.close()
@@ -0,0 +1,285 @@
+"""
+Pool of Milvus clients.
+
+A single MilvusClient shared by every request funnels all calls through one
+gRPC channel. MilvusClientPool holds up to `size` clients (channels) and is
+a drop-in replacement for one: any MilvusClient method called on the pool
+checks a client out, runs the call on it and returns it.
+
+- Clients are opened lazily up to `size`; callers wait for a free one (up
+  to acquire_timeout) once all are checked out.
+- A client idle for longer than health_check_interval is pinged before it
+  is handed out and replaced if the ping fails; a client whose call failed
+  with a transient error is replaced as well.
+- Every call gets a deadline (timeout, unless the caller passes one) and is
+  retried on transient errors (unavailable, deadline exceeded, rate limited)
+  with exponential backoff and full jitter. Inserts are never retried (they
+  are not idempotent); upserts and deletes are.
+- stats() reports size, utilisation, wait time and retries; on_wait and
+  on_retry callbacks feed them to monitoring (see MonitoringService.register_milvus_pool).
+"""
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from utils.logger import get_logger
+except ImportError:
+    import logging
+    def get_logger(name):
+        return logging.getLogger(name)
+
+logger = get_logger(__name__)
+
+LOCAL_METHODS = ("create_schema", "prepare_index_params")  # Build request objects; no RPC, no timeout
+NON_RETRYABLE_METHODS = ("insert",)  # Not idempotent: a retry after a lost response duplicates rows
+RETRYABLE_STATUS_CODES = ("UNAVAILABLE", "DEADLINE_EXCEEDED", "RESOURCE_EXHAUSTED")
+RETRYABLE_MESSAGES = ("unavailable", "deadline exceeded", "rate limit", "connection refused", "connection reset")
+
+
+class PoolExhaustedError(TimeoutError):
+    """No pooled client became free within acquire_timeout (not retried: retrying would only add load)."""
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether a failed Milvus call may succeed when retried (gRPC status, rate limiting, dropped connections)."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    code = getattr(error, "code", None)
+    if callable(code):  # grpc.RpcError
+        try:
+            code = code()
+        except Exception:
+            code = None
+    if str(getattr(code, "name", code)).upper() in RETRYABLE_STATUS_CODES:
+        return True
+    message = str(error).lower()
+    return any(fragment in message for fragment in RETRYABLE_MESSAGES)
+
+
+class MilvusClientPool:
+    """Thread-safe pool of MilvusClient instances with the MilvusClient interface."""
+
+    def __init__(
+        self,
+        uri: str,
+        token: str,
+        size: int = 4,
+        timeout: Optional[float] = 10.0,
+        max_retries: int = 3,
+        retry_backoff: float = 0.2,
+        max_backoff: float = 5.0,
+        health_check_interval: float = 30.0,
+        acquire_timeout: Optional[float] = 30.0,
+        client_factory: Optional[Callable[[], Any]] = None
+    ):
+        """
+        Open the pool (one client immediately, the rest on demand).
+
+        Args:
+            uri: Milvus / Zilliz Cloud URI
+            token: Milvus token
+            size: Maximum number of clients (channels)
+            timeout: Default deadline of each call in seconds (None = no deadline)
+            max_retries: Retries of a call failing with a transient error
+            retry_backoff: Base delay of the exponential backoff in seconds
+            max_backoff: Cap of a single backoff delay in seconds
+            health_check_interval: Idle seconds after which a client is pinged before reuse
+            acquire_timeout: Seconds to wait for a free client before failing (None = wait forever)
+            client_factory: Creates a client (MilvusClient(uri, token) if None)
+        """
+        if size < 1:
+            raise ValueError(f"Milvus pool size must be at least 1, got {size}")
+        self.uri = uri
+        self.size = size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        if client_factory is None:
+            from pymilvus import MilvusClient
+
+            def client_factory():
+                return MilvusClient(uri=uri, token=token)
+        self._client_factory = client_factory
+        self.on_wait: Optional[Callable[[float], None]] = None  # Called with the seconds each checkout waited
+        self.on_retry: Optional[Callable[[str], None]] = None  # Called with the method name of each retry
+
+        self._condition = threading.Condition()
+        self._idle = deque()  # (client, last_used) pairs, most recently used last
+        self._open = 0  # Clients created and not yet discarded
+        self._in_use = 0
+        self._checkouts = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._retries = 0
+        self._replaced = 0
+
+        # Fail fast on a bad URI or token, as a single MilvusClient would
+        self._idle.append((self._create_client(), time.monotonic()))
+        self._open = 1
+        logger.info(f"Opened Milvus client pool (size {size}, call timeout {timeout}s)")
+
+    # ------------------------------------------------------------------
+    # Checkout
+    # ------------------------------------------------------------------
+
+    def _create_client(self):
+        return self._client_factory()
+
+    def _close_client(self, client):
+        try:
+            client.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, client) -> bool:
+        """Ping a client that has been idle for a while."""
+        try:
+            client.list_collections(timeout=self.timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"Discarding unhealthy Milvus client: {e}")
+            return False
+
+    def _acquire(self):
+        """Check out an idle client, open a new one, or wait for one to be returned."""
+        deadline = None if self.acquire_timeout is None else time.monotonic() + self.acquire_timeout
+        while True:
+            create = False
+            with self._condition:
+                while not self._idle and self._open >= self.size:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise PoolExhaustedError(
+                            f"No Milvus client became free within {self.acquire_timeout}s (pool size {self.size})"
+                        )
+                    self._condition.wait(remaining)
+                if self._idle:
+                    client, last_used = self._idle.pop()
+                else:
+                    client, last_used = None, None
+                    self._open += 1
+                    create = True
+                self._in_use += 1
+
+            if create:
+                try:
+                    return self._create_client()
+                except Exception:
+                    self._discard(None)
+                    raise
+            if time.monotonic() - last_used <= self.health_check_interval or self._is_healthy(client):
+                return client
+            self._discard(client)
+
+    def _release(self, client):
+        with self._condition:
+            self._in_use -= 1
+            self._idle.append((client, time.monotonic()))
+            self._condition.notify()
+
+    def _discard(self, client):
+        """Drop a checked-out client (broken or never created) and free its slot."""
+        if client is not None:
+            self._close_client(client)
+        with self._condition:
+            self._in_use -= 1
+            self._open -= 1
+            if client is not None:
+                self._replaced += 1
+            self._condition.notify()
+
+    @contextmanager
+    def lease(self):
+        """Check a client out for several calls; it is replaced if a call fails with a transient error."""
+        started = time.perf_counter()
+        client = self._acquire()
+        waited = time.perf_counter() - started
+        with self._condition:
+            self._checkouts += 1
+            self._wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+        if self.on_wait is not None:
+            self.on_wait(waited)
+
+        try:
+            yield client
+        except Exception as e:
+            if is_transient_error(e):
+                self._discard(client)
+            else:
+                self._release(client)
+            raise
+        else:
+            self._release(client)
+
+    # ------------------------------------------------------------------
+    # MilvusClient interface
+    # ------------------------------------------------------------------
+
+    def call(self, method: str, *args, **kwargs) -> Any:
+        """Run a MilvusClient method on a pooled client with a deadline and retries."""
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
+        attempts = 1 if method in NON_RETRYABLE_METHODS else 1 + self.max_retries
+        for attempt in range(attempts):
+            try:
+                with self.lease() as client:
+                    return getattr(client, method)(*args, **kwargs)
+            except PoolExhaustedError:
+                raise
+            except Exception as e:
+                if attempt + 1 >= attempts or not is_transient_error(e):
+                    raise
+                delay = random.uniform(0, min(self.max_backoff, self.retry_backoff * 2 ** attempt))
+                logger.warning(f"Milvus {method} failed ({e}); retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+                with self._condition:
+                    self._retries += 1
+                if self.on_retry is not None:
+                    self.on_retry(method)
+                time.sleep(delay)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in LOCAL_METHODS:
+            with self.lease() as client:
+                return getattr(client, name)
+
+        def pooled_call(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+
+        pooled_call.__name__ = name
+        return pooled_call
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, utilisation, checkout wait times, retries and replaced clients."""
+        with self._condition:
+            return {
+                "size": self.size,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "utilization": self._in_use / self.size,
+                "checkouts": self._checkouts,
+                "wait_seconds_total": self._wait_seconds,
+                "wait_seconds_avg": self._wait_seconds / self._checkouts if self._checkouts else 0.0,
+                "wait_seconds_max": self._max_wait_seconds,
+                "retries": self._retries,
+                "replaced": self._replaced,
+            }
+
+    def close(self):
+        """Close the idle clients (call once no requests are in flight)."""
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for client, _ in idle:
+            self._close_client(client)
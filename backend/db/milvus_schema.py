@@ -0,0 +1,569 @@
+"""
+Typed Milvus collection schema shared by every Milvus writer.
+
+Collections used to be created with only a dimension and metric, so all
+metadata lived in the dynamic JSON field and every filter scanned JSON. The
+schema declared here makes the fields the ingestion paths filter on real
+scalar fields with scalar indexes (INVERTED for VARCHAR, STL_SORT for
+INT64), a partition key, an optional clustering key and an explicitly tuned
+vector index. The dynamic field stays enabled for the remaining metadata.
+
+By default 'source_type' is the partition key (see utils.source_types), so
+searches restricted to some kinds of content and per-source deletes only
+touch their partitions; 'repository' can be made the clustering key so
+clustering compaction groups each repository's rows together and filters on
+it skip unrelated segments.
+
+The vector field can be stored as FLOAT16_VECTOR (MILVUS_VECTOR_DTYPE=float16,
+half the memory and transfer of FLOAT_VECTOR) and indexed with a quantized
+index (IVF_SQ8, IVF_PQ); with MILVUS_RESCORE_FACTOR > 1 searches fetch
+top_k * factor candidates and rescore them against the stored vectors (see
+VectorClient.query_similar). Rows and queries are converted to the
+collection's vector type by prepare_rows / encode_vector.
+
+With MILVUS_SEARCH_DIMENSION set, collections also get a 'search_vector'
+field holding the re-normalized Matryoshka prefix of 'vector' (see
+utils.embedding_dimensions). The ANN index is built on the short prefix and
+'vector' gets a FLAT index; searches run on the prefix and rescore
+top_k * factor candidates on the full vectors (search_request /
+finish_search).
+
+Existing dynamic collections are migrated by copying them into a typed
+collection and switching the original name over to it with an alias, so
+searches keep working while the copy runs (see MilvusSchemaManager.migrate).
+"""
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+try:
+    from utils.embedding_dimensions import truncate_embeddings
+except ImportError:
+    from ..utils.embedding_dimensions import truncate_embeddings
+
+try:
+    from utils.logger import get_logger
+except ImportError:
+    import logging
+    def get_logger(name):
+        return logging.getLogger(name)
+
+logger = get_logger(__name__)
+
+PRIMARY_FIELD = "id"
+VECTOR_FIELD = "vector"
+LEGACY_SUFFIX = "_legacy"  # Name the original collection gets after a migration
+TYPED_SUFFIX = "_typed"  # Name of the collection a migration copies into
+INGESTED_AT_FIELD = "ingested_at"  # Write time of a row in epoch milliseconds
+SEARCH_VECTOR_FIELD = "search_vector"  # Matryoshka prefix of VECTOR_FIELD searched by two-stage collections
+TWO_STAGE_RESCORE_FACTOR = 4  # Candidates rescored per result in two-stage searches without MILVUS_RESCORE_FACTOR
+VECTOR_DTYPES = {"float32": "FLOAT_VECTOR", "float16": "FLOAT16_VECTOR"}  # MILVUS_VECTOR_DTYPE -> DataType
+PQ_SUBQUANTIZERS = (64, 48, 32, 24, 16, 12, 8, 4, 2, 1)  # Preferred IVF_PQ 'm' values, largest first
+
+
+@dataclass(frozen=True)
+class ScalarField:
+    """A typed scalar field and its index."""
+
+    name: str
+    dtype: str  # "VARCHAR" or "INT64"
+    max_length: int = 0  # VARCHAR only, in bytes
+    index_type: Optional[str] = None  # "INVERTED", "STL_SORT" or None
+    default: Any = ""  # Filled in for rows that do not set the field
+
+
+# Fields the ingestion paths write and filter on; anything else stays dynamic
+DEFAULT_SCALAR_FIELDS: Tuple[ScalarField, ...] = (
+    ScalarField("content", "VARCHAR", max_length=65535),
+    ScalarField("source", "VARCHAR", max_length=64, index_type="INVERTED"),
+    ScalarField("source_type", "VARCHAR", max_length=64, index_type="INVERTED"),
+    ScalarField("repository", "VARCHAR", max_length=256, index_type="INVERTED"),
+    ScalarField("file_path", "VARCHAR", max_length=1024, index_type="INVERTED"),
+    ScalarField("file_sha", "VARCHAR", max_length=64, index_type="INVERTED"),
+    ScalarField("chunk_id_str", "VARCHAR", max_length=64, index_type="INVERTED"),
+    ScalarField("issue_number", "INT64", index_type="STL_SORT", default=0),
+    ScalarField(INGESTED_AT_FIELD, "INT64", index_type="STL_SORT", default=0),
+)
+
+
+@dataclass(frozen=True)
+class CollectionSpec:
+    """Schema and index settings of a typed collection."""
+
+    dimension: int = 1536
+    metric: str = "COSINE"
+    scalar_fields: Tuple[ScalarField, ...] = DEFAULT_SCALAR_FIELDS
+    partition_key: Optional[str] = None  # Scalar field to use as partition key (None = no partition key)
+    num_partitions: int = 64  # Partitions created for the partition key
+    clustering_key: Optional[str] = None  # Scalar field to use as clustering key (None = none)
+    index_type: str = "HNSW"  # Vector index; AUTOINDEX on Zilliz Cloud serverless
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 200
+    extra_index_params: Dict[str, Any] = field(default_factory=dict)
+    vector_dtype: str = "float32"  # "float32" (FLOAT_VECTOR) or "float16" (FLOAT16_VECTOR)
+    ivf_nlist: int = 1024  # IVF_* clusters
+    pq_m: Optional[int] = None  # IVF_PQ sub-quantizers (must divide the dimension; derived if None)
+    pq_nbits: int = 8  # IVF_PQ bits per sub-quantizer code
+    search_dimension: Optional[int] = None  # Matryoshka prefix the ANN index is built on (None = full vectors)
+    # Search-time settings (None = server default); see scripts/tune/tune_search_params.py
+    search_ef: Optional[int] = None  # HNSW candidate list size
+    search_nprobe: Optional[int] = None  # IVF_* clusters probed
+    search_level: Optional[int] = None  # AUTOINDEX accuracy level (Zilliz Cloud)
+    consistency_level: Optional[str] = None  # Strong, Bounded, Session or Eventually
+    rescore_factor: int = 1  # Candidates fetched per result and rescored on the stored vectors (1 = off)
+
+    @classmethod
+    def from_env(cls, dimension: int = 1536, metric: str = "COSINE") -> "CollectionSpec":
+        """
+        Spec with index settings from MILVUS_INDEX_TYPE, MILVUS_HNSW_M,
+        MILVUS_HNSW_EF_CONSTRUCTION, MILVUS_IVF_NLIST, MILVUS_PQ_M,
+        MILVUS_PQ_NBITS, MILVUS_VECTOR_DTYPE, MILVUS_SEARCH_DIMENSION,
+        MILVUS_PARTITION_KEY (default
+        'source_type', 'none' to disable) and MILVUS_CLUSTERING_KEY, and
+        search settings from MILVUS_SEARCH_EF, MILVUS_SEARCH_NPROBE,
+        MILVUS_SEARCH_LEVEL, MILVUS_CONSISTENCY_LEVEL and MILVUS_RESCORE_FACTOR.
+        """
+        vector_dtype = os.getenv("MILVUS_VECTOR_DTYPE", "float32").strip().lower()
+        if vector_dtype not in VECTOR_DTYPES:
+            raise ValueError(f"MILVUS_VECTOR_DTYPE must be one of {', '.join(VECTOR_DTYPES)}, got '{vector_dtype}'")
+        search_dimension = _optional_int(os.getenv("MILVUS_SEARCH_DIMENSION", ""))
+        if search_dimension and search_dimension >= dimension:
+            raise ValueError(f"MILVUS_SEARCH_DIMENSION ({search_dimension}) must be below the dimension ({dimension})")
+        return cls(
+            dimension=dimension,
+            metric=metric,
+            partition_key=_optional_field(os.getenv("MILVUS_PARTITION_KEY", "source_type")),
+            clustering_key=_optional_field(os.getenv("MILVUS_CLUSTERING_KEY", "")),
+            num_partitions=int(os.getenv("MILVUS_NUM_PARTITIONS", "64")),
+            index_type=os.getenv("MILVUS_INDEX_TYPE", "HNSW").upper(),
+            hnsw_m=int(os.getenv("MILVUS_HNSW_M", "16")),
+            hnsw_ef_construction=int(os.getenv("MILVUS_HNSW_EF_CONSTRUCTION", "200")),
+            vector_dtype=vector_dtype,
+            ivf_nlist=int(os.getenv("MILVUS_IVF_NLIST", "1024")),
+            pq_m=_optional_int(os.getenv("MILVUS_PQ_M", "")),
+            pq_nbits=int(os.getenv("MILVUS_PQ_NBITS", "8")),
+            search_dimension=search_dimension or None,
+            search_ef=_optional_int(os.getenv("MILVUS_SEARCH_EF", "")),
+            search_nprobe=_optional_int(os.getenv("MILVUS_SEARCH_NPROBE", "")),
+            search_level=_optional_int(os.getenv("MILVUS_SEARCH_LEVEL", "")),
+            consistency_level=os.getenv("MILVUS_CONSISTENCY_LEVEL") or None,
+            rescore_factor=int(os.getenv("MILVUS_RESCORE_FACTOR", "1")),
+        )
+
+    def get_field(self, name: str) -> Optional[ScalarField]:
+        """Declared scalar field by name."""
+        for scalar_field in self.scalar_fields:
+            if scalar_field.name == name:
+                return scalar_field
+        return None
+
+    def vector_index_params(self) -> Dict[str, Any]:
+        """Build parameters of the vector index."""
+        params = dict(self.extra_index_params)
+        if self.index_type == "HNSW":
+            params.setdefault("M", self.hnsw_m)
+            params.setdefault("efConstruction", self.hnsw_ef_construction)
+        elif self.index_type.startswith("IVF"):
+            params.setdefault("nlist", self.ivf_nlist)
+            if self.index_type == "IVF_PQ":
+                params.setdefault("m", self.pq_m or _pq_subquantizers(self.dimension))
+                params.setdefault("nbits", self.pq_nbits)
+        return params
+
+    def search_params(self, top_k: int, index_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Search parameters for the configured search settings.
+
+        Args:
+            top_k: Number of results the search returns (HNSW ef is raised to it)
+            index_type: Index type of the searched collection (the spec's if None)
+
+        Returns:
+            search_params for MilvusClient.search ({} = server defaults)
+        """
+        index_type = (index_type or self.index_type).upper()
+        params: Dict[str, Any] = {}
+        if index_type == "HNSW" and self.search_ef:
+            params["ef"] = max(self.search_ef, top_k)
+        elif index_type.startswith("IVF") and self.search_nprobe:
+            params["nprobe"] = self.search_nprobe
+        elif index_type == "AUTOINDEX" and self.search_level:
+            params["level"] = self.search_level
+        return {"params": params} if params else {}
+
+
+def _optional_field(value: str) -> Optional[str]:
+    """Field name from an environment value; empty or 'none' means no field."""
+    value = value.strip()
+    return None if value.lower() in ("", "none") else value
+
+
+def _optional_int(value: str) -> Optional[int]:
+    """Integer from an environment value; empty means unset."""
+    value = value.strip()
+    return int(value) if value else None
+
+
+def _pq_subquantizers(dimension: int) -> int:
+    """Largest preferred IVF_PQ sub-quantizer count that divides the dimension."""
+    return next(m for m in PQ_SUBQUANTIZERS if dimension % m == 0)
+
+
+def decode_vector(value: Any) -> np.ndarray:
+    """
+    float32 array of a vector returned by a query or search. FLOAT16_VECTOR
+    values come back as raw bytes (or a one-element list of bytes).
+    """
+    if isinstance(value, (list, tuple)) and len(value) == 1 and isinstance(value[0], (bytes, bytearray)):
+        value = value[0]
+    if isinstance(value, (bytes, bytearray)):
+        return np.frombuffer(value, dtype=np.float16).astype(np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+def rescore_matches(vector: Any, matches: List[Dict[str, Any]], top_k: int, metric: str) -> List[Dict[str, Any]]:
+    """
+    Rerank search matches by the exact score of their full vectors (returned
+    in entity[VECTOR_FIELD]); 'distance' is replaced by that score and
+    matches without a vector are dropped.
+    """
+    matches = [match for match in matches if match.get("entity", {}).get(VECTOR_FIELD) is not None]
+    if not matches:
+        return []
+
+    query = decode_vector(vector)
+    vectors = np.stack([decode_vector(match["entity"][VECTOR_FIELD]) for match in matches])
+    if metric == "COSINE":
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    scores = ((vectors - query) ** 2).sum(axis=1) if metric == "L2" else vectors @ query
+
+    order = np.argsort(scores if metric == "L2" else -scores, kind="stable")[:top_k]
+    reranked = []
+    for position in order:
+        match = dict(matches[position])
+        match["distance"] = float(scores[position])
+        reranked.append(match)
+    return reranked
+
+
+def _truncate_utf8(value: str, max_bytes: int) -> str:
+    """Cut a string to at most max_bytes of UTF-8 without splitting a character."""
+    encoded = value.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return value
+    return encoded[:max_bytes].decode("utf-8", errors="ignore")
+
+
+class MilvusSchemaManager:
+    """Creates, inspects and migrates typed collections through a MilvusClient."""
+
+    def __init__(self, client, spec: Optional[CollectionSpec] = None):
+        """
+        Args:
+            client: pymilvus MilvusClient
+            spec: Collection spec (CollectionSpec.from_env() if None)
+        """
+        self.client = client
+        self.spec = spec or CollectionSpec.from_env()
+        self._declared: Dict[str, Set[str]] = {}
+        self._vector_indexes: Dict[str, Dict[str, Any]] = {}
+        self._vector_dtypes: Dict[str, str] = {}
+        self._search_dimensions: Dict[str, Optional[int]] = {}
+
+    def build_schema(self):
+        """Typed collection schema: INT64 id, vector, declared scalar fields, dynamic field."""
+        from pymilvus import DataType
+
+        schema_kwargs = {"auto_id": False, "enable_dynamic_field": True}
+        if self.spec.partition_key:
+            schema_kwargs["partition_key_field"] = self.spec.partition_key
+        schema = self.client.create_schema(**schema_kwargs)
+
+        schema.add_field(field_name=PRIMARY_FIELD, datatype=DataType.INT64, is_primary=True)
+        vector_type = getattr(DataType, VECTOR_DTYPES[self.spec.vector_dtype])
+        schema.add_field(field_name=VECTOR_FIELD, datatype=vector_type, dim=self.spec.dimension)
+        if self.spec.search_dimension:
+            schema.add_field(field_name=SEARCH_VECTOR_FIELD, datatype=vector_type, dim=self.spec.search_dimension)
+        for scalar_field in self.spec.scalar_fields:
+            kwargs = {}
+            if scalar_field.dtype == "VARCHAR":
+                kwargs["max_length"] = scalar_field.max_length
+            if scalar_field.name == self.spec.partition_key:
+                kwargs["is_partition_key"] = True
+            if scalar_field.name == self.spec.clustering_key:
+                kwargs["is_clustering_key"] = True
+            schema.add_field(field_name=scalar_field.name, datatype=getattr(DataType, scalar_field.dtype), **kwargs)
+        return schema
+
+    def build_index_params(self):
+        """Vector index (FLAT on the full vectors of two-stage collections) plus one scalar index per indexed field."""
+        index_params = self.client.prepare_index_params()
+        ann_field = SEARCH_VECTOR_FIELD if self.spec.search_dimension else VECTOR_FIELD
+        index_params.add_index(
+            field_name=ann_field,
+            index_type=self.spec.index_type,
+            index_name=f"{ann_field}_idx",
+            metric_type=self.spec.metric,
+            params=self.spec.vector_index_params()
+        )
+        if self.spec.search_dimension:
+            index_params.add_index(
+                field_name=VECTOR_FIELD,
+                index_type="FLAT",
+                index_name=f"{VECTOR_FIELD}_idx",
+                metric_type=self.spec.metric
+            )
+        for scalar_field in self.spec.scalar_fields:
+            if scalar_field.index_type:
+                index_params.add_index(
+                    field_name=scalar_field.name,
+                    index_type=scalar_field.index_type,
+                    index_name=f"{scalar_field.name}_idx"
+                )
+        return index_params
+
+    def create_collection(self, collection_name: str):
+        """Create a typed collection with its indexes."""
+        kwargs = {}
+        if self.spec.partition_key:
+            kwargs["num_partitions"] = self.spec.num_partitions
+        self.client.create_collection(
+            collection_name=collection_name,
+            schema=self.build_schema(),
+            index_params=self.build_index_params(),
+            **kwargs
+        )
+        self._declared[collection_name] = {f.name for f in self.spec.scalar_fields}
+        self._vector_dtypes[collection_name] = self.spec.vector_dtype
+        self._search_dimensions[collection_name] = self.spec.search_dimension
+        search = f", search dim {self.spec.search_dimension}" if self.spec.search_dimension else ""
+        logger.info(
+            f"Created typed Milvus collection '{collection_name}' "
+            f"({self.spec.index_type}, {self.spec.vector_dtype}, dim {self.spec.dimension}{search}, "
+            f"partition key: {self.spec.partition_key or 'none'})"
+        )
+
+    def ensure_collection(self, collection_name: str):
+        """Create the collection if it does not exist (typed); existing collections are left as they are."""
+        if not self.client.has_collection(collection_name=collection_name):
+            self.create_collection(collection_name)
+
+    def _describe(self, collection_name: str) -> bool:
+        """Cache the declared fields and vector fields of a collection; False if it cannot be described."""
+        try:
+            description = self.client.describe_collection(collection_name=collection_name)
+        except Exception as e:
+            logger.warning(f"Could not describe collection '{collection_name}': {e}")
+            return False
+        fields = description.get("fields", [])
+        names = {f.get("name") for f in fields}
+        self._declared[collection_name] = {f.name for f in self.spec.scalar_fields if f.name in names}
+        vector_type = next((f.get("type") for f in fields if f.get("name") == VECTOR_FIELD), None)
+        self._vector_dtypes[collection_name] = (
+            "float16" if "FLOAT16" in str(getattr(vector_type, "name", vector_type)).upper() else "float32"
+        )
+        search_field = next((f for f in fields if f.get("name") == SEARCH_VECTOR_FIELD), None)
+        self._search_dimensions[collection_name] = (
+            int((search_field.get("params") or {}).get("dim")) if search_field else None
+        )
+        return True
+
+    def declared_fields(self, collection_name: str) -> Set[str]:
+        """Scalar fields of the spec the collection declares (cached per collection)."""
+        if collection_name not in self._declared and not self._describe(collection_name):
+            return set()
+        return self._declared[collection_name]
+
+    def vector_dtype(self, collection_name: str) -> str:
+        """Storage type of the collection's vector field, "float32" or "float16" (cached per collection)."""
+        if collection_name not in self._vector_dtypes and not self._describe(collection_name):
+            return "float32"
+        return self._vector_dtypes[collection_name]
+
+    def encode_vector(self, collection_name: str, vector: Any) -> Any:
+        """A row or query vector in the form the collection's vector fields accept."""
+        if self.vector_dtype(collection_name) == "float16":
+            return decode_vector(vector).astype(np.float16)
+        return vector
+
+    def search_field(self, collection_name: str) -> Tuple[str, Optional[int]]:
+        """Vector field searches run on and its Matryoshka prefix length (None = the full vectors)."""
+        if collection_name not in self._search_dimensions and not self._describe(collection_name):
+            return VECTOR_FIELD, None
+        dimension = self._search_dimensions[collection_name]
+        return (SEARCH_VECTOR_FIELD, dimension) if dimension else (VECTOR_FIELD, None)
+
+    def truncate_for_search(self, collection_name: str, vectors: Any) -> np.ndarray:
+        """float32 vector(s) cut to the collection's search field (unchanged for single-stage collections)."""
+        _, dimension = self.search_field(collection_name)
+        if not dimension:
+            return np.asarray(vectors, dtype=np.float32)
+        return truncate_embeddings(vectors, dimension, normalize=self.spec.metric == "COSINE")
+
+    def rescore_factor(self, collection_name: str) -> int:
+        """Candidates fetched per result for rescoring on the full vectors (1 = no rescoring)."""
+        if self.spec.rescore_factor > 1:
+            return self.spec.rescore_factor
+        return TWO_STAGE_RESCORE_FACTOR if self.search_field(collection_name)[1] else 1
+
+    def search_request(self, collection_name: str, vector: Any, top_k: int) -> Dict[str, Any]:
+        """
+        data, anns_field, limit and output_fields of a MilvusClient.search for
+        one query; pass its results through finish_search.
+        """
+        field_name, dimension = self.search_field(collection_name)
+        query = self.truncate_for_search(collection_name, vector).tolist() if dimension else vector
+        factor = self.rescore_factor(collection_name)
+        return {
+            "data": [self.encode_vector(collection_name, query)],
+            "anns_field": field_name,
+            "limit": top_k * factor,
+            "output_fields": ["*", VECTOR_FIELD] if factor > 1 else ["*"],
+        }
+
+    def finish_search(
+        self,
+        collection_name: str,
+        vector: Any,
+        matches: List[Dict[str, Any]],
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """Top-k of the matches of a search_request, reranked on the full vectors when it fetched extra candidates."""
+        if self.rescore_factor(collection_name) <= 1:
+            return list(matches)[:top_k]
+        return rescore_matches(vector, matches, top_k, self.spec.metric)
+
+    def is_typed(self, collection_name: str) -> bool:
+        """Whether the collection declares typed scalar fields (False for dynamic-field collections)."""
+        return bool(self.declared_fields(collection_name))
+
+    def describe_vector_index(self, collection_name: str) -> Dict[str, Any]:
+        """Description of the index searches use (cached; {} if it cannot be described)."""
+        if collection_name not in self._vector_indexes:
+            try:
+                field_name, _ = self.search_field(collection_name)
+                index_names = self.client.list_indexes(collection_name=collection_name, field_name=field_name)
+                self._vector_indexes[collection_name] = dict(
+                    self.client.describe_index(collection_name=collection_name, index_name=index_names[0])
+                )
+            except Exception as e:
+                logger.warning(f"Could not describe the vector index of '{collection_name}': {e}")
+                return {}
+        return self._vector_indexes[collection_name]
+
+    def vector_index_type(self, collection_name: str) -> str:
+        """Index type of the collection's vector field (the spec's if it cannot be described)."""
+        return str(self.describe_vector_index(collection_name).get("index_type") or self.spec.index_type).upper()
+
+    def prepare_rows(self, collection_name: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Stamp rows with their write time and make them valid for a typed
+        collection: derive the search vector of two-stage collections,
+        convert vectors to the vector fields' type, fill in missing declared
+        fields and cut VARCHAR values to their byte limit.
+        Collections created before a field was added to the spec keep
+        receiving it through the dynamic field.
+
+        The write time (INGESTED_AT_FIELD, epoch milliseconds) is the change
+        watermark replicas sync from (see db.replica_cache).
+        """
+        now_ms = int(time.time() * 1000)
+        float16 = self.vector_dtype(collection_name) == "float16"
+        _, search_dimension = self.search_field(collection_name)
+        for row in rows:
+            row.setdefault(INGESTED_AT_FIELD, now_ms)
+            if VECTOR_FIELD not in row:
+                continue
+            if search_dimension:
+                prefix = self.truncate_for_search(collection_name, decode_vector(row[VECTOR_FIELD]))
+                row[SEARCH_VECTOR_FIELD] = prefix.astype(np.float16) if float16 else prefix.tolist()
+            if float16:
+                row[VECTOR_FIELD] = decode_vector(row[VECTOR_FIELD]).astype(np.float16)
+
+        declared = self.declared_fields(collection_name)
+        if not declared:
+            return rows
+
+        for row in rows:
+            for scalar_field in self.spec.scalar_fields:
+                if scalar_field.name not in declared:
+                    continue
+                value = row.get(scalar_field.name)
+                if value is None:
+                    row[scalar_field.name] = scalar_field.default
+                elif scalar_field.dtype == "VARCHAR":
+                    row[scalar_field.name] = _truncate_utf8(str(value), scalar_field.max_length)
+                elif scalar_field.dtype == "INT64":
+                    row[scalar_field.name] = int(value)
+        return rows
+
+    def migrate(self, collection_name: str, batch_size: int = 1000, drop_legacy: bool = False) -> str:
+        """
+        Move a dynamic-field collection onto the typed schema.
+
+        All rows are copied (with their vectors) into '<name>_typed' in
+        batches; the original is then renamed to '<name>_legacy' and
+        '<name>' becomes an alias of the typed collection, so callers keep
+        using the same name. Searches are served by the original collection
+        until the switch. Writes made during the copy may be missed: run it
+        while no ingestion is writing, or re-run ingestion afterwards (upserts
+        with stable IDs make that safe).
+
+        Args:
+            collection_name: Collection (or alias) to migrate
+            batch_size: Rows per copy batch
+            drop_legacy: Drop the original collection after the switch
+
+        Returns:
+            Name of the typed collection
+        """
+        if self.is_typed(collection_name):
+            logger.info(f"Collection '{collection_name}' already has the typed schema")
+            return collection_name
+
+        target = f"{collection_name}{TYPED_SUFFIX}"
+        if self.client.has_collection(collection_name=target):
+            logger.info(f"Resuming migration into existing '{target}'")
+        else:
+            self.create_collection(target)
+        self.client.load_collection(collection_name=target)
+
+        started = time.time()
+        copied = 0
+        iterator = self.client.query_iterator(
+            collection_name=collection_name,
+            batch_size=batch_size,
+            filter="",
+            output_fields=["*"]
+        )
+        try:
+            while True:
+                rows = iterator.next()
+                if not rows:
+                    break
+                rows = self.prepare_rows(target, [dict(row) for row in rows])
+                self.client.upsert(collection_name=target, data=rows)
+                copied += len(rows)
+                logger.info(f"  Copied {copied} rows into '{target}'")
+        finally:
+            iterator.close()
+
+        legacy = f"{collection_name}{LEGACY_SUFFIX}"
+        self.client.rename_collection(old_name=collection_name, new_name=legacy)
+        self.client.create_alias(collection_name=target, alias=collection_name)
+        self._declared[collection_name] = {f.name for f in self.spec.scalar_fields}
+        self._vector_dtypes[collection_name] = self.spec.vector_dtype
+        self._search_dimensions[collection_name] = self.spec.search_dimension
+        logger.info(
+            f"✓ Migrated {copied} rows in {time.time() - started:.1f}s; "
+            f"'{collection_name}' now points to '{target}' (original kept as '{legacy}')"
+        )
+
+        if drop_legacy:
+            self.client.drop_collection(collection_name=legacy)
+            logger.info(f"Dropped '{legacy}'")
+        return target
@@ -0,0 +1,487 @@
+"""
+Read-through local replica of a Milvus collection.
+
+Each /api/ask search is a network round trip to managed Milvus, and its tail
+latency follows the network. The corpus is small enough (a few hundred
+thousand vectors) to keep a float16 copy of every vector in process memory,
+so ReplicaVectorClient answers searches locally and only goes to Milvus when
+it cannot:
+
+- VectorReplica holds the vectors (float16 by default, half the memory of
+  float32) together with each row's source_type and repository for scoped
+  searches. It is filled by a snapshot scan and kept current by incremental
+  syncs of rows whose ingested_at write time (stamped by
+  MilvusSchemaManager.prepare_rows) is newer than the last watermark. A
+  periodic reconciliation of primary keys picks up deletes and rows written
+  without a write time.
+- Large replicas are partitioned into inverted lists around k-means
+  centroids, and a search scans only the nprobe lists nearest to the query
+  (IVF), so a query converts and scores a few percent of the matrix instead
+  of all of it. Replicas below exact_threshold rows are scanned in full.
+- Content and metadata are not replicated: the top-k rows' payloads come
+  from an LRU cache of hot rows, read through from Milvus by primary key on
+  a miss.
+
+Searches fall back to Milvus while the replica is loading, when its last
+successful sync is older than max_staleness, when a hit's payload no longer
+exists (deleted since the last sync), and for calls that ask for explicit
+server-side search params or Strong consistency.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from utils.logger import get_logger
+except ImportError:
+    import logging
+    def get_logger(name):
+        return logging.getLogger(name)
+
+from .milvus_schema import INGESTED_AT_FIELD, PRIMARY_FIELD, VECTOR_FIELD, decode_vector
+
+logger = get_logger(__name__)
+
+DEFAULT_NPROBE = 16  # Inverted lists scanned per search
+DEFAULT_EXACT_THRESHOLD = 20000  # Replicas below this many rows are scanned in full
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE_PER_LIST = 32  # Training rows per centroid
+SCAN_BLOCK_ROWS = 8192  # Rows converted to float32 per scoring step
+
+
+class _ReplicaData:
+    """Vector matrix and per-row scope codes of one replica generation."""
+
+    def __init__(self, dimension: int, dtype: np.dtype, capacity: int = 1024):
+        self.dimension = dimension
+        self.dtype = dtype
+        self.size = 0
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.vectors = np.zeros((capacity, dimension), dtype=dtype)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.lists = np.zeros(capacity, dtype=np.int32)
+        self.source_codes = np.zeros(capacity, dtype=np.int32)
+        self.repository_codes = np.zeros(capacity, dtype=np.int32)
+        self.codes: Dict[str, Dict[str, int]] = {"source_type": {}, "repository": {}}
+        self.rows: Dict[int, int] = {}  # id -> row
+        self.centroids: Optional[np.ndarray] = None
+
+    def _grow(self, needed: int):
+        capacity = len(self.ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("ids", "alive", "lists", "source_codes", "repository_codes"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        vectors = np.zeros((capacity, self.dimension), dtype=self.dtype)
+        vectors[:len(self.vectors)] = self.vectors
+        self.vectors = vectors
+
+    def code(self, field: str, value: Any) -> int:
+        """Integer code of a scope value (0 = unset)."""
+        codes = self.codes[field]
+        value = "" if value is None else str(value)
+        if value not in codes:
+            codes[value] = len(codes) + 1
+        return codes[value]
+
+    def upsert(self, ids: np.ndarray, vectors: np.ndarray, source_types: Sequence[Any], repositories: Sequence[Any]):
+        """Add or overwrite rows (vectors already normalized as float32)."""
+        self._grow(self.size + len(ids))
+        lists = self.assign(vectors)
+        for i, row_id in enumerate(ids.tolist()):
+            row = self.rows.get(row_id)
+            if row is None:
+                row = self.size
+                self.size += 1
+                self.rows[row_id] = row
+                self.ids[row] = row_id
+            self.vectors[row] = vectors[i]
+            self.alive[row] = True
+            self.lists[row] = lists[i]
+            self.source_codes[row] = self.code("source_type", source_types[i])
+            self.repository_codes[row] = self.code("repository", repositories[i])
+
+    def remove(self, ids: Sequence[int]) -> int:
+        """Mark rows deleted (their slots stay until the next snapshot)."""
+        removed = 0
+        for row_id in ids:
+            row = self.rows.pop(int(row_id), None)
+            if row is not None:
+                self.alive[row] = False
+                removed += 1
+        return removed
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Nearest centroid of each vector (0 when the replica is not partitioned)."""
+        if self.centroids is None or not len(vectors):
+            return np.zeros(len(vectors), dtype=np.int32)
+        lists = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), SCAN_BLOCK_ROWS):
+            block = vectors[start:start + SCAN_BLOCK_ROWS]
+            distances = (self.centroids ** 2).sum(axis=1) - 2 * block @ self.centroids.T
+            lists[start:start + SCAN_BLOCK_ROWS] = np.argmin(distances, axis=1)
+        return lists
+
+    def train(self, seed: int = 0):
+        """Partition the replica into about sqrt(n) lists with k-means and assign every row."""
+        live = np.flatnonzero(self.alive[:self.size])
+        nlist = max(1, int(np.sqrt(len(live))))
+        rng = np.random.default_rng(seed)
+        sample = self.vectors[rng.choice(live, size=min(len(live), nlist * KMEANS_SAMPLE_PER_LIST), replace=False)]
+        sample = sample.astype(np.float32)
+
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            self.centroids = centroids
+            labels = self.assign(sample)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+        self.centroids = centroids
+
+        for start in range(0, self.size, SCAN_BLOCK_ROWS):
+            block = self.vectors[start:start + SCAN_BLOCK_ROWS].astype(np.float32)
+            self.lists[start:start + SCAN_BLOCK_ROWS] = self.assign(block)
+        logger.info(f"Partitioned replica into {nlist} lists")
+
+
+class VectorReplica:
+    """In-memory copy of a Milvus collection's vectors, synced by write-time watermark."""
+
+    def __init__(
+        self,
+        vector_client,
+        dtype: str = "float16",
+        nprobe: int = DEFAULT_NPROBE,
+        exact_threshold: int = DEFAULT_EXACT_THRESHOLD,
+        max_staleness: float = 300.0,
+        reconcile_interval: float = 300.0,
+        batch_size: int = 1000
+    ):
+        """
+        Args:
+            vector_client: VectorClient of the replicated collection
+            dtype: Storage type of the vectors ("float16" or "float32")
+            nprobe: Inverted lists scanned per search
+            exact_threshold: Replicas below this many rows are scanned in full
+            max_staleness: Seconds after the last successful sync before searches fall back to Milvus
+            reconcile_interval: Seconds between primary key reconciliations (deletes, unstamped rows)
+            batch_size: Rows per Milvus query iterator batch
+        """
+        self.vector_client = vector_client
+        self.dtype = np.dtype(dtype)
+        self.nprobe = nprobe
+        self.exact_threshold = exact_threshold
+        self.max_staleness = max_staleness
+        self.reconcile_interval = reconcile_interval
+        self.batch_size = batch_size
+        self.metric = vector_client.metric.upper()
+
+        self._lock = threading.RLock()
+        self._data: Optional[_ReplicaData] = None
+        self.watermark = 0  # Largest ingested_at seen
+        self.last_sync = 0.0
+        self.last_reconcile = 0.0
+        self.on_rows_changed: Optional[Callable[[List[int]], None]] = None  # Called with updated/removed IDs
+
+    @property
+    def ready(self) -> bool:
+        return self._data is not None
+
+    def is_fresh(self) -> bool:
+        """Whether the replica is loaded and synced within max_staleness."""
+        return self.ready and time.time() - self.last_sync <= self.max_staleness
+
+    @property
+    def size(self) -> int:
+        data = self._data
+        return len(data.rows) if data is not None else 0
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.metric != "COSINE":
+            return vectors
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12)
+
+    def _iterate(self, filter_expr: str, output_fields: List[str]):
+        """Yield batches of rows of the collection matching a filter."""
+        iterator = self.vector_client.client.query_iterator(
+            collection_name=self.vector_client.collection_name,
+            batch_size=self.batch_size,
+            filter=filter_expr,
+            output_fields=output_fields
+        )
+        try:
+            while True:
+                rows = iterator.next()
+                if not rows:
+                    break
+                yield rows
+        finally:
+            iterator.close()
+
+    def _apply(self, data: _ReplicaData, rows: List[Dict[str, Any]]) -> int:
+        """Write a batch of Milvus rows into replica data; returns the largest write time seen."""
+        if not rows:
+            return 0
+        ids = np.asarray([row[PRIMARY_FIELD] for row in rows], dtype=np.int64)
+        vectors = self._normalize(np.stack([decode_vector(row[VECTOR_FIELD]) for row in rows]))
+        data.upsert(ids, vectors, [row.get("source_type") for row in rows], [row.get("repository") for row in rows])
+        if self.on_rows_changed is not None and data is self._data:
+            self.on_rows_changed(ids.tolist())
+        return max(int(row.get(INGESTED_AT_FIELD) or 0) for row in rows)
+
+    def _fields(self) -> List[str]:
+        return [PRIMARY_FIELD, VECTOR_FIELD, "source_type", "repository", INGESTED_AT_FIELD]
+
+    def snapshot(self):
+        """Load every row of the collection into a new replica generation and swap it in."""
+        started = time.time()
+        data = _ReplicaData(self.vector_client.dimension, self.dtype)
+        watermark = 0
+        for rows in self._iterate("", self._fields()):
+            watermark = max(watermark, self._apply(data, rows))
+        if len(data.rows) >= self.exact_threshold:
+            data.train()
+
+        with self._lock:
+            self._data = data
+            self.watermark = watermark
+            self.last_sync = started
+            self.last_reconcile = started
+        logger.info(
+            f"📥 Replica loaded {len(data.rows)} vectors ({self.dtype.name}, "
+            f"{data.vectors[:data.size].nbytes / 2 ** 20:.0f} MiB) in {time.time() - started:.1f}s"
+        )
+
+    def sync(self) -> int:
+        """
+        Pull rows written since the watermark; reconcile primary keys when due.
+
+        Returns:
+            Number of rows added, updated or removed
+        """
+        if self._data is None:
+            self.snapshot()
+            return self.size
+
+        started = time.time()
+        changed = 0
+        watermark = self.watermark
+        # >= re-reads rows stamped in the watermark millisecond; upserts make that harmless
+        for rows in self._iterate(f"{INGESTED_AT_FIELD} >= {self.watermark}", self._fields()):
+            with self._lock:
+                watermark = max(watermark, self._apply(self._data, rows))
+            changed += len(rows)
+
+        if started - self.last_reconcile >= self.reconcile_interval:
+            changed += self.reconcile()
+            self.last_reconcile = started
+
+        with self._lock:
+            self.watermark = watermark
+            self.last_sync = started
+        if changed:
+            logger.info(f"🔄 Replica synced {changed} changed rows ({self.size} vectors)")
+        return changed
+
+    def reconcile(self) -> int:
+        """Drop rows deleted in Milvus and fetch rows the watermark sync cannot see."""
+        remote = set()
+        for rows in self._iterate("", [PRIMARY_FIELD]):
+            remote.update(int(row[PRIMARY_FIELD]) for row in rows)
+
+        with self._lock:
+            local = set(self._data.rows)
+            removed = self._data.remove(local - remote)
+        if removed and self.on_rows_changed is not None:
+            self.on_rows_changed(sorted(local - remote))
+        missing = sorted(remote - local)
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            rows = self.vector_client.client.query(
+                collection_name=self.vector_client.collection_name,
+                filter=f"{PRIMARY_FIELD} in {batch}",
+                output_fields=self._fields()
+            )
+            with self._lock:
+                self._apply(self._data, rows)
+        if removed or missing:
+            logger.info(f"Replica reconciled: {removed} removed, {len(missing)} added")
+        return removed + len(missing)
+
+    def search(
+        self,
+        vector: Sequence[float],
+        top_k: int,
+        source_types: Optional[Sequence[str]] = None,
+        repositories: Optional[Sequence[str]] = None
+    ) -> Optional[List[Tuple[int, float]]]:
+        """
+        Top-k (id, score) pairs from the replica, best first, or None if it is not fresh.
+
+        Scores follow Milvus: similarity for COSINE and IP, squared distance for L2.
+        """
+        if not self.is_fresh():
+            return None
+        query = self._normalize(vector)
+
+        with self._lock:
+            data = self._data
+            mask = data.alive[:data.size].copy()
+            if source_types:
+                codes = [data.codes["source_type"].get(str(value), -1) for value in source_types]
+                mask &= np.isin(data.source_codes[:data.size], codes)
+            if repositories:
+                codes = [data.codes["repository"].get(str(value), -1) for value in repositories]
+                mask &= np.isin(data.repository_codes[:data.size], codes)
+
+            rows = np.flatnonzero(mask)
+            if data.centroids is not None and len(rows) > self.exact_threshold:
+                centroid_distances = (data.centroids ** 2).sum(axis=1) - 2 * data.centroids @ query
+                probed = np.argsort(centroid_distances)[:self.nprobe]
+                probed_rows = rows[np.isin(data.lists[rows], probed)]
+                if len(probed_rows) >= top_k:
+                    rows = probed_rows  # Otherwise the scope is too narrow for the probed lists; scan it all
+
+            scores = np.empty(len(rows), dtype=np.float32)
+            for start in range(0, len(rows), SCAN_BLOCK_ROWS):
+                block = data.vectors[rows[start:start + SCAN_BLOCK_ROWS]].astype(np.float32)
+                if self.metric == "L2":
+                    scores[start:start + len(block)] = ((block - query) ** 2).sum(axis=1)
+                else:
+                    scores[start:start + len(block)] = block @ query
+            ids = data.ids[rows]
+
+        if not len(rows):
+            return []
+        ranked = scores if self.metric == "L2" else -scores
+        k = min(top_k, len(rows))
+        best = np.argpartition(ranked, k - 1)[:k]
+        best = best[np.argsort(ranked[best])]
+        return list(zip(ids[best].tolist(), scores[best].tolist()))
+
+
+class ReplicaVectorClient:
+    """VectorClient that serves searches from a local replica and everything else from Milvus."""
+
+    def __init__(
+        self,
+        vector_client,
+        replica: Optional[VectorReplica] = None,
+        sync_interval: float = 30.0,
+        payload_cache_size: int = 20000
+    ):
+        """
+        Args:
+            vector_client: VectorClient of the replicated collection
+            replica: Replica to search (a float16 VectorReplica if None)
+            sync_interval: Seconds between background syncs
+            payload_cache_size: Rows whose content and metadata are kept in memory
+        """
+        self.vector_client = vector_client
+        self.replica = replica or VectorReplica(vector_client)
+        self.sync_interval = sync_interval
+        self.payload_cache_size = payload_cache_size
+        self.stats = {"local": 0, "fallback": 0, "payload_hits": 0, "payload_misses": 0}
+
+        self._payloads: "OrderedDict[int, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._payload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.replica.on_rows_changed = self._invalidate_payloads
+
+    def __getattr__(self, name):
+        # Writes, metadata queries and health checks go to Milvus unchanged
+        return getattr(self.vector_client, name)
+
+    def start(self):
+        """Load the replica and keep it synced in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="vector-replica-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.replica.sync()
+            except Exception as e:
+                logger.warning(f"Replica sync failed (searches fall back to Milvus once stale): {e}")
+            self._stop.wait(self.sync_interval)
+
+    def query_similar(
+        self,
+        vector: List[float],
+        top_k: int = 5,
+        source_types: Optional[List[str]] = None,
+        repositories: Optional[List[str]] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+        consistency_level: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Query for similar vectors locally, falling back to Milvus (see module docstring)."""
+        hits = None
+        if search_params is None and consistency_level != "Strong":
+            hits = self.replica.search(vector, top_k, source_types, repositories)
+
+        if hits is not None:
+            payloads = self._get_payloads([hit_id for hit_id, _ in hits])
+            if len(payloads) == len(hits):
+                self.stats["local"] += 1
+                return [
+                    {"content": payloads[hit_id][0], "score": score, "id": hit_id, "metadata": payloads[hit_id][1]}
+                    for hit_id, score in hits
+                ]
+
+        self.stats["fallback"] += 1
+        return self.vector_client.query_similar(
+            vector, top_k,
+            source_types=source_types,
+            repositories=repositories,
+            search_params=search_params,
+            consistency_level=consistency_level
+        )
+
+    def _invalidate_payloads(self, ids: List[int]):
+        """Forget cached payloads of rows the replica saw change."""
+        with self._payload_lock:
+            for row_id in ids:
+                self._payloads.pop(row_id, None)
+
+    def _get_payloads(self, ids: List[int]) -> Dict[int, Tuple[str, Dict[str, Any]]]:
+        """Content and metadata of rows from the LRU cache, reading misses through from Milvus."""
+        found = {}
+        with self._payload_lock:
+            for row_id in ids:
+                if row_id in self._payloads:
+                    self._payloads.move_to_end(row_id)
+                    found[row_id] = self._payloads[row_id]
+        self.stats["payload_hits"] += len(found)
+
+        missing = [row_id for row_id in ids if row_id not in found]
+        if missing:
+            self.stats["payload_misses"] += len(missing)
+            for entity in self.vector_client.get_by_ids(missing):
+                found[entity["id"]] = (entity["content"], entity["metadata"])
+            with self._payload_lock:
+                for row_id in missing:
+                    if row_id in found:
+                        self._payloads[row_id] = found[row_id]
+                while len(self._payloads) > self.payload_cache_size:
+                    self._payloads.popitem(last=False)
+        return found
@@ -0,0 +1,394 @@
+"""
+Recall/latency tuner for Milvus search parameters.
+
+ANN indexes trade recall for latency through a search-time parameter: ef for
+HNSW, nprobe for IVF_* and level for AUTOINDEX. The tuner measures that trade
+on this collection:
+
+1. Sample a snapshot of (id, vector) rows from the collection.
+2. Compute the exact top-k of each query vector over the snapshot by brute
+   force (numpy).
+3. Sweep the search parameter from cheap to expensive, running the queries
+   one per request the way the application does, and record recall@k and
+   latency of each setting.
+4. Pick the cheapest setting whose mean recall@k meets the target.
+
+When the snapshot covers the whole collection the live collection is
+searched; otherwise the snapshot is copied into a temporary collection with
+the same index, so ANN results and ground truth cover the same rows.
+Queries are real question embeddings when available, otherwise vectors
+sampled from the snapshot (their own row is excluded from both result lists).
+Searches are unfiltered, so scoped searches on small partitions may reach a
+higher recall than measured.
+"""
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from utils.logger import get_logger
+except ImportError:
+    import logging
+    def get_logger(name):
+        return logging.getLogger(name)
+
+from .milvus_schema import PRIMARY_FIELD, VECTOR_FIELD, CollectionSpec, MilvusSchemaManager, decode_vector
+
+logger = get_logger(__name__)
+
+# Candidate values per index type, cheapest first
+SWEEP_CANDIDATES: Dict[str, Tuple[int, ...]] = {
+    "HNSW": (16, 24, 32, 48, 64, 96, 128, 192, 256, 384, 512),
+    "IVF": (1, 2, 4, 8, 16, 32, 64, 128, 256),
+    "AUTOINDEX": (1, 2, 3, 4, 5, 6, 7, 8, 9, 10),
+}
+# Search parameter and environment variable per index type
+SWEEP_PARAMETERS: Dict[str, Tuple[str, str]] = {
+    "HNSW": ("ef", "MILVUS_SEARCH_EF"),
+    "IVF": ("nprobe", "MILVUS_SEARCH_NPROBE"),
+    "AUTOINDEX": ("level", "MILVUS_SEARCH_LEVEL"),
+}
+TUNING_SUFFIX = "_tuning"  # Temporary collection for snapshots of large collections
+EXACT_BATCH_ROWS = 4096  # Snapshot rows scored per brute-force step
+
+
+@dataclass
+class SweepResult:
+    """Recall and latency of one search parameter value."""
+
+    value: int
+    recall: float  # Mean recall@k
+    p50_ms: float
+    p95_ms: float
+
+
+def _index_family(index_type: str) -> str:
+    """Sweep family of an index type (IVF_FLAT, IVF_SQ8, IVF_PQ... share nprobe)."""
+    index_type = index_type.upper()
+    if index_type.startswith("IVF"):
+        return "IVF"
+    if index_type not in SWEEP_CANDIDATES:
+        raise ValueError(f"No search parameter to tune for index type {index_type}")
+    return index_type
+
+
+class SearchTuner:
+    """Sweeps the search parameter of a collection's vector index against exact results."""
+
+    def __init__(
+        self,
+        client,
+        collection_name: str,
+        spec: Optional[CollectionSpec] = None,
+        k: int = 10,
+        target_recall: float = 0.95
+    ):
+        """
+        Args:
+            client: pymilvus MilvusClient
+            collection_name: Collection to tune
+            spec: Collection spec (CollectionSpec.from_env() if None)
+            k: Result count recall is measured at
+            target_recall: Mean recall@k the chosen setting must reach
+        """
+        self.client = client
+        self.collection_name = collection_name
+        self.schema = MilvusSchemaManager(client, spec)
+        self.k = k
+        self.target_recall = target_recall
+
+        index = self.schema.describe_vector_index(collection_name)
+        self.index_type = self.schema.vector_index_type(collection_name)
+        self.metric = str(index.get("metric_type") or self.schema.spec.metric).upper()
+        self.family = _index_family(self.index_type)
+
+    def snapshot(self, sample_size: int, seed: int = 0, batch_size: int = 1000) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """
+        Uniformly sample rows of the collection (reservoir sampling over one scan).
+        Vectors are those of the searched field (the Matryoshka prefix on
+        two-stage collections).
+
+        Returns:
+            (ids, float32 vectors, whether the sample is the whole collection)
+        """
+        field_name, _ = self.schema.search_field(self.collection_name)
+        rng = np.random.default_rng(seed)
+        ids: List[int] = []
+        vectors: List[Any] = []
+        seen = 0
+
+        iterator = self.client.query_iterator(
+            collection_name=self.collection_name,
+            batch_size=batch_size,
+            filter="",
+            output_fields=[PRIMARY_FIELD, field_name]
+        )
+        try:
+            while True:
+                rows = iterator.next()
+                if not rows:
+                    break
+                for row in rows:
+                    seen += 1
+                    if len(ids) < sample_size:
+                        ids.append(row[PRIMARY_FIELD])
+                        vectors.append(decode_vector(row[field_name]))
+                    else:
+                        slot = rng.integers(seen)
+                        if slot < sample_size:
+                            ids[slot] = row[PRIMARY_FIELD]
+                            vectors[slot] = decode_vector(row[field_name])
+        finally:
+            iterator.close()
+
+        logger.info(f"📸 Sampled {len(ids)} of {seen} rows from '{self.collection_name}'")
+        return np.asarray(ids, dtype=np.int64), np.asarray(vectors, dtype=np.float32), len(ids) == seen
+
+    def exact_top_k(
+        self,
+        queries: np.ndarray,
+        ids: np.ndarray,
+        vectors: np.ndarray,
+        exclude_ids: Optional[Sequence[Optional[int]]] = None
+    ) -> List[List[int]]:
+        """
+        Exact top-k IDs of each query over the snapshot, by brute force.
+
+        Args:
+            queries: float32 matrix of query vectors
+            ids: Snapshot IDs
+            vectors: Snapshot vectors
+            exclude_ids: Per query, an ID to leave out (the query's own row) or None
+
+        Returns:
+            Top-k IDs per query, best first
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if self.metric == "COSINE":
+            queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_ids = np.empty((len(queries), 0), dtype=np.int64)
+        for start in range(0, len(ids), EXACT_BATCH_ROWS):
+            block = vectors[start:start + EXACT_BATCH_ROWS]
+            block_ids = ids[start:start + EXACT_BATCH_ROWS]
+            if self.metric == "COSINE":
+                block = block / np.maximum(np.linalg.norm(block, axis=1, keepdims=True), 1e-12)
+            if self.metric == "L2":
+                scores = -(
+                    (queries ** 2).sum(axis=1, keepdims=True) - 2 * queries @ block.T + (block ** 2).sum(axis=1)
+                )
+            else:
+                scores = queries @ block.T
+            if exclude_ids is not None:
+                for row, excluded in enumerate(exclude_ids):
+                    if excluded is not None:
+                        scores[row, block_ids == excluded] = -np.inf
+
+            # Keep the best k seen so far
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_ids = np.concatenate([best_ids, np.broadcast_to(block_ids, scores.shape)], axis=1)
+            if best_scores.shape[1] > self.k:
+                keep = np.argpartition(-best_scores, self.k - 1, axis=1)[:, :self.k]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_ids = np.take_along_axis(best_ids, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        return np.take_along_axis(best_ids, order, axis=1).tolist()
+
+    def sweep(
+        self,
+        collection_name: str,
+        queries: np.ndarray,
+        ground_truth: List[List[int]],
+        exclude_ids: Optional[Sequence[Optional[int]]] = None,
+        candidates: Optional[Sequence[int]] = None
+    ) -> List[SweepResult]:
+        """
+        Measure recall@k and latency of each candidate value, cheapest first.
+
+        Args:
+            collection_name: Collection to search
+            queries: Query vectors
+            ground_truth: Exact top-k IDs per query
+            exclude_ids: Per query, an ID to drop from the ANN results (the query's own row)
+            candidates: Values to try (SWEEP_CANDIDATES of the index type if None)
+
+        Returns:
+            One result per value
+        """
+        param, _ = SWEEP_PARAMETERS[self.family]
+        candidates = sorted(candidates or SWEEP_CANDIDATES[self.family])
+        limit = self.k + (1 if exclude_ids is not None else 0)
+        field_name, _ = self.schema.search_field(collection_name)
+        results = []
+
+        for value in candidates:
+            if param == "ef":
+                value = max(value, limit)  # HNSW needs ef >= limit
+            recalls = []
+            latencies = []
+            for i, query in enumerate(queries):
+                started = time.perf_counter()
+                res = self.client.search(
+                    collection_name=collection_name,
+                    data=[self.schema.encode_vector(collection_name, query.tolist())],
+                    anns_field=field_name,
+                    limit=limit,
+                    search_params={"params": {param: value}},
+                    output_fields=[PRIMARY_FIELD],
+                    consistency_level="Strong"
+                )
+                latencies.append((time.perf_counter() - started) * 1000)
+
+                found = [match.get("id") for match in (res[0] if res else [])]
+                if exclude_ids is not None:
+                    found = [found_id for found_id in found if found_id != exclude_ids[i]]
+                expected = set(ground_truth[i])
+                recalls.append(len(expected.intersection(found[:self.k])) / max(len(expected), 1))
+
+            result = SweepResult(
+                value=value,
+                recall=float(np.mean(recalls)),
+                p50_ms=float(np.percentile(latencies, 50)),
+                p95_ms=float(np.percentile(latencies, 95))
+            )
+            results.append(result)
+            logger.info(
+                f"  {param}={value}: recall@{self.k} {result.recall:.3f}, "
+                f"p50 {result.p50_ms:.1f} ms, p95 {result.p95_ms:.1f} ms"
+            )
+        return results
+
+    def choose(self, results: List[SweepResult]) -> Optional[SweepResult]:
+        """Cheapest result meeting the target recall (the most accurate one if none does)."""
+        meeting = [result for result in results if result.recall >= self.target_recall]
+        if meeting:
+            return min(meeting, key=lambda result: (result.value, result.p50_ms))
+        if results:
+            logger.warning(f"No setting reached recall@{self.k} {self.target_recall}; using the most accurate one")
+            return max(results, key=lambda result: result.recall)
+        return None
+
+    def profile(self, result: SweepResult) -> Dict[str, str]:
+        """Environment settings that select a sweep result."""
+        _, env_name = SWEEP_PARAMETERS[self.family]
+        return {env_name: str(result.value)}
+
+    def tune(
+        self,
+        query_vectors: Optional[np.ndarray] = None,
+        num_queries: int = 100,
+        sample_size: int = 100000,
+        candidates: Optional[Sequence[int]] = None,
+        seed: int = 0
+    ) -> Tuple[Optional[SweepResult], List[SweepResult]]:
+        """
+        Run the whole tuning procedure.
+
+        Args:
+            query_vectors: Embeddings of real queries (sampled from the snapshot if None)
+            num_queries: Queries sampled from the snapshot when query_vectors is None
+            sample_size: Rows in the snapshot
+            candidates: Values to sweep (SWEEP_CANDIDATES of the index type if None)
+            seed: Random seed of the sampling
+
+        Returns:
+            (chosen result, all sweep results)
+        """
+        ids, vectors, complete = self.snapshot(sample_size, seed=seed)
+        if not len(ids):
+            raise ValueError(f"Collection '{self.collection_name}' is empty")
+
+        exclude_ids = None
+        if query_vectors is None:
+            picks = np.random.default_rng(seed).choice(len(ids), size=min(num_queries, len(ids)), replace=False)
+            query_vectors = vectors[picks]
+            exclude_ids = ids[picks].tolist()
+        else:
+            query_vectors = self.schema.truncate_for_search(self.collection_name, query_vectors)
+        query_vectors = np.asarray(query_vectors, dtype=np.float32)
+
+        logger.info(f"🎯 Computing exact top-{self.k} of {len(query_vectors)} queries over {len(ids)} rows")
+        ground_truth = self.exact_top_k(query_vectors, ids, vectors, exclude_ids)
+
+        target = self.collection_name
+        if not complete:
+            target = self.build_snapshot_collection(ids, vectors)
+        try:
+            logger.info(f"🔧 Sweeping {SWEEP_PARAMETERS[self.family][0]} on '{target}' ({self.index_type}, {self.metric})")
+            results = self.sweep(target, query_vectors, ground_truth, exclude_ids, candidates)
+        finally:
+            if target != self.collection_name:
+                self.client.drop_collection(collection_name=target)
+
+        return self.choose(results), results
+
+    def build_snapshot_collection(
+        self,
+        ids: np.ndarray,
+        vectors: np.ndarray,
+        name: Optional[str] = None,
+        index_type: Optional[str] = None,
+        vector_dtype: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> str:
+        """
+        Copy the snapshot into a temporary collection (dropped first if it exists).
+
+        Args:
+            ids: Snapshot IDs
+            vectors: Snapshot vectors
+            name: Collection name ('<collection>_tuning' if None)
+            index_type: Vector index (the collection's index and build parameters if None)
+            vector_dtype: "float32" or "float16" vector field (the collection's if None)
+            batch_size: Rows per insert
+
+        Returns:
+            Name of the loaded collection
+        """
+        extra_params = {}
+        if index_type is None or index_type.upper() == self.index_type:
+            index = self.schema.describe_vector_index(self.collection_name)
+            meta_keys = {"index_type", "metric_type", "field_name", "index_name", "total_rows", "indexed_rows",
+                         "pending_index_rows", "state"}
+            extra_params = {key: value for key, value in index.items() if key not in meta_keys}
+
+        spec = replace(
+            self.schema.spec,
+            dimension=vectors.shape[1],
+            metric=self.metric,
+            index_type=(index_type or self.index_type).upper(),
+            vector_dtype=vector_dtype or self.schema.vector_dtype(self.collection_name),
+            search_dimension=None,  # Snapshot vectors already are the searched prefix
+            partition_key=None,
+            clustering_key=None,
+            extra_index_params=extra_params
+        )
+        manager = MilvusSchemaManager(self.client, spec)
+        name = name or f"{self.collection_name}{TUNING_SUFFIX}"
+        if self.client.has_collection(collection_name=name):
+            self.client.drop_collection(collection_name=name)
+        manager.create_collection(name)
+
+        for start in range(0, len(ids), batch_size):
+            rows = [
+                {PRIMARY_FIELD: int(row_id), VECTOR_FIELD: vector.tolist()}
+                for row_id, vector in zip(ids[start:start + batch_size], vectors[start:start + batch_size])
+            ]
+            self.client.insert(collection_name=name, data=manager.prepare_rows(name, rows))
+        self.client.flush(collection_name=name)
+        self.client.load_collection(collection_name=name)
+        logger.info(f"📦 Copied {len(ids)} snapshot rows into '{name}'")
+        return name
+
+
+def write_profile(env_path: str, settings: Dict[str, str]):
+    """Write search settings to an env file (existing keys are updated in place)."""
+    from dotenv import set_key
+
+    for key, value in settings.items():
+        set_key(env_path, key, value, quote_mode="never")
+    logger.info(f"✓ Wrote {', '.join(f'{key}={value}' for key, value in settings.items())} to {env_path}")
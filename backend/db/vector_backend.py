@@ -0,0 +1,94 @@
+"""
+Vector backend selection.
+
+VECTOR_BACKEND picks the store behind the VectorClient interface:
+"milvus" (default) talks to Milvus / Zilliz Cloud, "local" uses the embedded
+LocalVectorClient under LOCAL_VECTOR_PATH, which needs neither pymilvus nor
+a server. Milvus calls go through a pool of MILVUS_POOL_SIZE clients
+(db.milvus_pool) with per-call timeouts and retries. With
+VECTOR_REPLICA_ENABLED, a Milvus client is wrapped in a ReplicaVectorClient
+that serves searches from an in-process replica.
+"""
+from typing import Any, Dict
+
+try:
+    from utils.logger import get_logger
+except ImportError:
+    import logging
+    def get_logger(name):
+        return logging.getLogger(name)
+
+logger = get_logger(__name__)
+
+BACKEND_MILVUS = "milvus"
+BACKEND_LOCAL = "local"
+
+
+def create_vector_client(config: Dict[str, Any], collection_name: str = None, replicate: bool = True):
+    """
+    Create the configured vector client.
+
+    Args:
+        config: Configuration dict from utils.config.load_config()
+        collection_name: Collection to open (MILVUS_COLLECTION_NAME if None)
+        replicate: Allow the read replica (ingestion jobs pass False; they only write)
+
+    Returns:
+        VectorClient, ReplicaVectorClient or LocalVectorClient
+    """
+    backend = (config.get("VECTOR_BACKEND") or BACKEND_MILVUS).lower()
+    collection_name = collection_name or config["MILVUS_COLLECTION_NAME"]
+    dimension = config.get("MILVUS_DIMENSION", 1536)
+    metric = config.get("MILVUS_METRIC", "COSINE")
+
+    if backend == BACKEND_LOCAL:
+        from .local_vector_client import LocalVectorClient
+
+        logger.info(f"Using local vector backend at {config['LOCAL_VECTOR_PATH']}")
+        return LocalVectorClient(
+            path=config["LOCAL_VECTOR_PATH"],
+            collection_name=collection_name,
+            dimension=dimension,
+            metric=metric,
+            quantization=config.get("LOCAL_VECTOR_QUANTIZATION", "none"),
+            rescore_factor=config.get("LOCAL_VECTOR_RESCORE_FACTOR", 4),
+            search_dimension=config.get("LOCAL_VECTOR_SEARCH_DIMENSION")
+        )
+    if backend != BACKEND_MILVUS:
+        raise ValueError(f"Unknown VECTOR_BACKEND: {backend}")
+
+    from .vector_client import VectorClient
+
+    client = VectorClient(
+        uri=config["MILVUS_URI"],
+        token=config["MILVUS_TOKEN"],
+        collection_name=collection_name,
+        dimension=dimension,
+        metric=metric,
+        pool_size=config.get("MILVUS_POOL_SIZE", 0),
+        call_timeout=config.get("MILVUS_CALL_TIMEOUT"),
+        max_retries=config.get("MILVUS_MAX_RETRIES", 0),
+        retry_backoff=config.get("MILVUS_RETRY_BACKOFF", 0.2),
+        health_check_interval=config.get("MILVUS_POOL_HEALTH_CHECK_INTERVAL", 30.0),
+        acquire_timeout=config.get("MILVUS_POOL_ACQUIRE_TIMEOUT", 30.0)
+    )
+    if not replicate or not config.get("VECTOR_REPLICA_ENABLED"):
+        return client
+
+    from .replica_cache import ReplicaVectorClient, VectorReplica
+
+    replica = VectorReplica(
+        client,
+        dtype=config.get("VECTOR_REPLICA_DTYPE", "float16"),
+        nprobe=config.get("VECTOR_REPLICA_NPROBE", 16),
+        max_staleness=config.get("VECTOR_REPLICA_MAX_STALENESS", 300.0)
+    )
+    replicated = ReplicaVectorClient(
+        client,
+        replica,
+        sync_interval=config.get("VECTOR_REPLICA_SYNC_INTERVAL", 30.0),
+        payload_cache_size=config.get("VECTOR_REPLICA_PAYLOAD_CACHE", 20000)
+    )
+    replicated.start()
+    logger.info(f"Serving searches from an in-process {replica.dtype.name} replica of '{collection_name}'")
+    return replicated
@@ -1,5 +1,6 @@
+import json
+from dataclasses import replace
 from typing import List, Dict, Any, Optional
-import uuid
 
 try:
     from utils.logger import get_logger
@@ -9,8 +10,18 @@ except ImportError:
     def get_logger(name):
         return logging.getLogger(name)
 
+try:
+    from utils.vector_ids import metadata_chunk_id
+except ImportError:
+    from ..utils.vector_ids import metadata_chunk_id
+
+from .milvus_schema import SEARCH_VECTOR_FIELD, CollectionSpec, MilvusSchemaManager
+from .milvus_pool import MilvusClientPool
+
 logger = get_logger(__name__)
 
+NON_METADATA_FIELDS = ("id", "vector", SEARCH_VECTOR_FIELD, "content")  # Entity fields not returned as metadata
+
 try:
     from pymilvus import MilvusClient, DataType, Collection, connections
     MILVUS_AVAILABLE = True
@@ -33,8 +44,25 @@ class VectorClient:
         collection_name: str,
         dimension: Optional[int] = None,
         metric: str = "COSINE",
+        pool_size: int = 0,
+        call_timeout: Optional[float] = None,
+        max_retries: int = 0,
         **kwargs  # Accept extra args for backward compatibility
     ):
+        """
+        Connect to Milvus and create the collection if it does not exist.
+
+        Args:
+            uri: Milvus / Zilliz Cloud URI
+            token: Milvus token
+            collection_name: Collection to use
+            dimension: Vector dimension (1536 if None)
+            metric: COSINE, IP or L2
+            pool_size: Pooled clients for concurrent callers (db.milvus_pool); 0 = one shared MilvusClient
+            call_timeout: Deadline of each pooled call in seconds (None = no deadline)
+            max_retries: Retries of pooled calls failing with a transient error
+            **kwargs: Further MilvusClientPool options (retry_backoff, health_check_interval, acquire_timeout)
+        """
         if not MILVUS_AVAILABLE:
             raise RuntimeError("Milvus SDK not installed. Install with: pip install pymilvus")
 
@@ -44,13 +72,21 @@ class VectorClient:
         self.dimension = dimension or 1536
         self.metric = metric
         self.client = None
+        self.schema = None
 
         # Initialize Milvus client
         try:
-            self.client = MilvusClient(
-                uri=self.uri,
-                token=self.token
-            )
+            if pool_size > 0:
+                pool_options = {key: kwargs[key] for key in ("retry_backoff", "max_backoff", "health_check_interval",
+                                                             "acquire_timeout") if key in kwargs}
+                self.client = MilvusClientPool(self.uri, self.token, size=pool_size, timeout=call_timeout,
+                                               max_retries=max_retries, **pool_options)
+            else:
+                self.client = MilvusClient(
+                    uri=self.uri,
+                    token=self.token
+                )
+            self.schema = MilvusSchemaManager(self.client, CollectionSpec.from_env(self.dimension, self.metric))
 
             # Check if collection exists, create if not
             if not self.client.has_collection(collection_name=self.collection_name):
@@ -66,16 +102,9 @@ class VectorClient:
             logger.info("Application will continue but vector operations will fail until Milvus is accessible")
 
     def _create_collection(self):
-        """Create a new Milvus collection with the appropriate schema."""
+        """Create a new Milvus collection with the typed schema (see db.milvus_schema)."""
         try:
-            # Create collection with auto-id and vector field
-            self.client.create_collection(
-                collection_name=self.collection_name,
-                dimension=self.dimension,
-                metric_type=self.metric,
-                auto_id=False,  # We'll provide IDs
-                enable_dynamic_field=True  # Allow dynamic metadata fields
-            )
+            self.schema.create_collection(self.collection_name)
             logger.info(f"Created Milvus collection '{self.collection_name}' with dimension {self.dimension}")
         except Exception as e:
             logger.error(f"Failed to create collection: {e}")
@@ -104,49 +133,42 @@ class VectorClient:
                 f"metric {self.metric}"
             )
 
-            self.client.create_collection(
-                collection_name=self.collection_name,
-                dimension=int(dim),
-                metric_type=self.metric,
-                auto_id=False,
-                enable_dynamic_field=True
-            )
+            if self.schema.spec.dimension != int(dim):
+                self.schema.spec = replace(self.schema.spec, dimension=int(dim))
+            self.schema.create_collection(self.collection_name)
 
         if not self.dimension and dimension:
             self.dimension = int(dimension)
 
     def insert_embedding(self, content: str, vector: List[float], metadata: Optional[Dict[str, Any]] = None):
-        """Insert a single embedding into Milvus."""
-        self._ensure_collection(dimension=len(vector))
-
-        doc_id = str(uuid.uuid4())
-        meta = metadata or {}
-
-        # Prepare data for insertion
-        data = {
-            "id": doc_id,
-            "vector": vector,
-            "content": content,
-            **meta  # Include all metadata fields
-        }
-
-        try:
-            self.client.insert(
-                collection_name=self.collection_name,
-                data=[data]
-            )
-            logger.info(f"Inserted embedding with id: {doc_id}")
-            return doc_id
-        except Exception as e:
-            logger.error(f"Failed to insert embedding: {e}")
-            raise
+        """Upsert a single embedding into Milvus (see upsert_batch for the ID scheme)."""
+        return self.upsert_batch([{"content": content, "vector": vector, "metadata": metadata or {}}])[0]
 
     def insert_embeddings_batch(self, items: List[Dict[str, Any]]):
         """Insert multiple embeddings in batch.
 
+        Kept for existing callers; this is an upsert, so storing the same chunk
+        twice leaves one row.
+
         Args:
             items: List of dicts with keys 'content', 'vector', and optional 'metadata'
         """
+        return self.upsert_batch(items)
+
+    def upsert_batch(self, items: List[Dict[str, Any]]) -> List[int]:
+        """Upsert multiple embeddings under deterministic IDs.
+
+        Each item's ID is derived from its repository/source, file path/URL,
+        chunk index and content (see utils.vector_ids), or taken from an 'id'
+        key when the caller supplies one. Re-ingesting unchanged chunks
+        overwrites them in place, so no delete is needed beforehand.
+
+        Args:
+            items: List of dicts with keys 'content', 'vector', and optional 'metadata' and 'id'
+
+        Returns:
+            IDs of the upserted entities, in item order
+        """
         if not items:
             return []
 
@@ -155,15 +177,12 @@ class VectorClient:
         data_list = []
         doc_ids = []
 
-        import random
-        import time
-        base_time = int(time.time() * 1000000)
-
-        for idx, item in enumerate(items):
-            # Generate a unique integer ID from timestamp, index, and random number
-            doc_id = base_time + idx * 1000 + random.randint(100, 999)
+        for item in items:
+            meta = item.get("metadata") or {}
+            doc_id = item.get("id")
+            if doc_id is None:
+                doc_id = metadata_chunk_id(item["content"], meta)
             doc_ids.append(doc_id)
-            meta = item.get("metadata", {})
 
             data = {
                 "id": doc_id,
@@ -172,28 +191,72 @@ class VectorClient:
                 **meta  # Include all metadata fields
             }
             data_list.append(data)
+        data_list = self.schema.prepare_rows(self.collection_name, data_list)
 
         try:
-            self.client.insert(
+            self.client.upsert(
                 collection_name=self.collection_name,
                 data=data_list
             )
-            logger.info(f"Inserted {len(data_list)} embeddings in batch")
+            logger.info(f"Upserted {len(data_list)} embeddings in batch")
             return doc_ids
         except Exception as e:
-            logger.error(f"Failed to insert batch embeddings: {e}")
+            logger.error(f"Failed to upsert batch embeddings: {e}")
             raise
 
-    def query_similar(self, vector: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
-        """Query for similar vectors."""
+    def query_similar(
+        self,
+        vector: List[float],
+        top_k: int = 5,
+        source_types: Optional[List[str]] = None,
+        repositories: Optional[List[str]] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+        consistency_level: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Query for similar vectors.
+
+        Args:
+            vector: Query embedding
+            top_k: Number of results to return
+            source_types: Only search these source types (utils.source_types); all if None
+            repositories: Only search these repositories (owner/repo); all if None
+            search_params: Milvus search params, e.g. {"params": {"ef": 128}} for HNSW or
+                {"params": {"nprobe": 32}} for IVF; the configured profile if None
+            consistency_level: Strong, Bounded, Session or Eventually; the configured level if None
+
+        With 'source_type' as partition key, a source type restriction is
+        resolved to the matching partitions before the vector search runs.
+        The configured profile comes from MILVUS_SEARCH_EF / MILVUS_SEARCH_NPROBE /
+        MILVUS_SEARCH_LEVEL / MILVUS_CONSISTENCY_LEVEL (see CollectionSpec).
+        With MILVUS_RESCORE_FACTOR > 1 (for quantized indexes such as IVF_PQ),
+        or on two-stage collections (MILVUS_SEARCH_DIMENSION, searched on a
+        short Matryoshka prefix), top_k * factor candidates are fetched with
+        their stored vectors and reranked by their exact score.
+        """
         self._ensure_collection(dimension=len(vector))
 
+        scope = {}
+        if source_types:
+            scope["source_type"] = list(source_types)
+        if repositories:
+            scope["repository"] = list(repositories)
+
+        if search_params is None:
+            search_params = self.schema.spec.search_params(
+                top_k, self.schema.vector_index_type(self.collection_name)
+            )
+        search_kwargs = {}
+        consistency_level = consistency_level or self.schema.spec.consistency_level
+        if consistency_level:
+            search_kwargs["consistency_level"] = consistency_level
+
         try:
             res = self.client.search(
                 collection_name=self.collection_name,
-                data=[vector],
-                limit=top_k,
-                output_fields=["*"]  # Return all fields including metadata
+                filter=self._build_filter_expression(scope),
+                search_params=search_params,
+                **self.schema.search_request(self.collection_name, vector, top_k),  # data, limit, all fields
+                **search_kwargs
             )
         except Exception as e:
             logger.error(f"Milvus query failed: {e}")
@@ -203,13 +266,14 @@ class VectorClient:
 
         # Milvus returns results as list of lists
         if res and len(res) > 0:
-            for match in res[0]:
+            matches = self.schema.finish_search(self.collection_name, vector, res[0], top_k)
+            for match in matches:
                 entity = match.get("entity", {})
                 results.append({
                     "content": entity.get("content", ""),
                     "score": match.get("distance", 0.0),  # Milvus uses 'distance' instead of 'score'
                     "id": match.get("id"),
-                    "metadata": {k: v for k, v in entity.items() if k not in ["id", "vector", "content"]}
+                    "metadata": {k: v for k, v in entity.items() if k not in NON_METADATA_FIELDS}
                 })
 
         return results
@@ -242,7 +306,7 @@ class VectorClient:
             for entity in res:
                 results.append({
                     "id": entity.get("id"),
-                    "metadata": {k: v for k, v in entity.items() if k not in ["id", "vector", "content"]}
+                    "metadata": {k: v for k, v in entity.items() if k not in NON_METADATA_FIELDS}
                 })
 
             return results
@@ -250,12 +314,75 @@ class VectorClient:
             logger.error(f"Failed to query by metadata: {e}")
             return []
 
+    def exists(self, metadata_filter: Dict[str, Any]) -> bool:
+        """Check whether any entity matches a metadata filter (scalar query, no vector search)."""
+        self._ensure_collection()
+
+        res = self.client.query(
+            collection_name=self.collection_name,
+            filter=self._build_filter_expression(metadata_filter),
+            output_fields=["id"],
+            limit=1
+        )
+        return len(res) > 0
+
+    def get_ids(self, metadata_filter: Dict[str, Any], limit: int = 16384) -> List[Any]:
+        """Get the IDs of entities matching a metadata filter (at most 16384, Milvus' query window)."""
+        self._ensure_collection()
+
+        res = self.client.query(
+            collection_name=self.collection_name,
+            filter=self._build_filter_expression(metadata_filter),
+            output_fields=["id"],
+            limit=min(limit, 16384)
+        )
+        return [entity.get("id") for entity in res]
+
+    def get_by_ids(self, ids: List[int]) -> List[Dict[str, Any]]:
+        """Fetch entities by primary key (scalar query, no vector search), without their vectors.
+
+        Returns:
+            List of dicts with 'id', 'content' and 'metadata', in no particular order
+        """
+        if not ids:
+            return []
+        self._ensure_collection()
+
+        res = self.client.query(
+            collection_name=self.collection_name,
+            filter=self._build_filter_expression({"id": [int(i) for i in ids]}),
+            output_fields=["*"]
+        )
+        return [
+            {
+                "id": entity.get("id"),
+                "content": entity.get("content", ""),
+                "metadata": {k: v for k, v in entity.items() if k not in NON_METADATA_FIELDS}
+            }
+            for entity in res
+        ]
+
+    def count(self, metadata_filter: Optional[Dict[str, Any]] = None) -> int:
+        """Count entities matching a metadata filter (all entities if None)."""
+        self._ensure_collection()
+
+        res = self.client.query(
+            collection_name=self.collection_name,
+            filter=self._build_filter_expression(metadata_filter or {}),
+            output_fields=["count(*)"]
+        )
+        return int(res[0]["count(*)"]) if res else 0
+
     def _build_filter_expression(self, metadata_filter: Dict[str, Any]) -> str:
         """Build Milvus filter expression from metadata filter dict."""
         conditions = []
         for key, value in metadata_filter.items():
             if isinstance(value, dict) and "$eq" in value:
                 conditions.append(f'{key} == "{value["$eq"]}"')
+            elif isinstance(value, dict) and "$in" in value:
+                conditions.append(f'{key} in {json.dumps(list(value["$in"]))}')
+            elif isinstance(value, (list, tuple)):
+                conditions.append(f'{key} in {json.dumps(list(value))}')
             elif isinstance(value, str):
                 conditions.append(f'{key} == "{value}"')
             else:
@@ -281,8 +408,7 @@ class VectorClient:
                 "file_sha": file_sha
             }
 
-            results = self.query_by_metadata(metadata_filter, top_k=1)
-            exists = len(results) > 0
+            exists = self.exists(metadata_filter)
 
             if exists:
                 logger.info(f"File already processed: {file_path} (SHA: {file_sha[:8]})")
@@ -314,6 +440,50 @@ class VectorClient:
         except Exception as e:
             logger.warning(f"Could not delete old chunks for {file_path}: {e}")
 
+    def delete_stale_file_chunks(self, repository: str, file_path: str, file_sha: str):
+        """Delete the chunks of earlier versions of a file.
+
+        Call after all chunks of the current version are upserted: chunks that
+        did not change were overwritten in place and now carry the new SHA, so
+        only rows left over from older versions are removed.
+
+        Args:
+            repository: Repository identifier (owner/repo)
+            file_path: Path to the file in the repository
+            file_sha: Git SHA of the version that was just stored
+        """
+        self._ensure_collection()
+
+        try:
+            filter_expr = (
+                f'repository == "{repository}" && file_path == "{file_path}" && file_sha != "{file_sha}"'
+            )
+            self.client.delete(
+                collection_name=self.collection_name,
+                filter=filter_expr
+            )
+            logger.info(f"Deleted stale chunks for {file_path}")
+        except Exception as e:
+            logger.warning(f"Could not delete stale chunks for {file_path}: {e}")
+
+    def delete_repository(self, repository: str, source_type: Optional[str] = None):
+        """Delete all chunks of a repository, e.g. before re-indexing it from scratch.
+
+        Args:
+            repository: Repository identifier (owner/repo)
+            source_type: Only delete chunks of this source type (one partition); all if None
+        """
+        self._ensure_collection()
+
+        metadata_filter = {"repository": repository}
+        if source_type:
+            metadata_filter["source_type"] = source_type
+        self.client.delete(
+            collection_name=self.collection_name,
+            filter=self._build_filter_expression(metadata_filter)
+        )
+        logger.info(f"Deleted chunks of {repository}" + (f" ({source_type})" if source_type else ""))
+
     def test_connection(self) -> bool:
         """Test the Milvus connection."""
         try:
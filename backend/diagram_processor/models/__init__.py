@@ -10,6 +10,11 @@ from pathlib import Path
 from datetime import datetime
 from enum import Enum
 
+try:
+    from utils.source_types import SOURCE_TYPE_DIAGRAM
+except ImportError:
+    from ...utils.source_types import SOURCE_TYPE_DIAGRAM
+
 
 class FileType(Enum):
     """Supported file types for processing."""
@@ -126,6 +131,7 @@ class EmbeddingRecord:
             "embedding_id": self.embedding_id,  # Store original string ID as metadata
             "vector": self.vector,
             "source": "diagram_processor",
+            "source_type": SOURCE_TYPE_DIAGRAM,
             "file_path": str(self.chunk.source_file.file_path),
             "file_name": self.chunk.source_file.file_name,
             "file_type": self.chunk.source_file.file_type.value,
@@ -153,6 +159,7 @@ class EmbeddingRecord:
         # Flatten metadata to avoid nested dictionaries (Pinecone requirement)
         metadata = {
             "source": "diagram_processor",
+            "source_type": SOURCE_TYPE_DIAGRAM,
             "file_path": str(self.chunk.source_file.file_path),
             "file_name": self.chunk.source_file.file_name,
             "file_type": self.chunk.source_file.file_type.value,
@@ -6,18 +6,24 @@ Handles storage and retrieval of embeddings.
 """
 
 from typing import List, Dict, Any, Optional
+import json
 import time
 
 from ..models import EmbeddingRecord
 from ..utils.logger import get_logger
 
+try:
+    from db.milvus_schema import CollectionSpec, MilvusSchemaManager
+except ImportError:
+    from ...db.milvus_schema import CollectionSpec, MilvusSchemaManager
+
 logger = get_logger(__name__)
 
 
 class VectorStoreRepository:
     """Repository for storing and retrieving embeddings in Milvus."""
 
-    def __init__(self, uri: str, token: str, collection_name: str):
+    def __init__(self, uri: str, token: str, collection_name: str, dimension: int = 1536):
         """
         Initialize Milvus repository.
 
@@ -25,6 +31,7 @@ class VectorStoreRepository:
             uri: Milvus URI
             token: Milvus token
             collection_name: Name of the collection to use
+            dimension: Embedding dimension of new collections (Config.MILVUS_DIMENSION)
         """
         self.uri = uri
         self.token = token
@@ -35,17 +42,15 @@ class VectorStoreRepository:
 
             # Initialize Milvus
             self.client = MilvusClient(uri=uri, token=token)
+            self.schema = MilvusSchemaManager(
+                self.client,
+                CollectionSpec.from_env(dimension=dimension, metric='COSINE')
+            )
 
             # Check if collection exists, create if not
             if not self.client.has_collection(collection_name=collection_name):
                 logger.warning(f"Collection '{collection_name}' not found, creating it...")
-                self.client.create_collection(
-                    collection_name=collection_name,
-                    dimension=1536,  # text-embedding-3-small dimension
-                    metric_type='COSINE',
-                    auto_id=False,
-                    enable_dynamic_field=True
-                )
+                self.schema.create_collection(collection_name)
                 logger.info(f"✓ Created collection: {collection_name}")
 
             logger.info(f"✓ Connected to Milvus collection: {collection_name}")
@@ -58,6 +63,23 @@ class VectorStoreRepository:
         """
         Store embeddings in Milvus.
 
+        Args:
+            embedding_records: List of EmbeddingRecord objects
+            batch_size: Number of embeddings to upload per batch
+
+        Returns:
+            Number of embeddings stored
+        """
+        return self.upsert_batch(embedding_records, batch_size=batch_size)
+
+    def upsert_batch(self, embedding_records: List[EmbeddingRecord], batch_size: int = 100) -> int:
+        """
+        Insert or overwrite embeddings in Milvus.
+
+        Record IDs are derived from the file path, chunk index and content
+        (see EmbeddingRecord.to_milvus_format), so re-processing an unchanged
+        diagram overwrites its rows instead of duplicating them.
+
         Args:
             embedding_records: List of EmbeddingRecord objects
             batch_size: Number of embeddings to upload per batch
@@ -82,9 +104,10 @@ class VectorStoreRepository:
                 for record in batch:
                     milvus_data = record.to_milvus_format()
                     data_list.append(milvus_data)
+                data_list = self.schema.prepare_rows(self.collection_name, data_list)
 
-                # Insert to Milvus
-                self.client.insert(
+                # Upsert to Milvus
+                self.client.upsert(
                     collection_name=self.collection_name,
                     data=data_list
                 )
@@ -120,7 +143,9 @@ class VectorStoreRepository:
             if filter_dict:
                 conditions = []
                 for key, value in filter_dict.items():
-                    if isinstance(value, str):
+                    if isinstance(value, (list, tuple)):
+                        conditions.append(f'{key} in {json.dumps(list(value))}')
+                    elif isinstance(value, str):
                         conditions.append(f'{key} == "{value}"')
                     else:
                         conditions.append(f'{key} == {value}')
@@ -128,16 +153,14 @@ class VectorStoreRepository:
 
             results = self.client.search(
                 collection_name=self.collection_name,
-                data=[query_vector],
-                limit=top_k,
-                output_fields=["*"],
-                filter=filter_expr
+                filter=filter_expr,
+                **self.schema.search_request(self.collection_name, query_vector, top_k)
             )
 
             # Format results
             matches = []
             if results and len(results) > 0:
-                for match in results[0]:
+                for match in self.schema.finish_search(self.collection_name, query_vector, results[0], top_k):
                     matches.append({
                         "id": match.get("id"),
                         "score": match.get("distance", 0.0),
@@ -92,18 +92,21 @@ class DiagramProcessorOrchestrator:
                 embedding_model=self.config.AZURE_OPENAI_EMBEDDINGS_DEPLOYMENT or self.config.EMBEDDING_MODEL,
                 azure_endpoint=self.config.AZURE_OPENAI_ENDPOINT,
                 azure_api_version=self.config.AZURE_OPENAI_EMBEDDINGS_VERSION or self.config.AZURE_OPENAI_API_VERSION,
-                azure_deployment=self.config.AZURE_OPENAI_EMBEDDINGS_DEPLOYMENT
+                azure_deployment=self.config.AZURE_OPENAI_EMBEDDINGS_DEPLOYMENT,
+                dimensions=self.config.EMBEDDING_DIMENSIONS
             )
         else:
             self.embedding = EmbeddingService(
                 openai_api_key=self.config.OPENAI_API_KEY,
-                embedding_model=self.config.EMBEDDING_MODEL
+                embedding_model=self.config.EMBEDDING_MODEL,
+                dimensions=self.config.EMBEDDING_DIMENSIONS
             )
 
         self.vector_store = VectorStoreRepository(
             uri=self.config.MILVUS_URI,
             token=self.config.MILVUS_TOKEN,
-            collection_name=self.config.MILVUS_COLLECTION_NAME
+            collection_name=self.config.MILVUS_COLLECTION_NAME,
+            dimension=self.config.MILVUS_DIMENSION
         )
 
         self.knowledge_graph = KnowledgeGraphService(
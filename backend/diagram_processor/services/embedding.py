@@ -11,6 +11,11 @@ import time
 from ..models import TextChunk, EmbeddingRecord
 from ..utils.logger import get_logger
 
+try:
+    from utils.embedding_dimensions import embedding_request_options
+except ImportError:
+    from ...utils.embedding_dimensions import embedding_request_options
+
 logger = get_logger(__name__)
 
 
@@ -19,7 +24,7 @@ class EmbeddingService:
 
     def __init__(self, openai_api_key: str, embedding_model: str = "text-embedding-3-small",
                  azure_endpoint: Optional[str] = None, azure_api_version: Optional[str] = None,
-                 azure_deployment: Optional[str] = None):
+                 azure_deployment: Optional[str] = None, dimensions: Optional[int] = None):
         """
         Initialize embedding service.
 
@@ -29,9 +34,11 @@ class EmbeddingService:
             azure_endpoint: Azure OpenAI endpoint (if using Azure)
             azure_api_version: Azure OpenAI API version (if using Azure)
             azure_deployment: Azure OpenAI embeddings deployment name (if using Azure)
+            dimensions: Shortened embedding size (text-embedding-3-* only; None = full size)
         """
         self.api_key = openai_api_key
         self.embedding_model = embedding_model
+        self.dimensions = dimensions
         self.is_azure = azure_endpoint is not None
 
         try:
@@ -104,7 +111,8 @@ class EmbeddingService:
             # Call OpenAI API
             response = self.client.embeddings.create(
                 model=self.embedding_model,
-                input=texts
+                input=texts,
+                **embedding_request_options(self.dimensions, None if self.is_azure else self.embedding_model)
             )
 
             # Create EmbeddingRecord objects
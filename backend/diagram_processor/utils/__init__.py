@@ -32,7 +32,7 @@ class Config:
     MILVUS_URI: str = os.getenv("MILVUS_URI", "")
     MILVUS_TOKEN: str = os.getenv("MILVUS_TOKEN", "")
     MILVUS_COLLECTION_NAME: str = os.getenv("MILVUS_COLLECTION_NAME", "")
-    MILVUS_DIMENSION: int = int(os.getenv("MILVUS_DIMENSION", "1536"))
+    MILVUS_DIMENSION: int = int(os.getenv("MILVUS_DIMENSION") or os.getenv("EMBEDDING_DIMENSIONS") or "1536")
     MILVUS_METRIC: str = os.getenv("MILVUS_METRIC", "COSINE")
 
     # Azure OpenAI settings (primary)
@@ -47,6 +47,8 @@ class Config:
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", os.getenv("AZURE_OPENAI_API_KEY", ""))
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4")
     EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+    # Shortened embeddings (text-embedding-3-* only); empty = the model's full dimension
+    EMBEDDING_DIMENSIONS: Optional[int] = int(os.getenv("EMBEDDING_DIMENSIONS", "0")) or None
 
     # Google Cloud Vision API
     GOOGLE_APPLICATION_CREDENTIALS: Optional[str] = None
@@ -31,6 +31,7 @@ from .services import (
     ChunkingService,
     AzureEmbeddingService,
     MilvusVectorStore,
+    SQLiteSyncStateStore,
     IngestionOrchestrator,
 )
 
@@ -54,20 +55,27 @@ def create_ingestion_pipeline(
         settings = Settings.from_env()
     
     # Create all services (Dependency Injection)
-    issue_fetcher = GitHubIssueFetcher(token=settings.github_token)
+    issue_fetcher = GitHubIssueFetcher(
+        token=settings.github_token,
+        max_workers=settings.comment_workers,
+        api_backend=settings.issues_api_backend
+    )
     
     text_processor = TextProcessorService(include_code_blocks=True)
     
     chunker = ChunkingService(
         chunk_size=settings.chunk_size,
-        overlap=settings.chunk_overlap
+        overlap=settings.chunk_overlap,
+        max_tokens=settings.chunk_max_tokens or None,
+        overlap_tokens=settings.chunk_overlap_tokens
     )
     
     embedding_service = AzureEmbeddingService(
         api_key=settings.azure_openai_api_key,
         endpoint=settings.azure_openai_endpoint,
         deployment=settings.azure_openai_embeddings_deployment,
-        api_version=settings.azure_openai_api_version
+        api_version=settings.azure_openai_api_version,
+        dimensions=settings.embedding_dimensions
     )
     
     vector_store = MilvusVectorStore(
@@ -77,6 +85,13 @@ def create_ingestion_pipeline(
         dimension=settings.milvus_dimension
     )
     
+    sync_state = None
+    if settings.sync_state_enabled:
+        try:
+            sync_state = SQLiteSyncStateStore(settings.sync_state_path, collection=settings.milvus_collection_name)
+        except Exception as e:
+            print(f"Warning: Issue sync state unavailable, every run is a full sync: {e}")
+    
     # Create orchestrator with all dependencies
     orchestrator = IngestionOrchestrator(
         issue_fetcher=issue_fetcher,
@@ -84,7 +99,9 @@ def create_ingestion_pipeline(
         chunker=chunker,
         embedding_service=embedding_service,
         vector_store=vector_store,
-        batch_size=batch_size or settings.batch_size
+        batch_size=batch_size or settings.batch_size,
+        queue_size=settings.queue_size,
+        sync_state=sync_state
     )
     
     return orchestrator
@@ -97,6 +114,7 @@ __all__ = [
     "ChunkingService",
     "AzureEmbeddingService",
     "MilvusVectorStore",
+    "SQLiteSyncStateStore",
     "IngestionOrchestrator",
     "create_ingestion_pipeline",
 ]
@@ -27,6 +27,7 @@ class Settings:
     milvus_token: str
     milvus_collection_name: str
     milvus_dimension: int = 1536
+    embedding_dimensions: Optional[int] = None  # Shortened embeddings (text-embedding-3-* only)
 
     # Legacy Pinecone Settings (for backward compatibility)
     pinecone_api_key: Optional[str] = None
@@ -39,10 +40,17 @@ class Settings:
     # Chunking Settings
     chunk_size: int = 1000
     chunk_overlap: int = 200
+    chunk_max_tokens: int = 0  # > 0: chunk by exact token count instead of characters
+    chunk_overlap_tokens: int = 50
     
     # Processing Settings
     batch_size: int = 10
     max_workers: int = 5
+    comment_workers: int = 8  # Concurrent comment requests
+    issues_api_backend: str = "rest"  # "rest" or "graphql" (issues with comments, 50 per query)
+    queue_size: int = 50  # Issues buffered between pipeline stages
+    sync_state_enabled: bool = True  # Keep a watermark and issue hashes for incremental runs
+    sync_state_path: Optional[str] = None  # Sync state sqlite file (None = .cache/issue_sync_state.sqlite)
     
     # Namespace for issues
     issues_namespace: str = "github-issues"
@@ -99,7 +107,8 @@ class Settings:
             milvus_uri=os.getenv("MILVUS_URI"),
             milvus_token=os.getenv("MILVUS_TOKEN"),
             milvus_collection_name=os.getenv("MILVUS_COLLECTION_NAME", "github_issues"),
-            milvus_dimension=int(os.getenv("MILVUS_DIMENSION", "1536")),
+            milvus_dimension=int(os.getenv("MILVUS_DIMENSION") or os.getenv("EMBEDDING_DIMENSIONS") or "1536"),
+            embedding_dimensions=int(os.getenv("EMBEDDING_DIMENSIONS", "0")) or None,
 
             # Legacy Pinecone (for backward compatibility)
             pinecone_api_key=os.getenv("PINECONE_API_KEY"),
@@ -112,10 +121,17 @@ class Settings:
             # Chunking
             chunk_size=int(os.getenv("CHUNK_SIZE", "1000")),
             chunk_overlap=int(os.getenv("CHUNK_OVERLAP", "200")),
+            chunk_max_tokens=int(os.getenv("CHUNK_MAX_TOKENS", "0")),
+            chunk_overlap_tokens=int(os.getenv("CHUNK_OVERLAP_TOKENS", "50")),
             
             # Processing
             batch_size=int(os.getenv("BATCH_SIZE", "10")),
             max_workers=int(os.getenv("MAX_WORKERS", "5")),
+            comment_workers=int(os.getenv("ISSUE_COMMENT_WORKERS", "8")),
+            issues_api_backend=os.getenv("GITHUB_ISSUES_API_BACKEND", "rest").lower(),
+            queue_size=int(os.getenv("ISSUE_QUEUE_SIZE", "50")),
+            sync_state_enabled=os.getenv("ISSUE_SYNC_STATE", "true").lower() == "true",
+            sync_state_path=os.getenv("ISSUE_SYNC_STATE_PATH") or None,
             
             # Namespace
             issues_namespace=os.getenv("ISSUES_NAMESPACE", "github-issues"),
@@ -8,6 +8,7 @@ from .text_processor import ITextProcessor
 from .chunker import IChunker
 from .embedding_service import IEmbeddingService
 from .vector_store import IVectorStore
+from .sync_state_store import ISyncStateStore, IssueSyncState
 
 __all__ = [
     "IIssueFetcher",
@@ -15,5 +16,7 @@ __all__ = [
     "IChunker",
     "IEmbeddingService",
     "IVectorStore",
+    "ISyncStateStore",
+    "IssueSyncState",
 ]
 
@@ -4,7 +4,7 @@ Following Interface Segregation Principle.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 
 
 class IIssueFetcher(ABC):
@@ -36,6 +36,30 @@ class IIssueFetcher(ABC):
         """
         pass
 
+    def iter_issues(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        labels: Optional[List[str]] = None,
+        since: Optional[str] = None,
+        max_issues: Optional[int] = None
+    ) -> Iterator[Any]:
+        """
+        Yield issues as they are fetched.
+
+        Implementations should override this to stream issues page by page;
+        the default fetches them all first. Without max_issues, issues must
+        come least recently updated first and none may be left out: incremental
+        sync moves its watermark to the last issue yielded.
+
+        Args are the same as fetch_issues().
+
+        Yields:
+            Issues with all information
+        """
+        yield from self.fetch_issues(owner, repo, state, labels, since, max_issues)
+
     @abstractmethod
     def fetch_issue_comments(self, owner: str, repo: str, issue_number: int) -> List[Dict[str, Any]]:
         """
@@ -0,0 +1,84 @@
+"""
+Interface for persisting issue sync state between ingestion runs.
+Following Interface Segregation Principle.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class IssueSyncState:
+    """What was last ingested for an issue."""
+
+    updated_at: str
+    content_hash: str
+    chunk_ids: List[str] = field(default_factory=list)
+
+
+class ISyncStateStore(ABC):
+    """Interface for the per-repository issue sync state."""
+
+    @abstractmethod
+    def get_watermark(self, repository: str, sync_key: str = "") -> Optional[str]:
+        """
+        Get the updated_at watermark of a repository.
+
+        Every issue updated before the watermark has been ingested.
+
+        Args:
+            repository: Repository ID ('owner/repo')
+            sync_key: Fetch filter the watermark applies to (state, labels)
+
+        Returns:
+            ISO 8601 timestamp, or None if the repository was never fully synced
+        """
+        pass
+
+    @abstractmethod
+    def set_watermark(self, repository: str, watermark: str, sync_key: str = "") -> None:
+        """
+        Record the updated_at watermark of a repository.
+
+        Args:
+            repository: Repository ID ('owner/repo')
+            watermark: ISO 8601 timestamp
+            sync_key: Fetch filter the watermark applies to (state, labels)
+        """
+        pass
+
+    @abstractmethod
+    def get_issue_states(self, repository: str) -> Dict[int, IssueSyncState]:
+        """
+        Get the sync state of every ingested issue of a repository.
+
+        Args:
+            repository: Repository ID ('owner/repo')
+
+        Returns:
+            Dict mapping issue number -> IssueSyncState
+        """
+        pass
+
+    @abstractmethod
+    def record_issue(self, repository: str, issue_number: int, state: IssueSyncState) -> None:
+        """
+        Record that all chunks of an issue version were stored.
+
+        Args:
+            repository: Repository ID ('owner/repo')
+            issue_number: Issue number
+            state: updated_at, content hash and chunk IDs of the stored version
+        """
+        pass
+
+    @abstractmethod
+    def reset(self, repository: Optional[str] = None) -> None:
+        """
+        Forget the sync state.
+
+        Args:
+            repository: Only forget this repository (None = everything)
+        """
+        pass
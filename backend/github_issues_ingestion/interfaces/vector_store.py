@@ -39,6 +39,23 @@ class IVectorStore(ABC):
         """
         pass
 
+    @abstractmethod
+    def upsert_batch(self, chunks: List[TextChunk], vectors: List[List[float]]) -> List[str]:
+        """
+        Insert or overwrite chunks under deterministic IDs.
+
+        A chunk without a chunk_id gets one derived from its repository, issue,
+        index and content, so storing the same chunk again replaces it.
+
+        Args:
+            chunks: List of TextChunk objects
+            vectors: List of embedding vectors
+
+        Returns:
+            List of IDs for stored chunks
+        """
+        pass
+
     @abstractmethod
     def query_similar(
         self,
@@ -72,3 +89,52 @@ class IVectorStore(ABC):
         """
         pass
 
+    @abstractmethod
+    def delete_by_ids(self, ids: List[str]) -> None:
+        """
+        Delete vectors by chunk ID.
+
+        Args:
+            ids: IDs returned by store_chunks_batch/upsert_batch or get_ids
+        """
+        pass
+
+    @abstractmethod
+    def exists(self, filter_dict: Dict[str, Any]) -> bool:
+        """
+        Check whether any vector matches a metadata filter, without a vector search.
+
+        Args:
+            filter_dict: Metadata filters
+
+        Returns:
+            True if at least one vector matches
+        """
+        pass
+
+    @abstractmethod
+    def get_ids(self, filter_dict: Dict[str, Any], limit: Optional[int] = None) -> List[str]:
+        """
+        Get the chunk IDs of vectors matching a metadata filter, without a vector search.
+
+        Args:
+            filter_dict: Metadata filters
+            limit: Maximum number of IDs to return (None = all)
+
+        Returns:
+            List of chunk IDs (as returned by store_chunks_batch)
+        """
+        pass
+
+    @abstractmethod
+    def count(self, filter_dict: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Count vectors matching a metadata filter.
+
+        Args:
+            filter_dict: Metadata filters (None = all vectors)
+
+        Returns:
+            Number of matching vectors
+        """
+        pass
@@ -13,6 +13,7 @@ Options:
     --state: Issue state (open, closed, all) [default: all]
     --labels: Comma-separated list of labels to filter by
     --since: ISO 8601 timestamp (only issues updated after this date)
+    --full-sync: Ignore the sync watermark and fetch every issue
     --max-issues: Maximum number of issues to fetch
     --batch-size: Batch size for processing [default: 10]
     --query: Query the vector database instead of ingesting
@@ -62,6 +63,12 @@ def main():
         help="Only issues updated after this timestamp (ISO 8601 format)"
     )
     
+    parser.add_argument(
+        "--full-sync",
+        action="store_true",
+        help="Ignore the sync watermark and fetch every issue"
+    )
+    
     parser.add_argument(
         "--max-issues",
         type=int,
@@ -167,7 +174,8 @@ def main():
             state=args.state,
             labels=labels,
             since=args.since,
-            max_issues=args.max_issues
+            max_issues=args.max_issues,
+            full_sync=args.full_sync
         )
         
         # Exit with success
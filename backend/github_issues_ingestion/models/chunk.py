@@ -6,6 +6,11 @@ from dataclasses import dataclass, field
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+try:
+    from utils.vector_ids import chunk_id as stable_chunk_id
+except ImportError:
+    from ...utils.vector_ids import chunk_id as stable_chunk_id
+
 
 @dataclass
 class TextChunk:
@@ -32,6 +37,15 @@ class TextChunk:
         if self.chunk_index >= self.total_chunks:
             raise ValueError("Chunk index must be less than total chunks")
 
+    def stable_id(self) -> int:
+        """Deterministic 63-bit ID from the chunk's repository, issue number, index and content."""
+        return stable_chunk_id(
+            self.metadata.get("repository", ""),
+            f"issues/{self.metadata.get('issue_number', '')}",
+            self.chunk_index,
+            self.content
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert chunk to dictionary for storage."""
         return {
@@ -2,6 +2,8 @@
 GitHubIssue model representing a GitHub issue with all its information.
 """
 
+import hashlib
+import json
 from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional
 from datetime import datetime
@@ -83,6 +85,28 @@ class GitHubIssue:
         """Add comments to the issue."""
         self.comments = comments
 
+    def content_hash(self) -> str:
+        """
+        Hash of the indexed content of the issue.
+
+        Covers the text and the fields that end up in chunks, but not
+        timestamps, so an update that changes nothing indexed (e.g. a
+        reaction or subscription) keeps the same hash.
+
+        Returns:
+            SHA-256 hex digest
+        """
+        content = {
+            "title": self.title,
+            "body": self.body or "",
+            "state": self.state,
+            "labels": sorted(self.labels),
+            "assignees": sorted(self.assignees),
+            "milestone": self.milestone,
+            "comments": [(comment.get("user"), comment.get("body") or "") for comment in self.comments],
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert issue to dictionary."""
         return {
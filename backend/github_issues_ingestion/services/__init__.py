@@ -7,6 +7,7 @@ from .text_processor_service import TextProcessorService
 from .chunking_service import ChunkingService
 from .azure_embedding_service import AzureEmbeddingService
 from .milvus_vector_store import MilvusVectorStore
+from .sync_state_store import SQLiteSyncStateStore
 from .ingestion_orchestrator import IngestionOrchestrator
 
 __all__ = [
@@ -15,6 +16,7 @@ __all__ = [
     "ChunkingService",
     "AzureEmbeddingService",
     "MilvusVectorStore",
+    "SQLiteSyncStateStore",
     "IngestionOrchestrator",
 ]
 
@@ -3,10 +3,15 @@ Azure OpenAI Embedding Service.
 Implements IEmbeddingService interface.
 """
 
-from typing import List
+from typing import List, Optional
 import gc
 from openai import AzureOpenAI
 
+try:
+    from utils.embedding_dimensions import embedding_request_options
+except ImportError:
+    from ...utils.embedding_dimensions import embedding_request_options
+
 from ..interfaces.embedding_service import IEmbeddingService
 
 
@@ -18,7 +23,8 @@ class AzureEmbeddingService(IEmbeddingService):
         api_key: str,
         endpoint: str,
         deployment: str,
-        api_version: str = "2024-02-01"
+        api_version: str = "2024-02-01",
+        dimensions: Optional[int] = None
     ):
         """
         Initialize Azure Embedding Service.
@@ -28,6 +34,7 @@ class AzureEmbeddingService(IEmbeddingService):
             endpoint: Azure OpenAI endpoint URL
             deployment: Embeddings deployment name
             api_version: API version
+            dimensions: Shortened embedding size (text-embedding-3-* only; None = full size)
         """
         self.api_key = api_key
         self.endpoint = endpoint
@@ -42,8 +49,9 @@ class AzureEmbeddingService(IEmbeddingService):
         )
         
         # Embedding dimension for text-embedding-ada-002 and text-embedding-3-small
-        # For text-embedding-3-large, use 3072
-        self.embedding_dimension = 1536
+        # For text-embedding-3-large, use 3072; text-embedding-3-* can return shortened embeddings
+        self.dimensions = dimensions
+        self.embedding_dimension = dimensions or 1536
         
         print(f"Initialized Azure OpenAI Embedding Service with deployment: {deployment}")
 
@@ -66,7 +74,8 @@ class AzureEmbeddingService(IEmbeddingService):
         try:
             response = self.client.embeddings.create(
                 input=text,
-                model=self.deployment
+                model=self.deployment,
+                **embedding_request_options(self.dimensions)
             )
             
             embedding = response.data[0].embedding
@@ -113,7 +122,8 @@ class AzureEmbeddingService(IEmbeddingService):
             try:
                 response = self.client.embeddings.create(
                     input=batch,
-                    model=self.deployment
+                    model=self.deployment,
+                    **embedding_request_options(self.dimensions)
                 )
                 
                 # Extract embeddings
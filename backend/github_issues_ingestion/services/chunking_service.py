@@ -3,21 +3,36 @@ Chunking Service.
 Implements IChunker interface.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
 from ..interfaces.chunker import IChunker
 from ..models.chunk import TextChunk
+from ..utils.tokenizer import DEFAULT_ENCODING, EMBEDDING_MAX_TOKENS, get_tokenizer
 
 
 class ChunkingService(IChunker):
     """Service for chunking text into smaller parts with overlap."""
 
-    def __init__(self, chunk_size: int = 1000, overlap: int = 200):
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        overlap: int = 200,
+        max_tokens: Optional[int] = None,
+        overlap_tokens: int = 50,
+        encoding_name: str = DEFAULT_ENCODING
+    ):
         """
         Initialize Chunking Service.
 
         Args:
             chunk_size: Size of each chunk in characters
             overlap: Number of overlapping characters between chunks
+            max_tokens: If set, chunk_text() chunks by exact token count instead
+                        of characters (at most EMBEDDING_MAX_TOKENS)
+            overlap_tokens: Overlap in tokens when chunking by tokens
+            encoding_name: Tokenizer encoding of the embedding model
         """
         if chunk_size <= 0:
             raise ValueError("Chunk size must be positive")
@@ -28,8 +43,19 @@ class ChunkingService(IChunker):
         if overlap >= chunk_size:
             raise ValueError("Overlap must be less than chunk size")
 
+        if max_tokens is not None and not 0 < max_tokens <= EMBEDDING_MAX_TOKENS:
+            raise ValueError(f"max_tokens must be between 1 and {EMBEDDING_MAX_TOKENS}")
+
         self.chunk_size = chunk_size
         self.overlap = overlap
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.encoding_name = encoding_name
+
+    @property
+    def tokenizer(self):
+        """Tokenizer of the embedding model (shared, created on first use)."""
+        return get_tokenizer(self.encoding_name)
 
     def chunk_text(self, text: str, metadata: dict = None) -> List[TextChunk]:
         """
@@ -45,6 +71,9 @@ class ChunkingService(IChunker):
         if not text or not text.strip():
             return []
 
+        if self.max_tokens:
+            return self.chunk_by_tokens(text.strip(), metadata, self.max_tokens, self.overlap_tokens)
+
         # Clean the text
         text = text.strip()
         
@@ -121,12 +150,17 @@ class ChunkingService(IChunker):
         overlap_tokens: int = 50
     ) -> List[TextChunk]:
         """
-        Chunk text by token count (approximate using words).
+        Chunk text by exact token count.
+
+        The text is tokenized once and chunks are sliced from the original
+        string at token boundaries, so formatting of code and logs is kept and
+        no chunk exceeds max_tokens. Chunks end at a line break in their last
+        fifth, and overlaps start at a line start, when there is one.
 
         Args:
             text: Text to chunk
             metadata: Additional metadata to attach to each chunk
-            max_tokens: Maximum tokens per chunk (approximated by words)
+            max_tokens: Maximum tokens per chunk
             overlap_tokens: Overlap in tokens
 
         Returns:
@@ -135,10 +169,16 @@ class ChunkingService(IChunker):
         if not text or not text.strip():
             return []
 
-        # Split into words (rough token approximation)
-        words = text.split()
-        
-        if len(words) <= max_tokens:
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if overlap_tokens < 0 or overlap_tokens >= max_tokens:
+            raise ValueError("overlap_tokens must be between 0 and max_tokens")
+
+        offsets = self.tokenizer.offsets(text)
+        tokens, chars = offsets.tokens, offsets.chars
+        last = len(chars) - 1
+
+        if offsets.total_tokens <= max_tokens:
             return [
                 TextChunk(
                     content=text,
@@ -148,39 +188,45 @@ class ChunkingService(IChunker):
                 )
             ]
 
-        chunks = []
+        # Boundaries after a token that contains a newline are preferred chunk
+        # ends (tokenizers merge a newline with the next line's indentation)
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        newlines_before = np.concatenate(([0], np.cumsum(codes == ord("\n"))))
+        line_breaks = np.flatnonzero(newlines_before[chars[1:]] > newlines_before[chars[:-1]]) + 1
+        search_tokens = max(1, max_tokens // 5)
+
+        spans = []
         start = 0
-        chunk_index = 0
-        step = max_tokens - overlap_tokens
+        while True:
+            end = int(np.searchsorted(tokens, tokens[start] + max_tokens, side="right")) - 1
+            end = max(end, start + 1)  # A single character may take several tokens
 
-        # Calculate total chunks
-        total_chunks = max(1, (len(words) - overlap_tokens + step - 1) // step)
+            if end < last:
+                i = int(np.searchsorted(line_breaks, end, side="right")) - 1
+                if i >= 0 and line_breaks[i] > start and tokens[line_breaks[i]] > tokens[end] - search_tokens:
+                    end = int(line_breaks[i])
 
-        while start < len(words):
-            end = min(start + max_tokens, len(words))
-            chunk_words = words[start:end]
-            chunk_text = ' '.join(chunk_words)
+            spans.append((int(chars[start]), int(chars[end])))
+            if end >= last:
+                break
 
-            chunk = TextChunk(
-                content=chunk_text.strip(),
+            # Overlap starts at the first line start within the overlap, if any
+            next_start = int(np.searchsorted(tokens, tokens[end] - overlap_tokens, side="left"))
+            i = int(np.searchsorted(line_breaks, next_start, side="left"))
+            if i < len(line_breaks) and line_breaks[i] < end:
+                next_start = int(line_breaks[i])
+            start = next_start if next_start > start else end
+
+        contents = [chunk for chunk in (text[a:b].strip() for a, b in spans) if chunk]
+        return [
+            TextChunk(
+                content=content,
                 chunk_index=chunk_index,
-                total_chunks=total_chunks,
+                total_chunks=len(contents),
                 metadata=metadata or {},
             )
-            chunks.append(chunk)
-
-            if end >= len(words):
-                break
-
-            start += step
-            chunk_index += 1
-
-        # Update total chunks count
-        actual_total = len(chunks)
-        for chunk in chunks:
-            chunk.total_chunks = actual_total
-
-        return chunks
+            for chunk_index, content in enumerate(contents)
+        ]
 
     def get_chunk_size(self) -> int:
         """Get the configured chunk size."""
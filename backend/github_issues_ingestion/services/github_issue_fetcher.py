@@ -3,23 +3,89 @@ GitHub Issue Fetcher Service.
 Implements IIssueFetcher interface.
 """
 
+import os
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Iterator, Optional
+
 import requests
-import time
-from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
 
 from ..interfaces.issue_fetcher import IIssueFetcher
 from ..models.github_issue import GitHubIssue
 
+# Package-relative first: with backend/ also on sys.path (see services.llm_service),
+# "utils.github_rate_limiter" would load a second module with its own scheduler
+try:
+    from ...utils.github_rate_limiter import (
+        GitHubRateLimiter,
+        get_rate_limiter,
+        bucket_for_url,
+        BUCKET_GRAPHQL,
+        PRIORITY_NORMAL,
+    )
+except ImportError:
+    # Imported as a top-level package by the CLI scripts (backend/ on sys.path)
+    from utils.github_rate_limiter import (
+        GitHubRateLimiter,
+        get_rate_limiter,
+        bucket_for_url,
+        BUCKET_GRAPHQL,
+        PRIORITY_NORMAL,
+    )
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_ISSUES_PER_PAGE = 50
+GRAPHQL_COMMENTS_PER_ISSUE = 100  # Longer threads are completed over REST
+DEFAULT_COMMENT_WORKERS = 8
+
+# One page of issues with their first comments (pull requests are not included)
+ISSUES_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String, $states: [IssueState!],
+      $labels: [String!], $since: DateTime, $direction: OrderDirection!, $comments: Int!) {
+  rateLimit { cost remaining resetAt }
+  repository(owner: $owner, name: $name) {
+    issues(first: $first, after: $after, states: $states, labels: $labels,
+           filterBy: {since: $since}, orderBy: {field: UPDATED_AT, direction: $direction}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId number title body state url createdAt updatedAt closedAt
+        author { login }
+        labels(first: 50) { nodes { name } }
+        assignees(first: 20) { nodes { login } }
+        milestone { title }
+        comments(first: $comments) {
+          totalCount
+          nodes { databaseId author { login } body createdAt updatedAt }
+        }
+      }
+    }
+  }
+}
+"""
+
 
 class GitHubIssueFetcher(IIssueFetcher):
     """Service for fetching issues from GitHub repositories using REST API."""
 
-    def __init__(self, token: str):
+    def __init__(
+        self,
+        token: str,
+        rate_limiter: Optional[GitHubRateLimiter] = None,
+        priority: int = PRIORITY_NORMAL,
+        max_workers: Optional[int] = None,
+        api_backend: Optional[str] = None
+    ):
         """
         Initialize GitHub Issue Fetcher.
 
         Args:
             token: GitHub personal access token
+            rate_limiter: Shared quota scheduler (defaults to the process-wide one)
+            priority: Rate-limit priority of this fetcher's requests
+            max_workers: Concurrent comment requests (defaults to ISSUE_COMMENT_WORKERS)
+            api_backend: "rest" or "graphql" (defaults to GITHUB_ISSUES_API_BACKEND)
         """
         self.token = token
         self.base_url = "https://api.github.com"
@@ -27,8 +93,17 @@ class GitHubIssueFetcher(IIssueFetcher):
             "Accept": "application/vnd.github.v3+json",
             "Authorization": f"Bearer {token}",
         }
-        self.rate_limit_remaining = None
-        self.rate_limit_reset = None
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.priority = priority
+        self.max_workers = max_workers or int(os.getenv("ISSUE_COMMENT_WORKERS", str(DEFAULT_COMMENT_WORKERS)))
+        self.api_backend = (api_backend or os.getenv("GITHUB_ISSUES_API_BACKEND", "rest")).lower()
+        self._graphql_cost = 1  # Cost of the last GraphQL query, the estimate for the next one
+
+        # Keep-alive connections for every concurrent comment request
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(10, self.max_workers))
+        self.session.mount("https://", adapter)
 
     def _make_request(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -44,20 +119,17 @@ class GitHubIssueFetcher(IIssueFetcher):
         Raises:
             requests.HTTPError: If request fails
         """
-        # Check rate limit
-        if self.rate_limit_remaining is not None and self.rate_limit_remaining < 10:
-            if self.rate_limit_reset:
-                wait_time = max(0, self.rate_limit_reset - time.time())
-                if wait_time > 0:
-                    print(f"Rate limit low, waiting {wait_time:.0f} seconds...")
-                    time.sleep(wait_time)
+        # Wait for budget in the matching bucket (core or search)
+        bucket = bucket_for_url(url)
+        self.rate_limiter.acquire(bucket, self.priority)
+
+        response = self.session.get(url, params=params or {}, timeout=30)
+
+        # Update shared rate limit info
+        self.rate_limiter.update_from_headers(response.headers, bucket)
+        if response.status_code in (403, 429) and response.headers.get("Retry-After"):
+            self.rate_limiter.penalize(bucket, float(response.headers["Retry-After"]))
 
-        response = requests.get(url, headers=self.headers, params=params or {})
-        
-        # Update rate limit info
-        self.rate_limit_remaining = int(response.headers.get("X-RateLimit-Remaining", 5000))
-        self.rate_limit_reset = int(response.headers.get("X-RateLimit-Reset", 0))
-        
         response.raise_for_status()
         return response.json()
 
@@ -65,7 +137,8 @@ class GitHubIssueFetcher(IIssueFetcher):
         self,
         url: str,
         params: Optional[Dict[str, Any]] = None,
-        max_items: Optional[int] = None
+        max_items: Optional[int] = None,
+        max_pages: Optional[int] = 10
     ) -> List[Dict[str, Any]]:
         """
         Make paginated requests to GitHub API.
@@ -74,23 +147,45 @@ class GitHubIssueFetcher(IIssueFetcher):
             url: API endpoint URL
             params: Query parameters
             max_items: Maximum number of items to fetch
+            max_pages: Maximum number of pages (None = no limit)
 
         Returns:
             List of all items from all pages
         """
-        all_items = []
-        params = params or {}
+        return [item for page in self._iter_pages(url, params, max_items, max_pages) for item in page]
+
+    def _iter_pages(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        max_items: Optional[int] = None,
+        max_pages: Optional[int] = 10
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Request the pages of a paginated GitHub API endpoint one at a time.
+
+        Args:
+            url: API endpoint URL
+            params: Query parameters
+            max_items: Maximum number of items to fetch
+            max_pages: Maximum number of pages (None = no limit)
+
+        Yields:
+            The items of each page
+        """
+        fetched = 0
+        params = dict(params or {})
         params["per_page"] = 100  # Max items per page
         page = 1
         # GitHub API has a hard limit of 1000 results (10 pages of 100 items)
-        max_pages = 10
+        # for issue listings; max_pages=None is for endpoints without it
 
         while True:
             params["page"] = page
 
             # Check if we've hit GitHub's pagination limit
-            if page > max_pages:
-                print(f"Warning: Reached GitHub's pagination limit ({max_pages} pages, {len(all_items)} items)")
+            if max_pages is not None and page > max_pages:
+                print(f"Warning: Reached GitHub's pagination limit ({max_pages} pages, {fetched} items)")
                 break
 
             try:
@@ -98,28 +193,26 @@ class GitHubIssueFetcher(IIssueFetcher):
             except requests.exceptions.HTTPError as e:
                 if e.response.status_code == 422:
                     # Unprocessable Entity - usually means we've exceeded pagination limits
-                    print(f"Warning: Pagination limit reached at page {page}. Collected {len(all_items)} items so far.")
+                    print(f"Warning: Pagination limit reached at page {page}. Collected {fetched} items so far.")
                     break
                 raise  # Re-raise other HTTP errors
 
             if not items:
                 break
-            
-            all_items.extend(items)
-            
+
             # Check if we've reached max_items
-            if max_items and len(all_items) >= max_items:
-                all_items = all_items[:max_items]
+            if max_items and fetched + len(items) >= max_items:
+                yield items[:max_items - fetched]
                 break
-            
+
+            fetched += len(items)
+            yield items
+
             # Check if this was the last page
             if len(items) < 100:
                 break
             
             page += 1
-            time.sleep(0.1)  # Small delay between requests
-
-        return all_items
 
     def _fetch_issues_via_search(
         self,
@@ -144,6 +237,29 @@ class GitHubIssueFetcher(IIssueFetcher):
         Returns:
             List of issue data dictionaries
         """
+        return [
+            item
+            for page in self._iter_search_pages(owner, repo, state, labels, since, max_issues)
+            for item in page
+        ]
+
+    def _iter_search_pages(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        labels: Optional[List[str]] = None,
+        since: Optional[str] = None,
+        max_issues: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Request pages of issues from the Search API one at a time.
+
+        Arguments are the same as _fetch_issues_via_search().
+
+        Yields:
+            The issue data dictionaries of each page
+        """
         # Build search query
         query_parts = [f"repo:{owner}/{repo}", "is:issue"]
 
@@ -160,12 +276,12 @@ class GitHubIssueFetcher(IIssueFetcher):
         query = " ".join(query_parts)
 
         url = f"{self.base_url}/search/issues"
-        params = {"q": query, "sort": "updated", "order": "desc"}
+        params = {"q": query, "sort": "updated", "order": "asc"}
 
         print(f"Using Search API: {query}")
 
         # Search API returns different structure
-        all_items = []
+        fetched = 0
         params["per_page"] = 100
         page = 1
         max_pages = 10  # Search API also has pagination limits
@@ -189,22 +305,20 @@ class GitHubIssueFetcher(IIssueFetcher):
             if not items:
                 break
 
-            all_items.extend(items)
-
             # Check if we've reached max_issues
-            if max_issues and len(all_items) >= max_issues:
-                all_items = all_items[:max_issues]
+            if max_issues and fetched + len(items) >= max_issues:
+                yield items[:max_issues - fetched]
                 break
 
+            fetched += len(items)
+            yield items
+
             # Check if we've fetched all results
             total_count = response.get("total_count", 0)
-            if len(all_items) >= total_count or len(items) < 100:
+            if fetched >= total_count or len(items) < 100:
                 break
 
             page += 1
-            time.sleep(1)  # Search API has stricter rate limits
-
-        return all_items
 
     def fetch_issues(
         self,
@@ -218,6 +332,11 @@ class GitHubIssueFetcher(IIssueFetcher):
         """
         Fetch issues from a GitHub repository.
 
+        With the GraphQL backend, issues come with their comments in pages of
+        50 (pull requests are not included). Over REST, comments are fetched
+        once for the whole repository when all issues are needed, and otherwise
+        concurrently per issue; issues without comments cost no request.
+
         Args:
             owner: Repository owner/organization
             repo: Repository name
@@ -229,46 +348,179 @@ class GitHubIssueFetcher(IIssueFetcher):
         Returns:
             List of GitHubIssue objects with all information
         """
-        # Try standard API first
+        if self.api_backend == "graphql":
+            try:
+                return self._fetch_issues_graphql(owner, repo, state, labels, since, max_issues)
+            except Exception as e:
+                print(f"Warning: GraphQL issue fetch failed, using REST: {e}")
+
+        issues_data = [
+            issue
+            for page in self._iter_issue_data_pages(owner, repo, state, labels, since, max_issues)
+            for issue in page
+        ]
+
+        # No filtering - include all issues (including pull requests)
+        print(f"Fetched {len(issues_data)} issues (including pull requests)")
+
+        # Convert to GitHubIssue objects
+        issues = [GitHubIssue.from_api_response(issue_data, owner, repo) for issue_data in issues_data]
+        expected = {issue.number: issue.raw_data.get("comments", 1) for issue in issues}
+
+        # The repository-wide endpoint returns every comment in pages of 100; it
+        # is cheaper than one request per issue when all issues are needed
+        comments: Dict[int, List[Dict[str, Any]]] = {}
+        total_comments = sum(expected.values())
+        per_issue_requests = sum(1 for count in expected.values() if count)
+        all_issues = state == "all" and not labels and not since and not max_issues
+        if all_issues and math.ceil(total_comments / 100) < per_issue_requests:
+            comments = self.fetch_repository_comments(owner, repo)
+
+        self._complete_comments(owner, repo, issues, expected, comments)
+        return issues
+
+    def iter_issues(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        labels: Optional[List[str]] = None,
+        since: Optional[str] = None,
+        max_issues: Optional[int] = None
+    ) -> Iterator[GitHubIssue]:
+        """
+        Yield issues with their comments page by page, as they are fetched.
+
+        Only one page of issues (100 over REST, 50 over GraphQL) is held at a
+        time; the comments of a page are fetched concurrently before its issues
+        are yielded. Arguments are the same as fetch_issues().
+
+        Yields:
+            GitHubIssue objects with all information
+        """
+        if self.api_backend == "graphql":
+            yielded = False
+            try:
+                for page in self._iter_issue_pages_graphql(owner, repo, state, labels, since, max_issues):
+                    yielded = True
+                    yield from page
+                return
+            except Exception as e:
+                # Issues already yielded cannot be taken back
+                if yielded:
+                    raise
+                print(f"Warning: GraphQL issue fetch failed, using REST: {e}")
+
+        for page in self._iter_issue_data_pages(owner, repo, state, labels, since, max_issues):
+            issues = [GitHubIssue.from_api_response(issue_data, owner, repo) for issue_data in page]
+            expected = {issue.number: issue.raw_data.get("comments", 1) for issue in issues}
+            self._complete_comments(owner, repo, issues, expected, {})
+            yield from issues
+
+    def _iter_issue_data_pages(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        labels: Optional[List[str]] = None,
+        since: Optional[str] = None,
+        max_issues: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Request pages of issue data over REST.
+
+        Without max_issues, issues come least recently updated first and each
+        request continues from the update time of the last issue received
+        (keyset pagination) instead of a page offset, so GitHub's page limit
+        never cuts the listing short and issues updated during the listing
+        cannot shift others past a page boundary. Every issue before the last
+        one yielded has been yielded, which incremental sync relies on. With
+        max_issues, the most recently updated issues come first.
+
+        Arguments are the same as fetch_issues().
+
+        Yields:
+            The issue data dictionaries of each page (without duplicates)
+        """
         url = f"{self.base_url}/repos/{owner}/{repo}/issues"
-        params = {"state": state}
-        
+        params: Dict[str, Any] = {"state": state, "sort": "updated", "direction": "asc", "per_page": 100}
+
         if labels:
             params["labels"] = ",".join(labels)
-        
+
         if since:
             params["since"] = since
 
         print(f"Fetching issues from {owner}/{repo}...")
-        issues_data = self._make_paginated_request(url, params, max_issues)
-        
-        # If we hit the pagination limit and no max_issues specified, try search API
-        if len(issues_data) >= 1000 and not max_issues:
-            print("Standard API pagination limit reached, switching to Search API...")
-            additional_issues = self._fetch_issues_via_search(owner, repo, state, labels, since, max_issues)
-
-            # Merge results, avoiding duplicates
-            existing_ids = {issue["id"] for issue in issues_data}
-            for issue in additional_issues:
-                if issue["id"] not in existing_ids:
-                    issues_data.append(issue)
-                    existing_ids.add(issue["id"])
+        if max_issues:
+            # A sample of recent issues; such runs never move the sync watermark
+            params["direction"] = "desc"
+            yield from self._iter_pages(url, params, max_issues)
+            return
 
-        # No filtering - include all issues (including pull requests)
-        print(f"Fetched {len(issues_data)} issues (including pull requests)")
+        seen_ids = set()  # since is inclusive, so the last issues of a page come again
+        page = 1
+        while True:
+            params["page"] = page
+            items = self._make_request(url, params)
 
-        # Convert to GitHubIssue objects
-        issues = []
-        for issue_data in issues_data:
-            issue = GitHubIssue.from_api_response(issue_data, owner, repo)
-            
-            # Fetch comments for this issue
-            comments = self.fetch_issue_comments(owner, repo, issue.number)
-            issue.add_comments(comments)
-            
-            issues.append(issue)
-        
-        return issues
+            new_items = [item for item in items if item["id"] not in seen_ids]
+            seen_ids.update(item["id"] for item in new_items)
+            if new_items:
+                yield new_items
+
+            if len(items) < 100:
+                break
+
+            last_updated = items[-1]["updated_at"]
+            if last_updated != params.get("since"):
+                params["since"] = last_updated
+                page = 1
+            else:
+                page += 1  # A full page of issues updated in the same second
+
+    def _complete_comments(
+        self,
+        owner: str,
+        repo: str,
+        issues: List[GitHubIssue],
+        expected: Dict[int, int],
+        comments: Dict[int, List[Dict[str, Any]]]
+    ):
+        """
+        Attach comments to issues, fetching concurrently those that are still incomplete.
+
+        Args:
+            owner: Repository owner/organization
+            repo: Repository name
+            issues: Issues to attach comments to
+            expected: Issue number -> number of comments GitHub reports
+            comments: Comments already fetched, by issue number
+        """
+        missing = [
+            issue.number for issue in issues
+            if len(comments.get(issue.number, [])) < expected.get(issue.number, 1)
+        ]
+
+        if missing:
+            print(f"Fetching comments of {len(missing)} issues ({self.max_workers} concurrent requests)...")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                fetched = executor.map(lambda number: self.fetch_issue_comments(owner, repo, number), missing)
+                comments.update(zip(missing, fetched))
+
+        for issue in issues:
+            issue.add_comments(comments.get(issue.number, []))
+
+    @staticmethod
+    def _comment_from_api(comment: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the fields kept for a comment from a REST API comment."""
+        return {
+            "id": comment["id"],
+            "user": (comment.get("user") or {}).get("login"),
+            "body": comment.get("body", ""),
+            "created_at": comment["created_at"],
+            "updated_at": comment["updated_at"],
+        }
 
     def fetch_issue_comments(self, owner: str, repo: str, issue_number: int) -> List[Dict[str, Any]]:
         """
@@ -286,23 +538,190 @@ class GitHubIssueFetcher(IIssueFetcher):
         
         try:
             comments_data = self._make_paginated_request(url)
-            
-            # Extract relevant information from comments
-            comments = []
-            for comment in comments_data:
-                comments.append({
-                    "id": comment["id"],
-                    "user": comment.get("user", {}).get("login"),
-                    "body": comment.get("body", ""),
-                    "created_at": comment["created_at"],
-                    "updated_at": comment["updated_at"],
-                })
-            
-            return comments
+            return [self._comment_from_api(comment) for comment in comments_data]
         except Exception as e:
             print(f"Warning: Failed to fetch comments for issue #{issue_number}: {e}")
             return []
 
+    def fetch_repository_comments(
+        self,
+        owner: str,
+        repo: str,
+        since: Optional[str] = None
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Fetch the comments of all issues and pull requests of a repository.
+
+        Uses the repository-level /issues/comments endpoint, 100 comments per request.
+
+        Args:
+            owner: Repository owner/organization
+            repo: Repository name
+            since: Only comments updated after this timestamp (ISO 8601 format)
+
+        Returns:
+            Dict mapping issue number -> list of comment dictionaries (oldest first)
+        """
+        url = f"{self.base_url}/repos/{owner}/{repo}/issues/comments"
+        params = {"sort": "created", "direction": "asc"}
+        if since:
+            params["since"] = since
+
+        print(f"Fetching all comments of {owner}/{repo} in bulk...")
+        try:
+            comments_data = self._make_paginated_request(url, params, max_pages=None)
+        except Exception as e:
+            print(f"Warning: Bulk comment fetch failed, fetching per issue: {e}")
+            return {}
+
+        comments: Dict[int, List[Dict[str, Any]]] = {}
+        for comment in comments_data:
+            issue_number = int(comment.get("issue_url", "").rsplit("/", 1)[-1] or 0)
+            comments.setdefault(issue_number, []).append(self._comment_from_api(comment))
+
+        print(f"Fetched {len(comments_data)} comments in bulk")
+        return comments
+
+    def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute a GraphQL query under the shared GraphQL rate-limit bucket.
+
+        Returns:
+            The 'data' object of the response
+
+        Raises:
+            RuntimeError: If the response has errors and no data
+        """
+        self.rate_limiter.acquire(BUCKET_GRAPHQL, self.priority, cost=self._graphql_cost)
+
+        response = self.session.post(GRAPHQL_URL, json={"query": query, "variables": variables}, timeout=60)
+        self.rate_limiter.update_from_headers(response.headers, BUCKET_GRAPHQL)
+        response.raise_for_status()
+        payload = response.json()
+
+        data = payload.get("data") or {}
+        errors = payload.get("errors") or []
+        if errors and not data:
+            raise RuntimeError("; ".join(e.get("message", "") for e in errors[:3]))
+
+        rate_limit = data.get("rateLimit") or {}
+        self._graphql_cost = max(1, int(rate_limit.get("cost") or 1))
+        if rate_limit.get("remaining") is not None:
+            reset = None
+            if rate_limit.get("resetAt"):
+                reset = datetime.fromisoformat(rate_limit["resetAt"].replace("Z", "+00:00")).timestamp()
+            self.rate_limiter.update(BUCKET_GRAPHQL, int(rate_limit["remaining"]), reset)
+
+        return data
+
+    def _fetch_issues_graphql(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        labels: Optional[List[str]] = None,
+        since: Optional[str] = None,
+        max_issues: Optional[int] = None
+    ) -> List[GitHubIssue]:
+        """
+        Fetch issues with their comments over GraphQL, 50 issues per query.
+
+        Arguments are the same as fetch_issues().
+        """
+        print(f"Fetching issues with comments from {owner}/{repo} via GraphQL...")
+        issues = [
+            issue
+            for page in self._iter_issue_pages_graphql(owner, repo, state, labels, since, max_issues)
+            for issue in page
+        ]
+        print(f"Fetched {len(issues)} issues via GraphQL")
+        return issues
+
+    def _iter_issue_pages_graphql(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        labels: Optional[List[str]] = None,
+        since: Optional[str] = None,
+        max_issues: Optional[int] = None
+    ) -> Iterator[List[GitHubIssue]]:
+        """
+        Request pages of issues with their comments over GraphQL.
+
+        Threads with more comments than the query returns are completed over REST.
+        Arguments are the same as fetch_issues().
+
+        Yields:
+            The issues of each page
+        """
+        variables: Dict[str, Any] = {
+            "owner": owner,
+            "name": repo,
+            "first": GRAPHQL_ISSUES_PER_PAGE,
+            "after": None,
+            "states": None if state == "all" else [state.upper()],
+            "labels": labels or None,
+            "since": since,
+            "direction": "DESC" if max_issues else "ASC",  # Full listings oldest first, as over REST
+            "comments": GRAPHQL_COMMENTS_PER_ISSUE,
+        }
+
+        fetched = 0
+        while True:
+            data = self._graphql(ISSUES_QUERY, variables)
+            connection = ((data.get("repository") or {}).get("issues")) or {}
+
+            issues: List[GitHubIssue] = []
+            expected: Dict[int, int] = {}
+            comments: Dict[int, List[Dict[str, Any]]] = {}
+            for node in connection.get("nodes") or []:
+                issue = GitHubIssue.from_api_response(self._issue_from_graphql(node), owner, repo)
+                issues.append(issue)
+                expected[issue.number] = node["comments"]["totalCount"]
+                comments[issue.number] = [
+                    {
+                        "id": comment.get("databaseId"),
+                        "user": (comment.get("author") or {}).get("login"),
+                        "body": comment.get("body", ""),
+                        "created_at": comment["createdAt"],
+                        "updated_at": comment["updatedAt"],
+                    }
+                    for comment in node["comments"]["nodes"]
+                ]
+                if max_issues and fetched + len(issues) >= max_issues:
+                    break
+
+            self._complete_comments(owner, repo, issues, expected, comments)
+            fetched += len(issues)
+            if issues:
+                yield issues
+
+            page_info = connection.get("pageInfo") or {}
+            if (max_issues and fetched >= max_issues) or not page_info.get("hasNextPage"):
+                break
+            variables["after"] = page_info["endCursor"]
+
+    @staticmethod
+    def _issue_from_graphql(node: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a GraphQL issue node to the REST API shape used by GitHubIssue."""
+        return {
+            "id": node.get("databaseId"),
+            "number": node["number"],
+            "title": node["title"],
+            "body": node.get("body"),
+            "state": node["state"].lower(),
+            "html_url": node.get("url"),
+            "created_at": node["createdAt"],
+            "updated_at": node["updatedAt"],
+            "closed_at": node.get("closedAt"),
+            "user": {"login": node["author"]["login"]} if node.get("author") else None,
+            "labels": [{"name": label["name"]} for label in node["labels"]["nodes"]],
+            "assignees": [{"login": user["login"]} for user in node["assignees"]["nodes"]],
+            "milestone": node.get("milestone"),
+            "comments": node["comments"]["totalCount"],
+        }
+
     def get_rate_limit_status(self) -> Dict[str, Any]:
         """
         Get current rate limit status.
@@ -3,18 +3,28 @@ Ingestion Orchestrator Service.
 Coordinates the entire ingestion workflow following SOLID principles.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import queue
+import threading
 import time
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+
+try:
+    from utils.source_types import SOURCE_TYPE_ISSUE
+except ImportError:
+    from ...utils.source_types import SOURCE_TYPE_ISSUE
 
 from ..interfaces.issue_fetcher import IIssueFetcher
 from ..interfaces.text_processor import ITextProcessor
 from ..interfaces.chunker import IChunker
 from ..interfaces.embedding_service import IEmbeddingService
 from ..interfaces.vector_store import IVectorStore
+from ..interfaces.sync_state_store import ISyncStateStore, IssueSyncState
 from ..models.github_issue import GitHubIssue
 from ..models.chunk import TextChunk
 
+_END = object()  # Marks the end of a pipeline queue
+
 
 class IngestionOrchestrator:
     """
@@ -29,7 +39,9 @@ class IngestionOrchestrator:
         chunker: IChunker,
         embedding_service: IEmbeddingService,
         vector_store: IVectorStore,
-        batch_size: int = 10
+        batch_size: int = 10,
+        queue_size: int = 50,
+        sync_state: Optional[ISyncStateStore] = None
     ):
         """
         Initialize Ingestion Orchestrator.
@@ -41,6 +53,9 @@ class IngestionOrchestrator:
             embedding_service: Service for creating embeddings
             vector_store: Service for storing vectors
             batch_size: Number of chunks to process in each batch
+            queue_size: Issues buffered between pipeline stages
+            sync_state: Per-repository watermark and issue state, for
+                        incremental runs (None = every run is a full sync)
         """
         self.issue_fetcher = issue_fetcher
         self.text_processor = text_processor
@@ -48,6 +63,8 @@ class IngestionOrchestrator:
         self.embedding_service = embedding_service
         self.vector_store = vector_store
         self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.sync_state = sync_state
 
         # Statistics
         self.stats = {
@@ -69,18 +86,30 @@ class IngestionOrchestrator:
         state: str = "all",
         labels: Optional[List[str]] = None,
         since: Optional[str] = None,
-        max_issues: Optional[int] = None
+        max_issues: Optional[int] = None,
+        full_sync: bool = False
     ) -> Dict[str, Any]:
         """
         Ingest all issues from a GitHub repository.
 
+        Runs as a streaming pipeline: issues are fetched page by page in one
+        thread, processed and chunked in another, and embedded and stored in
+        batches in the calling thread. Stages are connected by bounded queues,
+        so memory stays flat however large the repository is and chunks reach
+        the vector store while fetching is still going on.
+
+        With a sync state store, only issues updated since the repository's
+        watermark are fetched, issues whose content hash is unchanged are
+        skipped, and every fully stored issue is recorded as it completes.
+
         Args:
             owner: Repository owner/organization
             repo: Repository name
             state: Issue state ('open', 'closed', 'all')
             labels: Filter by labels
-            since: Only issues updated after this timestamp
+            since: Only issues updated after this timestamp (defaults to the watermark)
             max_issues: Maximum number of issues to fetch
+            full_sync: Ignore the watermark and fetch every issue
 
         Returns:
             Dictionary with ingestion statistics
@@ -90,93 +119,319 @@ class IngestionOrchestrator:
         print(f"{'='*80}\n")
 
         self.stats["start_time"] = datetime.utcnow()
+        # Issues updated while the run is going on may be missed, so the
+        # watermark never passes the start of the run (less clock skew)
+        run_started = (datetime.now(timezone.utc) - timedelta(minutes=1)).replace(microsecond=0).isoformat()
+
+        repository = f"{owner}/{repo}"
+        sync_key = f"{state}|{','.join(sorted(labels or []))}"
+        known: Dict[int, IssueSyncState] = {}
+        watermark = None
+        if self.sync_state:
+            known = self.sync_state.get_issue_states(repository)
+            watermark = self.sync_state.get_watermark(repository, sync_key)
+            if since is None and watermark and not full_sync:
+                since = watermark
+                print(f"↻ Incremental sync: issues updated since {watermark}")
+            elif known:
+                print(f"↻ Sync state: {len(known)} issues already ingested")
+
+        # Each stage updates its own statistics, so no lock is needed
+        issue_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        chunk_queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        fetch_errors: List[Exception] = []
+        fetched_updates: List[str] = []  # updated_at of every fetched issue
+        failed_updates: List[str] = []  # updated_at of issues that were not stored
+
+        fetch_thread = threading.Thread(
+            target=self._fetch_stage,
+            args=(issue_queue, stop, fetch_errors, fetched_updates, owner, repo, state, labels, since, max_issues),
+            name="issue-fetch",
+            daemon=True
+        )
+        prepare_thread = threading.Thread(
+            target=self._prepare_stage,
+            args=(issue_queue, chunk_queue, stop, owner, repo, known, failed_updates),
+            name="issue-prepare",
+            daemon=True
+        )
+
+        print("Streaming issues (fetching, chunking, embedding, storing)...")
+        fetch_thread.start()
+        prepare_thread.start()
+
+        try:
+            self._store_stage(chunk_queue, repository, failed_updates)
+        except BaseException as e:
+            stop.set()
+            if not isinstance(e, KeyboardInterrupt):
+                error_msg = f"Fatal error during ingestion: {e}"
+                print(f"\n✗ {error_msg}")
+                self.stats["errors"].append(error_msg)
+            self.stats["end_time"] = datetime.utcnow()
+            raise
+        finally:
+            fetch_thread.join(timeout=5)
+            prepare_thread.join(timeout=5)
+
+        self.stats["end_time"] = datetime.utcnow()
 
+        if fetch_errors:
+            # Issues fetched before the failure are stored and recorded,
+            # but the watermark only moves after a complete fetch
+            error_msg = f"Fatal error during ingestion: {fetch_errors[0]}"
+            print(f"\n✗ {error_msg}")
+            self.stats["errors"].append(error_msg)
+            raise fetch_errors[0]
+
+        # Full listings come least recently updated first and are never cut
+        # short, so every issue up to the last one fetched was processed: move
+        # the watermark there, or back to the oldest failed issue so it is
+        # fetched again (since is inclusive). A run limited by max_issues, or
+        # starting after the watermark, may have left gaps.
+        if self.sync_state and fetched_updates and not max_issues and since in (None, watermark):
+            new_watermark = min(failed_updates) if failed_updates else min(max(fetched_updates), run_started)
+            if watermark and not failed_updates:
+                new_watermark = max(new_watermark, watermark)
+            self.sync_state.set_watermark(repository, new_watermark, sync_key)
+            print(f"✓ Watermark for {repository}: {new_watermark}")
+
+        if not self.stats["total_issues"]:
+            print("No issues found. Exiting.")
+            return self.stats
+
+        # Print summary
+        self._print_summary(owner, repo)
+
+        return self.stats
+
+    @staticmethod
+    def _put(target: "queue.Queue", item: Any, stop: threading.Event) -> bool:
+        """Put an item on a bounded queue, giving up when the pipeline stops."""
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _get(source: "queue.Queue", stop: threading.Event) -> Any:
+        """Take the next item off a queue (the end marker once the pipeline stops)."""
+        while not stop.is_set():
+            try:
+                return source.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _fetch_stage(
+        self,
+        issue_queue: "queue.Queue",
+        stop: threading.Event,
+        fetch_errors: List[Exception],
+        fetched_updates: List[str],
+        owner: str,
+        repo: str,
+        state: str,
+        labels: Optional[List[str]],
+        since: Optional[str],
+        max_issues: Optional[int]
+    ):
+        """Pipeline stage 1: stream issues from GitHub into the issue queue."""
         try:
-            # Step 1: Fetch issues
-            print("Step 1: Fetching issues from GitHub...")
-            issues = self.issue_fetcher.fetch_issues(
+            for issue in self.issue_fetcher.iter_issues(
                 owner=owner,
                 repo=repo,
                 state=state,
                 labels=labels,
                 since=since,
                 max_issues=max_issues
-            )
-            self.stats["total_issues"] = len(issues)
-            print(f"✓ Fetched {len(issues)} issues\n")
+            ):
+                self.stats["total_issues"] += 1
+                fetched_updates.append(issue.updated_at.isoformat())
+                if not self._put(issue_queue, issue, stop):
+                    return
+        except Exception as e:
+            fetch_errors.append(e)
+        finally:
+            self._put(issue_queue, _END, stop)
 
-            if not issues:
-                print("No issues found. Exiting.")
-                return self.stats
+    def _prepare_stage(
+        self,
+        issue_queue: "queue.Queue",
+        chunk_queue: "queue.Queue",
+        stop: threading.Event,
+        owner: str,
+        repo: str,
+        known: Dict[int, IssueSyncState],
+        failed_updates: List[str]
+    ):
+        """Pipeline stage 2: skip unchanged issues, then process and chunk the rest."""
+        repository = f"{owner}/{repo}"
+        position = 0
+        try:
+            while True:
+                issue = self._get(issue_queue, stop)
+                if issue is _END:
+                    break
 
-            # Step 2-5: Process each issue immediately (one at a time for better performance)
-            print("Step 2-5: Processing issues (chunking, embedding, storing)...")
-            all_chunk_ids = []
-            
-            for i, issue in enumerate(issues, 1):
-                print(f"\n[{i}/{len(issues)}] Processing issue #{issue.number} - {issue.title[:50]}...")
+                position += 1
+                print(f"\n[{position}] Processing issue #{issue.number} - {issue.title[:50]}...")
 
                 try:
-                    # Check if issue already exists in vector store
-                    existing_data = self._check_issue_exists(owner, repo, issue.number)
-
-                    if existing_data:
-                        # Check if the issue has been updated since last ingestion
-                        last_ingested = existing_data.get("updated_at")
-                        current_updated = issue.updated_at.isoformat()
-
-                        if last_ingested == current_updated:
-                            print(f"  ⊘ Skipping - already up to date")
-                            self.stats["skipped_issues"] += 1
-                            continue
-                        else:
-                            print(f"  ↻ Updating - has been modified since last ingestion")
-                            # Delete old chunks before re-processing
-                            self._delete_issue_chunks(owner, repo, issue.number)
-                            self.stats["updated_issues"] += 1
+                    current_updated = issue.updated_at.isoformat()
+                    content_hash = issue.content_hash()
+                    previous = known.get(issue.number)
+
+                    if previous and previous.content_hash == content_hash:
+                        print(f"  ⊘ Skipping - content unchanged")
+                        if previous.updated_at != current_updated and self.sync_state:
+                            self.sync_state.record_issue(
+                                repository,
+                                issue.number,
+                                IssueSyncState(current_updated, content_hash, previous.chunk_ids)
+                            )
+                        self.stats["skipped_issues"] += 1
+                        continue
+
+                    # Issues without sync state may still have chunks from
+                    # before it was kept (a scalar lookup, not a vector search)
+                    if previous:
+                        old_ids = previous.chunk_ids
+                    elif not known:
+                        old_ids = self._get_issue_chunk_ids(owner, repo, issue.number)
+                    else:
+                        old_ids = []
+
+                    if previous or old_ids:
+                        # Chunks are upserted under stable IDs; old chunks that were
+                        # not overwritten are deleted once the issue is stored
+                        print(f"  ↻ Updating - has been modified since last ingestion")
+                        self.stats["updated_issues"] += 1
                     else:
                         self.stats["new_issues"] += 1
 
-                    # Process this single issue (chunk, embed, store)
-                    chunk_ids = self._process_issue(issue)
-                    all_chunk_ids.extend(chunk_ids)
-                    print(f"  ✓ Stored {len(chunk_ids)} chunks")
+                    chunks = self._chunk_issue(issue)
 
                 except Exception as e:
                     error_msg = f"Error processing issue #{issue.number}: {e}"
                     print(f"  ✗ {error_msg}")
                     self.stats["errors"].append(error_msg)
+                    failed_updates.append(issue.updated_at.isoformat())
                     continue
 
-            self.stats["end_time"] = datetime.utcnow()
-            
-            # Print summary
-            self._print_summary(owner, repo)
-            
-            return self.stats
+                if not self._put(chunk_queue, (issue, content_hash, old_ids, chunks), stop):
+                    return
+        finally:
+            self._put(chunk_queue, _END, stop)
 
-        except Exception as e:
-            error_msg = f"Fatal error during ingestion: {e}"
-            print(f"\n✗ {error_msg}")
-            self.stats["errors"].append(error_msg)
-            self.stats["end_time"] = datetime.utcnow()
-            raise
+    def _store_stage(self, chunk_queue: "queue.Queue", repository: str, failed_updates: List[str]):
+        """
+        Pipeline stage 3: embed and store chunks in batches that may span issues.
 
-    def _process_issue(self, issue: GitHubIssue) -> List[str]:
+        Once its last chunk is stored, an issue's chunks from an earlier run
+        that were not overwritten are deleted and the issue is recorded in the
+        sync state; the remaining chunks of an issue whose batch failed are dropped.
         """
-        Process a single issue through the entire pipeline.
+        pending: List[Tuple[GitHubIssue, TextChunk]] = []
+        content_hashes: Dict[int, str] = {}
+        old_chunk_ids: Dict[int, List[str]] = {}  # Issue number -> IDs stored by an earlier run
+        chunk_ids: Dict[int, List[str]] = {}  # Issue number -> IDs of the stored chunks
+        remaining: Dict[int, int] = {}  # Issue number -> chunks not yet stored
+        failed: set = set()
+
+        def complete(issue: GitHubIssue):
+            stored_ids = chunk_ids.pop(issue.number, [])
+            stale_ids = set(old_chunk_ids.pop(issue.number, [])) - set(stored_ids)
+            if stale_ids:
+                try:
+                    self.vector_store.delete_by_ids(sorted(stale_ids))
+                except Exception as e:
+                    # Not recorded, so the next run retries the issue
+                    error_msg = f"Error deleting stale chunks of issue #{issue.number}: {e}"
+                    print(f"  ✗ {error_msg}")
+                    self.stats["errors"].append(error_msg)
+                    failed_updates.append(issue.updated_at.isoformat())
+                    content_hashes.pop(issue.number, None)
+                    return
+            if self.sync_state:
+                self.sync_state.record_issue(
+                    repository,
+                    issue.number,
+                    IssueSyncState(issue.updated_at.isoformat(), content_hashes.pop(issue.number), stored_ids)
+                )
+            print(f"  ✓ Stored {len(stored_ids)} chunks of issue #{issue.number}")
+
+        def flush(batch: List[Tuple[GitHubIssue, TextChunk]]):
+            batch = [(issue, chunk) for issue, chunk in batch if issue.number not in failed]
+            if not batch:
+                return
+
+            try:
+                # Extract text from chunks and create embeddings
+                embeddings = self.embedding_service.create_embeddings_batch([chunk.content for _, chunk in batch])
+                self.stats["total_embeddings"] += len(embeddings)
+
+                # Store in vector database
+                batch_ids = self.vector_store.store_chunks_batch([chunk for _, chunk in batch], embeddings)
+            except Exception as e:
+                for issue in {issue.number: issue for issue, _ in batch}.values():
+                    error_msg = f"Error processing issue #{issue.number}: {e}"
+                    print(f"  ✗ {error_msg}")
+                    self.stats["errors"].append(error_msg)
+                    failed_updates.append(issue.updated_at.isoformat())
+                    failed.add(issue.number)
+                    old_chunk_ids.pop(issue.number, None)
+                return
+
+            for (issue, _), chunk_id in zip(batch, batch_ids):
+                chunk_ids[issue.number].append(chunk_id)
+                remaining[issue.number] -= 1
+                if not remaining[issue.number]:
+                    del remaining[issue.number]
+                    complete(issue)
+
+        while True:
+            item = chunk_queue.get()
+            if item is _END:
+                break
+
+            issue, content_hash, old_ids, chunks = item
+            content_hashes[issue.number] = content_hash
+            old_chunk_ids[issue.number] = old_ids
+            chunk_ids[issue.number] = []
+            if not chunks:
+                complete(issue)
+                continue
+
+            remaining[issue.number] = len(chunks)
+            pending.extend((issue, chunk) for chunk in chunks)
+
+            while len(pending) >= self.batch_size:
+                flush(pending[:self.batch_size])
+                pending = pending[self.batch_size:]
+
+        flush(pending)
+
+    def _chunk_issue(self, issue: GitHubIssue) -> List[TextChunk]:
+        """
+        Process the text of an issue and split it into chunks.
 
         Args:
             issue: GitHubIssue object
 
         Returns:
-            List of chunk IDs that were stored
+            List of chunks with issue metadata
         """
         # Step 2: Process text
         processed_text = self.text_processor.process_issue(issue)
         
         # Step 3: Chunk text
         metadata = {
+            "source_type": SOURCE_TYPE_ISSUE,
             "issue_number": issue.number,
             "issue_title": issue.title,
             "repository": f"{issue.owner}/{issue.repo}",
@@ -189,6 +444,19 @@ class IngestionOrchestrator:
         
         chunks = self.chunker.chunk_text(processed_text, metadata=metadata)
         self.stats["total_chunks"] += len(chunks)
+        return chunks
+
+    def _process_issue(self, issue: GitHubIssue) -> List[str]:
+        """
+        Process a single issue through the entire pipeline.
+
+        Args:
+            issue: GitHubIssue object
+
+        Returns:
+            List of chunk IDs that were stored
+        """
+        chunks = self._chunk_issue(issue)
         
         if not chunks:
             return []
@@ -257,12 +525,14 @@ class IngestionOrchestrator:
         
         filter_dict = {"repository": f"{owner}/{repo}"}
         self.vector_store.delete_by_metadata(filter_dict)
+        if self.sync_state:
+            self.sync_state.reset(f"{owner}/{repo}")
         
         print(f"✓ Deleted all data for {owner}/{repo}")
 
-    def _check_issue_exists(self, owner: str, repo: str, issue_number: int) -> Optional[Dict[str, Any]]:
+    def _get_issue_chunk_ids(self, owner: str, repo: str, issue_number: int) -> List[str]:
         """
-        Check if an issue already exists in the vector store.
+        Get the IDs of the chunks stored for an issue.
 
         Args:
             owner: Repository owner
@@ -270,43 +540,12 @@ class IngestionOrchestrator:
             issue_number: Issue number
 
         Returns:
-            Metadata of existing issue if found, None otherwise
-        """
-        try:
-            # Query for any chunk from this issue
-            filter_dict = {
-                "repository": f"{owner}/{repo}",
-                "issue_number": issue_number
-            }
-
-            results = self.vector_store.query(
-                query_vector=[0.0] * 1536,  # Dummy vector
-                top_k=1,
-                filter_dict=filter_dict
-            )
-
-            if results and len(results) > 0:
-                return results[0].get("metadata", {})
-
-            return None
-        except Exception:
-            # If query fails, assume issue doesn't exist
-            return None
-
-    def _delete_issue_chunks(self, owner: str, repo: str, issue_number: int) -> None:
+            Chunk IDs (empty if the issue has not been ingested)
         """
-        Delete all chunks for a specific issue.
-
-        Args:
-            owner: Repository owner
-            repo: Repository name
-            issue_number: Issue number
-        """
-        filter_dict = {
+        return self.vector_store.get_ids({
             "repository": f"{owner}/{repo}",
             "issue_number": issue_number
-        }
-        self.vector_store.delete_by_metadata(filter_dict)
+        })
 
     def _print_summary(self, owner: str, repo: str):
         """Print ingestion summary."""
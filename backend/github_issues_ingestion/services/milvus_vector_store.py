@@ -3,14 +3,25 @@ Milvus Vector Store Service.
 Implements IVectorStore interface.
 """
 
+import json
 from typing import List, Dict, Any, Optional
-import uuid
 
 from pymilvus import MilvusClient
 
+try:
+    from utils.vector_ids import stable_id
+    from db.milvus_schema import SEARCH_VECTOR_FIELD, CollectionSpec, MilvusSchemaManager
+except ImportError:
+    from ...utils.vector_ids import stable_id
+    from ...db.milvus_schema import SEARCH_VECTOR_FIELD, CollectionSpec, MilvusSchemaManager
+
 from ..interfaces.vector_store import IVectorStore
 from ..models.chunk import TextChunk
 
+# Dynamic fields that existence checks filter on, with their JSON cast type
+SCALAR_INDEX_FIELDS = {"repository": "varchar", "issue_number": "double"}
+QUERY_LIMIT = 16384  # Largest result window of a single Milvus query
+
 
 class MilvusVectorStore(IVectorStore):
     """Service for storing and querying vectors in Milvus."""
@@ -42,23 +53,50 @@ class MilvusVectorStore(IVectorStore):
 
         # Initialize Milvus
         self.client = MilvusClient(uri=uri, token=token)
+        self.schema = MilvusSchemaManager(self.client, CollectionSpec.from_env(dimension, metric))
 
         # Get or create collection
         if not self.client.has_collection(collection_name=collection_name):
             print(f"Creating new Milvus collection: {collection_name}")
-            self.client.create_collection(
-                collection_name=collection_name,
-                dimension=dimension,
-                metric_type=metric,
-                auto_id=False,
-                enable_dynamic_field=True
-            )
+            self.schema.create_collection(collection_name)
             print(f"Collection {collection_name} created successfully")
         else:
             print(f"Using existing Milvus collection: {collection_name}")
 
+        # Typed collections index their scalar fields; older dynamic ones get JSON path indexes
+        if not self.schema.is_typed(collection_name):
+            self._ensure_scalar_indexes()
         print(f"Connected to Milvus collection: {collection_name}")
 
+    def _ensure_scalar_indexes(self):
+        """
+        Index the dynamic fields that existence checks filter on.
+
+        JSON path indexes on dynamic fields need Milvus 2.5.11 or later; on
+        older servers filters still work but scan the collection.
+        """
+        try:
+            existing = set(self.client.list_indexes(collection_name=self.collection_name))
+            index_params = self.client.prepare_index_params()
+            missing = []
+            for field_name, cast_type in SCALAR_INDEX_FIELDS.items():
+                index_name = f"{field_name}_idx"
+                if index_name in existing:
+                    continue
+                index_params.add_index(
+                    field_name=field_name,
+                    index_type="INVERTED",
+                    index_name=index_name,
+                    params={"json_path": field_name, "json_cast_type": cast_type}
+                )
+                missing.append(field_name)
+
+            if missing:
+                self.client.create_index(collection_name=self.collection_name, index_params=index_params)
+                print(f"Created scalar indexes on {', '.join(missing)}")
+        except Exception as e:
+            print(f"Note: Scalar indexes not available, metadata filters will scan: {e}")
+
     def store_chunk(self, chunk: TextChunk, vector: List[float]) -> str:
         """
         Store a single chunk with its vector.
@@ -70,40 +108,25 @@ class MilvusVectorStore(IVectorStore):
         Returns:
             ID of the stored chunk
         """
-        # Generate string ID if not present
-        chunk_id_str = chunk.chunk_id or str(uuid.uuid4())
-        chunk.chunk_id = chunk_id_str
-
-        # Convert string ID to int64 for Milvus (using hash)
-        chunk_id_int = abs(hash(chunk_id_str)) % (2**63 - 1)
-
-        # Prepare metadata
-        metadata = {
-            "id": chunk_id_int,  # Use int64 ID
-            "vector": vector,
-            "content": chunk.content[:1000],  # Limit content size in metadata
-            "chunk_id_str": chunk_id_str,  # Store original string ID in dynamic field
-            "chunk_index": chunk.chunk_index,
-            "total_chunks": chunk.total_chunks,
-            "created_at": chunk.created_at.isoformat(),
-            **chunk.metadata  # Include all custom metadata
-        }
-
-        # Ensure metadata values are valid types
-        metadata = self._sanitize_metadata(metadata)
-
-        # Insert to Milvus
-        self.client.insert(
-            collection_name=self.collection_name,
-            data=[metadata]
-        )
-
-        return chunk_id_str
+        return self.upsert_batch([chunk], [vector])[0]
 
     def store_chunks_batch(self, chunks: List[TextChunk], vectors: List[List[float]]) -> List[str]:
         """
         Store multiple chunks with their vectors in batch.
 
+        Args:
+            chunks: List of TextChunk objects
+            vectors: List of embedding vectors
+
+        Returns:
+            List of IDs for stored chunks
+        """
+        return self.upsert_batch(chunks, vectors)
+
+    def upsert_batch(self, chunks: List[TextChunk], vectors: List[List[float]]) -> List[str]:
+        """
+        Insert or overwrite chunks under deterministic IDs.
+
         Args:
             chunks: List of TextChunk objects
             vectors: List of embedding vectors
@@ -122,20 +145,15 @@ class MilvusVectorStore(IVectorStore):
         chunk_ids = []
 
         for chunk, vector in zip(chunks, vectors):
-            # Generate string ID if not present
-            chunk_id_str = chunk.chunk_id or str(uuid.uuid4())
-            chunk.chunk_id = chunk_id_str
-            chunk_ids.append(chunk_id_str)
-
-            # Convert string ID to int64 for Milvus (using hash)
-            chunk_id_int = abs(hash(chunk_id_str)) % (2**63 - 1)
+            chunk_id_int = self._primary_key(chunk)
+            chunk_ids.append(chunk.chunk_id)
 
             # Prepare metadata
             metadata = {
                 "id": chunk_id_int,  # Use int64 ID
                 "vector": vector,
                 "content": chunk.content[:1000],  # Limit content size
-                "chunk_id_str": chunk_id_str,  # Store original string ID in dynamic field
+                "chunk_id_str": chunk.chunk_id,  # Store original string ID in dynamic field
                 "chunk_index": chunk.chunk_index,
                 "total_chunks": chunk.total_chunks,
                 "created_at": chunk.created_at.isoformat(),
@@ -145,12 +163,13 @@ class MilvusVectorStore(IVectorStore):
             # Sanitize metadata
             metadata = self._sanitize_metadata(metadata)
             data_list.append(metadata)
+        data_list = self.schema.prepare_rows(self.collection_name, data_list)
 
-        # Batch insert (Milvus can handle large batches)
+        # Batch upsert (Milvus can handle large batches)
         batch_size = 100
         for i in range(0, len(data_list), batch_size):
             batch = data_list[i:i + batch_size]
-            self.client.insert(
+            self.client.upsert(
                 collection_name=self.collection_name,
                 data=batch
             )
@@ -160,6 +179,20 @@ class MilvusVectorStore(IVectorStore):
         print(f"Successfully stored {len(chunks)} chunks in Milvus")
         return chunk_ids
 
+    @staticmethod
+    def _primary_key(chunk: TextChunk) -> int:
+        """
+        INT64 primary key of a chunk, assigning its chunk_id if it has none.
+
+        New chunks get the decimal string of their stable ID as chunk_id;
+        caller-supplied string IDs are hashed with the same stable scheme.
+        """
+        if not chunk.chunk_id:
+            chunk.chunk_id = str(chunk.stable_id())
+        if chunk.chunk_id.isdigit():
+            return int(chunk.chunk_id)
+        return stable_id(chunk.chunk_id)
+
     def query_similar(
         self,
         query_vector: List[float],
@@ -185,21 +218,19 @@ class MilvusVectorStore(IVectorStore):
         # Query Milvus
         results = self.client.search(
             collection_name=self.collection_name,
-            data=[query_vector],
-            limit=top_k,
-            output_fields=["*"],
-            filter=filter_expr
+            filter=filter_expr,
+            **self.schema.search_request(self.collection_name, query_vector, top_k)
         )
 
         # Format results
         matches = []
         if results and len(results) > 0:
-            for match in results[0]:
+            for match in self.schema.finish_search(self.collection_name, query_vector, results[0], top_k):
                 entity = match.get("entity", {})
                 matches.append({
                     "id": match.get("id"),
                     "score": match.get("distance", 0.0),
-                    "metadata": {k: v for k, v in entity.items() if k not in ["id", "vector"]},
+                    "metadata": {k: v for k, v in entity.items() if k not in ["id", "vector", SEARCH_VECTOR_FIELD]},
                     "content": entity.get("content", "")
                 })
 
@@ -230,6 +261,99 @@ class MilvusVectorStore(IVectorStore):
             print(f"Error deleting vectors: {e}")
             raise
 
+    def delete_by_ids(self, ids: List[str]) -> None:
+        """
+        Delete vectors by chunk ID.
+
+        Args:
+            ids: Chunk IDs (the chunk_id_str field)
+        """
+        if not ids:
+            return
+
+        for i in range(0, len(ids), 1000):
+            batch = ", ".join(f'"{chunk_id}"' for chunk_id in ids[i:i + 1000])
+            self.client.delete(
+                collection_name=self.collection_name,
+                filter=f"chunk_id_str in [{batch}]"
+            )
+        print(f"Deleted {len(ids)} stale chunks")
+
+    def exists(self, filter_dict: Dict[str, Any]) -> bool:
+        """
+        Check whether any vector matches a metadata filter (scalar query, no search).
+
+        Args:
+            filter_dict: Metadata filters
+
+        Returns:
+            True if at least one vector matches
+        """
+        results = self.client.query(
+            collection_name=self.collection_name,
+            filter=self._build_filter_expression(filter_dict),
+            output_fields=["id"],
+            limit=1
+        )
+        return len(results) > 0
+
+    def get_ids(self, filter_dict: Dict[str, Any], limit: Optional[int] = None) -> List[str]:
+        """
+        Get the chunk IDs of vectors matching a metadata filter (scalar query, no search).
+
+        Args:
+            filter_dict: Metadata filters
+            limit: Maximum number of IDs to return (None = all)
+
+        Returns:
+            List of chunk IDs
+        """
+        filter_expr = self._build_filter_expression(filter_dict)
+
+        if limit is None and hasattr(self.client, "query_iterator"):
+            # Page through results past the query window
+            ids = []
+            iterator = self.client.query_iterator(
+                collection_name=self.collection_name,
+                batch_size=1000,
+                filter=filter_expr,
+                output_fields=["chunk_id_str"]
+            )
+            try:
+                while True:
+                    page = iterator.next()
+                    if not page:
+                        break
+                    ids.extend(str(entity.get("chunk_id_str", entity.get("id"))) for entity in page)
+            finally:
+                iterator.close()
+            return ids
+
+        results = self.client.query(
+            collection_name=self.collection_name,
+            filter=filter_expr,
+            output_fields=["chunk_id_str"],
+            limit=min(limit or QUERY_LIMIT, QUERY_LIMIT)
+        )
+        return [str(entity.get("chunk_id_str", entity.get("id"))) for entity in results]
+
+    def count(self, filter_dict: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Count vectors matching a metadata filter.
+
+        Args:
+            filter_dict: Metadata filters (None = all vectors)
+
+        Returns:
+            Number of matching vectors
+        """
+        results = self.client.query(
+            collection_name=self.collection_name,
+            filter=self._build_filter_expression(filter_dict or {}),
+            output_fields=["count(*)"]
+        )
+        return int(results[0]["count(*)"]) if results else 0
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get collection statistics.
@@ -286,6 +410,10 @@ class MilvusVectorStore(IVectorStore):
                     conditions.append(f'{key} == "{val}"')
                 else:
                     conditions.append(f'{key} == {val}')
+            elif isinstance(value, dict) and "$in" in value:
+                conditions.append(f'{key} in {json.dumps(list(value["$in"]))}')
+            elif isinstance(value, (list, tuple)):
+                conditions.append(f'{key} in {json.dumps(list(value))}')
             elif isinstance(value, str):
                 conditions.append(f'{key} == "{value}"')
             elif isinstance(value, (int, float, bool)):
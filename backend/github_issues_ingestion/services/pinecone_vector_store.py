@@ -4,13 +4,17 @@ Implements IVectorStore interface.
 """
 
 from typing import List, Dict, Any, Optional
-import uuid
 
 from pinecone import Pinecone, ServerlessSpec
 
 from ..interfaces.vector_store import IVectorStore
 from ..models.chunk import TextChunk
 
+# Metadata fields encoded, in order, as the prefix of chunk IDs so that
+# vectors can be listed by them without a query vector
+ID_PREFIX_FIELDS = ("repository", "issue_number")
+ID_SEPARATOR = "#"
+
 
 class PineconeVectorStore(IVectorStore):
     """Service for storing and querying vectors in Pinecone."""
@@ -81,34 +85,25 @@ class PineconeVectorStore(IVectorStore):
         Returns:
             ID of the stored chunk
         """
-        # Generate ID if not present
-        chunk_id = chunk.chunk_id or str(uuid.uuid4())
-        chunk.chunk_id = chunk_id
-
-        # Prepare metadata
-        metadata = {
-            "content": chunk.content[:1000],  # Limit content size in metadata
-            "chunk_index": chunk.chunk_index,
-            "total_chunks": chunk.total_chunks,
-            "created_at": chunk.created_at.isoformat(),
-            **chunk.metadata  # Include all custom metadata
-        }
-
-        # Ensure metadata values are valid types
-        metadata = self._sanitize_metadata(metadata)
-
-        # Upsert to Pinecone
-        self.index.upsert(
-            vectors=[(chunk_id, vector, metadata)],
-            namespace=self.namespace or ""
-        )
-
-        return chunk_id
+        return self.upsert_batch([chunk], [vector])[0]
 
     def store_chunks_batch(self, chunks: List[TextChunk], vectors: List[List[float]]) -> List[str]:
         """
         Store multiple chunks with their vectors in batch.
 
+        Args:
+            chunks: List of TextChunk objects
+            vectors: List of embedding vectors
+
+        Returns:
+            List of IDs for stored chunks
+        """
+        return self.upsert_batch(chunks, vectors)
+
+    def upsert_batch(self, chunks: List[TextChunk], vectors: List[List[float]]) -> List[str]:
+        """
+        Insert or overwrite chunks under deterministic IDs.
+
         Args:
             chunks: List of TextChunk objects
             vectors: List of embedding vectors
@@ -128,7 +123,7 @@ class PineconeVectorStore(IVectorStore):
 
         for chunk, vector in zip(chunks, vectors):
             # Generate ID if not present
-            chunk_id = chunk.chunk_id or str(uuid.uuid4())
+            chunk_id = chunk.chunk_id or self._new_chunk_id(chunk)
             chunk.chunk_id = chunk_id
             chunk_ids.append(chunk_id)
 
@@ -219,6 +214,121 @@ class PineconeVectorStore(IVectorStore):
             print(f"Error deleting vectors: {e}")
             raise
 
+    @staticmethod
+    def _id_prefix(values: Dict[str, Any]) -> str:
+        """ID prefix for the leading ID_PREFIX_FIELDS present in a metadata or filter dict."""
+        parts = []
+        for field_name in ID_PREFIX_FIELDS:
+            value = values.get(field_name)
+            if isinstance(value, dict):
+                value = value.get("$eq")
+            if value is None:
+                break
+            parts.append(f"{value}{ID_SEPARATOR}")
+        return "".join(parts)
+
+    def _new_chunk_id(self, chunk: TextChunk) -> str:
+        """Deterministic chunk ID: the ID prefix followed by the chunk's stable ID in hex."""
+        return f"{self._id_prefix(chunk.metadata)}{chunk.stable_id():016x}"
+
+    def _iter_matching_ids(self, filter_dict: Dict[str, Any]):
+        """
+        Yield pages of IDs of vectors matching a metadata filter.
+
+        IDs are listed by the prefix built from the filter; filter fields that
+        are not part of the prefix are checked against fetched metadata.
+        """
+        prefix = self._id_prefix(filter_dict)
+        covered = set(ID_PREFIX_FIELDS[:prefix.count(ID_SEPARATOR)])
+        remaining = {key: value for key, value in filter_dict.items() if key not in covered}
+
+        for page in self.index.list(prefix=prefix or None, namespace=self.namespace or ""):
+            ids = list(page)
+            if remaining and ids:
+                fetched = self.index.fetch(ids=ids, namespace=self.namespace or "").vectors
+                ids = [
+                    vector_id for vector_id in ids
+                    if vector_id in fetched and self._matches(fetched[vector_id].metadata or {}, remaining)
+                ]
+            if ids:
+                yield ids
+
+    @staticmethod
+    def _matches(metadata: Dict[str, Any], filter_dict: Dict[str, Any]) -> bool:
+        """Whether metadata satisfies an equality filter ({"field": value} or {"field": {"$eq": value}})."""
+        for key, value in filter_dict.items():
+            if isinstance(value, dict):
+                value = value.get("$eq")
+            if metadata.get(key) != value:
+                return False
+        return True
+
+    def delete_by_ids(self, ids: List[str]) -> None:
+        """
+        Delete vectors by chunk ID.
+
+        Args:
+            ids: Chunk IDs
+        """
+        # Pinecone deletes at most 1000 IDs per request
+        for i in range(0, len(ids), 1000):
+            self.index.delete(
+                ids=ids[i:i + 1000],
+                namespace=self.namespace or ""
+            )
+        if ids:
+            print(f"Deleted {len(ids)} stale chunks")
+
+    def exists(self, filter_dict: Dict[str, Any]) -> bool:
+        """
+        Check whether any vector matches a metadata filter (ID listing, no query vector).
+
+        Args:
+            filter_dict: Metadata filters
+
+        Returns:
+            True if at least one vector matches
+        """
+        return next(self._iter_matching_ids(filter_dict), None) is not None
+
+    def get_ids(self, filter_dict: Dict[str, Any], limit: Optional[int] = None) -> List[str]:
+        """
+        Get the IDs of vectors matching a metadata filter (ID listing, no query vector).
+
+        Only vectors stored with prefixed IDs (see ID_PREFIX_FIELDS) can be
+        listed by repository or issue.
+
+        Args:
+            filter_dict: Metadata filters
+            limit: Maximum number of IDs to return (None = all)
+
+        Returns:
+            List of chunk IDs
+        """
+        ids: List[str] = []
+        for page in self._iter_matching_ids(filter_dict):
+            ids.extend(page)
+            if limit is not None and len(ids) >= limit:
+                return ids[:limit]
+        return ids
+
+    def count(self, filter_dict: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Count vectors matching a metadata filter.
+
+        Args:
+            filter_dict: Metadata filters (None = all vectors)
+
+        Returns:
+            Number of matching vectors
+        """
+        if not filter_dict:
+            stats = self.index.describe_index_stats()
+            if self.namespace:
+                return stats.get("namespaces", {}).get(self.namespace, {}).get("vector_count", 0)
+            return stats.get("total_vector_count", 0)
+        return sum(len(page) for page in self._iter_matching_ids(filter_dict))
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get index statistics.
@@ -0,0 +1,134 @@
+"""
+SQLite Sync State Store Service.
+Implements ISyncStateStore interface.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..interfaces.sync_state_store import ISyncStateStore, IssueSyncState
+
+DEFAULT_SYNC_STATE_PATH = Path(__file__).resolve().parent.parent.parent.parent / ".cache" / "issue_sync_state.sqlite"
+
+
+class SQLiteSyncStateStore(ISyncStateStore):
+    """
+    Issue sync state in a local sqlite file, safe to share between threads.
+
+    State is kept per vector collection: what was stored in one collection
+    says nothing about another, so a new collection starts with a full sync.
+    """
+
+    def __init__(self, path: Optional[str] = None, collection: str = ""):
+        """
+        Open (or create) the sync state store.
+
+        Args:
+            path: Path to the sqlite file (None = default location, ":memory:" = not persisted)
+            collection: Vector collection the issues are stored in
+        """
+        self.path = str(path or DEFAULT_SYNC_STATE_PATH)
+        self.collection = collection
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(issues)")]
+        if columns and "collection" not in columns:
+            # State written before it was kept per collection cannot be attributed
+            # to one; dropping it makes the next run of each repository a full sync
+            self._conn.executescript("DROP TABLE IF EXISTS watermarks; DROP TABLE IF EXISTS issues;")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS watermarks (
+                collection TEXT NOT NULL,
+                repository TEXT NOT NULL,
+                sync_key TEXT NOT NULL,
+                watermark TEXT NOT NULL,
+                synced_at REAL NOT NULL,
+                PRIMARY KEY (collection, repository, sync_key)
+            );
+            CREATE TABLE IF NOT EXISTS issues (
+                collection TEXT NOT NULL,
+                repository TEXT NOT NULL,
+                issue_number INTEGER NOT NULL,
+                updated_at TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                chunk_ids TEXT NOT NULL,
+                synced_at REAL NOT NULL,
+                PRIMARY KEY (collection, repository, issue_number)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def get_watermark(self, repository: str, sync_key: str = "") -> Optional[str]:
+        """Get the updated_at watermark of a repository (None if never fully synced)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark FROM watermarks WHERE collection = ? AND repository = ? AND sync_key = ?",
+                (self.collection, repository, sync_key)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, repository: str, watermark: str, sync_key: str = "") -> None:
+        """Record the updated_at watermark of a repository."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO watermarks (collection, repository, sync_key, watermark, synced_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.collection, repository, sync_key, watermark, time.time())
+            )
+            self._conn.commit()
+
+    def get_issue_states(self, repository: str) -> Dict[int, IssueSyncState]:
+        """Get the sync state of every ingested issue of a repository."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT issue_number, updated_at, content_hash, chunk_ids FROM issues WHERE collection = ? AND repository = ?",
+                (self.collection, repository)
+            ).fetchall()
+        return {
+            number: IssueSyncState(updated_at, content_hash, json.loads(chunk_ids))
+            for number, updated_at, content_hash, chunk_ids in rows
+        }
+
+    def record_issue(self, repository: str, issue_number: int, state: IssueSyncState) -> None:
+        """Record that all chunks of an issue version were stored."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO issues "
+                "(collection, repository, issue_number, updated_at, content_hash, chunk_ids, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.collection, repository, issue_number,
+                    state.updated_at, state.content_hash, json.dumps(state.chunk_ids), time.time()
+                )
+            )
+            self._conn.commit()
+
+    def reset(self, repository: Optional[str] = None) -> None:
+        """Forget the sync state of a repository (None = every repository) in this collection."""
+        with self._lock:
+            if repository is None:
+                self._conn.execute("DELETE FROM watermarks WHERE collection = ?", (self.collection,))
+                self._conn.execute("DELETE FROM issues WHERE collection = ?", (self.collection,))
+            else:
+                for table in ("watermarks", "issues"):
+                    self._conn.execute(
+                        f"DELETE FROM {table} WHERE collection = ? AND repository = ?",
+                        (self.collection, repository)
+                    )
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying sqlite connection."""
+        with self._lock:
+            self._conn.close()
@@ -39,8 +39,8 @@ test_chunk = TextChunk(
     created_at=datetime.now()
 )
 
-# Create a dummy vector (1536 dimensions)
-test_vector = [0.1] * 1536
+# Create a dummy vector of the configured dimension
+test_vector = [0.1] * settings.milvus_dimension
 
 print("\nStoring test chunk...")
 try:
@@ -135,6 +135,42 @@ def test_chunker():
         return False
 
 
+def test_token_chunker():
+    """Test token-exact chunking."""
+    print("\nTesting token chunking...")
+    try:
+        from github_issues_ingestion.services import ChunkingService
+
+        chunker = ChunkingService(max_tokens=100, overlap_tokens=10)
+        log_lines = "\n".join(f"    at com.example.Service.method{i}(Service.java:{i})" for i in range(200))
+        test_text = f"Build fails on startup:\n\n```\n{log_lines}\n```"
+        chunks = chunker.chunk_text(test_text, metadata={"test": "value"})
+
+        # Long whitespace runs, emoji and CJK text must not be undercounted either
+        mixed_text = "構築に失敗しました " * 60 + "\n" + " " * 3000 + "stack trace\n" + "🔥" * 150
+        chunks += chunker.chunk_text(mixed_text)
+        test_text += mixed_text
+        if not chunker.tokenizer.exact:
+            count = chunker.tokenizer.count
+            assert count(" " * 3000 + "x") > 750 and count("🔥" * 100) >= 400 and count("構" * 400) >= 1200
+
+        token_counts = [chunker.tokenizer.count(chunk.content) for chunk in chunks]
+        exact = "exact" if chunker.tokenizer.exact else "approximate"
+        if chunks and max(token_counts) <= 100 and all(chunk.content in test_text for chunk in chunks):
+            print(f"✓ Created {len(chunks)} chunks of at most {max(token_counts)} tokens ({exact} counts)")
+            print(f"  Formatting kept: {chunks[1].content.splitlines()[1]!r}")
+            return True
+        else:
+            print(f"✗ Token chunking failed: {token_counts}")
+            return False
+
+    except Exception as e:
+        print(f"✗ Token chunker error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def test_embedding_service():
     """Test Azure embedding service."""
     print("\nTesting Azure embedding service...")
@@ -255,6 +291,7 @@ def main():
         ("GitHub Fetcher", test_github_fetcher),
         ("Text Processor", test_text_processor),
         ("Chunker", test_chunker),
+        ("Token Chunker", test_token_chunker),
         ("Embedding Service", test_embedding_service),
         ("Vector Store", test_vector_store),
         ("Complete Pipeline", test_complete_pipeline),
@@ -0,0 +1,176 @@
+"""
+Token offsets for token-exact chunking.
+
+A document is tokenized once; the result is the character offset at which
+each token ends, so chunks can be sliced from the original string (keeping
+code and log formatting) while their token count is known exactly.
+
+Uses tiktoken when it is installed. Otherwise a regex approximation is used
+that splits text into pieces no larger than a cl100k token (at most 4 ASCII
+letters, 3 digits or 4 whitespace characters, one piece per other ASCII
+character) and counts a non-ASCII character as one token per UTF-8 byte, so
+its counts err on the high side and chunks still fit the embedding model's
+limit.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+DEFAULT_ENCODING = "cl100k_base"  # text-embedding-ada-002 and text-embedding-3-*
+EMBEDDING_MAX_TOKENS = 8191  # Input limit of the OpenAI embedding models
+
+# Fallback piece widths by character class: other ASCII, letters, digits, whitespace, non-ASCII
+_OTHER, _LETTER, _DIGIT, _SPACE, _WIDE = range(5)
+_PIECE_WIDTH = np.array([1, 4, 3, 4, 1], dtype=np.int64)
+# Class of every ASCII character; all other code points are _WIDE
+_CHAR_CLASS = np.array(
+    [_LETTER if chr(c).isalpha() else
+     _DIGIT if chr(c).isdigit() else
+     _SPACE if chr(c).isspace() else
+     _OTHER for c in range(128)],
+    dtype=np.int64
+)
+
+
+class TokenOffsets:
+    """Token boundaries of a text that fall on character boundaries."""
+
+    def __init__(self, tokens: np.ndarray, chars: np.ndarray):
+        """
+        Args:
+            tokens: Number of tokens before each boundary (starts with 0, increasing)
+            chars: Character offset of each boundary (starts with 0, ends with len(text))
+        """
+        self.tokens = tokens
+        self.chars = chars
+
+    @property
+    def total_tokens(self) -> int:
+        """Number of tokens in the text."""
+        return int(self.tokens[-1])
+
+
+class Tokenizer:
+    """Counts tokens and finds token boundaries with one tokenizer call per text."""
+
+    def __init__(self, encoding_name: str = DEFAULT_ENCODING):
+        """
+        Initialize the tokenizer.
+
+        Args:
+            encoding_name: tiktoken encoding (ignored when tiktoken is not installed)
+        """
+        self.encoding_name = encoding_name
+        self.encoding = tiktoken.get_encoding(encoding_name) if tiktoken is not None else None
+        self._token_lengths: Optional[np.ndarray] = None
+
+    @property
+    def exact(self) -> bool:
+        """Whether token counts come from the real tokenizer."""
+        return self.encoding is not None
+
+    def _byte_lengths(self) -> np.ndarray:
+        """UTF-8 byte length of every token in the vocabulary (built once)."""
+        if self._token_lengths is None:
+            lengths = np.zeros(self.encoding.n_vocab, dtype=np.int64)
+            for token in range(self.encoding.n_vocab):
+                try:
+                    lengths[token] = len(self.encoding.decode_single_token_bytes(token))
+                except KeyError:
+                    pass  # Unused token id
+            self._token_lengths = lengths
+        return self._token_lengths
+
+    def offsets(self, text: str) -> TokenOffsets:
+        """
+        Tokenize a text and return its token boundaries.
+
+        Args:
+            text: Text to tokenize
+
+        Returns:
+            TokenOffsets; boundaries inside a multi-byte character are left out
+        """
+        if not text:
+            return TokenOffsets(np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64))
+
+        if self.encoding is None:
+            return _approximate_offsets(text)
+
+        tokens = np.array(self.encoding.encode_ordinary(text), dtype=np.int64)
+        byte_ends = np.concatenate(([0], np.cumsum(self._byte_lengths()[tokens])))
+        token_counts = np.arange(len(byte_ends), dtype=np.int64)
+
+        if text.isascii():
+            return TokenOffsets(token_counts, byte_ends)
+
+        # Map byte offsets to character offsets, keeping only character boundaries
+        data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+        is_char_start = np.append((data & 0xC0) != 0x80, True)
+        chars_before = np.concatenate(([0], np.cumsum(is_char_start[:-1])))
+        keep = is_char_start[byte_ends]
+        return TokenOffsets(token_counts[keep], chars_before[byte_ends[keep]])
+
+    def count(self, text: str) -> int:
+        """Number of tokens in a text."""
+        if self.encoding is None:
+            return self.offsets(text).total_tokens
+        return len(self.encoding.encode_ordinary(text))
+
+
+def _approximate_offsets(text: str) -> TokenOffsets:
+    """
+    Token boundaries of the fallback tokenizer, computed with numpy.
+
+    Pieces are runs of up to 4 ASCII letters or 3 digits (with the single space
+    before them), up to 4 ASCII whitespace characters, and single other
+    characters, which mirrors the regex
+    ``" ?[A-Za-z]{1,4}| ?[0-9]{1,3}|[\\t-\\r\\x1c- ]{1,4}|."``. A piece counts as
+    one token, except a non-ASCII character, which counts as its UTF-8 length
+    (byte-level BPE never needs more tokens than bytes).
+
+    Returns:
+        TokenOffsets with a boundary after every piece
+    """
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    classes = np.where(codes < 128, _CHAR_CLASS[np.minimum(codes, 127)], _WIDE)
+
+    # Runs of one class (every other and non-ASCII character is a run of its own)
+    run_starts = np.flatnonzero(np.concatenate((
+        [True], (classes[1:] != classes[:-1]) | (classes[1:] == _OTHER) | (classes[1:] == _WIDE)
+    )))
+    run_lengths = np.diff(np.append(run_starts, len(codes)))
+    width = _PIECE_WIDTH[classes[run_starts]]
+
+    # Split runs into pieces of at most their class width
+    pieces = -(-run_lengths // width)
+    first_piece = np.repeat(np.cumsum(pieces) - pieces, pieces)
+    piece_run = np.repeat(np.arange(len(run_starts)), pieces)
+    k = np.arange(len(piece_run)) - first_piece + 1
+    ends = np.minimum(run_starts[piece_run] + k * width[piece_run], run_starts[piece_run] + run_lengths[piece_run])
+
+    # A single space joins the word or number that follows it
+    single_space = (run_lengths[:-1] == 1) & (codes[run_starts[:-1]] == 32) & (
+        (classes[run_starts[1:]] == _LETTER) | (classes[run_starts[1:]] == _DIGIT)
+    )
+    keep = np.ones(len(codes) + 1, dtype=bool)
+    keep[run_starts[:-1][single_space] + 1] = False
+    ends = ends[keep[ends]]
+
+    # Pieces ending in a non-ASCII character are that single character
+    last = codes[ends - 1]
+    weights = 1 + (last >= 0x80).astype(np.int64) + (last >= 0x800) + (last >= 0x10000)
+    return TokenOffsets(np.concatenate(([0], np.cumsum(weights))), np.concatenate(([0], ends)))
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(encoding_name: str = DEFAULT_ENCODING) -> Tokenizer:
+    """Get a shared tokenizer for an encoding."""
+    return Tokenizer(encoding_name)
@@ -14,6 +14,7 @@ from .collectors.application_metrics_collector import ApplicationMetricsCollecto
 from .collectors.ai_metrics_collector import AIMetricsCollector
 from .collectors.scraping_metrics_collector import ScrapingMetricsCollector
 from .collectors.rule_evaluation_metrics_collector import RuleEvaluationMetricsCollector
+from .collectors.milvus_pool_metrics_collector import MilvusPoolMetricsCollector
 from .exporters.prometheus_exporter import PrometheusExporter
 from .loggers.structured_logger import StructuredLogger
 from .health.health_checker import HealthChecker
@@ -44,6 +45,7 @@ __all__ = [
     'AIMetricsCollector',
     'ScrapingMetricsCollector',
     'RuleEvaluationMetricsCollector',
+    'MilvusPoolMetricsCollector',
     'PrometheusExporter',
     'StructuredLogger',
     'HealthChecker',
@@ -0,0 +1,56 @@
+"""
+Milvus Pool Metrics Collector - Single Responsibility
+Collects Milvus client pool utilisation, checkout wait and retry metrics.
+"""
+from typing import Dict, Any, Optional
+from ..interfaces.metrics_interface import IMetricsCollector
+
+
+class MilvusPoolMetricsCollector(IMetricsCollector):
+    """Collects metrics of the Milvus client pool (db.milvus_pool)."""
+
+    def __init__(self):
+        """Initialize Milvus pool metrics collector."""
+        self._metric_names = [
+            'milvus_pool_size',
+            'milvus_pool_in_use',
+            'milvus_pool_utilization',
+            'milvus_pool_wait_seconds',
+            'milvus_pool_wait_avg_seconds',
+            'milvus_call_retries_total',
+            'milvus_pool_replaced_clients',
+        ]
+        self._pool = None
+        self._last_wait = 0.0
+
+    def collect(self) -> Dict[str, Any]:
+        """
+        Collect Milvus pool metrics.
+
+        Returns:
+            Dictionary of metric names and values ({} until a pool is registered)
+        """
+        if self._pool is None:
+            return {}
+        stats = self._pool.stats()
+        return {
+            'milvus_pool_size': stats['size'],
+            'milvus_pool_in_use': stats['in_use'],
+            'milvus_pool_utilization': stats['utilization'],
+            'milvus_pool_wait_seconds': self._last_wait,
+            'milvus_pool_wait_avg_seconds': stats['wait_seconds_avg'],
+            'milvus_call_retries_total': stats['retries'],
+            'milvus_pool_replaced_clients': stats['replaced'],
+        }
+
+    def get_metric_names(self) -> list:
+        """Get list of metric names."""
+        return self._metric_names.copy()
+
+    def set_pool(self, pool: Optional[Any]) -> None:
+        """Set the pool whose stats() are collected."""
+        self._pool = pool
+
+    def record_wait(self, wait_seconds: float) -> None:
+        """Record how long a checkout waited for a free client."""
+        self._last_wait = wait_seconds
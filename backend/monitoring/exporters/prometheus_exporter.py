@@ -46,6 +46,20 @@ class PrometheusExporter(IMetricsExporter):
                                            ['operation']),
             'vector_search_count': Counter('vector_searches_total', 'Total vector searches',
                                           ['operation', 'status']),
+
+            # Milvus client pool metrics
+            'milvus_pool_size': Gauge('milvus_pool_size', 'Maximum number of pooled Milvus clients'),
+            'milvus_pool_in_use': Gauge('milvus_pool_in_use', 'Milvus clients currently checked out'),
+            'milvus_pool_utilization': Gauge('milvus_pool_utilization',
+                                             'Share of pooled Milvus clients checked out (0-1)'),
+            'milvus_pool_wait': Histogram('milvus_pool_wait_seconds', 'Time waited for a free Milvus client',
+                                          buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)),
+            'milvus_pool_wait_avg': Gauge('milvus_pool_wait_avg_seconds',
+                                          'Average time waited for a free Milvus client'),
+            'milvus_call_retries': Counter('milvus_call_retries_total',
+                                           'Milvus calls retried after a transient error', ['operation']),
+            'milvus_pool_replaced_clients': Gauge('milvus_pool_replaced_clients',
+                                                  'Pooled Milvus clients replaced after failed health checks or calls'),
             
             # Health metrics
             'health_status': Gauge('health_check_status', 'Health check status (1=healthy, 0=unhealthy)',
@@ -136,6 +150,15 @@ class PrometheusExporter(IMetricsExporter):
         if 'http_requests_active' in metrics:
             self._prometheus_metrics['active_requests'].set(metrics['http_requests_active'])
 
+        # Milvus client pool metrics (wait histogram and retry counter are recorded directly)
+        for name in ('milvus_pool_size', 'milvus_pool_in_use', 'milvus_pool_utilization'):
+            if name in metrics:
+                self._prometheus_metrics[name].set(metrics[name])
+        if 'milvus_pool_wait_avg_seconds' in metrics:
+            self._prometheus_metrics['milvus_pool_wait_avg'].set(metrics['milvus_pool_wait_avg_seconds'])
+        if 'milvus_pool_replaced_clients' in metrics:
+            self._prometheus_metrics['milvus_pool_replaced_clients'].set(metrics['milvus_pool_replaced_clients'])
+
         # Scraping metrics
         if 'scraping_missed_iterations_total' in metrics:
             # Note: Counters can't be set, they need to be incremented
@@ -10,6 +10,7 @@ from ..collectors.application_metrics_collector import ApplicationMetricsCollect
 from ..collectors.ai_metrics_collector import AIMetricsCollector
 from ..collectors.scraping_metrics_collector import ScrapingMetricsCollector
 from ..collectors.rule_evaluation_metrics_collector import RuleEvaluationMetricsCollector
+from ..collectors.milvus_pool_metrics_collector import MilvusPoolMetricsCollector
 from ..exporters.prometheus_exporter import PrometheusExporter
 from ..loggers.structured_logger import StructuredLogger
 from ..health.health_checker import HealthChecker
@@ -34,6 +35,7 @@ class MonitoringService:
         self._ai_collector = AIMetricsCollector()
         self._scraping_collector = ScrapingMetricsCollector()
         self._rule_evaluation_collector = RuleEvaluationMetricsCollector()
+        self._milvus_pool_collector = MilvusPoolMetricsCollector()
 
         # Initialize exporter
         self._exporter = PrometheusExporter()
@@ -42,6 +44,7 @@ class MonitoringService:
         self._exporter.register_collector(self._ai_collector)
         self._exporter.register_collector(self._scraping_collector)
         self._exporter.register_collector(self._rule_evaluation_collector)
+        self._exporter.register_collector(self._milvus_pool_collector)
 
         # Initialize loggers
         self._app_logger = StructuredLogger('app', enable_json_logging)
@@ -81,6 +84,26 @@ class MonitoringService:
         """Record a vector search event."""
         self._ai_collector.record_vector_search(duration, results_count)
 
+    # Milvus client pool metrics methods
+    def register_milvus_pool(self, pool) -> None:
+        """Export the metrics of a Milvus client pool (db.milvus_pool.MilvusClientPool)."""
+        self._milvus_pool_collector.set_pool(pool)
+        pool.on_wait = self.record_milvus_pool_wait
+        pool.on_retry = self.record_milvus_retry
+
+    def record_milvus_pool_wait(self, wait_seconds: float) -> None:
+        """Record how long a Milvus call waited for a pooled client."""
+        self._milvus_pool_collector.record_wait(wait_seconds)
+        metric = self._exporter.get_metric('milvus_pool_wait')
+        if metric:
+            metric.observe(wait_seconds)
+
+    def record_milvus_retry(self, operation: str) -> None:
+        """Record a Milvus call retried after a transient error."""
+        metric = self._exporter.get_metric('milvus_call_retries')
+        if metric:
+            metric.labels(operation=operation).inc()
+
     # Scraping/Ingestion metrics methods
     def record_missed_iteration(self, count: int = 1) -> None:
         """Record one or more missed scraping iterations."""
@@ -236,6 +259,11 @@ class MonitoringService:
         """Get rule evaluation metrics collector."""
         return self._rule_evaluation_collector
 
+    @property
+    def milvus_pool_collector(self) -> MilvusPoolMetricsCollector:
+        """Get Milvus client pool metrics collector."""
+        return self._milvus_pool_collector
+
     @property
     def exporter(self) -> PrometheusExporter:
         """Get metrics exporter."""
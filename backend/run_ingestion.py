@@ -113,10 +113,14 @@ def main():
 
         if use_openai:
             logger.info("   Using OpenAI embeddings (text-embedding-ada-002)")
-            llm_service = LLMService(use_openai=True)
+            llm_service = LLMService(use_openai=True, embedding_dimensions=config.EMBEDDING_DIMENSIONS)
         else:
             logger.info(f"   Using SentenceTransformer: {config.EMBEDDING_MODEL}")
-            llm_service = LLMService(model_name=config.EMBEDDING_MODEL, use_openai=False)
+            llm_service = LLMService(
+                model_name=config.EMBEDDING_MODEL,
+                use_openai=False,
+                embedding_dimensions=config.EMBEDDING_DIMENSIONS
+            )
 
         logger.info(f"   Embedding dimension: {llm_service.get_dimension()}")
 
@@ -14,6 +14,7 @@ sys.path.insert(0, str(project_root))
 
 from backend.services.github_service import GitHubService
 from backend.utils.logger import get_logger
+from backend.utils.github_rate_limiter import PRIORITY_BACKGROUND
 
 logger = get_logger(__name__)
 
@@ -91,7 +92,7 @@ def main():
         logger.info("Using GitHub token for authentication")
 
     # Initialize GitHub service
-    github_service = GitHubService(token=github_token)
+    github_service = GitHubService(token=github_token, priority=PRIORITY_BACKGROUND)
 
     # Search parameters
     organization = "wso2"
@@ -129,6 +130,11 @@ def main():
         successful = 0
         failed = 0
 
+        # Fetch all READMEs up front (a few GraphQL queries when GITHUB_API_BACKEND=graphql)
+        fetched = github_service.get_readme_contents_batch(
+            [(repo['owner'], repo['name']) for repo in repositories]
+        )
+
         for i, repo in enumerate(repositories, 1):
             repo_name = repo['name']
             repo_owner = repo['owner']
@@ -136,7 +142,7 @@ def main():
             print(f"\n[{i}/{len(repositories)}] Fetching README for: {repo_name}")
 
             try:
-                readme = github_service.get_readme_content(repo_owner, repo_name)
+                readme = fetched.get(f"{repo_owner}/{repo_name}")
 
                 if readme:
                     # Save README to file
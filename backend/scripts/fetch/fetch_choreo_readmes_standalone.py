@@ -28,7 +28,15 @@ class SimpleLogger:
 
 
 logger = SimpleLogger()
-API_CALL_DELAY = 0.1
+API_CALL_DELAY = 0.1  # Fallback delay when the shared rate limiter is unavailable
+
+# Share GitHub quota with the backend clients when the backend package is importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+try:
+    from backend.utils.github_rate_limiter import get_rate_limiter, bucket_for_url
+    rate_limiter = get_rate_limiter()
+except ImportError:
+    rate_limiter = None
 
 
 class GitHubService:
@@ -44,8 +52,14 @@ class GitHubService:
     def _make_request(self, url: str) -> Optional[Dict[str, Any]]:
         """Make a GET request to GitHub API."""
         try:
-            time.sleep(API_CALL_DELAY)
+            bucket = bucket_for_url(url) if rate_limiter else None
+            if rate_limiter:
+                rate_limiter.acquire(bucket)
+            else:
+                time.sleep(API_CALL_DELAY)
             response = requests.get(url, headers=self.headers)
+            if rate_limiter:
+                rate_limiter.update_from_headers(response.headers, bucket)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -1,14 +1,22 @@
 """
-Script to ingest README files from Choreo repositories into Pinecone.
+Script to ingest README files from Choreo repositories into Milvus.
 This script:
 1. Reads all downloaded README files
 2. Chunks them into manageable pieces
-3. Generates embeddings using Azure OpenAI
-4. Stores them in the existing Pinecone index (choreo-ai-assistant-v2)
+3. Generates embeddings using Azure OpenAI as float32 arrays
+4. Stages them as columnar batch files and bulk-loads them into Milvus
+
+Usage:
+    python backend/scripts/ingest/ingest_choreo_readmes.py
+
+    # Import the staged files server-side into an empty collection
+    # (the staging directory must be visible to Milvus as --remote-dir):
+    python backend/scripts/ingest/ingest_choreo_readmes.py --bulk-insert --staging-dir /mnt/milvus/bulk --remote-dir bulk
 """
 import os
 import sys
 import json
+import argparse
 from pathlib import Path
 from typing import List, Dict, Any
 from datetime import datetime
@@ -19,9 +27,11 @@ sys.path.insert(0, str(project_root))
 
 from backend.utils.chunking import chunk_markdown, DEFAULT_MIN_CHUNK_CHARS, DEFAULT_MAX_CHUNK_CHARS, DEFAULT_OVERLAP_CHARS
 from backend.services.llm_service import LLMService
-from backend.db.vector_client import VectorClient
+from backend.db.vector_backend import create_vector_client
+from backend.db.bulk_loader import MilvusBulkLoader, MODE_BULK_INSERT, MODE_UPSERT
 from backend.utils.logger import get_logger
-from backend.utils.config import Config
+from backend.utils.config import load_config
+from backend.utils.source_types import SOURCE_TYPE_DOCS
 
 logger = get_logger(__name__)
 
@@ -121,6 +131,7 @@ def chunk_readme_files(readme_files: List[Dict[str, Any]]) -> List[Dict[str, Any
                 'stars': repo_metadata.get('stars', 0),
                 'forks': repo_metadata.get('forks', 0),
                 'source': 'choreo_org_repositories',
+                'source_type': SOURCE_TYPE_DOCS,
                 'file_type': 'readme',
                 'chunk_index': i,
                 'total_chunks': len(chunks),
@@ -135,11 +146,11 @@ def chunk_readme_files(readme_files: List[Dict[str, Any]]) -> List[Dict[str, Any
     return all_chunks
 
 
-def generate_embeddings_batch(chunks: List[Dict[str, Any]], llm_service: LLMService, batch_size: int = 50) -> List[Dict[str, Any]]:
-    """Generate embeddings for chunks in batches."""
+def generate_embeddings_batch(chunks: List[Dict[str, Any]], llm_service: LLMService, loader: MilvusBulkLoader, batch_size: int = 50) -> int:
+    """Generate embeddings for chunks in batches and stage them in the bulk loader."""
     logger.info(f"Generating embeddings for {len(chunks)} chunks...")
 
-    items_with_embeddings = []
+    total_embedded = 0
 
     for i in range(0, len(chunks), batch_size):
         batch = chunks[i:i + batch_size]
@@ -148,16 +159,10 @@ def generate_embeddings_batch(chunks: List[Dict[str, Any]], llm_service: LLMServ
         logger.info(f"Processing batch {i//batch_size + 1}/{(len(chunks)-1)//batch_size + 1} ({len(batch)} chunks)")
 
         try:
-            # Generate embeddings for the batch
-            embeddings = llm_service.get_embeddings(batch_texts)
-
-            # Combine chunks with their embeddings
-            for chunk, embedding in zip(batch, embeddings):
-                items_with_embeddings.append({
-                    'content': chunk['content'],
-                    'vector': embedding,
-                    'metadata': chunk['metadata']
-                })
+            # Embeddings stay a float32 matrix until Milvus reads them
+            embeddings = llm_service.get_embeddings_array(batch_texts)
+            loader.add(batch_texts, embeddings, [chunk['metadata'] for chunk in batch])
+            total_embedded += len(embeddings)
 
             logger.info(f"Generated {len(embeddings)} embeddings")
 
@@ -165,36 +170,29 @@ def generate_embeddings_batch(chunks: List[Dict[str, Any]], llm_service: LLMServ
             logger.error(f"Error generating embeddings for batch: {e}")
             raise
 
-    logger.info(f"Total embeddings generated: {len(items_with_embeddings)}")
-    return items_with_embeddings
-
-
-def store_in_pinecone(items: List[Dict[str, Any]], vector_client: VectorClient, batch_size: int = 100):
-    """Store embeddings in Pinecone database."""
-    logger.info(f"Storing {len(items)} embeddings in Pinecone...")
-
-    total_stored = 0
-
-    for i in range(0, len(items), batch_size):
-        batch = items[i:i + batch_size]
-
-        logger.info(f"Storing batch {i//batch_size + 1}/{(len(items)-1)//batch_size + 1} ({len(batch)} items)")
-
-        try:
-            vector_client.insert_embeddings_batch(batch)
-            total_stored += len(batch)
-            logger.info(f"Stored {total_stored}/{len(items)} embeddings")
-
-        except Exception as e:
-            logger.error(f"Error storing batch in Pinecone: {e}")
-            raise
-
-    logger.info(f"Successfully stored all {total_stored} embeddings in Pinecone")
-    return total_stored
+    logger.info(f"Total embeddings generated: {total_embedded}")
+    return total_embedded
 
 
 def main():
     """Main ingestion pipeline."""
+    parser = argparse.ArgumentParser(description="Ingest downloaded Choreo READMEs into Milvus")
+    parser.add_argument(
+        "--staging-dir",
+        default=None,
+        help="Directory for staged batch files (default: a temporary directory)"
+    )
+    parser.add_argument(
+        "--bulk-insert",
+        action="store_true",
+        help="Import staged parquet files with Milvus bulk insert instead of upserting them (empty collections only)"
+    )
+    parser.add_argument(
+        "--remote-dir",
+        default=None,
+        help="Path of the staging directory as seen by Milvus (with --bulk-insert)"
+    )
+    args = parser.parse_args()
 
     print("=" * 80)
     print("📚 Choreo README Ingestion Pipeline")
@@ -227,42 +225,45 @@ def main():
 
         # Step 3: Initialize services
         print("🔧 Step 3: Initializing services...")
-        config = Config()
+        config = load_config()
 
         # Initialize LLM service for embeddings
         llm_service = LLMService(
             use_openai=True,
-            endpoint=config.azure_openai_endpoint,
-            api_key=config.azure_openai_api_key,
-            api_version=config.azure_openai_api_version,
-            deployment=config.azure_openai_chat_deployment
-        )
-        llm_service.set_embeddings_deployment(config.azure_openai_embeddings_deployment)
-
-        # Initialize Pinecone vector client
-        vector_client = VectorClient(
-            api_key=config.pinecone_api_key,
-            index_name=config.pinecone_index_name,
-            dimension=config.pinecone_dimension,
-            cloud=config.pinecone_cloud,
-            region=config.pinecone_region
+            endpoint=config["AZURE_OPENAI_ENDPOINT"],
+            api_key=config["AZURE_OPENAI_KEY"],
+            api_version=config["AZURE_OPENAI_API_VERSION"],
+            deployment=config["AZURE_OPENAI_DEPLOYMENT"],
+            embedding_dimensions=config.get("EMBEDDING_DIMENSIONS")
         )
+        llm_service.set_embeddings_deployment(config["AZURE_OPENAI_EMBEDDINGS_DEPLOYMENT"])
+
+        # Initialize the vector client (Milvus, or the local backend with VECTOR_BACKEND=local)
+        vector_client = create_vector_client(config, replicate=False)
+        loader = MilvusBulkLoader(vector_client, staging_dir=args.staging_dir)
 
         print(f"✅ Services initialized")
-        print(f"   - Pinecone Index: {config.pinecone_index_name}")
-        print(f"   - Embedding Model: {config.azure_openai_embeddings_deployment}")
-        print(f"   - Dimension: {config.pinecone_dimension}")
+        print(f"   - Milvus Collection: {config['MILVUS_COLLECTION_NAME']}")
+        print(f"   - Embedding Model: {config['AZURE_OPENAI_EMBEDDINGS_DEPLOYMENT']}")
+        print(f"   - Dimension: {config['MILVUS_DIMENSION']}")
+        print(f"   - Staging: {loader.staging_dir} ({loader.file_format})")
         print()
 
         # Step 4: Generate embeddings
         print("🧮 Step 4: Generating embeddings...")
-        items_with_embeddings = generate_embeddings_batch(chunks, llm_service, batch_size=50)
-        print(f"✅ Generated {len(items_with_embeddings)} embeddings")
+        total_embedded = generate_embeddings_batch(chunks, llm_service, loader, batch_size=50)
+        print(f"✅ Generated {total_embedded} embeddings")
         print()
 
-        # Step 5: Store in Pinecone
-        print("💾 Step 5: Storing in Pinecone...")
-        total_stored = store_in_pinecone(items_with_embeddings, vector_client, batch_size=100)
+        # Step 5: Load the staged batches into Milvus
+        print("💾 Step 5: Loading into Milvus...")
+        try:
+            total_stored = loader.load(
+                mode=MODE_BULK_INSERT if args.bulk_insert else MODE_UPSERT,
+                remote_dir=args.remote_dir
+            )
+        finally:
+            loader.cleanup()
         print(f"✅ Stored {total_stored} embeddings")
         print()
 
@@ -272,15 +273,15 @@ def main():
         print("=" * 80)
         print(f"README files processed: {len(readme_files)}")
         print(f"Chunks created: {len(chunks)}")
-        print(f"Embeddings generated: {len(items_with_embeddings)}")
-        print(f"Embeddings stored in Pinecone: {total_stored}")
-        print(f"Pinecone index: {config.pinecone_index_name}")
+        print(f"Embeddings generated: {total_embedded}")
+        print(f"Embeddings stored in Milvus: {total_stored}")
+        print(f"Milvus collection: {config['MILVUS_COLLECTION_NAME']}")
         print("=" * 80)
         print()
         print("✅ Ingestion completed successfully!")
         print()
         print("🎯 Next steps:")
-        print("   - Your Choreo README embeddings are now searchable in Pinecone")
+        print("   - Your Choreo README embeddings are now searchable in Milvus")
         print("   - You can query them using the RAG system")
         print("   - The embeddings include metadata about each repository")
 
@@ -9,8 +9,7 @@ This script:
 import os
 import sys
 import json
-import re
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any
 from datetime import datetime
 from pathlib import Path
 
@@ -25,133 +24,16 @@ except ImportError:
     pass
 
 
-# ============================================================================
-# CHUNKING UTILITIES (from backend/utils/chunking.py)
-# ============================================================================
-
-DEFAULT_MIN_CHUNK_CHARS = 1000
-DEFAULT_MAX_CHUNK_CHARS = 4000
-DEFAULT_OVERLAP_CHARS = 200
-
-HEADER_RE = re.compile(r"^(#{1,6})\s+(.+)$", re.MULTILINE)
-CODE_FENCE_RE = re.compile(r"^```.*$", re.MULTILINE)
-
-
-def _find_code_fence_ranges(text: str) -> List[Tuple[int, int]]:
-    """Find all code block ranges in the text."""
-    ranges: List[Tuple[int, int]] = []
-    positions = [m.start() for m in CODE_FENCE_RE.finditer(text)]
-
-    for i in range(0, len(positions) - 1, 2):
-        start = positions[i]
-        end_pos = text.find("\n", positions[i + 1])
-        end = len(text) if end_pos == -1 else end_pos + 1
-        ranges.append((start, end))
-
-    return ranges
-
-
-def _inside_any_range(idx: int, ranges: List[Tuple[int, int]]) -> bool:
-    """Check if index falls within any of the given ranges."""
-    return any(start <= idx < end for start, end in ranges)
-
-
-def _safe_split_before(text: str, limit: int, code_ranges: List[Tuple[int, int]]) -> int:
-    """Find a safe split position before limit, avoiding code blocks."""
-    pos = text.rfind("\n\n", 0, limit)
-    while pos != -1 and _inside_any_range(pos, code_ranges):
-        pos = text.rfind("\n\n", 0, pos)
-    if pos != -1 and pos > 0:
-        return pos + 2
-
-    pos = text.rfind("\n", 0, limit)
-    while pos != -1 and _inside_any_range(pos, code_ranges):
-        pos = text.rfind("\n", 0, pos)
-
-    return limit if pos <= 0 else pos + 1
-
-
-def _extract_sections(content: str) -> List[Tuple[str, str]]:
-    """Split markdown content into sections based on headers."""
-    sections: List[Tuple[str, str]] = []
-    matches = list(HEADER_RE.finditer(content))
-
-    if not matches:
-        return [("", content)]
-
-    first_match = matches[0]
-    if first_match.start() > 0:
-        preamble = content[:first_match.start()]
-        sections.append(("", preamble))
-
-    for i, match in enumerate(matches):
-        title = match.group(2).strip()
-        start = match.start()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
-        section_content = content[start:end]
-        sections.append((title, section_content))
-
-    return sections
-
-
-def chunk_markdown(content: str, min_chunk_chars: int = DEFAULT_MIN_CHUNK_CHARS,
-                   max_chunk_chars: int = DEFAULT_MAX_CHUNK_CHARS,
-                   overlap_chars: int = DEFAULT_OVERLAP_CHARS,
-                   file_path: str = "README.md") -> List[Dict]:
-    """Chunk markdown content while respecting structure."""
-    code_ranges = _find_code_fence_ranges(content)
-    sections = _extract_sections(content)
-
-    chunks: List[Dict] = []
-
-    for section_title, section_text in sections:
-        section_len = len(section_text)
-
-        if section_len <= max_chunk_chars:
-            if section_text.strip():
-                chunks.append({
-                    "content": section_text.strip(),
-                    "section_title": section_title,
-                    "file_path": file_path,
-                })
-            continue
-
-        start = 0
-        while start < section_len:
-            limit = min(start + max_chunk_chars, section_len)
-            end = _safe_split_before(section_text, limit, code_ranges)
-
-            if end <= start:
-                end = limit
-
-            piece = section_text[start:end].strip()
-            if piece:
-                chunks.append({
-                    "content": piece,
-                    "section_title": section_title,
-                    "file_path": file_path,
-                })
-
-            if end >= section_len:
-                break
-
-            start = max(0, end - overlap_chars)
-
-    merged: List[Dict] = []
-    for chunk in chunks:
-        if merged and len(chunk["content"]) < min_chunk_chars:
-            prev_chunk = merged[-1]
-            combined_len = len(prev_chunk["content"]) + len(chunk["content"])
-
-            if combined_len <= max_chunk_chars + overlap_chars:
-                prev_chunk["content"] = (
-                    prev_chunk["content"].rstrip() + "\n\n" + chunk["content"]
-                ).strip()
-                continue
-
-        merged.append(chunk)
-
-    return merged
+# Shared markdown chunking engine (light module, no backend services needed)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+from backend.utils.chunking import (
+    chunk_markdown,
+    DEFAULT_MIN_CHUNK_CHARS,
+    DEFAULT_MAX_CHUNK_CHARS,
+    DEFAULT_OVERLAP_CHARS,
+)
+from backend.utils.embedding_dimensions import embedding_request_options
+from backend.utils.source_types import SOURCE_TYPE_DOCS
 
 
 # ============================================================================
@@ -246,6 +128,7 @@ def chunk_readme_files(readme_files: List[Dict[str, Any]]) -> List[Dict[str, Any
                 'stars': int(repo_metadata.get('stars', 0)),
                 'forks': int(repo_metadata.get('forks', 0)),
                 'source': 'choreo_org_repositories',
+                'source_type': SOURCE_TYPE_DOCS,
                 'file_type': 'readme',
                 'chunk_index': i,
                 'total_chunks': len(chunks),
@@ -301,7 +184,8 @@ def generate_embeddings_with_azure(chunks: List[Dict[str, Any]], batch_size: int
         try:
             response = client.embeddings.create(
                 input=batch_texts,
-                model=embeddings_deployment
+                model=embeddings_deployment,
+                **embedding_request_options(int(os.getenv("EMBEDDING_DIMENSIONS", "0")) or None)
             )
 
             embeddings = [item.embedding for item in response.data]
@@ -333,7 +217,7 @@ def store_in_milvus(items: List[Dict[str, Any]], batch_size: int = 100):
     uri = os.getenv("MILVUS_URI")
     token = os.getenv("MILVUS_TOKEN")
     collection_name = os.getenv("MILVUS_COLLECTION_NAME", "readme_embeddings")
-    dimension = int(os.getenv("MILVUS_DIMENSION", "1536"))
+    dimension = int(os.getenv("MILVUS_DIMENSION") or os.getenv("EMBEDDING_DIMENSIONS") or "1536")
 
     if not uri or not token:
         raise ValueError("MILVUS_URI and MILVUS_TOKEN not found in .env file")
@@ -28,9 +28,10 @@ sys.path.insert(0, str(project_root))
 from backend.services.github_service import GitHubService
 from backend.services.llm_service import LLMService
 from backend.services.ingestion import IngestionService, start_keyboard_monitor
-from backend.db.vector_client import VectorClient
+from backend.db.vector_backend import create_vector_client
 from backend.utils.config import load_config
 from backend.utils.logger import get_logger
+from backend.utils.github_rate_limiter import PRIORITY_BACKGROUND
 
 logger = get_logger(__name__)
 
@@ -58,6 +59,17 @@ def main():
         default=None,
         help="Maximum number of repositories to process (default: all)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of repositories to ingest in parallel (default: INGESTION_MAX_WORKERS or 4)"
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignore the checkpoint journal and start the sweep from scratch"
+    )
 
     args = parser.parse_args()
 
@@ -67,6 +79,7 @@ def main():
     logger.info(f"Organization: {args.org}")
     logger.info(f"Keyword filter: {args.keyword}")
     logger.info(f"Max repositories: {args.max_repos or 'All'}")
+    logger.info(f"Parallel workers: {args.workers or 'default'}")
     logger.info("=" * 80)
 
     # Start keyboard monitor for manual skip feature
@@ -110,15 +123,9 @@ def main():
     logger.info("\nInitializing services...")
 
     try:
-        # Initialize Vector Client (Milvus)
-        vector_client = VectorClient(
-            uri=config["MILVUS_URI"],
-            token=config["MILVUS_TOKEN"],
-            collection_name=config["MILVUS_COLLECTION_NAME"],
-            dimension=config.get("MILVUS_DIMENSION", 1536),
-            metric=config.get("MILVUS_METRIC", "COSINE")
-        )
-        logger.info("✓ Milvus client initialized")
+        # Initialize Vector Client (Milvus, or the local backend with VECTOR_BACKEND=local)
+        vector_client = create_vector_client(config, replicate=False)
+        logger.info(f"✓ Vector client initialized ({config['VECTOR_BACKEND']})")
 
         # Initialize LLM Service (Azure OpenAI)
         llm_service = LLMService(
@@ -126,6 +133,7 @@ def main():
             api_key=config["AZURE_OPENAI_KEY"],
             deployment=config["AZURE_OPENAI_DEPLOYMENT"],
             api_version=config.get("AZURE_OPENAI_API_VERSION") or "2024-02-15-preview",
+            embedding_dimensions=config.get("EMBEDDING_DIMENSIONS"),
         )
 
         # Set embeddings deployment if provided
@@ -135,7 +143,7 @@ def main():
         logger.info("✓ Azure OpenAI service initialized")
 
         # Initialize GitHub Service
-        github_service = GitHubService(token=config.get("GITHUB_TOKEN"))
+        github_service = GitHubService(token=config.get("GITHUB_TOKEN"), priority=PRIORITY_BACKGROUND)
         logger.info("✓ GitHub service initialized")
 
         # Initialize Ingestion Service
@@ -147,6 +155,10 @@ def main():
         )
         logger.info("✓ Ingestion service initialized")
 
+        if args.fresh and ingestion_service.checkpoint:
+            ingestion_service.checkpoint.reset()
+            logger.info("✓ Checkpoint journal cleared")
+
     except Exception as e:
         logger.error(f"Failed to initialize services: {e}")
         sys.exit(1)
@@ -168,7 +180,9 @@ def main():
         result = ingestion_service.ingest_org_repositories(
             org=args.org,
             keyword=args.keyword,
-            max_repos=args.max_repos
+            max_repos=args.max_repos,
+            max_workers=args.workers,
+            resume=not args.fresh
         )
 
         # Display results
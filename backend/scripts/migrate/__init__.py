@@ -0,0 +1,5 @@
+"""
+Migration Scripts
+
+Scripts for moving existing vector database collections onto a new schema.
+"""
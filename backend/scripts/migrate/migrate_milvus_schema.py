@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Migrate a Milvus collection from dynamic metadata fields to the typed schema.
+
+Copies every row (with its vector) into '<collection>_typed', which has typed
+scalar fields, scalar indexes and the configured vector index, then renames
+the original to '<collection>_legacy' and points '<collection>' at the new
+collection with an alias. Searches keep using the original until the switch;
+pause ingestion while the copy runs.
+
+Usage:
+    python backend/scripts/migrate/migrate_milvus_schema.py
+    python backend/scripts/migrate/migrate_milvus_schema.py --collection github_issues --drop-legacy
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.db.milvus_schema import CollectionSpec, MilvusSchemaManager
+from backend.utils.config import load_config
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def main():
+    """Migrate one collection."""
+    parser = argparse.ArgumentParser(description="Migrate a Milvus collection to the typed schema")
+    parser.add_argument(
+        "--collection",
+        type=str,
+        default=None,
+        help="Collection to migrate (default: MILVUS_COLLECTION_NAME)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Rows per copy batch (default: 1000)"
+    )
+    parser.add_argument(
+        "--drop-legacy",
+        action="store_true",
+        help="Drop the original collection after the switch"
+    )
+    args = parser.parse_args()
+
+    config = load_config()
+    if not config.get("MILVUS_URI"):
+        logger.error("MILVUS_URI is not configured")
+        sys.exit(1)
+
+    from pymilvus import MilvusClient
+
+    client = MilvusClient(uri=config["MILVUS_URI"], token=config["MILVUS_TOKEN"])
+    collection_name = args.collection or config["MILVUS_COLLECTION_NAME"]
+    if not client.has_collection(collection_name=collection_name):
+        logger.error(f"Collection '{collection_name}' does not exist")
+        sys.exit(1)
+
+    spec = CollectionSpec.from_env(dimension=config["MILVUS_DIMENSION"], metric=config["MILVUS_METRIC"])
+    manager = MilvusSchemaManager(client, spec)
+
+    logger.info(f"Migrating '{collection_name}' ({spec.index_type}, partition key: {spec.partition_key or 'none'})")
+    target = manager.migrate(collection_name, batch_size=args.batch_size, drop_legacy=args.drop_legacy)
+    logger.info(f"✓ '{collection_name}' is served by '{target}'")
+
+
+if __name__ == "__main__":
+    main()
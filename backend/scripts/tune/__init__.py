@@ -0,0 +1,5 @@
+"""
+Tuning Scripts
+
+Scripts for measuring and tuning vector search performance.
+"""
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark vector quantization on the collection's own vectors.
+
+Samples a snapshot of the collection and reports memory, latency and
+recall@k against exact float32 search for:
+
+- the local store options (utils.quantization): float16 and int8 scalar
+  quantization, each without and with full-precision rescoring of the best
+  k * factor candidates;
+- optionally, Milvus indexes (--milvus-indexes, e.g. HNSW,IVF_SQ8,IVF_PQ),
+  each built on a temporary copy of the snapshot and swept over its search
+  parameter the way scripts/tune/tune_search_params.py does.
+
+Queries are real questions (one per line in --queries-file, embedded with
+the configured Azure OpenAI deployment) or, without a file, vectors sampled
+from the snapshot (their own row is excluded from both result lists).
+
+Usage:
+    python backend/scripts/tune/benchmark_quantization.py
+    python backend/scripts/tune/benchmark_quantization.py --sample-size 50000 --rescore-factors 1,4
+    python backend/scripts/tune/benchmark_quantization.py --milvus-indexes HNSW,IVF_SQ8,IVF_PQ
+"""
+
+import sys
+import argparse
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.db.milvus_schema import CollectionSpec
+from backend.db.search_tuner import SWEEP_PARAMETERS, SearchTuner
+from backend.scripts.tune.tune_search_params import embed_queries
+from backend.utils.config import load_config
+from backend.utils.logger import get_logger
+from backend.utils.quantization import benchmark
+
+logger = get_logger(__name__)
+
+
+def index_bytes_per_vector(spec: CollectionSpec, index_type: str, vector_dtype: str) -> float:
+    """Approximate memory of one vector in a loaded Milvus index (raw vector plus index data)."""
+    dimension = spec.dimension
+    raw = dimension * (2 if vector_dtype == "float16" else 4)
+    if index_type == "HNSW":
+        return raw + spec.hnsw_m * 2 * 4  # Graph links (int32), layer 0 holds 2 * M
+    if index_type == "IVF_SQ8":
+        return dimension
+    if index_type == "IVF_PQ":
+        params = replace(spec, index_type="IVF_PQ", extra_index_params={}).vector_index_params()
+        return params["m"] * params["nbits"] / 8
+    return raw
+
+
+def main():
+    """Benchmark quantization options on a snapshot of one collection."""
+    parser = argparse.ArgumentParser(description="Benchmark vector quantization memory, latency and recall")
+    parser.add_argument("--collection", type=str, default=None,
+                        help="Collection to sample (default: MILVUS_COLLECTION_NAME)")
+    parser.add_argument("--queries-file", type=str, default=None,
+                        help="Real questions, one per line (default: sample vectors from the collection)")
+    parser.add_argument("--num-queries", type=int, default=100,
+                        help="Queries sampled from the collection without --queries-file (default: 100)")
+    parser.add_argument("--sample-size", type=int, default=100000,
+                        help="Rows in the snapshot (default: 100000)")
+    parser.add_argument("--k", type=int, default=10, help="Recall is measured at k (default: 10)")
+    parser.add_argument("--rescore-factors", type=str, default="1,2,4,8",
+                        help="Rescoring depths for the local variants, 1 = no rescoring (default: 1,2,4,8)")
+    parser.add_argument("--milvus-indexes", type=str, default="",
+                        help="Milvus index types to build on the snapshot, e.g. HNSW,IVF_SQ8,IVF_PQ (default: none)")
+    parser.add_argument("--milvus-dtype", type=str, default=None, choices=["float32", "float16"],
+                        help="Vector field type of the benchmark collections (default: the collection's)")
+    args = parser.parse_args()
+
+    config = load_config()
+    if not config.get("MILVUS_URI"):
+        logger.error("MILVUS_URI is not configured")
+        sys.exit(1)
+
+    from pymilvus import MilvusClient
+
+    client = MilvusClient(uri=config["MILVUS_URI"], token=config["MILVUS_TOKEN"])
+    collection_name = args.collection or config["MILVUS_COLLECTION_NAME"]
+    if not client.has_collection(collection_name=collection_name):
+        logger.error(f"Collection '{collection_name}' does not exist")
+        sys.exit(1)
+
+    spec = CollectionSpec.from_env(dimension=config["MILVUS_DIMENSION"], metric=config["MILVUS_METRIC"])
+    tuner = SearchTuner(client, collection_name, spec, k=args.k)
+    ids, vectors, _ = tuner.snapshot(args.sample_size)
+    if not len(ids):
+        logger.error(f"Collection '{collection_name}' is empty")
+        sys.exit(1)
+
+    rng = np.random.default_rng(0)
+    exclude_rows = None
+    if args.queries_file:
+        queries = tuner.schema.truncate_for_search(collection_name, embed_queries(config, args.queries_file))
+    else:
+        picks = rng.choice(len(ids), size=min(args.num_queries, len(ids)), replace=False)
+        queries = vectors[picks]
+        exclude_rows = picks.tolist()
+
+    metric = tuner.metric
+    if metric == "COSINE":
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+
+    logger.info(f"📏 Local quantization over {len(ids)} rows, {len(queries)} queries, recall@{args.k}")
+    rescore_factors = [int(factor) for factor in args.rescore_factors.split(",") if factor.strip()]
+    results = benchmark(vectors, queries, k=args.k, metric=metric, rescore_factors=rescore_factors,
+                        exclude_rows=exclude_rows)
+    baseline = results[0]
+    print(f"\n{'variant':<22} {'bytes/vec':>10} {'memory MB':>10} {'p50 ms':>8} {'p95 ms':>8} {'recall':>7} {'Δrecall':>8}")
+    for result in results:
+        variant = result["quantization"] + (f" x{result['rescore_factor']}" if result["rescore_factor"] > 1 else "")
+        print(
+            f"{variant:<22} {result['bytes_per_vector']:>10} {result['memory_mb']:>10.1f} "
+            f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['recall']:>7.3f} "
+            f"{result['recall'] - baseline['recall']:>+8.3f}"
+        )
+
+    index_types = [index_type.strip().upper() for index_type in args.milvus_indexes.split(",") if index_type.strip()]
+    if not index_types:
+        return
+
+    exclude_ids = [int(ids[row]) for row in exclude_rows] if exclude_rows is not None else None
+    ground_truth = tuner.exact_top_k(queries, ids, vectors, exclude_ids)
+    vector_dtype = args.milvus_dtype or tuner.schema.vector_dtype(collection_name)
+    for index_type in index_types:
+        name = f"{collection_name}_bench_{index_type.lower()}"
+        logger.info(f"📦 Building {index_type} ({vector_dtype}) on a copy of the snapshot")
+        tuner.build_snapshot_collection(ids, vectors, name=name, index_type=index_type, vector_dtype=vector_dtype)
+        try:
+            index_tuner = SearchTuner(client, name, spec, k=args.k)
+            param, _ = SWEEP_PARAMETERS[index_tuner.family]
+            sweep = index_tuner.sweep(name, queries, ground_truth, exclude_ids)
+        finally:
+            client.drop_collection(collection_name=name)
+
+        memory = index_bytes_per_vector(spec, index_type, vector_dtype)
+        print(f"\n{index_type} ({vector_dtype}), ~{memory:.0f} bytes/vector, ~{memory * len(ids) / 2 ** 20:.1f} MB")
+        for result in sweep:
+            print(
+                f"  {param}={result.value:<5} p50 {result.p50_ms:.1f} ms, p95 {result.p95_ms:.1f} ms, "
+                f"recall {result.recall:.3f} ({result.recall - baseline['recall']:+.3f})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tune Milvus search parameters for a target recall.
+
+Samples a snapshot of the collection, computes the exact top-k of each query
+by brute force, sweeps the index's search parameter (ef for HNSW, nprobe for
+IVF, level for AUTOINDEX) and writes the cheapest setting that reaches the
+target recall@k to backend/.env, where VectorClient picks it up as its
+default search profile.
+
+Queries are real questions (one per line in --queries-file, embedded with
+the configured Azure OpenAI deployment) or, without a file, vectors sampled
+from the collection.
+
+Usage:
+    python backend/scripts/tune/tune_search_params.py
+    python backend/scripts/tune/tune_search_params.py --queries-file questions.txt --target-recall 0.98
+    python backend/scripts/tune/tune_search_params.py --dry-run
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.db.milvus_schema import CollectionSpec
+from backend.db.search_tuner import SearchTuner, write_profile
+from backend.utils.config import load_config
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def embed_queries(config, queries_file: str):
+    """Embed the questions of a file (one per line) with the configured embeddings deployment."""
+    from backend.services.llm_service import LLMService
+
+    questions = [line.strip() for line in Path(queries_file).read_text(encoding="utf-8").splitlines() if line.strip()]
+    if not questions:
+        raise ValueError(f"No queries in {queries_file}")
+
+    llm_service = LLMService(
+        use_openai=True,
+        endpoint=config["AZURE_OPENAI_ENDPOINT"],
+        api_key=config["AZURE_OPENAI_KEY"],
+        api_version=config["AZURE_OPENAI_API_VERSION"],
+        deployment=config["AZURE_OPENAI_DEPLOYMENT"],
+        embedding_dimensions=config.get("EMBEDDING_DIMENSIONS")
+    )
+    llm_service.set_embeddings_deployment(config["AZURE_OPENAI_EMBEDDINGS_DEPLOYMENT"])
+    logger.info(f"Embedding {len(questions)} queries from {queries_file}")
+    return llm_service.get_embeddings_array(questions)
+
+
+def main():
+    """Tune one collection and write the chosen profile."""
+    parser = argparse.ArgumentParser(description="Tune Milvus search parameters for a target recall")
+    parser.add_argument("--collection", type=str, default=None,
+                        help="Collection to tune (default: MILVUS_COLLECTION_NAME)")
+    parser.add_argument("--queries-file", type=str, default=None,
+                        help="Real questions, one per line (default: sample vectors from the collection)")
+    parser.add_argument("--num-queries", type=int, default=100,
+                        help="Queries sampled from the collection without --queries-file (default: 100)")
+    parser.add_argument("--sample-size", type=int, default=100000,
+                        help="Rows in the snapshot used for exact results (default: 100000)")
+    parser.add_argument("--k", type=int, default=10, help="Recall is measured at k (default: 10)")
+    parser.add_argument("--target-recall", type=float, default=0.95,
+                        help="Mean recall@k to reach (default: 0.95)")
+    parser.add_argument("--env-file", type=str, default=str(project_root / "backend" / ".env"),
+                        help="Env file the profile is written to (default: backend/.env)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the profile without writing it")
+    args = parser.parse_args()
+
+    config = load_config()
+    if not config.get("MILVUS_URI"):
+        logger.error("MILVUS_URI is not configured")
+        sys.exit(1)
+
+    from pymilvus import MilvusClient
+
+    client = MilvusClient(uri=config["MILVUS_URI"], token=config["MILVUS_TOKEN"])
+    collection_name = args.collection or config["MILVUS_COLLECTION_NAME"]
+    if not client.has_collection(collection_name=collection_name):
+        logger.error(f"Collection '{collection_name}' does not exist")
+        sys.exit(1)
+
+    spec = CollectionSpec.from_env(dimension=config["MILVUS_DIMENSION"], metric=config["MILVUS_METRIC"])
+    tuner = SearchTuner(client, collection_name, spec, k=args.k, target_recall=args.target_recall)
+    query_vectors = embed_queries(config, args.queries_file) if args.queries_file else None
+
+    chosen, results = tuner.tune(query_vectors, num_queries=args.num_queries, sample_size=args.sample_size)
+    if chosen is None:
+        logger.error("No sweep results")
+        sys.exit(1)
+
+    profile = tuner.profile(chosen)
+    logger.info(
+        f"✓ Chosen {', '.join(f'{key}={value}' for key, value in profile.items())}: "
+        f"recall@{args.k} {chosen.recall:.3f}, p50 {chosen.p50_ms:.1f} ms, p95 {chosen.p95_ms:.1f} ms"
+    )
+    if args.dry_run:
+        logger.info("Dry run, profile not written")
+    else:
+        write_profile(args.env_file, profile)
+
+
+if __name__ == "__main__":
+    main()
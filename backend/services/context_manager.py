@@ -1,5 +1,6 @@
 from typing import Optional
 from .llm_service import LLMService
+from .retrieval_router import SearchScope
 from ..db.vector_client import VectorClient
 
 class ContextManager:
@@ -14,11 +15,20 @@ class ContextManager:
             vector = self.llm.get_embedding(text)
         self.vc.insert_embedding(text, vector)
 
-    def retrieve_context(self, vector, top_k=5):
-        return self.vc.query_similar(vector, top_k)
+    def retrieve_context(self, vector, top_k=5, scope: Optional[SearchScope] = None):
+        if scope is None or scope.is_global:
+            return self.vc.query_similar(vector, top_k)
 
-    def retrieve_by_text(self, text: str, top_k: int = 5):
+        rows = self.vc.query_similar(
+            vector, top_k,
+            source_types=scope.source_types,
+            repositories=scope.repositories
+        )
+        # Content ingested before source types were recorded is only reachable unscoped
+        return rows or self.vc.query_similar(vector, top_k)
+
+    def retrieve_by_text(self, text: str, top_k: int = 5, scope: Optional[SearchScope] = None):
         if not self.llm:
             raise ValueError("LLM service is required to compute embeddings from text")
         vector = self.llm.get_embedding(text)
-        return self.retrieve_context(vector, top_k)
\ No newline at end of file
+        return self.retrieve_context(vector, top_k, scope)
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Shared embedding batcher for parallel ingestion workers.
+
+Workers submit small groups of texts; a dispatcher thread coalesces requests
+from all workers into larger embedding calls and caps how many calls are in
+flight at once, so N parallel workers share one embedding quota instead of
+each hitting the provider independently.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Tuple
+
+import numpy as np
+
+from ..utils.logger import get_logger
+from .llm_service import LLMService
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_BATCH_TEXTS = 32  # Texts per coalesced embedding call
+DEFAULT_MAX_WAIT = 0.05  # Seconds to wait for more requests before dispatching
+DEFAULT_MAX_CONCURRENT_CALLS = 4  # Embedding calls in flight across all workers
+
+
+class EmbeddingBatcher:
+    """Coalesces embedding requests from many threads into shared, rate-capped calls."""
+
+    def __init__(
+        self,
+        llm_service: LLMService,
+        max_batch_texts: int = DEFAULT_MAX_BATCH_TEXTS,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        max_concurrent_calls: int = DEFAULT_MAX_CONCURRENT_CALLS
+    ):
+        """
+        Initialize the batcher and start its dispatcher thread.
+
+        Args:
+            llm_service: LLM service used to generate embeddings
+            max_batch_texts: Maximum number of texts per coalesced call
+            max_wait: Seconds to wait for more requests before dispatching a partial batch
+            max_concurrent_calls: Maximum embedding calls in flight at once
+        """
+        self.llm_service = llm_service
+        self.max_batch_texts = max_batch_texts
+        self.max_wait = max_wait
+
+        self._queue: "queue.Queue[Tuple[List[str], Future]]" = queue.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_calls,
+            thread_name_prefix="embedding-batcher"
+        )
+        self._slots = threading.BoundedSemaphore(max_concurrent_calls)
+        self._closed = False
+
+        self.calls_made = 0
+        self.texts_embedded = 0
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self._dispatcher.start()
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings, blocking until this request's batch has been processed.
+
+        Drop-in replacement for LLMService.get_embeddings().
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding per text, in order
+        """
+        if not texts:
+            return []
+        return self.get_embeddings_array(texts).tolist()
+
+    def get_embeddings_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings as a float32 matrix (see LLMService.get_embeddings_array()).
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Array of shape (len(texts), dimension), a view into the coalesced batch
+        """
+        if self._closed:
+            raise RuntimeError("EmbeddingBatcher is closed")
+        if not texts:
+            return self.llm_service.get_embeddings_array([])
+
+        future: Future = Future()
+        self._queue.put((texts, future))
+        return future.result()
+
+    def _dispatch_loop(self):
+        """Collect queued requests into batches and hand them to the executor."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            size = len(item[0])
+            deadline = time.time() + self.max_wait
+
+            while size < self.max_batch_texts:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)  # Re-queue shutdown marker for the outer loop
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            # Blocks the dispatcher while all call slots are busy, so requests keep coalescing
+            self._slots.acquire()
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: List[Tuple[List[str], Future]]):
+        """Embed one coalesced batch and distribute the results to the waiting callers."""
+        try:
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                embeddings = self.llm_service.get_embeddings_array(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                return
+
+            self.calls_made += 1
+            self.texts_embedded += len(texts)
+
+            offset = 0
+            for request_texts, future in batch:
+                future.set_result(embeddings[offset:offset + len(request_texts)])
+                offset += len(request_texts)
+
+            logger.debug(f"Embedded {len(texts)} texts for {len(batch)} requests")
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Stop the dispatcher after pending requests are processed."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,290 @@
+"""
+GitHub GraphQL batch fetcher.
+
+Fetches file contents and README files for many paths / repositories in a single
+GraphQL query using ``object(expression: "HEAD:path") { ... on Blob { text oid } }``
+aliases, instead of one REST call per file or per repository.
+"""
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+import requests
+
+from ..utils.logger import get_logger
+from ..utils.github_rate_limiter import (
+    GitHubRateLimiter,
+    get_rate_limiter,
+    BUCKET_GRAPHQL,
+    PRIORITY_NORMAL,
+)
+
+logger = get_logger(__name__)
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+DEFAULT_FILES_PER_QUERY = 50  # Blob objects per query for a single repository
+DEFAULT_REPOS_PER_QUERY = 25  # Repositories per README sweep query
+MIN_BATCH_SIZE = 1
+GRAPHQL_TIMEOUT = 30  # Seconds per GraphQL request
+
+# Same README variations that GitHubService.find_readme_file() probes over REST
+README_CANDIDATES = [
+    "README.md",
+    "readme.md",
+    "Readme.md",
+    "README.MD",
+    "docs/README.md",
+    "doc/README.md"
+]
+
+BLOB_FIELDS = "... on Blob { text oid byteSize isBinary isTruncated }"
+
+
+class GraphQLError(Exception):
+    """Raised when a GraphQL query returns errors and no usable data."""
+
+
+class GitHubGraphQLFetcher:
+    """Batch fetcher backed by the GitHub GraphQL API."""
+
+    def __init__(
+        self,
+        session: requests.Session,
+        files_per_query: int = DEFAULT_FILES_PER_QUERY,
+        repos_per_query: int = DEFAULT_REPOS_PER_QUERY,
+        rate_limiter: Optional[GitHubRateLimiter] = None,
+        priority: int = PRIORITY_NORMAL
+    ):
+        """
+        Initialize the GraphQL fetcher.
+
+        Args:
+            session: Authenticated requests.Session (shared with GitHubService)
+            files_per_query: Maximum number of file blobs requested per query
+            repos_per_query: Maximum number of repositories requested per README query
+            rate_limiter: Shared quota scheduler (defaults to the process-wide one)
+            priority: Rate-limit priority of this fetcher's queries
+        """
+        self.session = session
+        self.files_per_query = files_per_query
+        self.repos_per_query = repos_per_query
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.priority = priority
+
+        # Cost of the last query, used as the estimate for the next one
+        self.last_query_cost = 1
+        self.queries_made = 0
+
+    def execute(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Execute a GraphQL query, waiting on the shared rate limiter for GraphQL budget.
+
+        Args:
+            query: GraphQL query string
+            variables: Query variables
+
+        Returns:
+            The 'data' object of the response
+
+        Raises:
+            GraphQLError: If the response has errors and no data
+        """
+        self.rate_limiter.acquire(BUCKET_GRAPHQL, self.priority, cost=self.last_query_cost)
+
+        response = self.session.post(
+            GRAPHQL_URL,
+            json={"query": query, "variables": variables or {}},
+            timeout=GRAPHQL_TIMEOUT
+        )
+        self.rate_limiter.update_from_headers(response.headers, BUCKET_GRAPHQL)
+        response.raise_for_status()
+        payload = response.json()
+        self.queries_made += 1
+
+        data = payload.get("data") or {}
+        rate_limit = data.get("rateLimit")
+        if rate_limit:
+            self._update_rate_limit(rate_limit)
+
+        errors = payload.get("errors") or []
+        if errors:
+            # NOT_FOUND errors for missing repositories/paths still return partial data
+            messages = "; ".join(e.get("message", "") for e in errors[:3])
+            if not data:
+                raise GraphQLError(messages)
+            logger.debug(f"GraphQL partial errors: {messages}")
+
+        return data
+
+    def fetch_files(self, owner: str, repo: str, paths: List[str], ref: str = "HEAD") -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the contents of many files of one repository in as few queries as possible.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            paths: File paths within the repository
+            ref: Git ref to read from (branch, tag, commit or HEAD)
+
+        Returns:
+            Dict mapping path -> {'text', 'oid', 'size', 'is_binary', 'is_truncated'}.
+            Paths that do not exist are omitted.
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        pending = list(paths)
+        batch_size = self.files_per_query
+
+        while pending:
+            batch = pending[:batch_size]
+            try:
+                results.update(self._fetch_files_batch(owner, repo, batch, ref))
+                pending = pending[len(batch):]
+            except (GraphQLError, requests.exceptions.RequestException) as e:
+                # Large blobs can make a query time out; retry with smaller batches
+                if batch_size <= MIN_BATCH_SIZE:
+                    logger.error(f"GraphQL file fetch failed for {owner}/{repo}:{batch[0]}: {e}")
+                    pending = pending[1:]
+                    continue
+                batch_size = max(MIN_BATCH_SIZE, batch_size // 2)
+                logger.warning(f"GraphQL file batch failed ({e}), retrying with batch size {batch_size}")
+
+        logger.info(f"GraphQL fetched {len(results)}/{len(paths)} files from {owner}/{repo}")
+        return results
+
+    def fetch_readmes(self, repositories: List[Tuple[str, str]]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Fetch README files and basic metadata for many repositories.
+
+        Args:
+            repositories: List of (owner, repo) tuples
+
+        Returns:
+            Dict mapping 'owner/repo' -> README dict in the same shape as
+            GitHubService.get_readme_content() (or None if no README was found)
+        """
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        pending = list(repositories)
+        batch_size = self.repos_per_query
+
+        while pending:
+            batch = pending[:batch_size]
+            try:
+                results.update(self._fetch_readmes_batch(batch))
+                pending = pending[len(batch):]
+            except (GraphQLError, requests.exceptions.RequestException) as e:
+                if batch_size <= MIN_BATCH_SIZE:
+                    owner, repo = batch[0]
+                    logger.error(f"GraphQL README fetch failed for {owner}/{repo}: {e}")
+                    results[f"{owner}/{repo}"] = None
+                    pending = pending[1:]
+                    continue
+                batch_size = max(MIN_BATCH_SIZE, batch_size // 2)
+                logger.warning(f"GraphQL README batch failed ({e}), retrying with batch size {batch_size}")
+
+        found = sum(1 for r in results.values() if r)
+        logger.info(f"GraphQL fetched {found}/{len(repositories)} READMEs in {self.queries_made} queries so far")
+        return results
+
+    def _fetch_files_batch(self, owner: str, repo: str, paths: List[str], ref: str) -> Dict[str, Dict[str, Any]]:
+        """Fetch one batch of blobs from a single repository."""
+        var_defs = ["$owner: String!", "$name: String!"]
+        variables: Dict[str, Any] = {"owner": owner, "name": repo}
+        fields = []
+
+        for i, path in enumerate(paths):
+            var_defs.append(f"$e{i}: String!")
+            variables[f"e{i}"] = f"{ref}:{path}"
+            fields.append(f"f{i}: object(expression: $e{i}) {{ {BLOB_FIELDS} }}")
+
+        query = (
+            f"query({', '.join(var_defs)}) {{\n"
+            f"  rateLimit {{ cost remaining resetAt }}\n"
+            f"  repository(owner: $owner, name: $name) {{\n    "
+            + "\n    ".join(fields)
+            + "\n  }\n}"
+        )
+
+        data = self.execute(query, variables)
+        repository = data.get("repository") or {}
+
+        results = {}
+        for i, path in enumerate(paths):
+            blob = repository.get(f"f{i}")
+            if blob and blob.get("oid"):
+                results[path] = {
+                    "text": blob.get("text"),
+                    "oid": blob.get("oid"),
+                    "size": blob.get("byteSize", 0),
+                    "is_binary": blob.get("isBinary", False),
+                    "is_truncated": blob.get("isTruncated", False)
+                }
+        return results
+
+    def _fetch_readmes_batch(self, repositories: List[Tuple[str, str]]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch README candidates and metadata for one batch of repositories."""
+        var_defs = []
+        variables: Dict[str, Any] = {}
+        repo_fields = []
+
+        for i, (owner, repo) in enumerate(repositories):
+            var_defs.extend([f"$o{i}: String!", f"$n{i}: String!"])
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = repo
+            readme_fields = " ".join(
+                f'c{j}: object(expression: "HEAD:{candidate}") {{ {BLOB_FIELDS} }}'
+                for j, candidate in enumerate(README_CANDIDATES)
+            )
+            repo_fields.append(
+                f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ "
+                f"nameWithOwner url defaultBranchRef {{ name }} {readme_fields} }}"
+            )
+
+        query = (
+            f"query({', '.join(var_defs)}) {{\n"
+            f"  rateLimit {{ cost remaining resetAt }}\n  "
+            + "\n  ".join(repo_fields)
+            + "\n}"
+        )
+
+        data = self.execute(query, variables)
+
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for i, (owner, repo) in enumerate(repositories):
+            key = f"{owner}/{repo}"
+            node = data.get(f"r{i}")
+            results[key] = self._readme_from_node(node) if node else None
+        return results
+
+    def _readme_from_node(self, node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Pick the first README candidate present in a repository node."""
+        branch = (node.get("defaultBranchRef") or {}).get("name", "main")
+
+        for j, candidate in enumerate(README_CANDIDATES):
+            blob = node.get(f"c{j}")
+            if not blob or blob.get("isBinary") or blob.get("text") is None:
+                continue
+
+            return {
+                "name": candidate.split("/")[-1],
+                "path": candidate,
+                "content": blob["text"],
+                "size": blob.get("byteSize", 0),
+                "sha": blob.get("oid", ""),
+                "url": f"{node.get('url', '')}/blob/{branch}/{candidate}",
+                "is_truncated": blob.get("isTruncated", False)
+            }
+
+        return None
+
+    def _update_rate_limit(self, rate_limit: Dict[str, Any]):
+        """Record the cost and remaining budget returned in the query's rateLimit field."""
+        self.last_query_cost = max(1, int(rate_limit.get("cost") or 1))
+
+        reset = None
+        if rate_limit.get("resetAt"):
+            try:
+                reset = datetime.fromisoformat(rate_limit["resetAt"].replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                reset = None
+
+        if rate_limit.get("remaining") is not None:
+            self.rate_limiter.update(BUCKET_GRAPHQL, int(rate_limit["remaining"]), reset)
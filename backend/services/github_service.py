@@ -1,11 +1,23 @@
+import os
 import requests
 import base64
-import time
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from ..utils.logger import get_logger
+from ..utils.http_cache import HTTPCache
+from ..utils.github_rate_limiter import (
+    GitHubRateLimiter,
+    get_rate_limiter,
+    bucket_for_url,
+    PRIORITY_NORMAL,
+)
+from .github_graphql import GitHubGraphQLFetcher
 
 logger = get_logger(__name__)
 
@@ -13,19 +25,66 @@ logger = get_logger(__name__)
 MAX_RECURSION_DEPTH = 10  # Limit directory depth
 MAX_FILES_PER_SCAN = 1000  # Stop after finding this many files
 MAX_FILE_SIZE_BYTES = 10 * 1024 * 1024  # 10MB per file
-API_CALL_DELAY = 0.02  # Reduced from 0.1 to 0.02 (20ms) for faster scanning
 MAX_PARALLEL_REQUESTS = 10  # Number of parallel directory scans
+MAX_MEMORY_CACHE_ENTRIES = 2000  # In-process response cache size (LRU)
+REQUEST_TIMEOUT = 10  # Seconds per request
+MAX_RETRIES = 3  # Retries for connection errors and 5xx / 429 responses
+
+
+def create_github_session(pool_size: int = MAX_PARALLEL_REQUESTS, max_retries: int = MAX_RETRIES) -> requests.Session:
+    """
+    Create a pooled requests.Session for the GitHub API.
+
+    The connection pool is sized to match the number of parallel scanner threads
+    so keep-alive connections are reused instead of opening one per request.
+
+    Args:
+        pool_size: Number of pooled connections (should match MAX_PARALLEL_REQUESTS)
+        max_retries: Number of retries on connection errors and 429 / 5xx responses
+
+    Returns:
+        Configured requests.Session
+    """
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD", "POST"]),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
 class GitHubService:
     """Service for interacting with GitHub API to fetch markdown files."""
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        http_cache: Optional[HTTPCache] = None,
+        session: Optional[requests.Session] = None,
+        api_backend: Optional[str] = None,
+        rate_limiter: Optional[GitHubRateLimiter] = None,
+        priority: int = PRIORITY_NORMAL
+    ):
         """
         Initialize GitHub service.
 
         Args:
             token: GitHub personal access token (optional but recommended for higher rate limits)
+            http_cache: Persistent cache used for ETag / If-None-Match revalidation
+                        (defaults to the on-disk cache; disable with GITHUB_HTTP_CACHE=false)
+            session: Pre-configured requests.Session (a pooled session is created if omitted)
+            api_backend: "rest" or "graphql" for batch content fetches
+                         (defaults to GITHUB_API_BACKEND, GraphQL requires a token)
+            rate_limiter: Shared quota scheduler (defaults to the process-wide one)
+            priority: Rate-limit priority of this client's requests
         """
         self.token = token
         self.base_url = "https://api.github.com"
@@ -39,30 +98,105 @@ class GitHubService:
         else:
             logger.warning("GitHub service initialized without token - rate limits will be lower (60/hour)")
 
-        # Cache for directory contents to avoid redundant API calls
-        self._cache = {}
+        # Quota is shared with every other GitHub client in the process
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.priority = priority
+
+        # Pooled keep-alive session with retry policy
+        self.session = session or create_github_session()
+        self.session.headers.update(self.headers)
+
+        # Persistent conditional-request cache (304 responses are free)
+        if http_cache is None and os.getenv("GITHUB_HTTP_CACHE", "true").lower() == "true":
+            try:
+                http_cache = HTTPCache(
+                    path=os.getenv("GITHUB_HTTP_CACHE_PATH") or None,
+                    max_entries=int(os.getenv("GITHUB_HTTP_CACHE_MAX_ENTRIES", "20000")),
+                    max_bytes=int(os.getenv("GITHUB_HTTP_CACHE_MAX_MB", "256")) * 1024 * 1024
+                )
+            except Exception as e:
+                logger.warning(f"Persistent HTTP cache unavailable, continuing without it: {e}")
+                http_cache = None
+        self.http_cache = http_cache
+
+        # Bounded in-process cache for directory contents to avoid redundant API calls
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
         self._cache_lock = threading.Lock()
+        self.not_modified_count = 0
+
+        # Optional GraphQL backend for batch file / README fetches
+        api_backend = (api_backend or os.getenv("GITHUB_API_BACKEND", "rest")).lower()
+        self.graphql: Optional[GitHubGraphQLFetcher] = None
+        if api_backend == "graphql":
+            if token:
+                self.graphql = GitHubGraphQLFetcher(
+                    self.session,
+                    rate_limiter=self.rate_limiter,
+                    priority=priority
+                )
+                logger.info("GitHub GraphQL batch backend enabled")
+            else:
+                logger.warning("GraphQL backend requires a token - falling back to REST")
 
     def _make_request(self, url: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
-        """Make a GET request to GitHub API with optional caching."""
+        """
+        Make a GET request to GitHub API with optional caching.
+
+        Results fetched during this process are served from a bounded in-memory
+        cache when use_cache is True. Otherwise the request is sent with the
+        stored ETag / Last-Modified validators, and a 304 Not Modified response
+        is served from the persistent HTTP cache.
+        """
         # Check cache first
         if use_cache:
             with self._cache_lock:
                 if url in self._cache:
+                    self._cache.move_to_end(url)
                     logger.debug(f"Cache hit for: {url}")
                     return self._cache[url]
 
+        # Build conditional request headers from the persistent cache
+        cached = self.http_cache.get(url) if self.http_cache else None
+        conditional_headers = {}
+        if cached:
+            if cached.get("etag"):
+                conditional_headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                conditional_headers["If-Modified-Since"] = cached["last_modified"]
+
         try:
-            # Reduced delay for faster scanning
-            time.sleep(API_CALL_DELAY)
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            result = response.json()
+            bucket = bucket_for_url(url)
+            self.rate_limiter.acquire(bucket, self.priority)
+            response = self.session.get(url, headers=conditional_headers, timeout=REQUEST_TIMEOUT)
+            self.rate_limiter.update_from_headers(response.headers, bucket)
+
+            if response.status_code in (403, 429) and response.headers.get("Retry-After"):
+                self.rate_limiter.penalize(bucket, float(response.headers["Retry-After"]))
+
+            if response.status_code == 304 and cached:
+                # Unchanged since last fetch - does not count against the rate limit
+                logger.debug(f"Not modified (304): {url}")
+                self.not_modified_count += 1
+                result = cached["body"]
+            else:
+                response.raise_for_status()
+                result = response.json()
+
+                if self.http_cache:
+                    self.http_cache.set(
+                        url,
+                        result,
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified")
+                    )
 
             # Cache the result
             if use_cache:
                 with self._cache_lock:
                     self._cache[url] = result
+                    self._cache.move_to_end(url)
+                    while len(self._cache) > MAX_MEMORY_CACHE_ENTRIES:
+                        self._cache.popitem(last=False)
 
             return result
         except requests.exceptions.RequestException as e:
@@ -110,6 +244,10 @@ class GitHubService:
                 logger.warning(f"⚠️  File too large ({file_size} bytes), skipping: {path}")
                 raise ValueError(f"File exceeds maximum size ({MAX_FILE_SIZE_BYTES} bytes): {path}")
 
+            if not data["content"] and file_size > 0:
+                # Files over 1 MB come without inline content
+                return self._get_raw_file(url).decode("utf-8")
+
             # Content is base64 encoded
             content = base64.b64decode(data["content"]).decode("utf-8")
             logger.debug(f"Fetched {len(content)} characters from {path}")
@@ -141,12 +279,30 @@ class GitHubService:
                 logger.warning(f"⚠️  File too large ({file_size} bytes), skipping: {path}")
                 raise ValueError(f"File exceeds maximum size ({MAX_FILE_SIZE_BYTES} bytes): {path}")
 
+            if not data["content"] and file_size > 0:
+                # Files over 1 MB come without inline content
+                return self._get_raw_file(url)
+
             # Content is base64 encoded
             content_bytes = base64.b64decode(data["content"])
             return content_bytes
         else:
             raise ValueError(f"Could not retrieve bytes for {path}")
 
+    def _get_raw_file(self, url: str) -> bytes:
+        """
+        Raw bytes of a file from the contents API (raw media type, up to 100 MB).
+
+        Used for files over 1 MB, whose JSON response carries no content.
+        Not cached: bodies of that size are kept out of the response caches.
+        """
+        bucket = bucket_for_url(url)
+        self.rate_limiter.acquire(bucket, self.priority)
+        response = self.session.get(url, headers={"Accept": "application/vnd.github.raw"}, timeout=REQUEST_TIMEOUT)
+        self.rate_limiter.update_from_headers(response.headers, bucket)
+        response.raise_for_status()
+        return response.content
+
     def get_file_metadata(self, owner: str, repo: str, path: str) -> Dict[str, Any]:
         """
         Get metadata for a specific file including SHA hash.
@@ -157,7 +313,7 @@ class GitHubService:
             path: Path to the file
 
         Returns:
-            File metadata including sha, size, and download_url
+            File metadata including sha, size, download_url and html_url
         """
         url = f"{self.base_url}/repos/{owner}/{repo}/contents/{path}"
         data = self._make_request(url)
@@ -166,9 +322,98 @@ class GitHubService:
             "sha": data.get("sha", ""),
             "size": data.get("size", 0),
             "path": path,
-            "download_url": data.get("download_url", "")
+            "download_url": data.get("download_url", ""),
+            "html_url": data.get("html_url", "")
         }
 
+    def get_file_contents_batch(self, owner: str, repo: str, paths: List[str]) -> Dict[str, str]:
+        """
+        Get the contents of many files from one repository.
+
+        Uses a handful of GraphQL queries when the GraphQL backend is enabled,
+        otherwise one REST call per file. Files that GraphQL truncated or did
+        not return (failed batches, missing paths) are retried over REST;
+        binary files are omitted.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            paths: Paths to the files
+
+        Returns:
+            Dict mapping path -> decoded file content
+        """
+        contents: Dict[str, str] = {}
+        rest_paths = list(paths)
+
+        if self.graphql and paths:
+            try:
+                blobs = self.graphql.fetch_files(owner, repo, paths)
+                rest_paths = []
+                for path in paths:
+                    blob = blobs.get(path)
+                    if blob is None:
+                        rest_paths.append(path)
+                        continue
+                    if blob["is_binary"]:
+                        continue
+                    if blob["size"] > MAX_FILE_SIZE_BYTES:
+                        logger.warning(f"⚠️  File too large ({blob['size']} bytes), skipping: {path}")
+                        continue
+                    if blob["text"] is None or blob["is_truncated"]:
+                        rest_paths.append(path)
+                        continue
+                    contents[path] = blob["text"]
+            except Exception as e:
+                logger.warning(f"GraphQL batch fetch failed for {owner}/{repo}, using REST: {e}")
+                rest_paths = [p for p in paths if p not in contents]
+
+        for path in rest_paths:
+            try:
+                contents[path] = self.get_file_content(owner, repo, path)
+            except Exception as e:
+                logger.error(f"Failed to fetch {path}: {e}")
+
+        return contents
+
+    def get_readme_contents_batch(self, repositories: List[Tuple[str, str]]) -> Dict[str, Optional[Dict[str, str]]]:
+        """
+        Get README files for many repositories.
+
+        With the GraphQL backend, dozens of repositories are covered per query;
+        otherwise this falls back to get_readme_content() per repository.
+
+        Args:
+            repositories: List of (owner, repo) tuples
+
+        Returns:
+            Dict mapping 'owner/repo' -> README dict (same shape as get_readme_content) or None
+        """
+        results: Dict[str, Optional[Dict[str, str]]] = {}
+        rest_repos = list(repositories)
+
+        if self.graphql and repositories:
+            try:
+                readmes = self.graphql.fetch_readmes(repositories)
+                rest_repos = []
+                for owner, repo in repositories:
+                    readme = readmes.get(f"{owner}/{repo}")
+                    if readme and readme.pop("is_truncated", False):
+                        rest_repos.append((owner, repo))
+                    elif readme:
+                        results[f"{owner}/{repo}"] = readme
+                    else:
+                        # No README at the common locations - let the REST /readme endpoint look
+                        rest_repos.append((owner, repo))
+            except Exception as e:
+                logger.warning(f"GraphQL README sweep failed, using REST: {e}")
+                rest_repos = list(repositories)
+
+        for owner, repo in rest_repos:
+            results[f"{owner}/{repo}"] = self.get_readme_content(owner, repo)
+
+        return results
+
     def find_all_markdown_files(self, owner: str, repo: str, path: str = "", _depth: int = 0, _files_found: List = None) -> List[Dict[str, str]]:
         """
         Recursively find all .md files ONLY in a repository with safety limits.
@@ -672,23 +917,21 @@ class GitHubService:
         md_files = self.find_all_markdown_files(owner, repo)
         logger.info(f"Found {len(md_files)} markdown files")
 
-        # Fetch content for each file
+        # Fetch content for all files (batched when the GraphQL backend is enabled)
+        contents = self.get_file_contents_batch(owner, repo, [f["path"] for f in md_files])
+
         results = []
-        for i, file_info in enumerate(md_files, 1):
-            try:
-                logger.info(f"Fetching content {i}/{len(md_files)}: {file_info['path']}")
-                content = self.get_file_content(owner, repo, file_info["path"])
-
-                results.append({
-                    "path": file_info["path"],
-                    "name": file_info["name"],
-                    "url": file_info["url"],
-                    "content": content
-                })
-            except Exception as e:
-                logger.error(f"Failed to fetch {file_info['path']}: {e}")
+        for file_info in md_files:
+            if file_info["path"] not in contents:
                 continue
 
+            results.append({
+                "path": file_info["path"],
+                "name": file_info["name"],
+                "url": file_info["url"],
+                "content": contents[file_info["path"]]
+            })
+
         logger.info(f"Successfully fetched {len(results)} markdown files")
         return results
 
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import re
 import gc
 import psutil
@@ -6,21 +6,41 @@ import os
 import threading
 import sys
 import select
+import time
+import posixpath
+from urllib.parse import unquote, urlsplit
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
 
 from ..utils.logger import get_logger
 from ..utils.resource_monitor import (
     wait_for_memory,
     force_garbage_collection,
     get_memory_usage_mb,
-    get_memory_usage_percent
+    get_memory_usage_percent,
+    MemoryGovernor
 )
-from .github_service import GitHubService
+from .github_service import GitHubService, MAX_FILE_SIZE_BYTES
 from .llm_service import LLMService
+from .embedding_batcher import EmbeddingBatcher
+from ..utils.ingestion_checkpoint import IngestionCheckpoint, STATUS_IN_PROGRESS
+from ..utils.document_processing import IMAGE_EXTENSIONS, DocumentChunker, prepare_document, unpack_spans
+from ..utils.process_pool import ProcessWorkerPool, TaskTimeoutError, get_process_pool
 from .image_service import ImageProcessingService
 from ..db.vector_client import VectorClient
+from ..utils.source_types import SOURCE_TYPE_DOCS, SOURCE_TYPE_IMAGE
 
 logger = get_logger(__name__)
 
+MAX_DOCUMENT_FILE_SIZE = 1000000  # Bytes (and characters) per file
+MAX_API_DEFINITION_FILE_SIZE = 10000000  # API definitions are chunked per operation, so much larger specs are fine
+
+
+def max_file_size(file_type: str) -> int:
+    """Size limit of a repository file of the given type (checked before fetching and after decoding)."""
+    return MAX_API_DEFINITION_FILE_SIZE if file_type == "api_definition" else MAX_DOCUMENT_FILE_SIZE
+
 # Global flag for manual skip
 _manual_skip_flag = False
 _skip_lock = threading.Lock()
@@ -47,6 +67,46 @@ def check_manual_skip() -> bool:
         return _manual_skip_flag
 
 
+def repo_image_path(url: str, file_path: str, owner: str, repo: str) -> Optional[str]:
+    """
+    Resolve an image URL found in a markdown file to a path in the same repository.
+
+    Handles relative URLs, root-relative URLs and links to the repository on
+    github.com or raw.githubusercontent.com.
+
+    Args:
+        url: Image URL as written in the markdown
+        file_path: Repository path of the markdown file
+        owner: Repository owner
+        repo: Repository name
+
+    Returns:
+        Repository path of the image, or None for external or non-image URLs
+    """
+    parts = urlsplit(url)
+    path = unquote(parts.path)
+
+    if parts.scheme or parts.netloc:
+        host = parts.netloc.lower()
+        segments = path.strip("/").split("/")
+        if host == "github.com" and len(segments) > 4 and segments[2] in ("blob", "raw"):
+            segments = segments[:2] + segments[3:]
+        elif host != "raw.githubusercontent.com" or len(segments) < 4:
+            return None
+        if (segments[0].lower(), segments[1].lower()) != (owner.lower(), repo.lower()):
+            return None
+        path = "/".join(segments[3:])  # Drop owner, repo and branch
+    elif path.startswith("/"):
+        path = path.lstrip("/")
+    else:
+        path = posixpath.join(posixpath.dirname(file_path), path)
+
+    path = posixpath.normpath(path) if path else ""
+    if not path or path.startswith("..") or not path.lower().endswith(IMAGE_EXTENSIONS):
+        return None
+    return path
+
+
 def keyboard_monitor_thread():
     """Background thread that listens for 'q' key press to skip current file."""
     logger.info("⌨️  Keyboard monitor started - Press 'q' + Enter to skip current file")
@@ -89,247 +149,6 @@ def get_memory_usage() -> str:
             return "N/A"
 
 
-def remove_images_from_markdown(text: str) -> str:
-    """
-    Remove all image references from markdown text.
-
-    This function removes:
-    - Inline images: ![alt text](image.png)
-    - Reference-style images: ![alt text][ref]
-    - Image reference definitions: [ref]: image.png
-    - HTML img tags: <img src="image.png">
-    - Images with attributes and titles
-
-    Args:
-        text: Markdown text content
-
-    Returns:
-        Text with all image references removed
-    """
-    if not text:
-        return text
-
-    # Remove inline markdown images: ![alt text](url "title")
-    # Matches: ![anything](url) or ![anything](url "title")
-    text = re.sub(r'!\[([^\]]*)\]\([^\)]+\)', '', text)
-
-    # Remove reference-style markdown images: ![alt text][ref]
-    text = re.sub(r'!\[([^\]]*)\]\[([^\]]*)\]', '', text)
-
-    # Remove image reference definitions: [ref]: url "title"
-    # This handles lines like: [logo]: https://example.com/logo.png "Logo"
-    text = re.sub(r'^\s*\[([^\]]+)\]:\s+\S+.*$', '', text, flags=re.MULTILINE)
-
-    # Remove HTML img tags with any attributes
-    # Matches: <img src="..." alt="..." /> or <img src="...">
-    text = re.sub(r'<img[^>]*>', '', text, flags=re.IGNORECASE)
-
-    # Remove multiple consecutive blank lines (cleanup)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-
-    # Remove leading/trailing whitespace
-    text = text.strip()
-
-    logger.debug(f"Removed images from markdown text")
-    return text
-
-
-class DocumentChunker:
-    """Utility class for chunking documents."""
-
-    def __init__(self, chunk_size: int = 3000, chunk_overlap: int = 200):
-        """
-        Initialize chunker.
-
-        Args:
-            chunk_size: Maximum characters per chunk
-            chunk_overlap: Number of overlapping characters between chunks
-        """
-        self.chunk_size = chunk_size
-        self.chunk_overlap = chunk_overlap
-
-    def pre_split_large_text(self, text: str, max_section_size: int = 15000) -> List[str]:
-        """
-        Pre-split very large text into smaller sections to prevent timeout issues.
-        This is done BEFORE the detailed chunking algorithm runs.
-
-        Splits at natural boundaries (paragraph breaks, then newlines) to maintain context.
-
-        Args:
-            text: Text to split
-            max_section_size: Maximum characters per section (default 15KB)
-
-        Returns:
-            List of text sections
-        """
-        if len(text) <= max_section_size:
-            return [text]
-
-        sections = []
-        start = 0
-        text_length = len(text)
-
-        while start < text_length:
-            end = start + max_section_size
-
-            if end >= text_length:
-                # Last section
-                sections.append(text[start:].strip())
-                break
-
-            # Try to split at a paragraph break (two newlines)
-            split_pos = text.rfind('\n\n', start, end)
-
-            # If no paragraph break, try single newline
-            if split_pos == -1 or split_pos <= start:
-                split_pos = text.rfind('\n', start, end)
-
-            # If still no good split point, try space
-            if split_pos == -1 or split_pos <= start:
-                split_pos = text.rfind(' ', start, end)
-
-            # If still nothing, force split at max_section_size
-            if split_pos == -1 or split_pos <= start:
-                split_pos = end
-
-            sections.append(text[start:split_pos].strip())
-            start = split_pos + 1  # Skip the split character
-
-        logger.debug(f"Pre-split {text_length} chars into {len(sections)} sections")
-        return sections
-
-    def chunk_text(self, text: str, metadata: Dict[str, Any] = None) -> List[Dict[str, Any]]:
-        """
-        Split text into overlapping chunks.
-        For large texts (>15KB), pre-splits into sections first to prevent timeouts.
-
-        Args:
-            text: Text to chunk
-            metadata: Additional metadata to attach to each chunk
-
-        Returns:
-            List of chunks with metadata
-        """
-        if not text or not text.strip():
-            return []
-
-        # **NEW: Pre-split large files to prevent timeout**
-        # If text is larger than 15KB, split into sections first
-        if len(text) > 15000:
-            logger.info(f"Large file detected ({len(text)} chars), pre-splitting into sections...")
-            sections = self.pre_split_large_text(text, max_section_size=15000)
-            logger.info(f"Pre-split into {len(sections)} sections")
-
-            all_chunks = []
-            global_char_offset = 0
-
-            for section_idx, section in enumerate(sections):
-                if not section.strip():
-                    continue
-
-                # Chunk each section independently
-                section_chunks = self._chunk_section(section, metadata, global_char_offset)
-                all_chunks.extend(section_chunks)
-                global_char_offset += len(section) + 1  # +1 for the split character
-
-            # Update chunk indices to be sequential
-            for idx, chunk in enumerate(all_chunks):
-                chunk["metadata"]["chunk_index"] = idx
-
-            logger.info(f"Created {len(all_chunks)} chunks from {len(sections)} sections (total {len(text)} chars)")
-            return all_chunks
-
-        # For small files, use the regular chunking
-        return self._chunk_section(text, metadata, 0)
-
-    def _chunk_section(self, text: str, metadata: Dict[str, Any] = None, char_offset: int = 0) -> List[Dict[str, Any]]:
-        """
-        Internal method to chunk a single section of text.
-        Optimized to avoid expensive rfind() operations that cause timeouts.
-
-        Args:
-            text: Text section to chunk
-            metadata: Metadata to attach
-            char_offset: Character offset for absolute positioning
-
-        Returns:
-            List of chunks
-        """
-        if not text or not text.strip():
-            return []
-
-        chunks = []
-        start = 0
-        text_length = len(text)
-
-        while start < text_length:
-            end = start + self.chunk_size
-
-            # If this is the last chunk, just take the rest
-            if end >= text_length:
-                end = text_length
-            else:
-                # Try to find a good break point NEAR the end (not from start!)
-                # Only search in the last 300 chars to avoid expensive scans
-                search_start = max(start, end - 300)
-                found_break = False
-
-                # Look for paragraph break first (in limited range)
-                paragraph_pos = text.rfind('\n\n', search_start, end)
-                if paragraph_pos != -1 and paragraph_pos > start:
-                    end = paragraph_pos + 2  # Include the newlines
-                    found_break = True
-
-                # If no paragraph break, look for single newline
-                if not found_break:
-                    newline_pos = text.rfind('\n', search_start, end)
-                    if newline_pos != -1 and newline_pos > start:
-                        end = newline_pos + 1
-                        found_break = True
-
-                # If still no break, look for sentence ending (in limited range)
-                if not found_break:
-                    for marker in ['. ', '.\n', '! ', '? ', ': ', ':\n']:
-                        marker_pos = text.rfind(marker, search_start, end)
-                        if marker_pos != -1 and marker_pos > start:
-                            end = marker_pos + len(marker)
-                            found_break = True
-                            break
-
-                # Last resort: look for space (in limited range)
-                if not found_break:
-                    space_pos = text.rfind(' ', search_start, end)
-                    if space_pos != -1 and space_pos > start:
-                        end = space_pos + 1
-                        found_break = True
-
-                # If absolutely no break point found, just hard split
-                # This prevents infinite loops
-
-            chunk_text = text[start:end].strip()
-
-            if chunk_text:
-                chunk_data = {
-                    "content": chunk_text,
-                    "metadata": {
-                        **(metadata or {}),
-                        "chunk_index": len(chunks),
-                        "start_char": start + char_offset,
-                        "end_char": end + char_offset
-                    }
-                }
-                chunks.append(chunk_data)
-
-            # Move start position with overlap
-            start = end - self.chunk_overlap if end < text_length else text_length
-
-            # Safety check: ensure we're making progress
-            if start >= text_length:
-                break
-
-        return chunks
-
-
 class IngestionService:
     """Service for ingesting documents from GitHub and storing in Pinecone."""
 
@@ -340,7 +159,10 @@ class IngestionService:
         vector_client: VectorClient,
         image_service: ImageProcessingService = None,
         chunk_size: int = 3000,
-        chunk_overlap: int = 200
+        chunk_overlap: int = 200,
+        embedding_batcher: Optional[EmbeddingBatcher] = None,
+        checkpoint: Optional[IngestionCheckpoint] = None,
+        process_pool: Optional[ProcessWorkerPool] = None
     ):
         """
         Initialize ingestion service.
@@ -352,12 +174,126 @@ class IngestionService:
             image_service: Image processing service (optional)
             chunk_size: Size of text chunks
             chunk_overlap: Overlap between chunks
+            embedding_batcher: Shared batcher for embedding calls (optional, created
+                               automatically for parallel organization sweeps)
+            checkpoint: Resumable ingestion journal (defaults to the on-disk journal of
+                        the vector client's collection; disable with INGESTION_CHECKPOINT=false)
+            process_pool: Worker processes for cleaning and chunking (defaults to the
+                          shared pool; disable with INGESTION_PROCESS_POOL=false to
+                          run in-process without timeouts)
         """
         self.github_service = github_service
         self.llm_service = llm_service
         self.vector_client = vector_client
         self.image_service = image_service
         self.chunker = DocumentChunker(chunk_size, chunk_overlap)
+        self.embedding_batcher = embedding_batcher
+
+        if checkpoint is None and os.getenv("INGESTION_CHECKPOINT", "true").lower() == "true":
+            try:
+                checkpoint = IngestionCheckpoint(
+                    os.getenv("INGESTION_CHECKPOINT_PATH") or None,
+                    collection=getattr(vector_client, "collection_name", "")
+                )
+            except Exception as e:
+                logger.warning(f"Ingestion checkpoint journal unavailable, continuing without it: {e}")
+                checkpoint = None
+        self.checkpoint = checkpoint
+
+        if process_pool is None and os.getenv("INGESTION_PROCESS_POOL", "true").lower() == "true":
+            process_pool = get_process_pool()
+        self.process_pool = process_pool
+
+    def _get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate float32 embeddings through the shared batcher when one is active."""
+        if self.embedding_batcher is not None:
+            return self.embedding_batcher.get_embeddings_array(texts)
+        return self.llm_service.get_embeddings_array(texts)
+
+    def _plan_file(self, repository_id: str, file_info: Dict[str, Any]) -> Optional[int]:
+        """
+        Decide from its tree entry whether a file needs to be fetched.
+
+        Args:
+            repository_id: Repository identifier ('owner/repo')
+            file_info: Tree entry (path, name, sha, size, file_type)
+
+        Returns:
+            Batch to resume the file at (0 = from the start), or None to skip it
+            (too large, or already processed at this SHA)
+        """
+        file_path = file_info['path']
+        file_sha = file_info.get('sha', '')
+        file_size = file_info.get('size', 0)
+        size_limit = max_file_size(file_info.get('file_type', 'unknown'))
+
+        # Check file size before processing
+        if file_size > size_limit:
+            logger.warning(f"⚠️  File too large ({file_size} bytes, max: {size_limit}) - Skipping: {file_path}")
+            return None
+
+        # **RESUME CHECK** - A file interrupted in an earlier run continues at its batch cursor
+        file_state = self.checkpoint.get_file_state(repository_id, file_path, file_sha) if self.checkpoint and file_sha else None
+        if file_state and file_state["status"] == STATUS_IN_PROGRESS:
+            logger.info(f"♻️  Resuming {file_info['name']} at batch {file_state['batches_done'] + 1}")
+            return file_state["batches_done"]
+
+        # **EARLY SHA CHECK** - Check if already processed BEFORE fetching content (saves time)
+        if file_sha and self.vector_client.file_already_processed(repository_id, file_path, file_sha):
+            logger.info(f"⏭️  Skipping {file_info['name']} - already processed (SHA: {file_sha[:8]})")
+            if self.checkpoint:
+                self.checkpoint.start_file(repository_id, file_path, file_sha)
+                self.checkpoint.complete_file(repository_id, file_path, file_sha)
+            return None
+
+        # Chunks are upserted under stable IDs; rows of the old version are removed once this one is stored
+        if file_sha and self.checkpoint:
+            self.checkpoint.start_file(repository_id, file_path, file_sha)
+        return 0
+
+    def _prepare_document(self, content: str, file_type: str, file_metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Clean and chunk a document, in a worker process when the pool is enabled.
+
+        The worker returns only the cleaned text and a flat array of chunk spans
+        (or the per-operation chunk texts of an API definition); chunk dicts are
+        built here. URLs of images removed from markdown are added to
+        file_metadata as 'image_urls'.
+
+        Raises:
+            TaskTimeoutError: If the worker exceeded the per-file timeout (it has been killed)
+            WorkerCrashedError: If the worker process died
+        """
+        args = (content, file_type, self.chunker.chunk_size, self.chunker.chunk_overlap)
+        if self.process_pool is not None:
+            cleaned, flat_spans, api_chunks, image_urls = self.process_pool.run(prepare_document, *args)
+        else:
+            cleaned, flat_spans, api_chunks, image_urls = prepare_document(*args)
+
+        if image_urls:
+            file_metadata["image_urls"] = image_urls
+
+        if api_chunks is not None:
+            logger.info(f"📐 Structured API definition: {len(api_chunks)} operation/schema chunks from {file_metadata['file_path']}")
+            return [
+                {
+                    "content": text,
+                    "metadata": {
+                        **file_metadata,
+                        "chunk_index": chunk_index,
+                        "chunk_type": chunk_type,
+                        "api_section": section
+                    }
+                }
+                for chunk_index, (text, chunk_type, section) in enumerate(api_chunks)
+            ]
+
+        if cleaned is None:
+            cleaned = content
+        elif len(cleaned) != len(content):
+            logger.info(f"Removed images from {file_metadata['file_path']}: {len(content)} -> {len(cleaned)} chars")
+
+        return self.chunker.chunks_from_spans(cleaned, unpack_spans(flat_spans), file_metadata)
 
     def ingest_from_github(self, owner: str, repo: str) -> Dict[str, Any]:
         """
@@ -446,7 +382,48 @@ class IngestionService:
         md_processed = 0
         api_processed = 0
 
+        # Images referenced from the markdown, collected while removing them
+        referenced_images = set()
+
+        if self.checkpoint:
+            # Store batches that were embedded before the last run was interrupted
+            for pending in self.checkpoint.pending_batches(repository_id):
+                self.vector_client.insert_embeddings_batch(pending["items"])
+                self.checkpoint.batch_stored(
+                    repository_id, pending["file_path"], pending["file_sha"], pending["batch_index"]
+                )
+                total_embeddings_stored += len(pending["items"])
+                logger.info(f"♻️  Stored pending batch {pending['batch_index'] + 1} of {pending['file_path']} from checkpoint")
+
+            # Files fully ingested in an earlier run are skipped without a Milvus round trip
+            completed = self.checkpoint.completed_files(repository_id)
+            if completed:
+                remaining_files = [
+                    f for f in all_files
+                    if not f.get("sha") or completed.get(f["path"]) != f.get("sha")
+                ]
+                files_skipped += len(all_files) - len(remaining_files)
+                logger.info(f"♻️  Checkpoint: {len(all_files) - len(remaining_files)} files already ingested, {len(remaining_files)} to go")
+                all_files = remaining_files
+
+        # With the GraphQL backend, file contents are prefetched in small windows
+        # (one query per window) instead of one REST call per file. The files of
+        # a window are planned first, so unchanged and oversized files are not fetched.
+        prefetch_window = 20
+        prefetched: Dict[str, str] = {}
+        plans: Dict[str, Optional[int]] = {}  # Path -> batch to resume at, None = skip
+
         for file_idx, file_info in enumerate(all_files, 1):
+            if self.github_service.graphql and (file_idx - 1) % prefetch_window == 0:
+                prefetched.clear()
+                plans.clear()
+                window = all_files[file_idx - 1:file_idx - 1 + prefetch_window]
+                for f in window:
+                    plans[f['path']] = self._plan_file(repository_id, f)
+                wanted = [path for path, resume in plans.items() if resume is not None]
+                if wanted and get_memory_usage_percent() <= 98.0:
+                    prefetched.update(self.github_service.get_file_contents_batch(owner, repo, wanted))
+
             # **MANUAL SKIP CHECK** - Check if user pressed 'q' to skip
             if check_manual_skip():
                 logger.warning(f"⏭️  MANUAL SKIP: User requested to skip {file_info['name']}")
@@ -467,31 +444,21 @@ class IngestionService:
 
                 file_path = file_info['path']
                 file_sha = file_info.get('sha', '')
-                file_size = file_info.get('size', 0)
                 file_type = file_info.get('file_type', 'unknown')
-                max_file_size = 1000000  # 1000KB limit per file (increased for API files which can be larger)
+                size_limit = max_file_size(file_type)
 
                 logger.info(f"Processing file {file_idx}/{len(all_files)}: {file_path} ({file_type}) [Memory: {get_memory_usage()}]")
 
-                # Check file size before processing
-                if file_size > max_file_size:
-                    logger.warning(f"⚠️  File too large ({file_size} bytes, max: {max_file_size}) - Skipping: {file_path}")
+                # Size, resume and SHA checks, before any content is fetched
+                resume_batch = plans.pop(file_path) if file_path in plans else self._plan_file(repository_id, file_info)
+                if resume_batch is None:
                     files_skipped += 1
                     continue
 
-                # **EARLY SHA CHECK** - Check if already processed BEFORE fetching content (saves time)
-                if file_sha and self.vector_client.file_already_processed(repository_id, file_path, file_sha):
-                    logger.info(f"⏭️  Skipping {file_info['name']} - already processed (SHA: {file_sha[:8]})")
-                    files_skipped += 1
-                    continue
-
-                # If file SHA changed, delete old chunks before adding new ones
-                if file_sha:
-                    logger.debug(f"Checking for outdated chunks of {file_path}...")
-                    self.vector_client.delete_file_chunks(repository_id, file_path)
-
                 # Fetch content for this file
-                content = self.github_service.get_file_content(owner, repo, file_path)
+                content = prefetched.pop(file_path, None)
+                if content is None:
+                    content = self.github_service.get_file_content(owner, repo, file_path)
 
                 if not content or not content.strip():
                     logger.warning(f"Skipping empty file: {file_path}")
@@ -499,27 +466,13 @@ class IngestionService:
                     continue
 
                 # Add character limit check for very large files (AFTER fetching content)
-                max_file_chars = 1000000  # Maximum 1000K characters to prevent chunking timeouts
-                if len(content) > max_file_chars:
-                    logger.warning(f"⚠️  File content too large ({len(content)} chars, max: {max_file_chars}) - Skipping: {file_path}")
+                if len(content) > size_limit:
+                    logger.warning(f"⚠️  File content too large ({len(content)} chars, max: {size_limit}) - Skipping: {file_path}")
                     files_skipped += 1
                     del content
                     force_garbage_collection()
                     continue
 
-                # For markdown files, remove image references
-                original_length = len(content)
-                if file_type == 'markdown':
-                    content = remove_images_from_markdown(content)
-                    cleaned_length = len(content)
-                    if original_length != cleaned_length:
-                        logger.info(f"Removed images from {file_path}: {original_length} -> {cleaned_length} chars")
-
-                if not content or not content.strip():
-                    logger.warning(f"Skipping file with no content after processing: {file_path}")
-                    files_skipped += 1
-                    continue
-
                 # **MEMORY SAFETY CHECK** - Check memory before chunking
                 pre_chunk_memory = get_memory_usage_percent()
                 if pre_chunk_memory > 97.0:
@@ -533,6 +486,7 @@ class IngestionService:
                 # Chunk this file
                 file_metadata = {
                     "source": "github",
+                    "source_type": SOURCE_TYPE_DOCS,
                     "repository": repository_id,
                     "file_path": file_path,
                     "file_name": file_info["name"],
@@ -554,30 +508,28 @@ class IngestionService:
 
                     logger.info(f"📝 Chunking {file_info['name']} ({len(content)} chars, type: {file_type})...")
 
-                    # **TIMEOUT PROTECTION** using threading (works in any thread/process)
-                    from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
-
-                    def chunk_with_timeout():
-                        return self.chunker.chunk_text(content, file_metadata)
-
-                    try:
-                        with ThreadPoolExecutor(max_workers=1) as executor:
-                            future = executor.submit(chunk_with_timeout)
-                            chunks = future.result(timeout=5)  # 5 seconds timeout
-                    except (FutureTimeoutError, TimeoutError):
-                        logger.error(f"⏱️  TIMEOUT: Chunking took too long for {file_info['name']} - SKIPPING")
-                        files_dropped_due_to_memory += 1
-                        files_skipped += 1
-                        del content
-                        force_garbage_collection()
-                        continue
+                    # Image removal and chunking run in a worker process that is
+                    # killed if it exceeds the per-file timeout
+                    chunks = self._prepare_document(content, file_type, file_metadata)
 
                     logger.info(f"✓ Created {len(chunks)} chunks from {file_info['name']}")
 
+                    for image_url in file_metadata.get("image_urls", ()):
+                        image_path = repo_image_path(image_url, file_path, owner, repo)
+                        if image_path:
+                            referenced_images.add(image_path)
+
                     # **IMMEDIATE MEMORY CLEANUP** after chunking
                     del content
                     force_garbage_collection()
 
+                except TaskTimeoutError as e:
+                    logger.error(f"⏱️  TIMEOUT: {e} - SKIPPING {file_path}")
+                    files_skipped += 1
+                    del content
+                    force_garbage_collection()
+                    continue
+
                 except Exception as e:
                     logger.error(f"❌ Error chunking {file_path}: {e}")
                     files_skipped += 1
@@ -585,7 +537,7 @@ class IngestionService:
                     continue
 
                 if not chunks:
-                    logger.warning(f"No chunks created from {file_path}")
+                    logger.warning(f"No chunks created from {file_path} (no content after processing)")
                     files_skipped += 1
                     continue
 
@@ -594,10 +546,11 @@ class IngestionService:
                 # Process embeddings in batches
                 batch_size = 5
                 embedding_batch_failed = False
+                embedding_batch_errors = False
 
                 logger.info(f"🔄 Processing {len(chunks)} chunks in batches of {batch_size}...")
 
-                for j in range(0, len(chunks), batch_size):
+                for j in range(resume_batch * batch_size, len(chunks), batch_size):
                     # **MANUAL SKIP CHECK**
                     if check_manual_skip():
                         logger.warning(f"⏭️  MANUAL SKIP: User requested to skip rest of {file_info['name']}")
@@ -624,7 +577,7 @@ class IngestionService:
 
                     # Generate embeddings
                     try:
-                        embeddings = self.llm_service.get_embeddings(texts)
+                        embeddings = self._get_embeddings(texts)
                         logger.info(f"  ✓ Generated {len(embeddings)} embeddings")
 
                         # Pair embeddings with metadata
@@ -637,10 +590,20 @@ class IngestionService:
                             for chunk, embedding in zip(batch_chunks, embeddings)
                         ]
 
+                        # Journal the batch first so a crash before the insert does not re-embed it
+                        if self.checkpoint and file_sha:
+                            self.checkpoint.save_pending_batch(repository_id, file_path, file_sha, batch_num - 1, batch_items)
+
                         # Insert immediately to free memory
                         logger.info(f"  💾 Storing embeddings in Milvus...")
                         self.vector_client.insert_embeddings_batch(batch_items)
                         total_embeddings_stored += len(batch_items)
+
+                        if self.checkpoint and file_sha:
+                            self.checkpoint.batch_stored(
+                                repository_id, file_path, file_sha, batch_num - 1,
+                                advance_cursor=not embedding_batch_errors
+                            )
                         logger.info(f"  ✓ Stored batch {batch_num}/{total_batches} ({len(batch_items)} embeddings)")
 
                         # Free memory
@@ -649,6 +612,7 @@ class IngestionService:
 
                     except Exception as embed_error:
                         logger.error(f"Failed to generate embeddings for batch {batch_num}: {embed_error}")
+                        embedding_batch_errors = True
                         del batch_chunks, texts
                         gc.collect()
                         continue
@@ -660,6 +624,10 @@ class IngestionService:
                         md_processed += 1
                     elif file_type == "api_definition":
                         api_processed += 1
+                    if file_sha and not embedding_batch_errors:
+                        self.vector_client.delete_stale_file_chunks(repository_id, file_path, file_sha)
+                        if self.checkpoint:
+                            self.checkpoint.complete_file(repository_id, file_path, file_sha)
                     logger.info(f"✓ Completed {file_info['name']} ({file_idx}/{len(all_files)})")
                 else:
                     logger.warning(f"⚠️  Partially processed or skipped {file_info['name']} due to memory constraints")
@@ -695,6 +663,7 @@ class IngestionService:
             "embeddings_stored": total_embeddings_stored,
             "markdown_processed": md_processed,
             "api_files_processed": api_processed,
+            "referenced_images": sorted(referenced_images),
             "repository": repository_id
         }
 
@@ -719,7 +688,7 @@ class IngestionService:
 
         # Generate embeddings
         texts = [chunk["content"] for chunk in chunks]
-        embeddings = self.llm_service.get_embeddings(texts)
+        embeddings = self._get_embeddings(texts)
 
         # Store in Pinecone
         batch_items = []
@@ -768,7 +737,12 @@ class IngestionService:
         # Call the existing ingest_from_github method
         return self.ingest_from_github(owner, repo)
 
-    def ingest_images_from_github(self, owner: str, repo: str) -> Dict[str, Any]:
+    def ingest_images_from_github(
+        self,
+        owner: str,
+        repo: str,
+        image_paths: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         Ingest all image files from a GitHub repository using Google Vision API.
         Processes images one at a time to avoid memory issues.
@@ -777,6 +751,9 @@ class IngestionService:
         Args:
             owner: Repository owner
             repo: Repository name
+            image_paths: Repository paths of the images to ingest (e.g. the
+                         'referenced_images' of ingest_from_github). When given,
+                         the repository is not scanned for image files.
 
         Returns:
             Summary statistics of the ingestion process
@@ -796,8 +773,12 @@ class IngestionService:
         repository_id = f"{owner}/{repo}"
 
         # Step 1: Find all image files
-        logger.info("Step 1: Finding image files in GitHub repository...")
-        image_file_paths = self.github_service.find_all_image_files(owner, repo)
+        if image_paths is not None:
+            logger.info(f"Step 1: Using {len(image_paths)} images referenced from markdown files...")
+            image_file_paths = self._image_files_from_paths(owner, repo, image_paths)
+        else:
+            logger.info("Step 1: Finding image files in GitHub repository...")
+            image_file_paths = self.github_service.find_all_image_files(owner, repo)
 
         if not image_file_paths:
             logger.info("No image files found in the repository")
@@ -829,11 +810,6 @@ class IngestionService:
                     images_skipped += 1
                     continue
 
-                # If image SHA changed, delete old chunks before adding new ones
-                if file_sha:
-                    logger.debug(f"Checking for outdated chunks of {file_path}...")
-                    self.vector_client.delete_file_chunks(repository_id, file_path)
-
                 # Fetch raw image bytes
                 image_bytes = self.github_service.get_file_bytes(owner, repo, file_path)
 
@@ -860,6 +836,7 @@ class IngestionService:
                 # Create metadata for the image
                 file_metadata = {
                     "source": "github",
+                    "source_type": SOURCE_TYPE_IMAGE,
                     "repository": repository_id,
                     "file_path": file_path,
                     "file_name": file_info["name"],
@@ -903,7 +880,7 @@ class IngestionService:
                         }
 
                     # Generate embeddings
-                    embeddings = self.llm_service.get_embeddings(texts)
+                    embeddings = self._get_embeddings(texts)
 
                     # Pair embeddings with metadata
                     batch_items = [
@@ -924,6 +901,10 @@ class IngestionService:
                     del batch_chunks, texts, embeddings, batch_items
                     gc.collect()
 
+                # Remove chunks of the previous version of the image
+                if file_sha:
+                    self.vector_client.delete_stale_file_chunks(repository_id, file_path, file_sha)
+
                 images_processed += 1
                 logger.info(f"✓ Completed image {file_info['name']} ({i}/{len(image_file_paths)})")
 
@@ -948,6 +929,27 @@ class IngestionService:
             "repository": repository_id
         }
 
+    def _image_files_from_paths(self, owner: str, repo: str, image_paths: List[str]) -> List[Dict[str, str]]:
+        """Look up the SHA of known image paths (same format as find_all_image_files)."""
+        image_files = []
+        for path in image_paths:
+            try:
+                metadata = self.github_service.get_file_metadata(owner, repo, path)
+            except Exception as e:
+                logger.warning(f"⚠️  Referenced image not found, skipping: {path} ({e})")
+                continue
+            if metadata.get("size", 0) > MAX_FILE_SIZE_BYTES:
+                logger.warning(f"⚠️  Skipping large image ({metadata['size']} bytes): {path}")
+                continue
+            image_files.append({
+                "path": path,
+                "name": posixpath.basename(path),
+                "url": metadata.get("html_url", ""),
+                "sha": metadata.get("sha", ""),
+                "size": metadata.get("size", 0)
+            })
+        return image_files
+
     def ingest_github_repo_with_images(self, repo_url: str, branch: str = "main") -> Dict[str, Any]:
         """
         Ingest both markdown files and images from a GitHub repository.
@@ -980,8 +982,13 @@ class IngestionService:
         # First, ingest markdown files
         md_result = self.ingest_from_github(owner, repo)
 
-        # Then, ingest images
-        img_result = self.ingest_images_from_github(owner, repo)
+        # Then, ingest images. The images referenced from markdown were recorded
+        # while cleaning it, so the repository is only scanned for image files
+        # when none were found or some markdown files were skipped
+        image_paths = md_result.get("referenced_images")
+        if not image_paths or md_result.get("files_skipped"):
+            image_paths = None
+        img_result = self.ingest_images_from_github(owner, repo, image_paths=image_paths)
 
         # Combine results
         return {
@@ -1001,15 +1008,30 @@ class IngestionService:
             "total_embeddings": md_result.get("embeddings_stored", 0) + img_result.get("embeddings_stored", 0)
         }
 
-    def ingest_org_repositories(self, org: str, keyword: str = "", max_repos: int = None) -> Dict[str, Any]:
+    def ingest_org_repositories(
+        self,
+        org: str,
+        keyword: str = "",
+        max_repos: int = None,
+        max_workers: Optional[int] = None,
+        resume: bool = True
+    ) -> Dict[str, Any]:
         """
         Ingest all markdown files from multiple repositories in an organization,
         optionally filtered by a keyword.
 
+        Repositories are processed by a pool of workers. A memory governor only
+        lets a worker start its next repository while memory is below
+        INGESTION_MEMORY_THRESHOLD (and INGESTION_MAX_RSS_MB, if set).
+
         Args:
             org: Organization name (e.g., 'wso2-enterprise')
             keyword: Optional keyword to filter repositories (e.g., 'choreo')
             max_repos: Optional maximum number of repositories to process
+            max_workers: Number of repositories processed in parallel
+                         (defaults to INGESTION_MAX_WORKERS, 4)
+            resume: Continue an unfinished sweep of the same org/keyword from the
+                    checkpoint journal, skipping repositories it already completed
 
         Returns:
             Summary statistics of the bulk ingestion process
@@ -1050,82 +1072,97 @@ class IngestionService:
             repositories = repositories[:max_repos]
             logger.info(f"Limited to first {max_repos} repositories")
 
-        # Step 2: Process each repository
-        logger.info(f"Step 2: Processing {len(repositories)} repositories...")
+        # Step 2: Process repositories in parallel, admitted by the memory governor
+        if max_workers is None:
+            max_workers = int(os.getenv("INGESTION_MAX_WORKERS", "4"))
+        max_workers = max(1, min(max_workers, len(repositories)))
+        governor = MemoryGovernor(
+            threshold_percent=float(os.getenv("INGESTION_MEMORY_THRESHOLD", "90")),
+            max_rss_mb=float(os.getenv("INGESTION_MAX_RSS_MB", "0")) or None
+        )
+
+        logger.info(f"Step 2: Processing {len(repositories)} repositories with {max_workers} worker(s)...")
+
+        # Workers share one embedding batcher (and the process-wide GitHub rate limiter)
+        owns_batcher = max_workers > 1 and self.embedding_batcher is None
+        if owns_batcher:
+            self.embedding_batcher = EmbeddingBatcher(self.llm_service)
 
         results = []
         total_files_processed = 0
         total_files_skipped = 0
         total_files_dropped_memory = 0
-        total_files_manually_skipped = 0
         total_embeddings_stored = 0
         repos_processed = 0
         repos_failed = 0
+        repos_resumed = 0
+        sweep_start = time.time()
 
-        for i, repo_info in enumerate(repositories, 1):
-            repo_name = repo_info.get("name", "")
-            owner = repo_info.get("owner", org)
-            full_name = repo_info.get("full_name", f"{owner}/{repo_name}")
+        sweep_key = f"{org}:{keyword}"
+        completed_repos = self.checkpoint.begin_sweep(sweep_key, fresh=not resume) if self.checkpoint else {}
 
-            # **MANUAL SKIP CHECK** - Clear skip flag at the start of each repo
-            # This allows skipping individual files within a repo, but continues to next repo
-            if check_manual_skip():
-                logger.info(f"Manual skip flag was set, clearing for next repository: {full_name}")
-                clear_manual_skip()
-
-            logger.info("=" * 80)
-            logger.info(f"Repository {i}/{len(repositories)}: {full_name}")
-            logger.info(f"Description: {repo_info.get('description', 'N/A')}")
-            logger.info(f"Memory before processing: {get_memory_usage()}")
-            logger.info("=" * 80)
-
-            try:
-                # Wait for memory to be available before processing next repo
-                wait_for_memory(
-                    threshold_percent=96.0,  # Adjusted for systems with high baseline memory usage
-                    check_interval=2.0,
-                    timeout=120.0,
-                    raise_on_timeout=True
-                )
-
-                # Ingest this repository
-                result = self.ingest_from_github(owner, repo_name)
-
-                repos_processed += 1
-                total_files_processed += result.get("files_fetched", 0)
-                total_files_skipped += result.get("files_skipped", 0)
-                total_files_dropped_memory += result.get("files_dropped_memory", 0)
-                total_embeddings_stored += result.get("embeddings_stored", 0)
-
-                results.append({
-                    "repository": full_name,
-                    "status": result.get("status", "completed"),
-                    "files_processed": result.get("files_fetched", 0),
-                    "files_skipped": result.get("files_skipped", 0),
-                    "files_dropped_memory": result.get("files_dropped_memory", 0),
-                    "embeddings_stored": result.get("embeddings_stored", 0)
-                })
-
-                logger.info(f"✓ Completed {full_name}: {result.get('files_fetched', 0)} files, {result.get('embeddings_stored', 0)} embeddings" +
-                           (f" (dropped {result.get('files_dropped_memory', 0)} due to memory)" if result.get('files_dropped_memory', 0) > 0 else ""))
-                logger.info(f"Memory after processing: {get_memory_usage()}")
-
-                # Force garbage collection between repositories
-                force_garbage_collection()
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="repo-ingest") as executor:
+                futures = []
+                for i, repo_info in enumerate(repositories, 1):
+                    full_name = repo_info.get("full_name", f"{repo_info.get('owner', org)}/{repo_info.get('name', '')}")
+                    if full_name in completed_repos:
+                        # Completed before the last run stopped - reuse the recorded result
+                        results.append({**completed_repos[full_name], "index": i, "resumed": True})
+                        repos_resumed += 1
+                        continue
+                    futures.append(executor.submit(
+                        self._ingest_repository, repo_info, org, i, len(repositories), governor,
+                        max_workers == 1, sweep_key
+                    ))
+
+                for future in as_completed(futures):
+                    entry = future.result()
+                    results.append(entry)
+
+                    if entry["status"] == "failed":
+                        repos_failed += 1
+                    else:
+                        repos_processed += 1
+                        total_files_processed += entry["files_processed"]
+                        total_files_skipped += entry["files_skipped"]
+                        total_files_dropped_memory += entry["files_dropped_memory"]
+                        total_embeddings_stored += entry["embeddings_stored"]
+
+                    # Per-repo progress report
+                    done = repos_processed + repos_failed
+                    elapsed = time.time() - sweep_start
+                    eta = elapsed / done * (len(futures) - done)
+                    logger.info(
+                        f"📊 Progress {done + repos_resumed}/{len(repositories)} | ✓ {repos_processed} ❌ {repos_failed} | "
+                        f"last: {entry['repository']} ({entry['status']}, {entry['files_processed']} files, "
+                        f"{entry['embeddings_stored']} embeddings, {entry['duration_seconds']:.1f}s) | "
+                        f"active workers: {governor.active} | elapsed {elapsed:.0f}s, ETA {eta:.0f}s"
+                    )
+        finally:
+            if owns_batcher:
+                self.embedding_batcher.close()
+                self.embedding_batcher = None
+
+        results.sort(key=lambda r: r["index"])
+
+        # Keep the sweep open while anything is left to retry
+        if self.checkpoint and repos_failed == 0 and total_files_dropped_memory == 0:
+            self.checkpoint.finish_sweep(sweep_key)
+        if repos_resumed:
+            logger.info(f"♻️  {repos_resumed} repositories were completed in an earlier run and skipped")
 
-            except Exception as e:
-                repos_failed += 1
-                logger.error(f"❌ Failed to process {full_name}: {e}")
-                results.append({
-                    "repository": full_name,
-                    "status": "failed",
-                    "error": str(e),
-                    "files_processed": 0,
-                    "files_skipped": 0,
-                    "files_dropped_memory": 0,
-                    "embeddings_stored": 0
-                })
-                continue
+        logger.info("=" * 80)
+        logger.info("PER-REPOSITORY REPORT")
+        logger.info("=" * 80)
+        for entry in results:
+            logger.info(
+                f"  {'✓' if entry['status'] != 'failed' else '❌'} {entry['repository']}: "
+                f"{entry['files_processed']} files, {entry['files_skipped']} skipped, "
+                f"{entry['embeddings_stored']} embeddings in {entry['duration_seconds']:.1f}s"
+                + (" (earlier run)" if entry.get("resumed") else "")
+                + (f" - {entry['error']}" if entry.get("error") else "")
+            )
 
         logger.info("=" * 80)
         logger.info("BULK INGESTION COMPLETED")
@@ -1138,8 +1175,8 @@ class IngestionService:
         logger.info(f"Total files skipped: {total_files_skipped}")
         if total_files_dropped_memory > 0:
             logger.info(f"Total files dropped due to memory: {total_files_dropped_memory}")
-        logger.info(f"Total files dropped due to memory: {total_files_dropped_memory}")
         logger.info(f"Total embeddings stored: {total_embeddings_stored}")
+        logger.info(f"Wall time: {time.time() - sweep_start:.1f}s (peak workers: {governor.peak_active})")
         logger.info(f"Final memory usage: {get_memory_usage()}")
         logger.info("=" * 80)
 
@@ -1150,9 +1187,103 @@ class IngestionService:
             "repositories_found": len(repositories),
             "repositories_processed": repos_processed,
             "repositories_failed": repos_failed,
+            "repositories_resumed": repos_resumed,
             "total_files_processed": total_files_processed,
             "total_files_skipped": total_files_skipped,
             "total_files_dropped_memory": total_files_dropped_memory,
             "total_embeddings_stored": total_embeddings_stored,
+            "duration_seconds": time.time() - sweep_start,
+            "max_workers": max_workers,
             "details": results
         }
+
+    def _ingest_repository(
+        self,
+        repo_info: Dict[str, Any],
+        org: str,
+        index: int,
+        total: int,
+        governor: MemoryGovernor,
+        sequential: bool,
+        sweep_key: str
+    ) -> Dict[str, Any]:
+        """
+        Ingest one repository of an organization sweep inside a memory governor slot.
+
+        Args:
+            repo_info: Repository info from search_org_repositories()
+            org: Organization name (fallback owner)
+            index: 1-based position of the repository in the sweep
+            total: Number of repositories in the sweep
+            governor: Shared memory governor
+            sequential: True when running with a single worker
+            sweep_key: Checkpoint key of the sweep
+
+        Returns:
+            Per-repository result entry for the sweep report
+        """
+        repo_name = repo_info.get("name", "")
+        owner = repo_info.get("owner", org)
+        full_name = repo_info.get("full_name", f"{owner}/{repo_name}")
+        start_time = time.time()
+
+        # **MANUAL SKIP CHECK** - Clear skip flag at the start of each repo
+        # This allows skipping individual files within a repo, but continues to next repo.
+        # With parallel workers the flag belongs to whichever file checks it first.
+        if sequential and check_manual_skip():
+            logger.info(f"Manual skip flag was set, clearing for next repository: {full_name}")
+            clear_manual_skip()
+
+        try:
+            with governor.slot(f"repository {index}/{total}: {full_name}"):
+                logger.info("=" * 80)
+                logger.info(f"Repository {index}/{total}: {full_name}")
+                logger.info(f"Description: {repo_info.get('description', 'N/A')}")
+                logger.info(f"Memory before processing: {get_memory_usage()}")
+                logger.info("=" * 80)
+
+                # Hard ceiling regardless of how many workers are running
+                wait_for_memory(
+                    threshold_percent=96.0,  # Adjusted for systems with high baseline memory usage
+                    check_interval=2.0,
+                    timeout=120.0,
+                    raise_on_timeout=True
+                )
+
+                # Ingest this repository
+                result = self.ingest_from_github(owner, repo_name)
+
+            logger.info(f"✓ Completed {full_name}: {result.get('files_fetched', 0)} files, {result.get('embeddings_stored', 0)} embeddings" +
+                       (f" (dropped {result.get('files_dropped_memory', 0)} due to memory)" if result.get('files_dropped_memory', 0) > 0 else ""))
+            logger.info(f"Memory after processing: {get_memory_usage()}")
+
+            entry = {
+                "index": index,
+                "repository": full_name,
+                "status": result.get("status", "completed"),
+                "files_processed": result.get("files_fetched", 0),
+                "files_skipped": result.get("files_skipped", 0),
+                "files_dropped_memory": result.get("files_dropped_memory", 0),
+                "embeddings_stored": result.get("embeddings_stored", 0),
+                "duration_seconds": time.time() - start_time
+            }
+
+            # Files dropped under memory pressure are retried when the sweep resumes
+            if self.checkpoint and entry["files_dropped_memory"] == 0:
+                self.checkpoint.complete_repository(sweep_key, full_name, entry)
+
+            return entry
+
+        except Exception as e:
+            logger.error(f"❌ Failed to process {full_name}: {e}")
+            return {
+                "index": index,
+                "repository": full_name,
+                "status": "failed",
+                "error": str(e),
+                "files_processed": 0,
+                "files_skipped": 0,
+                "files_dropped_memory": 0,
+                "embeddings_stored": 0,
+                "duration_seconds": time.time() - start_time
+            }
@@ -1,17 +1,23 @@
 from typing import List, Union, Optional
+import base64
 import sys
 import gc
 from pathlib import Path
 
+import numpy as np
+
 # Add backend to path if needed
 backend_path = Path(__file__).parent.parent
 if str(backend_path) not in sys.path:
     sys.path.insert(0, str(backend_path))
 
 from utils.logger import get_logger
+from utils.embedding_dimensions import embedding_request_options, truncate_embeddings
 
 logger = get_logger(__name__)
 
+OPENAI_EMBEDDING_MODEL = "text-embedding-ada-002"  # Embedding model of the plain OpenAI provider
+
 
 class LLMService:
     """Service for generating embeddings and LLM responses using various providers."""
@@ -23,7 +29,8 @@ class LLMService:
         endpoint: Optional[str] = None,
         api_key: Optional[str] = None,
         deployment: Optional[str] = None,
-        api_version: Optional[str] = None
+        api_version: Optional[str] = None,
+        embedding_dimensions: Optional[int] = None  # Shortened embeddings (text-embedding-3-* natively, other models truncated)
     ):
         self.model_name = model_name
         self.use_openai = use_openai
@@ -34,6 +41,7 @@ class LLMService:
         self.embeddings_deployment = None
         self.model = None
         self.embedding_dimension = None
+        self.embedding_dimensions = embedding_dimensions
         self.use_azure = endpoint is not None and "azure" in endpoint.lower()
         self.embedding_call_count = 0  # Track calls for memory management
 
@@ -60,7 +68,7 @@ class LLMService:
                 api_version=self.api_version or "2024-02-15-preview",
                 azure_endpoint=self.endpoint
             )
-            self.embedding_dimension = 1536  # Default for text-embedding-ada-002
+            self.embedding_dimension = self.embedding_dimensions or 1536  # Default for text-embedding-ada-002
             logger.info("Azure OpenAI initialized successfully")
         except ImportError:
             raise RuntimeError("OpenAI SDK not installed. Install with: pip install openai")
@@ -79,7 +87,7 @@ class LLMService:
                 raise ValueError("OPENAI_API_KEY not found in environment")
 
             self.client = OpenAI(api_key=api_key)
-            self.embedding_dimension = 1536  # text-embedding-ada-002 dimension
+            self.embedding_dimension = self.embedding_dimensions or 1536  # text-embedding-ada-002 dimension
             logger.info("Initialized OpenAI embeddings")
         except ImportError:
             raise RuntimeError("OpenAI not installed. Install with: pip install openai")
@@ -91,7 +99,7 @@ class LLMService:
 
             logger.info(f"Loading SentenceTransformer model: {self.model_name}")
             self.model = SentenceTransformer(self.model_name)
-            self.embedding_dimension = self.model.get_sentence_embedding_dimension()
+            self.embedding_dimension = self.embedding_dimensions or self.model.get_sentence_embedding_dimension()
             logger.info(f"Model loaded. Embedding dimension: {self.embedding_dimension}")
         except ImportError:
             raise RuntimeError("sentence-transformers not installed. Install with: pip install sentence-transformers")
@@ -139,18 +147,20 @@ class LLMService:
             deployment = self.embeddings_deployment or self.deployment
             response = self.client.embeddings.create(
                 input=text,
-                model=deployment
+                model=deployment,
+                **embedding_request_options(self.embedding_dimensions)
             )
             return response.data[0].embedding
         elif self.use_openai:
             response = self.client.embeddings.create(
                 input=text,
-                model="text-embedding-ada-002"
+                model=OPENAI_EMBEDDING_MODEL,
+                **embedding_request_options(self.embedding_dimensions, OPENAI_EMBEDDING_MODEL)
             )
-            return response.data[0].embedding
+            return self._shorten(response.data[0].embedding)
         else:
             embedding = self.model.encode(text, convert_to_tensor=False)
-            return embedding.tolist()
+            return self._shorten(embedding).tolist()
 
     def get_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple texts with memory management."""
@@ -164,7 +174,8 @@ class LLMService:
                 try:
                     response = self.client.embeddings.create(
                         input=batch,
-                        model=deployment
+                        model=deployment,
+                        **embedding_request_options(self.embedding_dimensions)
                     )
                     batch_embeddings = [item.embedding for item in response.data]
                     embeddings.extend(batch_embeddings)
@@ -191,9 +202,10 @@ class LLMService:
                 batch = texts[i:i + batch_size]
                 response = self.client.embeddings.create(
                     input=batch,
-                    model="text-embedding-ada-002"
+                    model=OPENAI_EMBEDDING_MODEL,
+                    **embedding_request_options(self.embedding_dimensions, OPENAI_EMBEDDING_MODEL)
                 )
-                embeddings.extend([item.embedding for item in response.data])
+                embeddings.extend(self._shorten([item.embedding for item in response.data]))
 
                 # Force garbage collection after each batch
                 if i > 0 and i % 50 == 0:
@@ -201,26 +213,7 @@ class LLMService:
 
             return embeddings
         else:
-            # SentenceTransformer with memory management
-            embeddings = self.model.encode(
-                texts,
-                convert_to_tensor=False,
-                show_progress_bar=False,  # Disable progress bar to reduce overhead
-                batch_size=32  # Process in smaller internal batches
-            )
-
-            # Increment call count and clear cache periodically
-            self.embedding_call_count += 1
-
-            # Clear cache every 10 calls
-            if self.embedding_call_count % 10 == 0:
-                self.clear_model_cache()
-
-            # Reinitialize model every 50 calls to fully reset memory
-            if self.embedding_call_count % 50 == 0:
-                logger.info(f"Reloading model after {self.embedding_call_count} embedding calls")
-                self.reinitialize_model()
-
+            embeddings = self._encode_local(texts)
             result = [emb.tolist() for emb in embeddings]
 
             # Clear embeddings from memory
@@ -229,6 +222,83 @@ class LLMService:
 
             return result
 
+    def get_embeddings_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings as one contiguous float32 matrix.
+
+        OpenAI responses are requested base64-encoded and decoded straight
+        into float32, so no per-float Python objects are created; use this
+        for bulk loads instead of get_embeddings().
+
+        Returns:
+            Array of shape (len(texts), dimension)
+        """
+        if not texts:
+            return np.empty((0, self.embedding_dimension or 0), dtype=np.float32)
+
+        if self.use_azure or self.use_openai:
+            model = (self.embeddings_deployment or self.deployment) if self.use_azure else OPENAI_EMBEDDING_MODEL
+            batch_size = 5 if self.use_azure else 10  # Same request sizes as get_embeddings()
+            batches = []
+            for i in range(0, len(texts), batch_size):
+                try:
+                    response = self.client.embeddings.create(
+                        input=texts[i:i + batch_size],
+                        model=model,
+                        encoding_format="base64",
+                        **embedding_request_options(self.embedding_dimensions, None if self.use_azure else model)
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to get embeddings for batch {i//batch_size}: {e}")
+                    raise
+                batches.append(self._shorten(self._response_array(response)))
+                del response
+            return np.concatenate(batches) if len(batches) > 1 else batches[0]
+
+        return np.asarray(self._encode_local(texts), dtype=np.float32)
+
+    @staticmethod
+    def _response_array(response) -> np.ndarray:
+        """Decode the embeddings of a response (base64 or float lists) into a float32 matrix."""
+        data = response.data
+        if data and isinstance(data[0].embedding, str):
+            return np.stack([np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32) for item in data])
+        return np.asarray([item.embedding for item in data], dtype=np.float32)
+
+    def _encode_local(self, texts: List[str]) -> np.ndarray:
+        """Encode texts with the SentenceTransformer model, with memory management."""
+        embeddings = self.model.encode(
+            texts,
+            convert_to_tensor=False,
+            show_progress_bar=False,  # Disable progress bar to reduce overhead
+            batch_size=32  # Process in smaller internal batches
+        )
+
+        # Increment call count and clear cache periodically
+        self.embedding_call_count += 1
+
+        # Clear cache every 10 calls
+        if self.embedding_call_count % 10 == 0:
+            self.clear_model_cache()
+
+        # Reinitialize model every 50 calls to fully reset memory
+        if self.embedding_call_count % 50 == 0:
+            logger.info(f"Reloading model after {self.embedding_call_count} embedding calls")
+            self.reinitialize_model()
+
+        return self._shorten(embeddings)
+
+    def _shorten(self, embeddings):
+        """
+        Cut embeddings a model returned at full size (text-embedding-ada-002,
+        SentenceTransformer models) to embedding_dimensions, re-normalized.
+        Returns embeddings that already have the configured size unchanged.
+        """
+        if self.embedding_dimensions and np.shape(embeddings)[-1] > self.embedding_dimensions:
+            shortened = truncate_embeddings(embeddings, self.embedding_dimensions)
+            return shortened.tolist() if isinstance(embeddings, list) else shortened
+        return embeddings
+
     def get_response(self, prompt: str, max_tokens: int = 4096) -> str:
         """Generate a text response using LLM."""
         system_prompt = """You are DevChoreo, an AI assistant for Choreo platform developers at WSO2.
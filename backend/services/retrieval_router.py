@@ -0,0 +1,109 @@
+"""
+Retrieval Router
+
+Maps a request to the part of the knowledge base it should search. An intent
+("docs", "issues", "wiki", "diagrams") resolves to a set of source types, and
+a request can name the repositories it is about. The resulting SearchScope is
+passed to the vector client, where the source types select partitions of the
+partition-keyed collection instead of searching everything.
+
+Intents are taken from the request when it names them; otherwise they are
+inferred from explicit mentions in the question ("open issues about ...",
+"the architecture diagram of ..."). Questions without such a mention search
+everything.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Pattern, Sequence, Tuple
+
+from ..utils.logger import get_logger
+from ..utils.source_types import INTENT_SOURCE_TYPES
+
+logger = get_logger(__name__)
+
+INTENT_GENERAL = "general"
+
+# Question patterns that select an intent, checked in order
+INTENT_PATTERNS: List[Tuple[str, Pattern]] = [
+    ("issues", re.compile(
+        r"\b(github issues?|(open|closed|known|reported|existing) issues?|bug reports?)\b|\bissue\s*#\d+",
+        re.IGNORECASE
+    )),
+    ("diagrams", re.compile(r"\b(diagrams?|flowcharts?|drawio|draw\.io)\b", re.IGNORECASE)),
+    ("wiki", re.compile(r"\bwiki\b", re.IGNORECASE)),
+]
+
+
+@dataclass(frozen=True)
+class SearchScope:
+    """The part of the knowledge base a search is restricted to."""
+
+    intent: str = INTENT_GENERAL
+    source_types: Optional[Tuple[str, ...]] = None  # None = all source types
+    repositories: Optional[Tuple[str, ...]] = None  # None = all repositories
+
+    @property
+    def is_global(self) -> bool:
+        """Whether the scope covers the whole knowledge base."""
+        return not self.source_types and not self.repositories
+
+
+class RetrievalRouter:
+    """Resolves request intents and repositories to a SearchScope."""
+
+    def __init__(self, infer_intent: bool = True):
+        """
+        Initialize the router.
+
+        Args:
+            infer_intent: Infer the intent from the question when the request names none
+        """
+        self.infer_intent = infer_intent
+
+    def classify(self, question: str) -> str:
+        """Intent of a question from explicit mentions, or 'general'."""
+        for intent, pattern in INTENT_PATTERNS:
+            if pattern.search(question or ""):
+                return intent
+        return INTENT_GENERAL
+
+    def route(
+        self,
+        question: str,
+        intents: Optional[Sequence[str]] = None,
+        repositories: Optional[Sequence[str]] = None
+    ) -> SearchScope:
+        """
+        Build the search scope of a request.
+
+        Args:
+            question: User question
+            intents: Intents named by the request (unknown names are ignored)
+            repositories: Repositories (owner/repo) named by the request
+
+        Returns:
+            SearchScope to pass to the vector search
+        """
+        known = [intent for intent in (intents or []) if intent in INTENT_SOURCE_TYPES]
+        if not known and self.infer_intent:
+            inferred = self.classify(question)
+            known = [inferred] if inferred != INTENT_GENERAL else []
+
+        source_types = None
+        if known:
+            source_types = tuple(dict.fromkeys(
+                source_type for intent in known for source_type in INTENT_SOURCE_TYPES[intent]
+            ))
+
+        scope = SearchScope(
+            intent="+".join(known) or INTENT_GENERAL,
+            source_types=source_types,
+            repositories=tuple(dict.fromkeys(repositories)) if repositories else None
+        )
+        if not scope.is_global:
+            logger.info(
+                f"🧭 Routing '{scope.intent}' search to source types {scope.source_types or 'all'}, "
+                f"repositories {scope.repositories or 'all'}"
+            )
+        return scope
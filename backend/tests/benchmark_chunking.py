@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark the chunking engine, in MB/s.
+
+Usage:
+    python backend/tests/benchmark_chunking.py [file.md | spec.yaml ...]
+
+Without arguments a synthetic OpenAPI spec (~12MB), worst-case texts without
+any line breaks, and a synthetic markdown document (~6MB) are benchmarked with
+the boundary index and with every markdown entry point (DocumentChunker,
+chunk_markdown and the wiki chunker). Pass paths to large files of a
+repository to measure real inputs.
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add project root and backend to path (the wiki module is imported top-level)
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+from backend.utils.boundary_index import BoundaryIndex
+from backend.utils.chunking import chunk_markdown
+from backend.utils.document_processing import DocumentChunker
+
+CHUNK_SIZE = 3000
+CHUNK_OVERLAP = 200
+SEARCH_WINDOW = 300
+RUNS = 3
+
+
+def synthetic_openapi_spec(paths: int = 60000) -> str:
+    """Build a large OpenAPI-like YAML document."""
+    lines = ["openapi: 3.0.0\ninfo:\n  title: Benchmark API\n  version: 1.0.0\npaths:\n"]
+    for i in range(paths):
+        lines.append(
+            f"  /items/{i}:\n"
+            f"    get:\n"
+            f"      summary: Get item {i}. Returns the item!\n"
+            f"      description: Long description of the operation with several words\n"
+            f"      responses:\n"
+            f"        '200':\n"
+            f"          description: OK\n\n"
+        )
+    return "".join(lines)
+
+
+def synthetic_markdown(sections: int = 6000) -> str:
+    """Build a large markdown document with headers, lists, tables and code blocks."""
+    parts = ["# Benchmark Guide\n\nIntroduction to the guide.\n\n"]
+    for i in range(sections):
+        parts.append(
+            f"## Section {i}\n\n"
+            f"Section {i} explains one feature. It has a few sentences! Does it work? Yes.\n\n"
+            f"- First item of section {i}\n- Second item\n  continued on the next line\n\n"
+            f"| Key | Value |\n|-----|-------|\n| a{i} | b{i} |\n\n"
+            f"```python\n# Example {i}\ndef handler_{i}(event):\n\n    return event\n```\n\n"
+            f"### Notes {i}\n\nShort notes for section {i}.\n\n"
+        )
+    return "".join(parts)
+
+
+def entry_points():
+    """Chunking entry points to benchmark: name -> function(text) returning chunks."""
+    chunker = DocumentChunker(CHUNK_SIZE, CHUNK_OVERLAP)
+    functions = {
+        "boundary index": lambda text: [
+            span for span in BoundaryIndex(text).split_points(CHUNK_SIZE, CHUNK_OVERLAP, SEARCH_WINDOW)
+            if text[span[0]:span[1]].strip()
+        ],
+        "DocumentChunker": chunker.chunk_text,
+        "chunk_markdown": chunk_markdown,
+    }
+
+    try:
+        from wiki_ingestion.services.wiki_chunking_service import WikiChunkingService
+        functions["wiki chunker"] = WikiChunkingService(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)._smart_chunk
+    except ImportError as e:
+        print(f"  (wiki chunker skipped: {e})")
+
+    return functions
+
+
+def benchmark(name: str, text: str, chunk_function):
+    """Chunk a text RUNS times and print the best throughput."""
+    size_mb = len(text.encode("utf-8")) / (1024 * 1024)
+    best = float("inf")
+    chunks = 0
+
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        chunks = len(chunk_function(text))
+        best = min(best, time.perf_counter() - start)
+
+    print(f"  {name:<48} {size_mb:8.2f} MB  {chunks:7d} chunks  {best * 1000:9.1f} ms  {size_mb / best:8.1f} MB/s")
+
+
+def main():
+    print("=" * 100)
+    print(f"Chunking benchmark (chunk_size={CHUNK_SIZE}, overlap={CHUNK_OVERLAP}, best of {RUNS})")
+    print("=" * 100)
+
+    functions = entry_points()
+
+    if len(sys.argv) > 1:
+        inputs = [(Path(path).name, Path(path).read_text(encoding="utf-8", errors="replace")) for path in sys.argv[1:]]
+    else:
+        inputs = [
+            ("synthetic OpenAPI spec", synthetic_openapi_spec()),
+            ("synthetic markdown", synthetic_markdown()),
+            ("no line breaks (spaces only)", "word " * 1_000_000),
+            ("no break points at all", "x" * 5_000_000),
+        ]
+
+    for input_name, text in inputs:
+        print()
+        for function_name, chunk_function in functions.items():
+            benchmark(f"{input_name} / {function_name}", text, chunk_function)
+
+    print("\n✓ Benchmark complete")
+
+
+if __name__ == "__main__":
+    main()
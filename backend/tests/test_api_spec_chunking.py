@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Test structure-aware chunking of OpenAPI/AsyncAPI definitions."""
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+OPENAPI_SPEC = """
+openapi: 3.0.0
+info:
+  title: Pet Store
+  version: 1.0.0
+paths:
+  /pets/{petId}:
+    parameters:
+      - {name: petId, in: path, required: true, schema: {type: string}}
+    get:
+      operationId: getPet
+      summary: Get a pet
+      responses:
+        '200':
+          description: OK
+          content:
+            application/json:
+              schema: {$ref: '#/components/schemas/Pet'}
+    delete:
+      operationId: deletePet
+      responses:
+        '204': {description: Deleted}
+components:
+  schemas:
+    Pet:
+      type: object
+      required: [name]
+      properties:
+        name: {type: string, description: Pet name}
+        parent: {$ref: '#/components/schemas/Pet'}
+        owner: {$ref: '#/components/schemas/Owner'}
+    Owner: {type: object, properties: {address: {$ref: '#/components/schemas/Address'}}}
+    Address: {type: object, properties: {geo: {$ref: '#/components/schemas/Geo'}}}
+    Geo: {type: object, properties: {lat: {type: number}}}
+"""
+
+ASYNCAPI_SPEC = """
+asyncapi: 2.6.0
+info: {title: Events, version: '1'}
+channels:
+  user/signedup:
+    subscribe:
+      message:
+        name: UserSignedUp
+        payload: {type: object, properties: {email: {type: string}}}
+"""
+
+try:
+    from backend.utils.api_spec_chunking import chunk_api_spec
+    from backend.utils.document_processing import prepare_document
+    print("✓ Successfully imported API spec chunking")
+
+    chunks = chunk_api_spec(OPENAPI_SPEC, chunk_size=3000, max_schema_depth=3)
+    sections = [section for _, _, section in chunks]
+    print(f"\n✓ OpenAPI spec: {len(chunks)} chunk(s): {sections}")
+    assert sections == ["overview", "GET /pets/{petId}", "DELETE /pets/{petId}", "schemas Geo"], sections
+
+    get_pet = chunks[1][0]
+    assert "Operation ID: getPet" in get_pet
+    assert "- petId (path, string, required)" in get_pet
+    assert "- name (string, required): Pet name" in get_pet
+    assert get_pet.count("- name (") == 1, "recursive schema expanded twice"
+    print("✓ Operation chunk has parameters and resolved schemas")
+
+    # The same spec as JSON gives the same chunks
+    import yaml
+    assert chunk_api_spec(json.dumps(yaml.safe_load(OPENAPI_SPEC))) == chunks
+    print("✓ JSON and YAML specs chunk identically")
+
+    async_chunks = chunk_api_spec(ASYNCAPI_SPEC)
+    assert async_chunks[1][2] == "SUBSCRIBE user/signedup"
+    assert "- email (string)" in async_chunks[1][0]
+    print(f"✓ AsyncAPI spec: {len(async_chunks)} chunk(s)")
+
+    # Oversized operations are split at line boundaries
+    small = chunk_api_spec(OPENAPI_SPEC, chunk_size=150)
+    assert all(len(text) <= 150 for text, _, _ in small)
+    print(f"✓ Small chunk size: {len(small)} chunk(s), all within 150 chars")
+
+    # Other YAML files fall back to text chunking
+    assert chunk_api_spec("name: my-service\nreplicas: 2\n") is None
+    cleaned, spans, api_chunks, image_urls = prepare_document("name: my-service\n", "api_definition", 3000, 200)
+    assert api_chunks is None and list(spans) == [0, 17]
+    print("✓ Non-API YAML falls back to text chunking")
+
+    # API definitions over 1 MB are fetched and chunked instead of being skipped
+    from backend.services.ingestion import MAX_DOCUMENT_FILE_SIZE, max_file_size
+    assert max_file_size("api_definition") > 5 * MAX_DOCUMENT_FILE_SIZE
+    assert max_file_size("markdown") == MAX_DOCUMENT_FILE_SIZE
+    print("✓ API definitions get a larger file size limit")
+
+    print("\n✓ All tests passed!")
+
+except Exception as e:
+    print(f"✗ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Test reduced-dimension embeddings and two-stage (prefix, then full vector) search."""
+import os
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+class FakeEmbeddingsClient:
+    """OpenAI client returning full-size 3-dimensional embeddings and recording request arguments."""
+
+    def __init__(self):
+        self.requests = []
+        self.embeddings = self
+
+    def create(self, input, model, **kwargs):
+        self.requests.append(kwargs)
+        texts = [input] if isinstance(input, str) else input
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[3.0, 4.0, 12.0]) for _ in texts])
+
+
+class FakeMilvusClient:
+    """Describes a two-stage collection with a 16-dimensional search_vector field."""
+
+    def describe_collection(self, collection_name):
+        return {"fields": [
+            {"name": "id", "type": "INT64"},
+            {"name": "vector", "type": "FLOAT_VECTOR", "params": {"dim": 64}},
+            {"name": "search_vector", "type": "FLOAT_VECTOR", "params": {"dim": 16}},
+        ]}
+
+
+try:
+    from backend.db.local_vector_client import LocalVectorClient
+    from backend.db.milvus_schema import CollectionSpec, MilvusSchemaManager
+    from backend.utils.embedding_dimensions import embedding_request_options, truncate_embeddings
+    print("✓ Successfully imported embedding dimension helpers")
+
+    assert embedding_request_options(256) == {"dimensions": 256}
+    assert embedding_request_options(None) == {} and embedding_request_options(0) == {}
+    assert embedding_request_options(256, "text-embedding-3-small") == {"dimensions": 256}
+    assert embedding_request_options(256, "text-embedding-ada-002") == {}
+    print("✓ The dimensions parameter is only sent when configured")
+
+    prefix = truncate_embeddings([[3.0, 4.0, 12.0], [0.0, 2.0, 1.0]], 2)
+    assert np.allclose(prefix, [[0.6, 0.8], [0.0, 1.0]])
+    assert truncate_embeddings([3.0, 4.0, 12.0], 2, normalize=False).tolist() == [3.0, 4.0]
+    try:
+        truncate_embeddings([1.0, 2.0], 3)
+        raise AssertionError("Truncating to a longer dimension should fail")
+    except ValueError:
+        pass
+    print("✓ Embeddings are truncated to re-normalized prefixes")
+
+    from backend.services.llm_service import LLMService
+    service = LLMService.__new__(LLMService)  # Plain OpenAI provider (text-embedding-ada-002) without a key
+    service.use_azure, service.use_openai, service.embedding_dimensions = False, True, 2
+    service.client = FakeEmbeddingsClient()
+    assert np.allclose(service.get_embedding("q"), [0.6, 0.8])
+    assert np.allclose(service.get_embeddings(["a", "b"]), [[0.6, 0.8], [0.6, 0.8]])
+    assert service.client.requests == [{}, {}]
+    print("✓ text-embedding-ada-002 gets no dimensions parameter; its embeddings are truncated")
+
+    os.environ["MILVUS_SEARCH_DIMENSION"] = "16"
+    spec = CollectionSpec.from_env(dimension=64)
+    assert spec.search_dimension == 16
+    try:
+        CollectionSpec.from_env(dimension=16)
+        raise AssertionError("A search dimension of the full dimension should fail")
+    except ValueError:
+        pass
+    print("✓ MILVUS_SEARCH_DIMENSION is read and validated")
+
+    from backend.github_issues_ingestion.config import Settings
+    os.environ.update({
+        "GITHUB_TOKEN": "token", "AZURE_OPENAI_API_KEY": "key", "AZURE_OPENAI_ENDPOINT": "https://example",
+        "AZURE_OPENAI_EMBEDDINGS_DEPLOYMENT": "embeddings", "AZURE_OPENAI_API_VERSION": "2024-02-01",
+        "MILVUS_URI": "http://milvus", "MILVUS_TOKEN": "token", "EMBEDDING_DIMENSIONS": "512",
+    })
+    os.environ.pop("MILVUS_DIMENSION", None)
+    settings = Settings.from_env()
+    assert settings.embedding_dimensions == 512 and settings.milvus_dimension == 512
+    print("✓ Issue ingestion settings read EMBEDDING_DIMENSIONS")
+
+    rng = np.random.default_rng(0)
+    # Leading dimensions carry most of the variance, as in Matryoshka embeddings
+    vectors = rng.standard_normal((2000, 64)).astype(np.float32) / (1 + np.arange(64, dtype=np.float32) / 4)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    query = vectors[7] + 0.02 * rng.standard_normal(64).astype(np.float32)
+    query /= np.linalg.norm(query)
+    exact = np.argsort(-(vectors @ query))[:5]
+
+    manager = MilvusSchemaManager(FakeMilvusClient(), spec)
+    row = {"id": 1, "vector": vectors[0].tolist()}
+    manager.prepare_rows("docs", [row])
+    assert np.allclose(row["search_vector"], truncate_embeddings(vectors[0], 16), atol=1e-6)
+    assert len(row["vector"]) == 64
+    print("✓ Rows of two-stage collections get their search vector")
+
+    request = manager.search_request("docs", query.tolist(), top_k=5)
+    assert request["anns_field"] == "search_vector" and request["limit"] == 20
+    assert len(request["data"][0]) == 16 and "vector" in request["output_fields"]
+    candidates = np.argsort(-(truncate_embeddings(vectors, 16) @ np.asarray(request["data"][0])))[:20]
+    matches = [{"id": int(i), "distance": 0.0, "entity": {"vector": vectors[i].tolist()}} for i in candidates]
+    finished = manager.finish_search("docs", query.tolist(), matches, top_k=5)
+    assert len(finished) == 5 and finished[0]["id"] == int(exact[0])
+    assert np.isclose(finished[0]["distance"], vectors[exact[0]] @ query, atol=1e-5)
+    print("✓ Searches run on the prefix field and are reranked on the full vectors")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = LocalVectorClient(tmp, "docs", dimension=64, search_dimension=16, rescore_factor=8)
+        client.upsert_batch([{"id": i, "content": f"chunk {i}", "vector": v} for i, v in enumerate(vectors)])
+        found = client.query_similar(query.tolist(), top_k=5)
+        assert [r["id"] for r in found] == exact.tolist()
+        assert np.isclose(found[0]["score"], vectors[exact[0]] @ query, atol=1e-5)
+
+        client.upsert_batch([{"id": 99999, "content": "new", "vector": vectors[3]}])
+        assert {r["id"] for r in client.query_similar(vectors[3].tolist(), top_k=2)} == {3, 99999}
+        client.close()
+    print("✓ Local two-stage search matches exact search and picks up new rows")
+
+    print("\n✓ All tests passed!")
+
+except Exception as e:
+    print(f"✗ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
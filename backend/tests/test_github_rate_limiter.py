@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Test the shared GitHub rate limiter: buckets, priority reserves, header updates and back-off."""
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def acquire_in_thread(limiter, **kwargs):
+    """Start an acquire() call in a thread and return the thread and its completion time."""
+    done = {}
+
+    def target():
+        limiter.acquire(**kwargs)
+        done["at"] = time.perf_counter()
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread, done
+
+
+try:
+    from backend.utils.github_rate_limiter import (
+        GitHubRateLimiter,
+        get_rate_limiter,
+        bucket_for_url,
+        BUCKET_CORE,
+        PRIORITY_INTERACTIVE,
+        PRIORITY_NORMAL,
+        PRIORITY_BACKGROUND,
+    )
+    print("✓ Successfully imported GitHubRateLimiter")
+
+    assert bucket_for_url("https://api.github.com/graphql") == "graphql"
+    assert bucket_for_url("https://api.github.com/search/issues?q=x") == "search"
+    assert bucket_for_url("https://api.github.com/repos/o/r/issues") == "core"
+    print("✓ URLs map to their rate-limit buckets")
+
+    # 15 of 100 left: background keeps 20 in reserve, normal 5, interactive none
+    limiter = GitHubRateLimiter()
+    limiter.update(BUCKET_CORE, remaining=15, reset=time.time() + 3600, limit=100)
+    background, background_done = acquire_in_thread(limiter, priority=PRIORITY_BACKGROUND)
+    started = time.perf_counter()
+    limiter.acquire(priority=PRIORITY_NORMAL)
+    limiter.acquire(priority=PRIORITY_INTERACTIVE)
+    assert time.perf_counter() - started < 0.5
+    background.join(0.5)
+    assert background.is_alive() and limiter.get_status()["core"]["remaining"] == 13
+    print("✓ Background callers wait on the reserve that normal and interactive callers may spend")
+
+    # A new window releases the waiting caller
+    limiter.update(BUCKET_CORE, remaining=5000, reset=time.time() + 7200, limit=5000)
+    background.join(2.0)
+    assert not background.is_alive() and limiter.get_status()["core"]["remaining"] == 4999
+    print("✓ A new rate-limit window wakes waiting callers")
+
+    limiter = GitHubRateLimiter()
+    reset = time.time() + 3600
+    limiter.update(BUCKET_CORE, remaining=100, reset=reset, limit=5000)
+    limiter.update(BUCKET_CORE, remaining=120, reset=reset)
+    assert limiter.get_status()["core"]["remaining"] == 120
+    limiter.update(BUCKET_CORE, remaining=4000, reset=reset - 3600)
+    assert limiter.get_status()["core"]["remaining"] == 120
+    limiter.update(BUCKET_CORE, remaining=500)
+    limiter.update(BUCKET_CORE, remaining=90)
+    assert limiter.get_status()["core"]["remaining"] == 90
+    limiter.update_from_headers({
+        "X-RateLimit-Remaining": "29", "X-RateLimit-Limit": "30",
+        "X-RateLimit-Reset": str(int(reset)), "X-RateLimit-Resource": "search",
+    })
+    assert limiter.get_status()["search"] == {"limit": 30, "remaining": 29, "reset": float(int(reset))}
+    print("✓ Headers for the current window replace the estimate; older windows are ignored")
+
+    # A secondary limit before any headers were seen still pauses non-interactive callers
+    limiter = GitHubRateLimiter()
+    limiter.penalize(BUCKET_CORE, 0.6)
+    started = time.perf_counter()
+    limiter.acquire(priority=PRIORITY_INTERACTIVE)
+    assert time.perf_counter() - started < 0.2
+    limiter.acquire(priority=PRIORITY_BACKGROUND)
+    assert time.perf_counter() - started >= 0.5
+    print("✓ Secondary rate limit back-off applies on a cold start, except to interactive callers")
+
+    # Both import paths must share one scheduler (backend/ is also on sys.path in the app)
+    sys.path.insert(0, str(project_root / "backend"))
+    from backend.github_issues_ingestion.services import github_issue_fetcher
+    assert github_issue_fetcher.get_rate_limiter() is get_rate_limiter()
+    assert "utils.github_rate_limiter" not in sys.modules
+    print("✓ The issue fetcher shares the process-wide rate limiter")
+
+    print("\n✓ All tests passed!")
+
+except Exception as e:
+    print(f"✗ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
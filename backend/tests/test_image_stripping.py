@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Test single-pass removal of images from markdown and recording of their URLs."""
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+MARKDOWN = """# Title
+
+Intro text ![logo](./img/logo.png "Logo") more.
+
+![diagram][arch]
+
+<IMG src='docs/flow.svg' width=300>
+
+
+
+Paragraph after blank lines, see [x]: not a definition.
+
+[arch]: images/arch.png
+[link]: https://example.com
+
+End ![spaced](<my image.png>)
+"""
+
+try:
+    from backend.utils.document_processing import strip_markdown_images, remove_images_from_markdown
+    print("✓ Successfully imported image stripping")
+
+    cleaned, urls = strip_markdown_images(MARKDOWN)
+    assert cleaned == (
+        "# Title\n\nIntro text  more.\n\n"
+        "Paragraph after blank lines, see [x]: not a definition.\n\nEnd"
+    ), repr(cleaned)
+    print("✓ Images, reference definitions and img tags removed, blank lines collapsed")
+
+    assert urls == ["./img/logo.png", "docs/flow.svg", "images/arch.png", "my image.png"], urls
+    print(f"✓ Recorded {len(urls)} image URLs (link definitions are not images)")
+
+    assert remove_images_from_markdown(MARKDOWN) == cleaned
+    assert strip_markdown_images("") == ("", [])
+    assert strip_markdown_images("a\n\n\n\n![x](x.png)\n\n\n\nb")[0] == "a\n\nb"
+    print("✓ Blank lines around removed images collapse to one")
+
+    assert strip_markdown_images("See the diagram [Figure 1]: ![arch](docs/arch.png) for details.") == (
+        "See the diagram [Figure 1]:  for details.", ["docs/arch.png"]
+    )
+    assert strip_markdown_images('Footnote [1]: <img src="a.png"> done') == ("Footnote [1]:  done", ["a.png"])
+    assert strip_markdown_images("   [logo]: img/logo.png\ntext") == ("text", ["img/logo.png"])
+    print("✓ Images after a mid-line '[label]:' are still removed")
+
+    from backend.services.ingestion import repo_image_path
+    assert repo_image_path("./img/logo.png", "docs/guide/README.md", "org", "repo") == "docs/guide/img/logo.png"
+    assert repo_image_path("/assets/a.png", "docs/README.md", "org", "repo") == "assets/a.png"
+    assert repo_image_path(
+        "https://github.com/org/repo/blob/main/docs/a.PNG?raw=true", "README.md", "org", "repo"
+    ) == "docs/a.PNG"
+    assert repo_image_path("https://example.com/a.png", "README.md", "org", "repo") is None
+    assert repo_image_path("../../a.png", "docs/README.md", "org", "repo") is None
+    print("✓ Image URLs resolve to repository paths")
+
+    print("\n✓ All tests passed!")
+
+except Exception as e:
+    print(f"✗ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Test the ingestion checkpoint journal: file resume and skip, pending batches, sweeps and collections."""
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+class FakeVectorClient:
+    """Reports files stored in the collection at a given SHA."""
+
+    def __init__(self, collection_name, stored=None):
+        self.collection_name = collection_name
+        self.stored = stored or {}
+
+    def file_already_processed(self, repository_id, file_path, file_sha):
+        return self.stored.get((repository_id, file_path)) == file_sha
+
+
+def tree_entry(path, sha, size=100):
+    return {"path": path, "name": Path(path).name, "sha": sha, "size": size, "file_type": "markdown"}
+
+
+try:
+    from backend.utils.ingestion_checkpoint import IngestionCheckpoint, STATUS_COMPLETED, STATUS_IN_PROGRESS
+    print("✓ Successfully imported IngestionCheckpoint")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "checkpoint.sqlite")
+        journal = IngestionCheckpoint(path, collection="docs_v1")
+
+        journal.start_file("o/r", "a.md", "sha1")
+        batch = [{"content": f"chunk {i}", "vector": [0.5 * i, 1.0, 2.0], "metadata": {"chunk_index": i}} for i in range(3)]
+        journal.save_pending_batch("o/r", "a.md", "sha1", 0, batch)
+        journal.batch_stored("o/r", "a.md", "sha1", 0)
+        journal.save_pending_batch("o/r", "a.md", "sha1", 1, batch)
+        journal.close()
+
+        # A restarted run sees the batch cursor and the batch that was never confirmed
+        journal = IngestionCheckpoint(path, collection="docs_v1")
+        assert journal.get_file_state("o/r", "a.md", "sha1") == {"status": STATUS_IN_PROGRESS, "batches_done": 1}
+        assert journal.get_file_state("o/r", "a.md", "sha2") is None
+        pending = journal.pending_batches("o/r")
+        assert [(p["file_path"], p["batch_index"]) for p in pending] == [("a.md", 1)]
+        assert pending[0]["items"] == batch
+        journal.batch_stored("o/r", "a.md", "sha1", 1)
+        journal.complete_file("o/r", "a.md", "sha1")
+        assert journal.pending_batches("o/r") == [] and journal.completed_files("o/r") == {"a.md": "sha1"}
+        print("✓ Batch cursors and unconfirmed batches survive a restart")
+
+        assert journal.begin_sweep("org") == {}
+        journal.complete_repository("org", "o/r", {"files_processed": 1})
+        assert IngestionCheckpoint(path, collection="docs_v1").begin_sweep("org") == {"o/r": {"files_processed": 1}}
+        journal.finish_sweep("org")
+        assert journal.begin_sweep("org") == {}
+        print("✓ Unfinished sweeps resume; finished sweeps start over")
+
+        other = IngestionCheckpoint(path, collection="docs_v2")
+        assert other.completed_files("o/r") == {} and other.get_file_state("o/r", "a.md", "sha1") is None
+        other.start_file("o/r", "a.md", "sha1")
+        other.reset()
+        assert journal.completed_files("o/r") == {"a.md": "sha1"}
+        other.close()
+        print("✓ Progress is kept per collection and reset only touches its own collection")
+
+        # Ingestion resumes interrupted files, skips stored ones and plans new ones from the start
+        os.environ["INGESTION_CHECKPOINT_PATH"] = path
+        os.environ["INGESTION_PROCESS_POOL"] = "false"
+        from backend.services.ingestion import IngestionService
+        journal.start_file("o/r", "b.md", "shab")
+        journal.batch_stored("o/r", "b.md", "shab", 0)
+        journal.batch_stored("o/r", "b.md", "shab", 1)
+        journal.close()
+
+        service = IngestionService(None, None, FakeVectorClient("docs_v1", {("o/r", "c.md"): "shac"}))
+        assert service.checkpoint.collection == "docs_v1"
+        assert service._plan_file("o/r", tree_entry("b.md", "shab")) == 2
+        assert service._plan_file("o/r", tree_entry("c.md", "shac")) is None
+        assert service.checkpoint.get_file_state("o/r", "c.md", "shac")["status"] == STATUS_COMPLETED
+        assert service._plan_file("o/r", tree_entry("d.md", "shad")) == 0
+        assert service._plan_file("o/r", tree_entry("e.md", "shae", size=10 ** 9)) is None
+        service.checkpoint.close()
+
+        fresh = IngestionService(None, None, FakeVectorClient("docs_v3"))
+        assert fresh._plan_file("o/r", tree_entry("b.md", "shab")) == 0
+        assert fresh._plan_file("o/r", tree_entry("a.md", "sha1")) == 0
+        fresh.checkpoint.close()
+        print("✓ Files are resumed or skipped from the journal of the service's collection only")
+
+        legacy = str(Path(tmp) / "legacy.sqlite")
+        conn = sqlite3.connect(legacy)
+        conn.executescript(
+            "CREATE TABLE files (repository TEXT, file_path TEXT, file_sha TEXT, status TEXT,"
+            " batches_done INTEGER, updated_at REAL, PRIMARY KEY (repository, file_path));"
+            "INSERT INTO files VALUES ('o/r', 'a.md', 'sha1', 'completed', 1, 0);"
+        )
+        conn.commit()
+        conn.close()
+        migrated = IngestionCheckpoint(legacy, collection="docs_v1")
+        assert migrated.completed_files("o/r") == {}
+        migrated.start_file("o/r", "a.md", "sha1")
+        assert migrated.get_file_state("o/r", "a.md", "sha1")["batches_done"] == 0
+        migrated.close()
+        print("✓ Journals written before collections were tracked are discarded")
+
+    print("\n✓ All tests passed!")
+
+except Exception as e:
+    print(f"✗ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
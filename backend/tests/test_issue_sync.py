@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Test incremental issue sync: keyset pagination, watermarks, hash skips and per-collection state."""
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import requests
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def timestamp(seconds: int) -> str:
+    return (START + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class FakeIssuesAPI:
+    """The REST issues listing: since filter (inclusive), sorting and GitHub's 10-page limit."""
+
+    def __init__(self, issues):
+        self.issues = issues
+        self.requests = []
+
+    def __call__(self, url, params=None):
+        params = dict(params or {})
+        self.requests.append(params)
+        if params["page"] > 10:
+            raise requests.exceptions.HTTPError(response=SimpleNamespace(status_code=422))
+        items = [i for i in self.issues if not params.get("since") or parse(i["updated_at"]) >= parse(params["since"])]
+        items.sort(key=lambda i: (i["updated_at"], i["id"]), reverse=params.get("direction") == "desc")
+        start = (params["page"] - 1) * params["per_page"]
+        return [dict(i) for i in items[start:start + params["per_page"]]]
+
+
+def make_issue(number: int, updated: int, body: str = "body") -> dict:
+    return {
+        "id": 1000 + number, "number": number, "title": f"Issue {number}", "body": body, "state": "open",
+        "created_at": timestamp(0), "updated_at": timestamp(updated), "comments": 0,
+        "labels": [], "assignees": [], "html_url": f"https://github.com/o/r/issues/{number}",
+    }
+
+
+class FakeTextProcessor:
+    def process_issue(self, issue):
+        return f"{issue.title}\n{issue.body}"
+
+
+class FakeChunker:
+    def chunk_text(self, text, metadata=None):
+        from backend.github_issues_ingestion.models.chunk import TextChunk
+        return [TextChunk(content=text, chunk_index=0, total_chunks=1, metadata=dict(metadata or {}))]
+
+
+class FakeEmbeddings:
+    def create_embeddings_batch(self, texts):
+        return [[0.1, 0.2] for _ in texts]
+
+
+class FakeVectorStore:
+    def __init__(self):
+        self.stored = []
+
+    def store_chunks_batch(self, chunks, vectors):
+        self.stored.extend(chunk.metadata["issue_number"] for chunk in chunks)
+        return [f"{chunk.metadata['issue_number']}-{chunk.chunk_index}" for chunk in chunks]
+
+    def get_ids(self, filter_dict, limit=None):
+        return []
+
+    def delete_by_ids(self, ids):
+        pass
+
+
+try:
+    from backend.github_issues_ingestion.services.github_issue_fetcher import GitHubIssueFetcher
+    from backend.github_issues_ingestion.services.ingestion_orchestrator import IngestionOrchestrator
+    from backend.github_issues_ingestion.services.sync_state_store import SQLiteSyncStateStore
+    from backend.github_issues_ingestion.interfaces.sync_state_store import IssueSyncState
+    from backend.utils.github_rate_limiter import GitHubRateLimiter
+    print("✓ Successfully imported issue sync components")
+
+    def make_fetcher(api):
+        fetcher = GitHubIssueFetcher("token", rate_limiter=GitHubRateLimiter(), api_backend="rest")
+        fetcher._make_request = api
+        return fetcher
+
+    # More issues than GitHub lists with page offsets, plus a full page updated in the same second
+    issues = [make_issue(n, 10 * n) for n in range(1, 2501)]
+    issues += [make_issue(n, 30000) for n in range(2501, 2651)]
+    api = FakeIssuesAPI(issues)
+    listed = [i["number"] for page in make_fetcher(api)._iter_issue_data_pages("o", "r") for i in page]
+    assert sorted(listed) == list(range(1, 2651)) and len(listed) == len(set(listed))
+    assert listed[:2500] == list(range(1, 2501))
+    assert max(r["page"] for r in api.requests) <= 2
+    print("✓ Full listings page by update time past GitHub's page limit, oldest first, without duplicates")
+
+    sample = make_fetcher(FakeIssuesAPI(issues[:300])).fetch_issues("o", "r", max_issues=5)
+    assert [issue.number for issue in sample] == [300, 299, 298, 297, 296]
+    print("✓ max_issues still returns the most recently updated issues")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "sync.sqlite")
+        store = SQLiteSyncStateStore(path, collection="issues_v1")
+        vector_store = FakeVectorStore()
+
+        def run(api_issues, sync_state):
+            orchestrator = IngestionOrchestrator(
+                make_fetcher(FakeIssuesAPI(api_issues)), FakeTextProcessor(), FakeChunker(),
+                FakeEmbeddings(), vector_store, batch_size=50, sync_state=sync_state
+            )
+            return orchestrator.ingest_repository("o", "r")
+
+        stats = run(issues[:2500], store)
+        assert stats["new_issues"] == 2500 and sorted(vector_store.stored) == list(range(1, 2501))
+        assert parse(store.get_watermark("o/r", "all|")) == parse(timestamp(25000))
+        print("✓ A full sync of 2500 issues stores all of them and moves the watermark to the last one")
+
+        changed = [dict(i) for i in issues[:2500]]
+        changed[9] = make_issue(10, 40000, body="edited")  # New content
+        changed[19] = make_issue(20, 40010)  # Only the update time changed
+        vector_store.stored.clear()
+        stats = run(changed, store)
+        assert vector_store.stored == [10]
+        assert stats["total_issues"] == 3 and stats["updated_issues"] == 1 and stats["skipped_issues"] == 2
+        assert store.get_issue_states("o/r")[20].updated_at == parse(timestamp(40010)).isoformat()
+        assert parse(store.get_watermark("o/r", "all|")) == parse(timestamp(40010))
+        print("✓ Incremental runs fetch from the watermark and skip issues with unchanged content")
+
+        other = SQLiteSyncStateStore(path, collection="issues_v2")
+        assert other.get_watermark("o/r", "all|") is None and other.get_issue_states("o/r") == {}
+        vector_store.stored.clear()
+        stats = run(issues[:30], other)
+        assert stats["new_issues"] == 30 and len(vector_store.stored) == 30
+        other.reset("o/r")
+        assert other.get_issue_states("o/r") == {} and len(store.get_issue_states("o/r")) == 2500
+        other.close()
+        store.close()
+        print("✓ Sync state is kept per collection")
+
+        legacy = str(Path(tmp) / "legacy.sqlite")
+        import sqlite3
+        conn = sqlite3.connect(legacy)
+        conn.executescript(
+            "CREATE TABLE watermarks (repository TEXT, sync_key TEXT, watermark TEXT, synced_at REAL);"
+            "CREATE TABLE issues (repository TEXT, issue_number INTEGER, updated_at TEXT, content_hash TEXT,"
+            " chunk_ids TEXT, synced_at REAL);"
+            "INSERT INTO watermarks VALUES ('o/r', 'all|', '2024-01-01T00:00:00+00:00', 0);"
+        )
+        conn.commit()
+        conn.close()
+        migrated = SQLiteSyncStateStore(legacy, collection="issues_v1")
+        assert migrated.get_watermark("o/r", "all|") is None
+        migrated.record_issue("o/r", 1, IssueSyncState("2024-01-01T00:00:00+00:00", "hash", ["1-0"]))
+        assert migrated.get_issue_states("o/r")[1].chunk_ids == ["1-0"]
+        migrated.close()
+        print("✓ Sync state written before collections were tracked is dropped")
+
+    print("\n✓ All tests passed!")
+
+except Exception as e:
+    print(f"✗ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
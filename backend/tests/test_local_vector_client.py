@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Test the embedded local vector backend."""
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    from backend.db.local_vector_client import INITIAL_CAPACITY, LocalVectorClient
+    print("✓ Successfully imported local vector client")
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((INITIAL_CAPACITY + 200, 16)).astype(np.float32)
+
+    def item(i, repository="org/docs", source_type="github_docs", sha="a"):
+        return {
+            "content": f"chunk {i}",
+            "vector": vectors[i],
+            "metadata": {"repository": repository, "source_type": source_type, "file_path": f"f{i // 10}.md",
+                         "file_sha": sha, "chunk_index": i % 10},
+        }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = LocalVectorClient(tmp, "docs", dimension=16)
+        ids = client.upsert_batch([item(i) for i in range(len(vectors))])
+        assert client.count() == len(vectors)
+        print("✓ Collection grows past its initial capacity")
+
+        query = vectors[42]
+        expected = np.argsort(-(vectors / np.linalg.norm(vectors, axis=1, keepdims=True)) @ (query / np.linalg.norm(query)))[:5]
+        results = client.query_similar(query.tolist(), top_k=5)
+        assert [r["content"] for r in results] == [f"chunk {i}" for i in expected]
+        assert abs(results[0]["score"] - 1.0) < 1e-5 and results[0]["metadata"]["file_path"] == "f4.md"
+        print("✓ Exact search matches a full cosine sort")
+
+        client.upsert_batch([item(i) for i in range(10)])
+        assert client.count() == len(vectors)
+        client.upsert_batch([item(0, repository="org/issues", source_type="github_issue")])
+        scoped = client.query_similar(query.tolist(), top_k=5, source_types=["github_issue"])
+        assert [r["content"] for r in scoped] == ["chunk 0"]
+        assert client.query_similar(query.tolist(), top_k=5, repositories=["org/none"]) == []
+        print("✓ Upserts are idempotent and searches honour source type / repository scopes")
+
+        assert client.file_already_processed("org/docs", "f3.md", "a")
+        client.delete_stale_file_chunks("org/docs", "f3.md", "b")
+        assert not client.exists({"repository": "org/docs", "file_path": "f3.md"})
+        client.delete_repository("org/issues")
+        assert client.count({"source_type": ["github_issue"]}) == 0
+        assert client.get_ids({"chunk_index": 7}, limit=3) and len(client.get_ids({"chunk_index": 7}, limit=3)) == 3
+        remaining = client.count()
+        client.upsert_batch([item(35)])  # Reuses a freed slot
+        assert client.count() == remaining + 1
+        print("✓ Metadata queries and deletes")
+        client.close()
+
+        reopened = LocalVectorClient(tmp, "docs")
+        assert reopened.dimension == 16 and reopened.count() == remaining + 1
+        assert reopened.query_similar(vectors[35].tolist(), top_k=1)[0]["id"] == ids[35]
+        reopened.close()
+        print("✓ Data persists across reopen")
+
+    print("\n✓ All tests passed!")
+
+except Exception as e:
+    print(f"✗ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
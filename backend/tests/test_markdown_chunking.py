@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Golden-output tests for the shared markdown chunking engine.
+
+Every entry point (DocumentChunker, chunk_markdown and the wiki chunker) is run
+over the documents in tests/fixtures/markdown_chunking and compared with the
+stored golden output. After an intended change to the chunking, regenerate the
+golden file and review its diff:
+
+    python backend/tests/test_markdown_chunking.py --update
+"""
+import json
+import sys
+from pathlib import Path
+
+# Add project root and backend to path (the wiki module is imported top-level)
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "backend"))
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "markdown_chunking"
+GOLDEN_PATH = FIXTURES_DIR / "golden.json"
+
+CHUNK_SIZE = 400
+CHUNK_OVERLAP = 50
+
+
+def run_entry_points(text: str) -> dict:
+    """Chunk a document with every entry point."""
+    from backend.utils.chunking import chunk_markdown
+    from backend.utils.document_processing import DocumentChunker
+    from wiki_ingestion.services.wiki_chunking_service import WikiChunkingService
+
+    document_chunks = DocumentChunker(CHUNK_SIZE, CHUNK_OVERLAP).chunk_text(text)
+    readme_chunks = chunk_markdown(
+        text,
+        min_chunk_chars=100,
+        max_chunk_chars=CHUNK_SIZE,
+        overlap_chars=CHUNK_OVERLAP,
+        file_path="fixture.md"
+    )
+    wiki_chunker = WikiChunkingService(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP, min_chunk_size=20)
+
+    return {
+        "document_chunker": [
+            [chunk["metadata"]["start_char"], chunk["metadata"]["end_char"], chunk["content"]]
+            for chunk in document_chunks
+        ],
+        "chunk_markdown": [[chunk["section_title"], chunk["content"]] for chunk in readme_chunks],
+        "wiki": wiki_chunker._smart_chunk(text),
+    }
+
+
+def check_invariants(name: str, text: str):
+    """Properties every policy must keep, independent of the golden output."""
+    from backend.utils.document_processing import DocumentChunker
+    from backend.utils.markdown_chunking import scan_markdown
+
+    spans = DocumentChunker(CHUNK_SIZE, CHUNK_OVERLAP).split_points(text)
+    assert spans[0][0] == 0 and spans[-1][1] == len(text), f"{name}: spans do not cover the text"
+    for (_, previous_end), (start, end) in zip(spans, spans[1:]):
+        assert start <= previous_end, f"{name}: gap between chunks at {previous_end}"
+        assert end - start <= CHUNK_SIZE, f"{name}: chunk longer than {CHUNK_SIZE}"
+
+    ends = {end for _, end in spans}
+    for block_start, block_end in scan_markdown(text).blocks:
+        if block_end - block_start <= CHUNK_SIZE // 2:
+            inside = [end for end in ends if block_start < end < block_end]
+            assert not inside, f"{name}: code block/table at {block_start} split at {inside}"
+
+
+def main():
+    update = "--update" in sys.argv
+    fixtures = sorted(FIXTURES_DIR.glob("*.md"))
+    print(f"Found {len(fixtures)} fixture document(s)")
+
+    # Read bytes so CRLF line endings are kept
+    outputs = {path.name: run_entry_points(path.read_bytes().decode("utf-8")) for path in fixtures}
+
+    if update:
+        GOLDEN_PATH.write_text(json.dumps(outputs, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"✓ Golden output written to {GOLDEN_PATH}")
+        return
+
+    golden = json.loads(GOLDEN_PATH.read_text(encoding="utf-8"))
+    failures = 0
+    for path in fixtures:
+        text = path.read_bytes().decode("utf-8")
+        check_invariants(path.name, text)
+        for entry_point, chunks in outputs[path.name].items():
+            expected = golden.get(path.name, {}).get(entry_point)
+            if chunks == expected:
+                print(f"  ✓ {path.name:<20} {entry_point:<18} {len(chunks)} chunks")
+            else:
+                failures += 1
+                print(f"  ✗ {path.name:<20} {entry_point:<18} differs from golden output")
+
+    if failures:
+        print(f"\n✗ {failures} output(s) differ (run with --update if the change is intended)")
+        sys.exit(1)
+    print("\n✓ All tests passed!")
+
+
+if __name__ == "__main__":
+    main()
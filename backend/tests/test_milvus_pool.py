@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Test the Milvus client pool: checkout limits, timeouts, retries and health checks."""
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+class FakeMilvusClient:
+    """Records calls; the next `failing` searches (on any client) raise `error`."""
+
+    created = []
+    failing = 0
+    error = ConnectionError("connection reset by peer")
+    delay = 0.0
+
+    def __init__(self):
+        self.calls = []
+        self.healthy = True
+        self.closed = False
+        FakeMilvusClient.created.append(self)
+
+    def search(self, collection_name, data, limit, timeout=None):
+        self.calls.append(("search", timeout))
+        if FakeMilvusClient.failing:
+            FakeMilvusClient.failing -= 1
+            raise FakeMilvusClient.error
+        if FakeMilvusClient.delay:
+            time.sleep(FakeMilvusClient.delay)
+        return [[{"id": 1, "distance": 0.9}]]
+
+    def insert(self, collection_name, data, timeout=None):
+        self.calls.append(("insert", timeout))
+        raise ConnectionError("unavailable")
+
+    def list_collections(self, timeout=None):
+        if not self.healthy:
+            raise ConnectionError("unavailable")
+        return ["docs"]
+
+    def prepare_index_params(self, **kwargs):
+        return {"kwargs": kwargs}
+
+    def close(self):
+        self.closed = True
+
+
+try:
+    from backend.db.milvus_pool import MilvusClientPool, PoolExhaustedError, is_transient_error
+    print("✓ Successfully imported MilvusClientPool")
+
+    assert is_transient_error(ConnectionError("boom")) and is_transient_error(Exception("rate limit exceeded"))
+    assert not is_transient_error(ValueError("collection not found"))
+    print("✓ Transient errors are told apart from permanent ones")
+
+    waits = []
+    retries = []
+    pool = MilvusClientPool("http://milvus", "token", size=2, timeout=5.0, max_retries=2, retry_backoff=0.001,
+                            acquire_timeout=1.0, client_factory=FakeMilvusClient)
+    pool.on_wait = waits.append
+    pool.on_retry = retries.append
+    assert len(FakeMilvusClient.created) == 1 and pool.stats()["open"] == 1
+
+    assert pool.search(collection_name="docs", data=[[0.1]], limit=1)[0][0]["id"] == 1
+    assert FakeMilvusClient.created[0].calls[-1] == ("search", 5.0)
+    pool.search(collection_name="docs", data=[[0.1]], limit=1, timeout=1.5)
+    assert FakeMilvusClient.created[0].calls[-1] == ("search", 1.5)
+    assert pool.prepare_index_params() == {"kwargs": {}}
+    print("✓ Calls run on pooled clients with the default or the caller's deadline")
+
+    FakeMilvusClient.delay = 0.2
+    threads = [threading.Thread(target=pool.search, kwargs={"collection_name": "docs", "data": [[0.1]], "limit": 1})
+               for _ in range(4)]
+    peak = []
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    peak.append(pool.stats())
+    for thread in threads:
+        thread.join()
+    FakeMilvusClient.delay = 0.0
+    assert peak[0]["in_use"] == 2 and peak[0]["utilization"] == 1.0
+    assert len(FakeMilvusClient.created) == 2 and pool.stats()["in_use"] == 0
+    assert max(waits) >= 0.1 and pool.stats()["wait_seconds_max"] >= 0.1
+    print("✓ Concurrent calls are capped at the pool size and their waits are measured")
+
+    FakeMilvusClient.failing = 2
+    assert pool.search(collection_name="docs", data=[[0.1]], limit=1)
+    assert retries == ["search", "search"] and pool.stats()["retries"] == 2
+    assert pool.stats()["replaced"] == 2 and all(c.closed for c in FakeMilvusClient.created[:2])
+    print("✓ Transient failures are retried and their clients replaced")
+
+    FakeMilvusClient.failing = 1
+    FakeMilvusClient.error = ValueError("collection not found")
+    try:
+        pool.search(collection_name="docs", data=[[0.1]], limit=1)
+        raise AssertionError("A permanent error should not be retried")
+    except ValueError:
+        pass
+    assert pool.stats()["retries"] == 2 and pool.stats()["replaced"] == 2
+    try:
+        pool.insert(collection_name="docs", data=[{"id": 1}])
+        raise AssertionError("Inserts should fail without retries")
+    except ConnectionError:
+        pass
+    assert pool.stats()["retries"] == 2
+    print("✓ Permanent errors and inserts are not retried")
+
+    pool.search(collection_name="docs", data=[[0.1]], limit=1)  # Leaves a healthy client idle
+    pool.health_check_interval = 0.0
+    stale = pool._idle[-1][0]
+    stale.healthy = False
+    assert pool.search(collection_name="docs", data=[[0.1]], limit=1)
+    assert stale.closed and stale not in [client for client, _ in pool._idle]
+    print("✓ Idle clients failing their health check are replaced before use")
+
+    with pool.lease(), pool.lease():
+        started = time.perf_counter()
+        try:
+            pool.search(collection_name="docs", data=[[0.1]], limit=1)
+            raise AssertionError("Checkout should time out while the pool is exhausted")
+        except PoolExhaustedError:
+            pass
+    assert 0.9 <= time.perf_counter() - started < 2.0
+    print("✓ Checkouts time out when every client stays busy")
+
+    pool.close()
+    assert pool.stats()["idle"] == 0
+    print("✓ Closing the pool closes its idle clients")
+
+    print("\n✓ All tests passed!")
+
+except Exception as e:
+    print(f"✗ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
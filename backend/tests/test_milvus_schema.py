@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Test typed Milvus collection settings and row preparation."""
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+class FakeMilvusClient:
+    """Describes one typed and one dynamic collection."""
+
+    def __init__(self, typed_fields):
+        self.typed_fields = typed_fields
+
+    def describe_collection(self, collection_name):
+        names = ["id", "vector"] + (self.typed_fields if collection_name == "typed" else [])
+        return {"fields": [{"name": name} for name in names]}
+
+
+try:
+    from backend.db.milvus_schema import CollectionSpec, MilvusSchemaManager
+    print("✓ Successfully imported Milvus schema")
+
+    os.environ.update({"MILVUS_INDEX_TYPE": "autoindex", "MILVUS_PARTITION_KEY": "source_type"})
+    spec = CollectionSpec.from_env(dimension=8)
+    assert spec.index_type == "AUTOINDEX" and spec.partition_key == "source_type"
+    assert spec.vector_index_params() == {}
+    assert CollectionSpec().vector_index_params() == {"M": 16, "efConstruction": 200}
+    print("✓ Index settings read from the environment")
+
+    manager = MilvusSchemaManager(FakeMilvusClient([f.name for f in spec.scalar_fields]), spec)
+    assert manager.is_typed("typed") and not manager.is_typed("dynamic")
+
+    row = {"id": 1, "content": "é" * 40000, "repository": "org/repo", "issue_number": "42", "extra": True}
+    manager.prepare_rows("typed", [row])
+    assert len(row["content"].encode("utf-8")) <= 65535 and row["content"] == "é" * 32767
+    assert row["issue_number"] == 42 and row["file_sha"] == "" and row["extra"] is True
+    print("✓ Typed rows get defaults and byte-limited VARCHAR values")
+
+    dynamic_row = {"id": 2, "content": "x"}
+    manager.prepare_rows("dynamic", [dynamic_row])
+    assert dynamic_row.pop("ingested_at") >= row["ingested_at"] > 0
+    assert dynamic_row == {"id": 2, "content": "x"}
+    print("✓ Rows for dynamic collections are only stamped with their write time")
+
+    print("\n✓ All tests passed!")
+
+except Exception as e:
+    print(f"✗ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Test the CPU worker process pool: results, errors, timeouts, crashes and recycling."""
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def run_with_deadline(pool, func, *args, deadline=10.0):
+    """Run a task in a thread so that a pool that hangs fails the test instead of blocking it."""
+    result = {}
+
+    def target():
+        try:
+            result["value"] = pool.run(func, *args)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(deadline)
+    if thread.is_alive():
+        raise AssertionError(f"run({func.__name__}) blocked - a worker was not returned to the pool")
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+# Workers are spawned and import this script, so the tests only run in the parent
+if __name__ == "__main__":
+    try:
+        from backend.utils.process_pool import ProcessWorkerPool, TaskTimeoutError, WorkerCrashedError
+        print("✓ Successfully imported ProcessWorkerPool")
+
+        pool = ProcessWorkerPool(max_workers=1, task_timeout=5.0, max_tasks_per_worker=100)
+        assert pool.run(len, "abc") == 3
+        pid = pool.run(os.getpid)
+        assert pid != os.getpid() and pool.tasks_completed == 2
+        try:
+            pool.run(int, "not a number")
+            raise AssertionError("The task's exception should be raised")
+        except ValueError:
+            pass
+        assert pool.run(os.getpid) == pid and pool.workers_recycled == 0
+        print("✓ Results and task exceptions come back from the same worker")
+
+        try:
+            pool.run(lambda: 1)
+            raise AssertionError("A lambda cannot be sent to a worker")
+        except Exception as e:
+            assert not isinstance(e, AssertionError), e
+        assert run_with_deadline(pool, os.getpid) == pid and pool.workers_recycled == 0
+        print("✓ A task that cannot be pickled leaves the worker usable")
+
+        try:
+            pool.run(time.sleep, 10, timeout=0.5)
+            raise AssertionError("The task should time out")
+        except TaskTimeoutError:
+            pass
+        new_pid = run_with_deadline(pool, os.getpid)
+        assert new_pid != pid and pool.tasks_timed_out == 1 and pool.workers_recycled == 1
+        print("✓ A task over its timeout kills and replaces the worker")
+
+        try:
+            pool.run(os._exit, 1)
+            raise AssertionError("The worker crash should be reported")
+        except WorkerCrashedError:
+            pass
+        assert run_with_deadline(pool, len, "ab") == 2 and pool.workers_recycled == 2
+        print("✓ A crashed worker is replaced")
+
+        def interrupt(signum, frame):
+            raise KeyboardInterrupt
+
+        previous = signal.signal(signal.SIGALRM, interrupt)
+        signal.setitimer(signal.ITIMER_REAL, 0.3)
+        try:
+            pool.run(time.sleep, 10)
+            raise AssertionError("The interrupt should propagate")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGALRM, previous)
+        assert run_with_deadline(pool, len, "abcd") == 4 and pool.workers_recycled == 3
+        print("✓ A worker interrupted mid-task is replaced")
+        pool.shutdown()
+
+        pool = ProcessWorkerPool(max_workers=1, max_tasks_per_worker=2)
+        pids = [pool.run(os.getpid) for _ in range(4)]
+        assert pids[0] == pids[1] != pids[2] == pids[3] and pool.workers_recycled == 2
+        assert pool.tasks_completed == 4
+        pool.shutdown()
+        try:
+            pool.run(os.getpid)
+            raise AssertionError("A shut down pool should not run tasks")
+        except RuntimeError:
+            pass
+        print("✓ Workers are recycled after max_tasks_per_worker tasks; shut down pools refuse tasks")
+
+        pool = ProcessWorkerPool(max_workers=3)
+        threads = [threading.Thread(target=pool.run, args=(time.sleep, 0.5)) for _ in range(6)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert pool.tasks_completed == 6 and time.perf_counter() - started >= 1.0
+        pool.shutdown()
+        print("✓ Concurrent tasks share the workers and are counted exactly")
+
+        print("\n✓ All tests passed!")
+
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Test the in-process read replica of a Milvus collection."""
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+class FakeIterator:
+    def __init__(self, rows, batch_size):
+        self.rows = rows
+        self.batch_size = batch_size
+
+    def next(self):
+        batch, self.rows = self.rows[:self.batch_size], self.rows[self.batch_size:]
+        return batch
+
+    def close(self):
+        pass
+
+
+class FakeMilvusClient:
+    """Stores rows in a dict and understands the filters the replica sends."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def _match(self, filter_expr):
+        if not filter_expr:
+            return list(self.rows.values())
+        watermark = re.match(r"ingested_at >= (\d+)", filter_expr)
+        if watermark:
+            return [row for row in self.rows.values() if row["ingested_at"] >= int(watermark.group(1))]
+        ids = set(int(i) for i in re.findall(r"\d+", filter_expr))
+        return [row for row_id, row in self.rows.items() if row_id in ids]
+
+    def query_iterator(self, collection_name, batch_size, filter, output_fields):
+        return FakeIterator(self._match(filter), batch_size)
+
+    def query(self, collection_name, filter, output_fields):
+        return self._match(filter)
+
+
+class FakeVectorClient:
+    collection_name = "docs"
+    metric = "COSINE"
+    dimension = 8
+
+    def __init__(self):
+        self.client = FakeMilvusClient()
+        self.searches = 0
+        self.clock = 1
+
+    def upsert(self, row_id, vector, source_type="github_docs"):
+        self.clock += 1
+        self.client.rows[row_id] = {"id": row_id, "vector": vector.tolist(), "content": f"row {row_id}",
+                                    "source_type": source_type, "repository": "org/repo", "ingested_at": self.clock}
+
+    def get_by_ids(self, ids):
+        return [{"id": row["id"], "content": row["content"], "metadata": {"source_type": row["source_type"]}}
+                for row in self.client.query("docs", f"id in {list(ids)}", ["*"])]
+
+    def query_similar(self, vector, top_k=5, **kwargs):
+        self.searches += 1
+        return []
+
+
+def exact(vectors, ids, query, k):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    order = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:k]
+    return [ids[i] for i in order]
+
+
+try:
+    from backend.db.replica_cache import ReplicaVectorClient, VectorReplica
+    print("✓ Successfully imported replica cache")
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((3000, 8)).astype(np.float32)
+    source = FakeVectorClient()
+    for i, vector in enumerate(vectors):
+        source.upsert(i + 100, vector, "github_issue" if i % 10 == 0 else "github_docs")
+
+    replica = VectorReplica(source, exact_threshold=1000, nprobe=1000)
+    client = ReplicaVectorClient(source, replica)
+    replica.sync()
+    assert replica.size == 3000 and replica._data.centroids is not None
+    query = rng.standard_normal(8).astype(np.float32)
+    results = client.query_similar(query.tolist(), top_k=10)
+    assert [r["id"] for r in results] == exact(vectors, list(range(100, 3100)), query, 10)
+    assert source.searches == 0 and results[0]["content"].startswith("row ")
+    print("✓ Snapshot answers searches locally (float16, partitioned)")
+
+    replica.nprobe = 4
+    probed = [r["id"] for r in client.query_similar(query.tolist(), top_k=10)]
+    assert len(probed) == 10 and len(set(probed) & set(exact(vectors, list(range(100, 3100)), query, 10))) >= 5
+    print("✓ Probing a few lists keeps most of the exact top-k")
+
+    issues = client.query_similar(query.tolist(), top_k=5, source_types=["github_issue"])
+    assert len(issues) == 5 and all(r["metadata"]["source_type"] == "github_issue" for r in issues)
+    print("✓ Scoped searches only return rows of the scope")
+
+    source.upsert(99, query * 3)
+    del source.client.rows[100]
+    replica.reconcile_interval = 0
+    replica.sync()
+    assert client.query_similar(query.tolist(), top_k=1)[0]["id"] == 99
+    assert 100 not in replica._data.rows and replica.size == 3000
+    print("✓ Incremental sync picks up new rows; reconciliation drops deleted ones")
+
+    replica.last_sync -= replica.max_staleness + 1
+    client.query_similar(query.tolist(), top_k=1)
+    client.query_similar(query.tolist(), top_k=1, search_params={"params": {"ef": 64}})
+    assert source.searches == 2 and client.stats["fallback"] == 2
+    print("✓ Stale replicas and explicit search params fall back to Milvus")
+
+    print("\n✓ All tests passed!")
+
+except Exception as e:
+    print(f"✗ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Test routing of retrieval requests to source type partitions."""
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+class FakeVectorClient:
+    """Returns stored rows matching the requested source types and repositories."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def query_similar(self, vector, top_k=5, source_types=None, repositories=None):
+        self.calls.append((source_types, repositories))
+        return [
+            row for row in self.rows
+            if (not source_types or row["metadata"].get("source_type") in source_types)
+            and (not repositories or row["metadata"].get("repository") in repositories)
+        ][:top_k]
+
+
+try:
+    from backend.services.context_manager import ContextManager
+    from backend.services.retrieval_router import RetrievalRouter
+    from backend.utils.source_types import SOURCE_TYPE_ISSUE, SOURCE_TYPE_WIKI
+    print("✓ Successfully imported retrieval router")
+
+    router = RetrievalRouter()
+    assert router.route("How do I deploy a service?").is_global
+    assert router.route("I have an issue deploying my service").is_global
+    assert router.route("Are there open issues about builds?").source_types == (SOURCE_TYPE_ISSUE,)
+    assert SOURCE_TYPE_WIKI in router.route("What does the wiki say about releases?").source_types
+    print("✓ Intents inferred only from explicit mentions")
+
+    scope = router.route("How do builds work?", intents=["issues", "unknown"], repositories=["org/a", "org/a"])
+    assert scope.intent == "issues" and scope.source_types == (SOURCE_TYPE_ISSUE,)
+    assert scope.repositories == ("org/a",)
+    assert RetrievalRouter(infer_intent=False).route("open issues?").is_global
+    print("✓ Request intents and repositories take precedence")
+
+    client = FakeVectorClient([
+        {"content": "doc", "metadata": {"source_type": "github_docs", "repository": "org/a"}},
+        {"content": "issue", "metadata": {"source_type": SOURCE_TYPE_ISSUE, "repository": "org/a"}},
+    ])
+    manager = ContextManager(client)
+    assert [row["content"] for row in manager.retrieve_context([0.0], 5, scope)] == ["issue"]
+    assert client.calls[-1] == ((SOURCE_TYPE_ISSUE,), ("org/a",))
+
+    empty_scope = router.route("", intents=["diagrams"])
+    assert len(manager.retrieve_context([0.0], 5, empty_scope)) == 2
+    assert client.calls[-1] == (None, None)
+    print("✓ Scoped searches fall back to the whole collection when nothing matches")
+
+    print("\n✓ All tests passed!")
+
+except Exception as e:
+    print(f"✗ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
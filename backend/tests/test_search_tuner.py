@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Test the recall/latency sweep of Milvus search parameters."""
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+class FakeIterator:
+    def __init__(self, rows, batch_size):
+        self.rows = rows
+        self.batch_size = batch_size
+
+    def next(self):
+        batch, self.rows = self.rows[:self.batch_size], self.rows[self.batch_size:]
+        return batch
+
+    def close(self):
+        pass
+
+
+class FakeMilvusClient:
+    """HNSW collection whose searches only see a share of the rows that grows with ef."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.ids = np.arange(len(vectors)) * 7 + 1
+        self.searches = []
+
+    def list_indexes(self, collection_name, field_name):
+        return ["vector_idx"]
+
+    def describe_index(self, collection_name, index_name):
+        return {"index_type": "HNSW", "metric_type": "IP", "M": "16"}
+
+    def query_iterator(self, collection_name, batch_size, filter, output_fields):
+        rows = [{"id": int(i), "vector": v.tolist()} for i, v in zip(self.ids, self.vectors)]
+        return FakeIterator(rows, batch_size)
+
+    def search(self, collection_name, data, limit, search_params, output_fields, consistency_level,
+               anns_field="vector"):
+        self.searches.append(search_params)
+        visible = min(len(self.ids), len(self.ids) * search_params["params"]["ef"] // 128)
+        scores = self.vectors[:visible] @ np.asarray(data[0], dtype=np.float32)
+        order = np.argsort(-scores)[:limit]
+        return [[{"id": int(self.ids[i]), "distance": float(scores[i])} for i in order]]
+
+
+try:
+    from backend.db.milvus_schema import CollectionSpec
+    from backend.db.search_tuner import SearchTuner, write_profile
+    print("✓ Successfully imported search tuner")
+
+    vectors = np.random.default_rng(0).standard_normal((500, 8)).astype(np.float32)
+    client = FakeMilvusClient(vectors)
+    tuner = SearchTuner(client, "docs", CollectionSpec(dimension=8), k=10, target_recall=0.9)
+    assert tuner.index_type == "HNSW" and tuner.metric == "IP"
+
+    queries = vectors[:3] + 0.01
+    exact = tuner.exact_top_k(queries, client.ids, vectors)
+    expected = [client.ids[np.argsort(-(vectors @ q))[:10]].tolist() for q in queries]
+    assert exact == expected
+    print("✓ Brute-force top-k matches a full sort")
+
+    chosen, results = tuner.tune(num_queries=20, candidates=[16, 64, 128])
+    assert [result.value for result in results] == [16, 64, 128]
+    assert results[0].recall < 0.9 <= results[-1].recall
+    assert chosen.value == 128 and tuner.profile(chosen) == {"MILVUS_SEARCH_EF": "128"}
+    print("✓ Cheapest setting meeting the target recall is chosen")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env_path = Path(tmp) / ".env"
+        env_path.write_text("MILVUS_URI=x\nMILVUS_SEARCH_EF=32\n")
+        write_profile(str(env_path), tuner.profile(chosen))
+        assert env_path.read_text().splitlines() == ["MILVUS_URI=x", "MILVUS_SEARCH_EF=128"]
+    print("✓ Profile written to the env file")
+
+    spec = CollectionSpec(search_ef=64, search_nprobe=8)
+    assert spec.search_params(top_k=100, index_type="HNSW") == {"params": {"ef": 100}}
+    assert spec.search_params(top_k=10, index_type="IVF_FLAT") == {"params": {"nprobe": 8}}
+    assert spec.search_params(top_k=10, index_type="AUTOINDEX") == {}
+    print("✓ Configured profile maps to search params of the index type")
+
+    print("\n✓ All tests passed!")
+
+except Exception as e:
+    print(f"✗ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Test deterministic chunk IDs used for idempotent vector store upserts."""
+import subprocess
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    from backend.utils.vector_ids import chunk_id, metadata_chunk_id, stable_id
+    print("✓ Successfully imported vector IDs")
+
+    first = chunk_id("org/repo", "docs/README.md", 0, "Hello")
+    assert first == chunk_id("org/repo", "docs/README.md", 0, "Hello")
+    assert 0 <= first < 2 ** 63
+    print("✓ Same chunk gives the same 63-bit ID")
+
+    assert first != chunk_id("org/repo", "docs/README.md", 1, "Hello")
+    assert first != chunk_id("org/repo", "docs/README.md", 0, "Hello!")
+    assert first != chunk_id("org/repo", "docs/GUIDE.md", 0, "Hello")
+    assert stable_id("a", "bc") != stable_id("ab", "c")
+    print("✓ Index, content and path all change the ID")
+
+    metadata = {"source": "github", "repository": "org/repo", "file_path": "docs/README.md", "chunk_index": 0}
+    assert metadata_chunk_id("Hello", metadata) == first
+    assert metadata_chunk_id("Hello", {"source": "wiki", "source_url": "https://wiki/x"}) == chunk_id(
+        "wiki", "https://wiki/x", 0, "Hello"
+    )
+    print("✓ Metadata of every ingestion path maps to an ID")
+
+    # The built-in hash() is salted per process; these IDs must not be
+    other_process = subprocess.run(
+        [sys.executable, "-c",
+         "import sys; sys.path.insert(0, sys.argv[1]);"
+         "from backend.utils.vector_ids import chunk_id;"
+         "print(chunk_id('org/repo', 'docs/README.md', 0, 'Hello'))",
+         str(project_root)],
+        capture_output=True, text=True, check=True
+    )
+    assert int(other_process.stdout) == first
+    print("✓ IDs are stable across processes")
+
+    print("\n✓ All tests passed!")
+
+except Exception as e:
+    print(f"✗ Error: {e}")
+    import traceback
+    traceback.print_exc()
+    sys.exit(1)
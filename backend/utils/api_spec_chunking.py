@@ -0,0 +1,652 @@
+"""
+Structure-aware chunking of OpenAPI (Swagger) and AsyncAPI definitions.
+
+Instead of cutting a spec into character windows, every operation becomes one
+self-contained chunk: method and path (or channel), summary, description,
+parameters, request body and responses, with referenced schemas resolved up to
+a depth limit. Schemas that are cut off by the depth limit are described once,
+in shared schema chunks, instead of being repeated in every operation that
+uses them.
+
+YAML specs are built directly from the parser's event stream (libyaml when
+available), which is several times faster than constructing them with a YAML
+loader. This module has no service dependencies so it can run in the
+ingestion worker processes.
+"""
+import json
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .boundary_index import BoundaryIndex
+from .logger import get_logger
+
+try:
+    import yaml
+    from yaml import events as yaml_events
+    _EventLoader = getattr(yaml, "CBaseLoader", yaml.BaseLoader)
+    _SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+except ImportError:  # JSON specs can still be parsed
+    yaml = None
+
+logger = get_logger(__name__)
+
+HTTP_METHODS = ("get", "put", "post", "delete", "patch", "options", "head", "trace")
+ASYNCAPI_V2_ACTIONS = ("publish", "subscribe")
+
+DEFAULT_MAX_SCHEMA_DEPTH = 3  # Nested schema levels rendered inside an operation
+MAX_PROPERTIES_PER_OBJECT = 50  # Properties listed per object before eliding the rest
+MAX_FIELD_DESCRIPTION_CHARS = 200  # Property/parameter descriptions are truncated
+MAX_SCHEMA_LINES = 400  # Lines rendered per chunk before further schemas are only named
+
+# (chunk text, chunk type, section label)
+ApiChunk = Tuple[str, str, str]
+
+# Plain scalars that are not kept as strings (numbers are, which is all rendering needs)
+_PLAIN_SCALARS = {
+    "true": True, "True": True, "TRUE": True,
+    "false": False, "False": False, "FALSE": False,
+    "null": None, "Null": None, "NULL": None, "~": None, "": None
+}
+_NO_KEY = object()
+
+
+def _load_yaml(text: str) -> Any:
+    """
+    Build a YAML document from the parser's event stream.
+
+    Handles anchors, aliases and merge keys. Numbers stay strings. Documents
+    with collections as mapping keys fall back to the regular safe loader.
+    """
+    anchors: Dict[str, Any] = {}
+    stack: List[Tuple[Any, Any]] = []
+    root = None
+    container: Any = None
+    key: Any = _NO_KEY
+
+    for event in yaml.parse(text, Loader=_EventLoader):
+        event_class = event.__class__
+        new_container = None
+
+        if event_class is yaml_events.ScalarEvent:
+            value = event.value
+            if event.implicit[0] and value in _PLAIN_SCALARS:
+                value = _PLAIN_SCALARS[value]
+        elif event_class is yaml_events.MappingStartEvent:
+            value = new_container = {}
+        elif event_class is yaml_events.SequenceStartEvent:
+            value = new_container = []
+        elif event_class is yaml_events.AliasEvent:
+            value = anchors.get(event.anchor)
+        elif event_class is yaml_events.MappingEndEvent or event_class is yaml_events.SequenceEndEvent:
+            container, key = stack.pop()
+            continue
+        else:  # Stream and document events
+            continue
+
+        if event_class is not yaml_events.AliasEvent and event.anchor:
+            anchors[event.anchor] = value
+
+        if container is None:
+            root = value
+        elif container.__class__ is list:
+            container.append(value)
+        elif key is _NO_KEY:
+            if new_container is not None:
+                return yaml.load(text, Loader=_SafeLoader)
+            key = value
+            continue
+        else:
+            if key == "<<":  # Merge key: explicit keys win
+                for merged in (value if isinstance(value, list) else [value]):
+                    if isinstance(merged, dict):
+                        for merged_key, merged_value in merged.items():
+                            container.setdefault(merged_key, merged_value)
+            else:
+                container[key] = value
+            key = _NO_KEY
+
+        if new_container is not None:
+            stack.append((container, key))
+            container, key = new_container, _NO_KEY
+
+    return root
+
+
+def parse_api_spec(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse an OpenAPI, Swagger or AsyncAPI document.
+
+    Args:
+        text: YAML or JSON file content
+
+    Returns:
+        The parsed spec, or None if the text is not a parseable API definition
+    """
+    try:
+        if text.lstrip().startswith("{"):
+            spec = json.loads(text)
+        elif yaml is not None:
+            spec = _load_yaml(text)
+        else:
+            return None
+    except Exception as e:
+        logger.debug(f"Not a parseable API definition: {e}")
+        return None
+
+    if not isinstance(spec, dict):
+        return None
+    if not any(key in spec for key in ("openapi", "swagger", "asyncapi")):
+        return None
+    return spec
+
+
+def _truncate(text: Any, limit: int = MAX_FIELD_DESCRIPTION_CHARS) -> str:
+    """Collapse whitespace and cut a description to ``limit`` characters."""
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+class ApiSpecChunker:
+    """Turns a parsed API spec into one chunk per operation plus shared schema chunks."""
+
+    def __init__(self, chunk_size: int = 3000, max_schema_depth: int = DEFAULT_MAX_SCHEMA_DEPTH):
+        """
+        Initialize chunker.
+
+        Args:
+            chunk_size: Maximum characters per chunk (longer operations are split)
+            max_schema_depth: Nested schema levels rendered inline in an operation
+        """
+        self.chunk_size = chunk_size
+        self.max_schema_depth = max_schema_depth
+
+    def chunk_spec(self, spec: Dict[str, Any]) -> List[ApiChunk]:
+        """
+        Chunk a parsed spec.
+
+        Args:
+            spec: Parsed OpenAPI/Swagger/AsyncAPI document
+
+        Returns:
+            List of (text, chunk_type, section) tuples, without duplicates
+        """
+        chunks = []
+        seen_texts = set()
+        for chunk in self.iter_chunks(spec):
+            if chunk[0] not in seen_texts:
+                seen_texts.add(chunk[0])
+                chunks.append(chunk)
+        return chunks
+
+    def iter_chunks(self, spec: Dict[str, Any]) -> Iterator[ApiChunk]:
+        """Yield the overview chunk, one chunk per operation, then the shared schema chunks."""
+        renderer = _SpecRenderer(spec, self.max_schema_depth)
+
+        yield renderer.overview(), "api_overview", "overview"
+
+        if "asyncapi" in spec:
+            operations = renderer.asyncapi_operations()
+        else:
+            operations = renderer.openapi_operations()
+
+        operation_count = 0
+        for section, text in operations:
+            operation_count += 1
+            for part in self._split(section, text):
+                yield part, "api_operation", section
+
+        # Specs without operations (e.g. shared schema files) are described by their schemas
+        if operation_count == 0:
+            renderer.include_all_schemas()
+
+        # Schemas only get their own chunk if the depth limit cut them off somewhere
+        for names, text in self._pack(renderer.shared_schemas()):
+            for part in self._split(names, text):
+                yield part, "api_schema", names
+
+    def _pack(self, schemas: List[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+        """Pack consecutive small schema descriptions into chunks of up to chunk_size."""
+        names: List[str] = []
+        texts: List[str] = []
+        size = 0
+        for name, text in schemas:
+            if texts and size + len(text) > self.chunk_size:
+                yield "schemas " + ", ".join(names), "\n\n".join(texts)
+                names, texts, size = [], [], 0
+            names.append(name)
+            texts.append(text)
+            size += len(text) + 2
+        if texts:
+            yield "schemas " + ", ".join(names), "\n\n".join(texts)
+
+    def _split(self, section: str, text: str) -> List[str]:
+        """Split an oversized chunk at line boundaries, repeating its section as a header."""
+        if len(text) <= self.chunk_size:
+            return [text]
+
+        header = f"{section} (continued)\n"
+        spans = BoundaryIndex(text).split_points(self.chunk_size - len(header), search_window=self.chunk_size // 2)
+        parts = []
+        for i, (start, end) in enumerate(spans):
+            part = text[start:end].strip()
+            if part:
+                parts.append(part if i == 0 else header + part)
+        return parts
+
+
+class _SpecRenderer:
+    """Renders the parts of one spec as text, resolving local $refs."""
+
+    def __init__(self, spec: Dict[str, Any], max_schema_depth: int):
+        self.spec = spec
+        self.max_schema_depth = max_schema_depth
+        self._refs: Dict[str, Any] = {}
+        # Component schemas whose rendering was cut short by the depth limit
+        self._truncated: Dict[str, Any] = {}
+
+        info = spec.get("info") if isinstance(spec.get("info"), dict) else {}
+        self.title = " ".join(str(part) for part in (info.get("title", "API"), info.get("version", "")) if part)
+
+    # ------------------------------------------------------------------
+    # References
+    # ------------------------------------------------------------------
+
+    def resolve(self, node: Any, max_hops: int = 10) -> Tuple[Any, Optional[str]]:
+        """
+        Follow local $refs.
+
+        Returns:
+            Tuple of (resolved node, name of the last referenced component or None)
+        """
+        name = None
+        while isinstance(node, dict) and isinstance(node.get("$ref"), str) and max_hops > 0:
+            ref = node["$ref"]
+            name = ref.rsplit("/", 1)[-1]
+            if not ref.startswith("#/"):
+                return {"description": f"external reference {ref}"}, name
+            if ref not in self._refs:
+                target: Any = self.spec
+                for part in ref[2:].split("/"):
+                    part = part.replace("~1", "/").replace("~0", "~")
+                    target = target.get(part) if isinstance(target, dict) else None
+                self._refs[ref] = target if target is not None else {"description": f"unresolved reference {ref}"}
+            node = self._refs[ref]
+            max_hops -= 1
+        return node, name
+
+    # ------------------------------------------------------------------
+    # Schemas
+    # ------------------------------------------------------------------
+
+    def type_label(self, schema: Any) -> str:
+        """Short type description of a schema, e.g. 'array of Pet' or 'string (date-time)'."""
+        schema, name = self.resolve(schema)
+        if not isinstance(schema, dict):
+            return "any"
+        if name:
+            return name
+
+        for combinator in ("oneOf", "anyOf"):
+            if isinstance(schema.get(combinator), list):
+                word = "one of" if combinator == "oneOf" else "any of"
+                return f"{word} " + " | ".join(self.type_label(option) for option in schema[combinator])
+
+        schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            schema_type = " or ".join(str(t) for t in schema_type)
+
+        if schema_type == "array" or "items" in schema:
+            return f"array of {self.type_label(schema.get('items'))}"
+
+        if isinstance(schema.get("additionalProperties"), dict) and not schema.get("properties"):
+            return f"map of {self.type_label(schema['additionalProperties'])}"
+
+        label = str(schema_type or ("object" if "properties" in schema or "allOf" in schema else "any"))
+        if schema.get("format"):
+            label += f" ({schema['format']})"
+        if isinstance(schema.get("enum"), list):
+            label += " enum: " + ", ".join(str(value) for value in schema["enum"][:20])
+        return label
+
+    def properties(self, schema: Dict[str, Any]) -> Tuple[Dict[str, Any], Set[str]]:
+        """Collect properties and required names of an object schema, flattening allOf."""
+        properties: Dict[str, Any] = {}
+        required: Set[str] = set()
+
+        for part in [schema] + list(schema.get("allOf") or []):
+            part, _ = self.resolve(part)
+            if not isinstance(part, dict):
+                continue
+            if part is not schema and part.get("allOf"):
+                nested_properties, nested_required = self.properties(part)
+                properties.update(nested_properties)
+                required.update(nested_required)
+            if isinstance(part.get("properties"), dict):
+                properties.update(part["properties"])
+            if isinstance(part.get("required"), list):
+                required.update(str(name) for name in part["required"])
+
+        return properties, required
+
+    def render_schema(
+        self,
+        schema: Any,
+        lines: List[str],
+        indent: int,
+        depth: int,
+        expanded: Set[str]
+    ):
+        """
+        Append the fields of a schema to ``lines``.
+
+        Args:
+            schema: Schema node (may be a $ref)
+            lines: Output lines
+            indent: Indentation level
+            depth: Nesting depth so far
+            expanded: Component names already expanded in this chunk (each is rendered
+                      once per chunk, which also stops recursive schemas)
+        """
+        schema, name = self.resolve(schema)
+        if not isinstance(schema, dict):
+            return
+
+        pad = "  " * indent
+        if name:
+            if name in expanded:
+                return
+            if depth >= self.max_schema_depth or len(lines) >= MAX_SCHEMA_LINES:
+                self._truncated.setdefault(name, schema)
+                return
+            expanded.add(name)
+
+        if schema.get("type") == "array" or "items" in schema:
+            self.render_schema(schema.get("items"), lines, indent, depth + 1, expanded)
+            return
+
+        for combinator in ("oneOf", "anyOf"):
+            for option in schema.get(combinator) or []:
+                self.render_schema(option, lines, indent, depth + 1, expanded)
+
+        properties, required = self.properties(schema)
+        for i, (prop_name, prop_schema) in enumerate(properties.items()):
+            if i == MAX_PROPERTIES_PER_OBJECT or len(lines) >= MAX_SCHEMA_LINES:
+                lines.append(f"{pad}- ... {len(properties) - i} more properties")
+                break
+
+            resolved, _ = self.resolve(prop_schema)
+            flag = ", required" if prop_name in required else ""
+            line = f"{pad}- {prop_name} ({self.type_label(prop_schema)}{flag})"
+            if isinstance(resolved, dict) and resolved.get("description"):
+                line += f": {_truncate(resolved['description'])}"
+            lines.append(line)
+
+            self.render_schema(prop_schema, lines, indent + 1, depth + 1, expanded)
+
+    def schema_lines(self, schema: Any, indent: int, expanded: Set[str]) -> List[str]:
+        """Render a top-level schema (request/response body, message payload)."""
+        lines = [f"{'  ' * indent}{self.type_label(schema)}"]
+        self.render_schema(schema, lines, indent + 1, 0, expanded)
+        return lines
+
+    def include_all_schemas(self):
+        """Describe every component schema in the shared schema chunks."""
+        components = self.spec.get("components") if isinstance(self.spec.get("components"), dict) else {}
+        for schemas in (components.get("schemas"), self.spec.get("definitions")):
+            if isinstance(schemas, dict):
+                for name, schema in schemas.items():
+                    self._truncated.setdefault(str(name), schema)
+
+    def shared_schemas(self) -> List[Tuple[str, str]]:
+        """
+        Render the component schemas that were cut off by the depth limit, once each.
+
+        Rendering a schema can cut off further schemas, so this runs until no new ones appear.
+        """
+        rendered: Dict[str, str] = {}
+        while len(rendered) < len(self._truncated):
+            for name, schema in list(self._truncated.items()):
+                if name in rendered:
+                    continue
+                lines = [f"{self.title} - schema {name}"]
+                if isinstance(schema, dict) and schema.get("description"):
+                    lines.append(f"Description: {_truncate(schema['description'], 1000)}")
+                lines.append(f"Type: {self.type_label(schema)}")
+                self.render_schema(schema, lines, 0, 0, {name})
+                rendered[name] = "\n".join(lines)
+        return list(rendered.items())
+
+    # ------------------------------------------------------------------
+    # Overview
+    # ------------------------------------------------------------------
+
+    def overview(self) -> str:
+        """Describe the API as a whole: title, description, servers and tags."""
+        spec = self.spec
+        info = spec.get("info") if isinstance(spec.get("info"), dict) else {}
+        kind = "AsyncAPI" if "asyncapi" in spec else "OpenAPI"
+        version = spec.get("asyncapi") or spec.get("openapi") or spec.get("swagger")
+
+        lines = [f"{self.title} - {kind} {version} definition"]
+        if info.get("description"):
+            lines.append(f"Description: {_truncate(info['description'], 2000)}")
+
+        servers = spec.get("servers")
+        if isinstance(servers, list):
+            urls = [str(server.get("url")) for server in servers if isinstance(server, dict) and server.get("url")]
+        elif isinstance(servers, dict):
+            urls = [str(server.get("url") or server.get("host")) for server in servers.values() if isinstance(server, dict)]
+        else:
+            urls = [f"{spec.get('host', '')}{spec.get('basePath', '')}"] if spec.get("host") else []
+        if urls:
+            lines.append("Servers: " + ", ".join(urls))
+
+        tags = [tag for tag in spec.get("tags") or [] if isinstance(tag, dict) and tag.get("name")]
+        if tags:
+            lines.append("Tags:")
+            for tag in tags:
+                description = f": {_truncate(tag['description'])}" if tag.get("description") else ""
+                lines.append(f"- {tag['name']}{description}")
+
+        if isinstance(spec.get("paths"), dict):
+            lines.append(f"Paths: {len(spec['paths'])}")
+        if isinstance(spec.get("channels"), dict):
+            lines.append(f"Channels: {len(spec['channels'])}")
+
+        return "\n".join(lines)
+
+    # ------------------------------------------------------------------
+    # OpenAPI / Swagger
+    # ------------------------------------------------------------------
+
+    def openapi_operations(self) -> Iterator[Tuple[str, str]]:
+        """Yield (section, text) for every operation under paths."""
+        paths = self.spec.get("paths")
+        if not isinstance(paths, dict):
+            return
+
+        for path, path_item in paths.items():
+            path_item, _ = self.resolve(path_item)
+            if not isinstance(path_item, dict):
+                continue
+            shared_parameters = path_item.get("parameters") or []
+
+            for method in HTTP_METHODS:
+                operation = path_item.get(method)
+                if isinstance(operation, dict):
+                    section = f"{method.upper()} {path}"
+                    yield section, self.openapi_operation(section, operation, shared_parameters)
+
+    def openapi_operation(self, section: str, operation: Dict[str, Any], shared_parameters: List[Any]) -> str:
+        """Render one OpenAPI/Swagger operation."""
+        lines = [f"{self.title} - API operation", section]
+        lines.extend(self.operation_header(operation))
+        expanded: Set[str] = set()
+
+        # Operation parameters override path-level ones with the same name and location
+        parameters: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for parameter in list(shared_parameters) + list(operation.get("parameters") or []):
+            parameter, _ = self.resolve(parameter)
+            if isinstance(parameter, dict) and parameter.get("name"):
+                parameters[(str(parameter.get("in")), str(parameter["name"]))] = parameter
+
+        # Swagger 2 describes the request body as an 'in: body' parameter
+        body_keys = [key for key in parameters if key[0] == "body"]
+        body_parameter = parameters.pop(body_keys[0]) if body_keys else None
+        if parameters:
+            lines.append("Parameters:")
+            for (location, name), parameter in parameters.items():
+                flag = ", required" if parameter.get("required") else ""
+                schema = parameter.get("schema", parameter)
+                line = f"- {name} ({location}, {self.type_label(schema)}{flag})"
+                if parameter.get("description"):
+                    line += f": {_truncate(parameter['description'])}"
+                lines.append(line)
+
+        request_body, _ = self.resolve(operation.get("requestBody"))
+        if isinstance(request_body, dict):
+            media_type, schema = self.media_schema(request_body.get("content"))
+            flag = ", required" if request_body.get("required") else ""
+            lines.append(f"Request body ({media_type or 'no content'}{flag}):")
+            if request_body.get("description"):
+                lines.append(f"  {_truncate(request_body['description'])}")
+            if schema is not None:
+                lines.extend(self.schema_lines(schema, 1, expanded))
+        elif body_parameter is not None:
+            lines.append("Request body:")
+            lines.extend(self.schema_lines(body_parameter.get("schema"), 1, expanded))
+
+        responses = operation.get("responses")
+        if isinstance(responses, dict) and responses:
+            lines.append("Responses:")
+            for status, response in responses.items():
+                response, _ = self.resolve(response)
+                if not isinstance(response, dict):
+                    continue
+                lines.append(f"- {status}: {_truncate(response.get('description', ''))}".rstrip(": "))
+                schema = response.get("schema")  # Swagger 2
+                if schema is None:
+                    _, schema = self.media_schema(response.get("content"))
+                if schema is not None:
+                    lines.extend(self.schema_lines(schema, 1, expanded))
+
+        return "\n".join(lines)
+
+    def media_schema(self, content: Any) -> Tuple[Optional[str], Any]:
+        """Pick the schema of a content map, preferring JSON media types."""
+        if not isinstance(content, dict) or not content:
+            return None, None
+        media_type = next((media for media in content if "json" in str(media)), next(iter(content)))
+        media = content[media_type]
+        return str(media_type), media.get("schema") if isinstance(media, dict) else None
+
+    def operation_header(self, operation: Dict[str, Any]) -> List[str]:
+        """Render the operation ID, summary, tags and description of an operation."""
+        lines = []
+        if operation.get("operationId"):
+            lines.append(f"Operation ID: {operation['operationId']}")
+        if operation.get("summary"):
+            lines.append(f"Summary: {_truncate(operation['summary'], 500)}")
+        if operation.get("tags"):
+            lines.append("Tags: " + ", ".join(str(tag) for tag in operation["tags"]))
+        if operation.get("deprecated"):
+            lines.append("Deprecated: yes")
+        if operation.get("description"):
+            lines.append(f"Description: {_truncate(operation['description'], 2000)}")
+        return lines
+
+    # ------------------------------------------------------------------
+    # AsyncAPI
+    # ------------------------------------------------------------------
+
+    def asyncapi_operations(self) -> Iterator[Tuple[str, str]]:
+        """Yield (section, text) for every AsyncAPI operation (v2 channel actions or v3 operations)."""
+        channels = self.spec.get("channels") if isinstance(self.spec.get("channels"), dict) else {}
+
+        if str(self.spec.get("asyncapi", "")).startswith("2"):
+            for channel_name, channel in channels.items():
+                channel, _ = self.resolve(channel)
+                if not isinstance(channel, dict):
+                    continue
+                for action in ASYNCAPI_V2_ACTIONS:
+                    operation = channel.get(action)
+                    if isinstance(operation, dict):
+                        section = f"{action.upper()} {channel_name}"
+                        messages = operation.get("message")
+                        if isinstance(messages, dict) and isinstance(messages.get("oneOf"), list):
+                            messages = messages["oneOf"]
+                        yield section, self.asyncapi_operation(section, operation, channel, messages)
+            return
+
+        operations = self.spec.get("operations")
+        if not isinstance(operations, dict):
+            return
+        for operation_id, operation in operations.items():
+            operation, _ = self.resolve(operation)
+            if not isinstance(operation, dict):
+                continue
+            channel, _ = self.resolve(operation.get("channel"))
+            channel = channel if isinstance(channel, dict) else {}
+            address = channel.get("address") or operation_id
+            section = f"{str(operation.get('action', 'operation')).upper()} {address}"
+            messages = operation.get("messages") or list((channel.get("messages") or {}).values())
+            operation = {"operationId": operation_id, **operation}
+            yield section, self.asyncapi_operation(section, operation, channel, messages)
+
+    def asyncapi_operation(self, section: str, operation: Dict[str, Any], channel: Dict[str, Any], messages: Any) -> str:
+        """Render one AsyncAPI operation with its channel parameters and message payloads."""
+        lines = [f"{self.title} - event operation", section]
+        lines.extend(self.operation_header(operation))
+        if channel.get("description"):
+            lines.append(f"Channel: {_truncate(channel['description'], 500)}")
+        expanded: Set[str] = set()
+
+        parameters = channel.get("parameters")
+        if isinstance(parameters, dict) and parameters:
+            lines.append("Channel parameters:")
+            for name, parameter in parameters.items():
+                parameter, _ = self.resolve(parameter)
+                description = parameter.get("description", "") if isinstance(parameter, dict) else ""
+                lines.append(f"- {name}: {_truncate(description)}".rstrip(": "))
+
+        if not isinstance(messages, list):
+            messages = [messages] if messages else []
+        for message in messages:
+            message, name = self.resolve(message)
+            if not isinstance(message, dict):
+                continue
+            label = message.get("name") or message.get("title") or name or "message"
+            lines.append(f"Message {label}:")
+            summary = message.get("summary") or message.get("description")
+            if summary:
+                lines.append(f"  {_truncate(summary, 500)}")
+            if message.get("headers"):
+                lines.append("  Headers:")
+                self.render_schema(message["headers"], lines, 2, 0, expanded)
+            if message.get("payload") is not None:
+                lines.append("  Payload:")
+                lines.extend(self.schema_lines(message["payload"], 2, expanded))
+
+        return "\n".join(lines)
+
+
+def chunk_api_spec(
+    text: str,
+    chunk_size: int = 3000,
+    max_schema_depth: int = DEFAULT_MAX_SCHEMA_DEPTH
+) -> Optional[List[ApiChunk]]:
+    """
+    Parse and chunk an API definition.
+
+    Args:
+        text: YAML or JSON file content
+        chunk_size: Maximum characters per chunk
+        max_schema_depth: Nested schema levels rendered inline in an operation
+
+    Returns:
+        List of (text, chunk_type, section) tuples, or None if the text is not an
+        OpenAPI/Swagger/AsyncAPI definition (callers fall back to text chunking)
+    """
+    spec = parse_api_spec(text)
+    if spec is None:
+        return None
+    return ApiSpecChunker(chunk_size, max_schema_depth).chunk_spec(spec)
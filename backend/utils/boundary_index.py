@@ -0,0 +1,167 @@
+"""
+Boundary index for linear-time text chunking.
+
+Candidate split offsets are collected up front into sorted arrays ranked by
+boundary strength (paragraph break > line break > sentence end), and chunk
+ends are chosen with bisect lookups instead of repeated backwards ``rfind``
+scans. Spaces, the weakest boundary, are only looked for inside the bounded
+search window of a chunk that has no stronger boundary.
+
+The index is built with vectorized numpy comparisons over the text's code
+points, and each chunk costs O(log n) plus at most one scan of its search
+window, so chunking a text of n characters is O(n) with no pathological inputs.
+"""
+import re
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+_NEWLINE = ord("\n")
+_SPACE = ord(" ")
+_SENTENCE_MARKS = [ord(c) for c in ".!?:"]
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def code_points(text: str) -> np.ndarray:
+    """
+    Get the code points of a text, one array element per character.
+
+    Array positions are str offsets; uint32 code points are only needed for
+    non-ASCII text.
+    """
+    if text.isascii():
+        return np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+class BoundaryIndex:
+    """Sorted candidate split offsets of a text, one array per boundary strength."""
+
+    def __init__(self, text: str):
+        """
+        Build the index in one vectorized pass over the text.
+
+        Offsets are chunk END positions, i.e. just after the separator, so the
+        separator stays with the earlier chunk.
+
+        Args:
+            text: Text to index
+        """
+        self.text = text
+        self.length = len(text)
+        self.codes = codes = code_points(text)
+
+        newline = codes == _NEWLINE
+        followed_by_break = newline[1:] | (codes[1:] == _SPACE)
+
+        paragraph_ends = np.flatnonzero(newline[:-1] & newline[1:]) + 2
+        line_ends = np.flatnonzero(newline) + 1
+        sentence_mark = np.zeros(len(codes) - 1 if len(codes) else 0, dtype=bool)
+        for mark in _SENTENCE_MARKS:
+            sentence_mark |= codes[:-1] == mark
+        sentence_ends = np.flatnonzero(sentence_mark & followed_by_break) + 2
+
+        # Strongest first
+        self.offsets = (paragraph_ends, line_ends, sentence_ends)
+
+    def best_break(self, low: int, high: int) -> Optional[int]:
+        """
+        Find the strongest boundary ending in (low, high], preferring the rightmost.
+
+        Args:
+            low: Exclusive lower bound for the chunk end
+            high: Inclusive upper bound for the chunk end
+
+        Returns:
+            Chunk end offset, or None if the range has no boundary
+        """
+        for offsets in self.offsets:
+            i = bisect_right(offsets, high) - 1
+            if i >= 0 and offsets[i] > low:
+                return int(offsets[i])
+
+        # Last resort: the rightmost space in range
+        space_pos = self.text.rfind(" ", low, high)
+        if space_pos != -1 and space_pos + 1 > low:
+            return space_pos + 1
+
+        return None
+
+    def split_points(
+        self,
+        chunk_size: int,
+        chunk_overlap: int = 0,
+        search_window: Optional[int] = None,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        """
+        Compute (start, end) spans covering the text (or the range start:stop of it).
+
+        Each chunk ends at the strongest boundary within the last ``search_window``
+        characters before ``start + chunk_size`` (hard split if there is none).
+        The next chunk starts ``chunk_overlap`` characters before the previous end,
+        moved forward to the next word boundary.
+
+        Args:
+            chunk_size: Maximum characters per chunk
+            chunk_overlap: Characters shared by consecutive chunks
+            search_window: How far back from the size limit to look for a boundary
+                           (None = anywhere in the chunk)
+            start: Offset where the first chunk starts
+            stop: Offset where the last chunk ends (None = end of text)
+
+        Returns:
+            List of (start, end) offsets
+        """
+        spans = []
+        text_length = self.length if stop is None else stop
+
+        while start < text_length:
+            end = start + chunk_size
+
+            if end >= text_length:
+                end = text_length
+            else:
+                low = start if search_window is None else max(start, end - search_window)
+                found = self.best_break(low, end)
+                if found is not None:
+                    end = found
+
+            spans.append((start, end))
+
+            if end >= text_length:
+                break
+
+            # Always make progress, even when the overlap is larger than the chunk
+            start = max(end - chunk_overlap, start + 1)
+
+            # Don't start the overlap in the middle of a word
+            if chunk_overlap and not self.text[start - 1].isspace():
+                word_end = _WHITESPACE_RE.search(self.text, start, end)
+                if word_end:
+                    start = word_end.end()
+
+        return spans
+
+
+def split_text(
+    text: str,
+    chunk_size: int,
+    chunk_overlap: int = 0,
+    search_window: Optional[int] = None
+) -> List[Tuple[int, int]]:
+    """
+    Index a text and compute its chunk spans.
+
+    Args:
+        text: Text to split
+        chunk_size: Maximum characters per chunk
+        chunk_overlap: Characters shared by consecutive chunks
+        search_window: How far back from the size limit to look for a boundary
+
+    Returns:
+        List of (start, end) offsets
+    """
+    return BoundaryIndex(text).split_points(chunk_size, chunk_overlap, search_window)
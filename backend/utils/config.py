@@ -28,7 +28,7 @@ class Config:
     MILVUS_URI: str = os.getenv("MILVUS_URI", "")
     MILVUS_TOKEN: str = os.getenv("MILVUS_TOKEN", "")
     MILVUS_COLLECTION_NAME: str = os.getenv("MILVUS_COLLECTION_NAME", "choreo-docs")
-    MILVUS_DIMENSION: Optional[int] = int(os.getenv("MILVUS_DIMENSION", "1536"))
+    MILVUS_DIMENSION: Optional[int] = int(os.getenv("MILVUS_DIMENSION") or os.getenv("EMBEDDING_DIMENSIONS") or "1536")
     MILVUS_METRIC: str = os.getenv("MILVUS_METRIC", "COSINE")
 
     # GitHub Configuration
@@ -41,6 +41,7 @@ class Config:
     # LLM Configuration
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
     EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+    EMBEDDING_DIMENSIONS: Optional[int] = int(os.getenv("EMBEDDING_DIMENSIONS", "0")) or None
 
     # Chunking Configuration
     CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "1000"))
@@ -71,9 +72,32 @@ def load_config():
         "MILVUS_URI": os.getenv("MILVUS_URI", ""),
         "MILVUS_TOKEN": os.getenv("MILVUS_TOKEN", ""),
         "MILVUS_COLLECTION_NAME": os.getenv("MILVUS_COLLECTION_NAME", "readme_embeddings"),
-        "MILVUS_DIMENSION": int(os.getenv("MILVUS_DIMENSION", "1536")),
+        "MILVUS_DIMENSION": int(os.getenv("MILVUS_DIMENSION") or os.getenv("EMBEDDING_DIMENSIONS") or "1536"),
         "MILVUS_METRIC": os.getenv("MILVUS_METRIC", "COSINE"),
 
+        # Milvus client pool (see db/milvus_pool.py); MILVUS_POOL_SIZE=0 shares one MilvusClient
+        "MILVUS_POOL_SIZE": int(os.getenv("MILVUS_POOL_SIZE", "4")),
+        "MILVUS_CALL_TIMEOUT": float(os.getenv("MILVUS_CALL_TIMEOUT", "30")) or None,
+        "MILVUS_MAX_RETRIES": int(os.getenv("MILVUS_MAX_RETRIES", "3")),
+        "MILVUS_RETRY_BACKOFF": float(os.getenv("MILVUS_RETRY_BACKOFF", "0.2")),
+        "MILVUS_POOL_HEALTH_CHECK_INTERVAL": float(os.getenv("MILVUS_POOL_HEALTH_CHECK_INTERVAL", "30")),
+        "MILVUS_POOL_ACQUIRE_TIMEOUT": float(os.getenv("MILVUS_POOL_ACQUIRE_TIMEOUT", "30")),
+
+        # Vector backend: "milvus" or "local" (embedded, see db/local_vector_client.py)
+        "VECTOR_BACKEND": os.getenv("VECTOR_BACKEND", "milvus"),
+        "LOCAL_VECTOR_PATH": os.getenv("LOCAL_VECTOR_PATH", str(backend_dir / "data" / "vectors")),
+        "LOCAL_VECTOR_QUANTIZATION": os.getenv("LOCAL_VECTOR_QUANTIZATION", "none"),
+        "LOCAL_VECTOR_RESCORE_FACTOR": int(os.getenv("LOCAL_VECTOR_RESCORE_FACTOR", "4")),
+        "LOCAL_VECTOR_SEARCH_DIMENSION": int(os.getenv("LOCAL_VECTOR_SEARCH_DIMENSION", "0")) or None,
+
+        # In-process read replica of the Milvus collection (see db/replica_cache.py)
+        "VECTOR_REPLICA_ENABLED": os.getenv("VECTOR_REPLICA_ENABLED", "false").lower() == "true",
+        "VECTOR_REPLICA_DTYPE": os.getenv("VECTOR_REPLICA_DTYPE", "float16"),
+        "VECTOR_REPLICA_NPROBE": int(os.getenv("VECTOR_REPLICA_NPROBE", "16")),
+        "VECTOR_REPLICA_SYNC_INTERVAL": float(os.getenv("VECTOR_REPLICA_SYNC_INTERVAL", "30")),
+        "VECTOR_REPLICA_MAX_STALENESS": float(os.getenv("VECTOR_REPLICA_MAX_STALENESS", "300")),
+        "VECTOR_REPLICA_PAYLOAD_CACHE": int(os.getenv("VECTOR_REPLICA_PAYLOAD_CACHE", "20000")),
+
         # GitHub
         "GITHUB_TOKEN": os.getenv("GITHUB_TOKEN"),
 
@@ -89,6 +113,8 @@ def load_config():
 
         # Embedding
         "EMBEDDING_MODEL": os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"),
+        # Shortened (Matryoshka) embeddings, text-embedding-3-* only; None = the model's full dimension
+        "EMBEDDING_DIMENSIONS": int(os.getenv("EMBEDDING_DIMENSIONS", "0")) or None,
 
         # Chunking
         "CHUNK_SIZE": int(os.getenv("CHUNK_SIZE", "10000")),
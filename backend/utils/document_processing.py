@@ -0,0 +1,282 @@
+"""
+CPU-bound document processing used during ingestion.
+
+Kept free of service and network dependencies so that worker processes of
+the ingestion process pool can import it cheaply.
+"""
+import re
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .logger import get_logger
+from .api_spec_chunking import ApiChunk, chunk_api_spec
+from .markdown_chunking import ChunkPolicy, chunk_spans
+
+logger = get_logger(__name__)
+
+MAX_TEXT_CHUNKING_CHARS = 1000000  # Larger files are only ingested if they parse as API definitions
+
+
+# One pass over the text finds every image construct and every run of blank
+# lines. Every branch starts with a literal character or a line start, so the
+# regex engine only tries a match at '!', '<', '[' and line boundaries.
+_MARKDOWN_IMAGE_RE = re.compile(
+    r"""
+    !\[[^\]]*\]\((?P<inline>[^)]+)\)              # ![alt](url "title")
+    | !\[(?P<alt>[^\]]*)\]\[(?P<ref>[^\]]*)\]     # ![alt][ref]
+    | ^[ \t]{0,3}\[(?P<label>[^\]\n]+)\]:[ \t]+(?P<definition>\S+)  # [ref]: url at the start of a line
+    | <img\b(?P<tag>[^>]*)>                       # <img src="url">
+    | \n\n\n+                                      # blank lines
+    """,
+    re.VERBOSE | re.IGNORECASE | re.MULTILINE
+)
+_IMG_SRC_RE = re.compile(r"""\bsrc\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".svg", ".webp")
+
+
+def _image_url(target: str) -> str:
+    """URL part of a markdown link target ('url "title"' or '<url>')."""
+    target = target.strip()
+    if target.startswith("<"):
+        return target[1:target.find(">")] if ">" in target else target[1:]
+    return target.split(None, 1)[0] if target else ""
+
+
+def strip_markdown_images(text: str) -> Tuple[str, List[str]]:
+    """
+    Remove all image references from markdown text in a single pass.
+
+    Removes inline images, reference-style images, reference definitions and
+    HTML img tags, and collapses the blank lines they leave behind. Reference
+    definitions are only recorded as images when an image uses them or their
+    URL has an image extension.
+
+    Args:
+        text: Markdown text content
+
+    Returns:
+        Tuple of (text without images, image URLs in order of first appearance)
+    """
+    if not text:
+        return text, []
+
+    pieces: List[str] = []
+    urls: Dict[str, None] = {}  # Ordered set
+    image_refs = set()
+    position = 0
+    trailing_newlines = 0  # Newlines at the end of the output so far
+
+    def append(piece: str):
+        nonlocal trailing_newlines
+        if not piece:
+            return
+        leading = len(piece) - len(piece.lstrip("\n"))
+        if trailing_newlines + leading > 2:
+            # Collapse a blank-line run that spans removed content
+            piece = piece[min(leading, trailing_newlines + leading - 2):]
+            leading = len(piece) - len(piece.lstrip("\n"))
+            if not piece:
+                return
+        pieces.append(piece)
+        if leading == len(piece):
+            trailing_newlines += leading
+        else:
+            trailing_newlines = len(piece) - len(piece.rstrip("\n"))
+
+    for match in _MARKDOWN_IMAGE_RE.finditer(text):
+        start = match.start()
+        if start < position:
+            continue  # Inside a removed definition line
+        kind = match.lastgroup
+
+        if kind == "definition":
+            append(text[position:start])
+            line_end = text.find("\n", match.end())
+            position = len(text) if line_end < 0 else line_end
+
+            url = _image_url(match.group("definition"))
+            is_image = (
+                match.group("label").strip().lower() in image_refs
+                or url.split("?", 1)[0].lower().endswith(IMAGE_EXTENSIONS)
+            )
+            if is_image:
+                urls[url] = None
+            continue
+
+        append(text[position:start])
+        position = match.end()
+
+        if kind == "inline":
+            url = _image_url(match.group("inline"))
+        elif kind == "ref":
+            image_refs.add((match.group("ref") or match.group("alt")).strip().lower())
+            continue
+        elif kind == "tag":
+            src = _IMG_SRC_RE.search(match.group("tag"))
+            url = next((value for value in src.groups() if value is not None), "") if src else ""
+        else:
+            append("\n\n")
+            continue
+
+        if url:
+            urls[url] = None
+
+    append(text[position:])
+    cleaned = "".join(pieces).strip()
+
+    if urls:
+        logger.debug(f"Removed {len(urls)} images from markdown text")
+    return cleaned, list(urls)
+
+
+def remove_images_from_markdown(text: str) -> str:
+    """
+    Remove all image references from markdown text.
+
+    Args:
+        text: Markdown text content
+
+    Returns:
+        Text with all image references removed (see strip_markdown_images())
+    """
+    return strip_markdown_images(text)[0]
+
+
+class DocumentChunker:
+    """Utility class for chunking documents."""
+
+    def __init__(self, chunk_size: int = 3000, chunk_overlap: int = 200):
+        """
+        Initialize chunker.
+
+        Args:
+            chunk_size: Maximum characters per chunk
+            chunk_overlap: Number of overlapping characters between chunks
+        """
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        # Size windows without forced section breaks; break points are only
+        # searched in the last 300 chars of each chunk
+        self.policy = ChunkPolicy(max_chars=chunk_size, overlap_chars=chunk_overlap, search_window=300)
+
+    def split_points(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Compute the (start, end) spans of the chunks of a text.
+
+        Uses the shared markdown chunking engine: chunks end at headers,
+        paragraph or line breaks, and code blocks and tables are kept whole when
+        they fit. Chunking time grows linearly with the text size.
+
+        Args:
+            text: Text to chunk
+
+        Returns:
+            List of (start, end) offsets
+        """
+        return [(start, end) for start, end, _ in chunk_spans(text, self.policy)]
+
+    def chunk_text(self, text: str, metadata: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """
+        Split text into overlapping chunks.
+
+        Args:
+            text: Text to chunk
+            metadata: Additional metadata to attach to each chunk
+
+        Returns:
+            List of chunks with metadata
+        """
+        return self.chunks_from_spans(text, self.split_points(text), metadata)
+
+    def chunks_from_spans(
+        self,
+        text: str,
+        spans: Iterable[Tuple[int, int]],
+        metadata: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Build chunk dicts from precomputed spans (e.g. returned by a worker process).
+
+        Args:
+            text: Text the spans refer to
+            spans: (start, end) offsets
+            metadata: Additional metadata to attach to each chunk
+
+        Returns:
+            List of chunks with metadata
+        """
+        chunks = []
+        for start, end in spans:
+            chunk_text = text[start:end].strip()
+            if not chunk_text:
+                continue
+
+            chunks.append({
+                "content": chunk_text,
+                "metadata": {
+                    **(metadata or {}),
+                    "chunk_index": len(chunks),
+                    "start_char": start,
+                    "end_char": end
+                }
+            })
+
+        if len(text) > 15000:
+            logger.info(f"Created {len(chunks)} chunks from {len(text)} chars")
+
+        return chunks
+
+
+def prepare_document(
+    text: str,
+    file_type: str,
+    chunk_size: int,
+    chunk_overlap: int
+) -> Tuple[Optional[str], array, Optional[List[ApiChunk]], List[str]]:
+    """
+    Clean and chunk one document (runs in a worker process).
+
+    The result is a compact record: the cleaned text (only if cleaning changed
+    it) plus a flat array of (start, end) offsets, instead of one dict per chunk
+    with repeated metadata. OpenAPI/AsyncAPI definitions are chunked per
+    operation instead, and their chunk texts are returned as the third element.
+    The URLs of images removed from markdown are returned last.
+
+    Args:
+        text: Raw file content
+        file_type: 'markdown' or 'api_definition'
+        chunk_size: Maximum characters per chunk
+        chunk_overlap: Number of overlapping characters between chunks
+
+    Returns:
+        Tuple of (cleaned text or None if unchanged,
+                  flat array [start0, end0, start1, end1, ...],
+                  (text, chunk_type, section) tuples of an API definition or None,
+                  removed image URLs)
+    """
+    spans = array("q")
+
+    if file_type == "api_definition":
+        api_chunks = chunk_api_spec(text, chunk_size)
+        if api_chunks is not None:
+            return None, spans, api_chunks, []
+
+        if len(text) > MAX_TEXT_CHUNKING_CHARS:
+            logger.warning(f"Unparseable API definition too large for text chunking ({len(text)} chars)")
+            return None, spans, None, []
+
+    if file_type == "markdown":
+        cleaned, image_urls = strip_markdown_images(text)
+    else:
+        cleaned, image_urls = text, []
+
+    for start, end in DocumentChunker(chunk_size, chunk_overlap).split_points(cleaned):
+        spans.append(start)
+        spans.append(end)
+
+    return (None if cleaned == text else cleaned), spans, None, image_urls
+
+
+def unpack_spans(flat_spans: array) -> List[Tuple[int, int]]:
+    """Turn a flat [start0, end0, start1, end1, ...] array back into (start, end) pairs."""
+    return list(zip(flat_spans[0::2], flat_spans[1::2]))
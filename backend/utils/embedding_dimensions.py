@@ -0,0 +1,56 @@
+"""
+Reduced-dimension (Matryoshka) embeddings.
+
+text-embedding-3-small / -large are trained so that a prefix of an
+embedding, re-normalized, is itself a good embedding. They accept a
+'dimensions' request parameter that returns that prefix directly, so
+memory, bandwidth and search time of the vectors drop roughly in proportion
+to the dimension (EMBEDDING_DIMENSIONS; older models such as
+text-embedding-ada-002 reject the parameter).
+
+The same property allows two-stage search over full-dimension vectors: an
+ANN pass over short prefixes followed by rescoring of the best candidates on
+the full vectors (MILVUS_SEARCH_DIMENSION, LOCAL_VECTOR_SEARCH_DIMENSION).
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+MATRYOSHKA_MODEL_PREFIX = "text-embedding-3"  # OpenAI models accepting the 'dimensions' parameter
+
+
+def embedding_request_options(dimensions: Optional[int], model: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extra embeddings.create arguments requesting shortened embeddings ({} = model default).
+
+    Args:
+        dimensions: Requested embedding size (None = full size)
+        model: OpenAI model name; {} unless it is a text-embedding-3 model (None = an
+            Azure deployment, whose name says nothing about the model and is trusted)
+    """
+    if not dimensions or (model is not None and not model.startswith(MATRYOSHKA_MODEL_PREFIX)):
+        return {}
+    return {"dimensions": int(dimensions)}
+
+
+def truncate_embeddings(vectors: Any, dimension: int, normalize: bool = True) -> np.ndarray:
+    """
+    Matryoshka prefix of embeddings.
+
+    Args:
+        vectors: One embedding or a matrix of embeddings
+        dimension: Prefix length
+        normalize: Re-normalize the prefixes to unit length (for COSINE / IP on unit vectors)
+
+    Returns:
+        float32 array of the same rank as the input
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.shape[-1] < dimension:
+        raise ValueError(f"Cannot truncate {vectors.shape[-1]}-dimensional embeddings to {dimension}")
+    prefix = vectors[..., :dimension]
+    if not normalize:
+        return prefix.copy()
+    return prefix / np.maximum(np.linalg.norm(prefix, axis=-1, keepdims=True), 1e-12)
@@ -0,0 +1,261 @@
+"""
+Shared GitHub rate-limit budget scheduler.
+
+All GitHub clients in the process (GitHubService, the GraphQL fetcher,
+GitHubIssueFetcher and the fetch scripts) draw from one scheduler per
+process, so that quota is tracked once per bucket (core, search, graphql)
+from the ``X-RateLimit-*`` response headers instead of each client sleeping
+a fixed time.
+
+Callers acquire budget with a priority. Lower-priority callers (nightly
+sweeps) may not spend the share of the window reserved for higher-priority
+callers (interactive requests), and yield to them while waiting. While the
+budget is plentiful requests go out immediately; once it runs low the
+remaining budget is spread evenly over the time left until reset.
+"""
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Priorities (lower value = more important)
+PRIORITY_INTERACTIVE = 0  # Chat / webhook requests made while a user is waiting
+PRIORITY_NORMAL = 1  # Manually started ingestion
+PRIORITY_BACKGROUND = 2  # Nightly / org-wide sweeps
+
+# Share of each bucket's limit that a priority may NOT spend (kept for higher priorities)
+RESERVE_FRACTIONS = {
+    PRIORITY_INTERACTIVE: 0.0,
+    PRIORITY_NORMAL: 0.05,
+    PRIORITY_BACKGROUND: 0.2,
+}
+
+# Start spreading requests over the window once less than this share of the limit is available
+PACING_THRESHOLD = 0.2
+
+# Bucket names as reported in the X-RateLimit-Resource header
+BUCKET_CORE = "core"
+BUCKET_SEARCH = "search"
+BUCKET_GRAPHQL = "graphql"
+
+
+def bucket_for_url(url: str) -> str:
+    """
+    Map a GitHub API URL to its rate-limit bucket.
+
+    Args:
+        url: Request URL
+
+    Returns:
+        Bucket name ('core', 'search' or 'graphql')
+    """
+    if url.rstrip("/").endswith("/graphql"):
+        return BUCKET_GRAPHQL
+    if "/search/" in url:
+        return BUCKET_SEARCH
+    return BUCKET_CORE
+
+
+class _Bucket:
+    """Rate-limit state of a single bucket."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset: Optional[float] = None
+        self.next_slot = 0.0  # Earliest time the next paced request may start
+        self.paused_until = 0.0  # Secondary rate limit back-off (applies even before any headers are seen)
+        self.waiting = {p: 0 for p in RESERVE_FRACTIONS}
+
+
+class GitHubRateLimiter:
+    """Thread-safe, priority-aware quota scheduler for the GitHub API."""
+
+    def __init__(self, pacing_threshold: float = PACING_THRESHOLD):
+        """
+        Initialize the scheduler.
+
+        Args:
+            pacing_threshold: Fraction of the limit below which requests are paced
+        """
+        self.pacing_threshold = pacing_threshold
+        self._buckets: Dict[str, _Bucket] = {}
+        self._condition = threading.Condition()
+
+    def _bucket(self, name: str) -> _Bucket:
+        """Get or create bucket state (lock must be held)."""
+        if name not in self._buckets:
+            self._buckets[name] = _Bucket(name)
+        return self._buckets[name]
+
+    def acquire(self, bucket: str = BUCKET_CORE, priority: int = PRIORITY_NORMAL, cost: int = 1):
+        """
+        Block until a request of the given cost may be sent.
+
+        Args:
+            bucket: Rate-limit bucket ('core', 'search' or 'graphql')
+            priority: Caller priority (PRIORITY_INTERACTIVE / NORMAL / BACKGROUND)
+            cost: Budget consumed by the request (GraphQL query cost, 1 for REST)
+        """
+        priority = priority if priority in RESERVE_FRACTIONS else PRIORITY_NORMAL
+
+        with self._condition:
+            state = self._bucket(bucket)
+            state.waiting[priority] += 1
+            try:
+                while True:
+                    wait_time = self._wait_time(state, priority, cost)
+                    if wait_time <= 0:
+                        break
+                    self._condition.wait(timeout=wait_time)
+            finally:
+                state.waiting[priority] -= 1
+
+            if state.remaining is not None:
+                state.remaining -= cost
+                available = state.remaining - self._reserve(state, priority)
+                if state.limit and state.reset and available < state.limit * self.pacing_threshold:
+                    # Spread what is left evenly over the rest of the window
+                    interval = max(0.0, state.reset - time.time()) / max(1, available)
+                    state.next_slot = max(state.next_slot, time.time()) + interval
+
+    def _reserve(self, state: _Bucket, priority: int) -> int:
+        """Budget this priority must leave untouched."""
+        if not state.limit:
+            return 0
+        return int(state.limit * RESERVE_FRACTIONS[priority])
+
+    def _wait_time(self, state: _Bucket, priority: int, cost: int) -> float:
+        """Seconds to wait before this caller may proceed (0 = go now)."""
+        now = time.time()
+
+        # Backing off after a secondary rate limit
+        if priority != PRIORITY_INTERACTIVE and state.paused_until > now:
+            return state.paused_until - now
+
+        # Window rolled over - budget is unknown until the next response arrives
+        if state.reset is not None and now >= state.reset:
+            state.remaining = None
+            state.reset = None
+            state.next_slot = 0.0
+
+        if state.remaining is None:
+            return 0.0
+
+        # Yield to more important callers waiting on the same bucket
+        if any(state.waiting[p] for p in state.waiting if p < priority):
+            return 0.5
+
+        if state.remaining - cost < self._reserve(state, priority):
+            if state.reset is None:
+                return 0.0
+            wait_time = state.reset - now + 1
+            logger.warning(
+                f"GitHub {state.name} budget low ({state.remaining} left), "
+                f"waiting {wait_time:.0f}s for reset"
+            )
+            return wait_time
+
+        # Higher priorities are never paced
+        if priority == PRIORITY_INTERACTIVE:
+            return 0.0
+
+        return max(0.0, state.next_slot - now)
+
+    def update_from_headers(self, headers: Mapping[str, str], bucket: Optional[str] = None):
+        """
+        Record rate-limit state from GitHub response headers.
+
+        Args:
+            headers: Response headers (X-RateLimit-Limit / Remaining / Reset / Resource)
+            bucket: Bucket to update when X-RateLimit-Resource is absent
+        """
+        if headers.get("X-RateLimit-Remaining") is None:
+            return
+
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            limit = int(headers.get("X-RateLimit-Limit") or 0) or None
+            reset = float(headers.get("X-RateLimit-Reset") or 0) or None
+        except (TypeError, ValueError):
+            return
+
+        self.update(headers.get("X-RateLimit-Resource") or bucket or BUCKET_CORE, remaining, reset, limit)
+
+    def update(self, bucket: str, remaining: int, reset: Optional[float] = None, limit: Optional[int] = None):
+        """
+        Record rate-limit state for a bucket.
+
+        A response for the current window (same reset time) replaces the local
+        count, which is only an estimate: requests answered 304 from the cache
+        are not charged by GitHub. Responses without a reset time can only lower
+        it; responses for an older window are ignored.
+
+        Args:
+            bucket: Bucket name
+            remaining: Remaining budget in the current window
+            reset: Unix timestamp when the window resets
+            limit: Budget per window
+        """
+        with self._condition:
+            state = self._bucket(bucket)
+            new_window = reset is not None and (state.reset is None or reset > state.reset)
+
+            if new_window or state.remaining is None:
+                state.remaining = remaining
+                state.next_slot = 0.0
+            elif reset is None:
+                state.remaining = min(state.remaining, remaining)
+            elif reset == state.reset:
+                state.remaining = remaining
+
+            if new_window:
+                state.reset = reset
+            if limit:
+                state.limit = limit
+
+            self._condition.notify_all()
+
+    def penalize(self, bucket: str, retry_after: float):
+        """
+        Stop non-interactive use of a bucket after a secondary rate limit (403/429 + Retry-After).
+
+        Args:
+            bucket: Bucket name
+            retry_after: Seconds to back off
+        """
+        with self._condition:
+            state = self._bucket(bucket)
+            state.paused_until = max(state.paused_until, time.time() + retry_after)
+            self._condition.notify_all()
+            logger.warning(f"GitHub {bucket} secondary rate limit hit, backing off {retry_after:.0f}s")
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the last known state of each bucket.
+
+        Returns:
+            Dict mapping bucket name -> {'limit', 'remaining', 'reset'}
+        """
+        with self._condition:
+            return {
+                name: {"limit": b.limit, "remaining": b.remaining, "reset": b.reset}
+                for name, b in self._buckets.items()
+            }
+
+
+_rate_limiter: Optional[GitHubRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> GitHubRateLimiter:
+    """Get the process-wide GitHub rate limiter."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = GitHubRateLimiter()
+        return _rate_limiter
@@ -0,0 +1,175 @@
+"""
+Persistent, bounded HTTP cache for conditional GitHub API requests.
+
+Stores the response body together with its ETag / Last-Modified validators so
+that later requests can be sent with If-None-Match / If-Modified-Since. GitHub
+answers unchanged resources with 304 Not Modified, which does not count against
+the rate limit, and the body is served from this cache instead.
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Default cache location next to the .logs directory in the project root
+CACHE_DIR = Path(__file__).parent.parent.parent / ".cache"
+DEFAULT_CACHE_PATH = CACHE_DIR / "github_http_cache.sqlite"
+DEFAULT_MAX_ENTRIES = 20000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # Total size of the stored bodies
+PRUNE_EVERY_WRITES = 100
+
+
+class HTTPCache:
+    """
+    Sqlite-backed store of response bodies keyed by URL.
+
+    The store is bounded: once it grows past ``max_entries`` or its bodies
+    past ``max_bytes`` in total, the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Path to the sqlite file (None = default location, ":memory:" = not persisted)
+            max_entries: Maximum number of entries kept on disk
+            max_bytes: Maximum total size of the stored bodies in bytes
+        """
+        self.path = str(path or DEFAULT_CACHE_PATH)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._bytes_since_prune = 0
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(http_cache)")]
+        if "size" not in columns:
+            # Caches created before the byte cap
+            self._conn.execute("ALTER TABLE http_cache ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("UPDATE http_cache SET size = LENGTH(CAST(body AS BLOB))")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_http_cache_accessed ON http_cache (accessed_at)"
+        )
+        self._conn.commit()
+        logger.debug(f"HTTP cache ready at {self.path} (max {max_entries} entries, {max_bytes} bytes)")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            url: Request URL (cache key)
+
+        Returns:
+            Dict with 'etag', 'last_modified' and 'body' (decoded JSON), or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body FROM http_cache WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE http_cache SET accessed_at = ? WHERE url = ?",
+                (time.time(), url)
+            )
+            self._conn.commit()
+
+            return {"etag": row[0], "last_modified": row[1], "body": json.loads(row[2])}
+
+    def set(self, url: str, body: Any, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Store a response body with its validators.
+
+        Args:
+            url: Request URL (cache key)
+            body: Decoded JSON body
+            etag: ETag response header
+            last_modified: Last-Modified response header
+        """
+        # Only responses with validators can be revalidated later
+        if not etag and not last_modified:
+            return
+
+        data = json.dumps(body)
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body, stored_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, data, now, now, size)
+            )
+            self._writes_since_prune += 1
+            self._bytes_since_prune += size
+            # Prune early after large writes so a few big bodies cannot overshoot max_bytes by much
+            if self._writes_since_prune >= PRUNE_EVERY_WRITES or self._bytes_since_prune >= self.max_bytes // 10:
+                self._prune()
+            self._conn.commit()
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM http_cache")
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying sqlite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _prune(self):
+        """Evict least recently used rows beyond max_entries or max_bytes (lock must be held)."""
+        self._writes_since_prune = 0
+        self._bytes_since_prune = 0
+        count, total_bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache").fetchone()
+        excess = count - self.max_entries
+        excess_bytes = total_bytes - self.max_bytes
+        if excess <= 0 and excess_bytes <= 0:
+            return
+
+        evicted = []
+        freed = 0
+        for url, size in self._conn.execute("SELECT url, size FROM http_cache ORDER BY accessed_at ASC"):
+            if len(evicted) >= excess and freed >= excess_bytes:
+                break
+            evicted.append((url,))
+            freed += size
+        self._conn.executemany("DELETE FROM http_cache WHERE url = ?", evicted)
+        logger.debug(f"HTTP cache pruned {len(evicted)} least recently used entries ({freed} bytes)")
@@ -0,0 +1,363 @@
+"""
+Durable checkpoint journal for GitHub ingestion.
+
+Records which repositories of an organization sweep and which files of a
+repository have been fully ingested, the embedding batch cursor of files that
+were interrupted part-way, and embedding batches that were generated but not
+yet stored. A restarted sweep resumes where it stopped: completed repositories
+and files are skipped without a Milvus round trip, and pending batches are
+written out instead of being embedded again.
+
+Progress is kept per vector collection, so pointing ingestion at a new
+collection starts from scratch. Completed files are keyed by their Git blob
+SHA, so a changed file is always re-ingested. If a collection is dropped and
+recreated under the same name, reset the journal (``reset()`` or ``--fresh``)
+as well.
+"""
+import json
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+CHECKPOINT_DIR = Path(__file__).parent.parent.parent / ".cache"
+DEFAULT_CHECKPOINT_PATH = CHECKPOINT_DIR / "ingestion_checkpoint.sqlite"
+
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_COMPLETED = "completed"
+
+
+class IngestionCheckpoint:
+    """Sqlite-backed ingestion journal, safe to share between worker threads."""
+
+    def __init__(self, path: Optional[str] = None, collection: str = ""):
+        """
+        Open (or create) the checkpoint journal.
+
+        Args:
+            path: Path to the sqlite file (None = default location, ":memory:" = not persisted)
+            collection: Vector collection the ingested chunks are written to
+        """
+        self.path = str(path or DEFAULT_CHECKPOINT_PATH)
+        self.collection = collection
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(files)")]
+        if columns and "collection" not in columns:
+            # Progress recorded before the journal was kept per collection cannot be
+            # attributed to one; dropping it makes the next run re-check every file
+            logger.info("Discarding ingestion checkpoint journal without collection names")
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS sweeps; DROP TABLE IF EXISTS sweep_repositories; "
+                "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS pending_batches;"
+            )
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sweeps (
+                collection TEXT NOT NULL,
+                sweep_key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                finished_at REAL,
+                PRIMARY KEY (collection, sweep_key)
+            );
+            CREATE TABLE IF NOT EXISTS sweep_repositories (
+                collection TEXT NOT NULL,
+                sweep_key TEXT NOT NULL,
+                repository TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (collection, sweep_key, repository)
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                collection TEXT NOT NULL,
+                repository TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                file_sha TEXT NOT NULL,
+                status TEXT NOT NULL,
+                batches_done INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (collection, repository, file_path)
+            );
+            CREATE TABLE IF NOT EXISTS pending_batches (
+                collection TEXT NOT NULL,
+                repository TEXT NOT NULL,
+                file_path TEXT NOT NULL,
+                file_sha TEXT NOT NULL,
+                batch_index INTEGER NOT NULL,
+                items TEXT NOT NULL,
+                vectors BLOB NOT NULL,
+                dimension INTEGER NOT NULL,
+                PRIMARY KEY (collection, repository, file_path, batch_index)
+            );
+            """
+        )
+        self._conn.commit()
+        logger.debug(f"Ingestion checkpoint journal at {self.path}")
+
+    # ------------------------------------------------------------------
+    # Organization sweeps
+    # ------------------------------------------------------------------
+
+    def begin_sweep(self, sweep_key: str, fresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Start or resume an organization sweep.
+
+        A sweep that finished last time starts over; an unfinished one resumes.
+
+        Args:
+            sweep_key: Identifies the sweep (e.g. 'wso2-enterprise:choreo')
+            fresh: Discard any unfinished progress of this sweep
+
+        Returns:
+            Dict mapping repository -> stored result of repositories already completed
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM sweeps WHERE collection = ? AND sweep_key = ?", (self.collection, sweep_key)
+            ).fetchone()
+
+            if row is None or row[0] == STATUS_COMPLETED or fresh:
+                self._conn.execute(
+                    "DELETE FROM sweep_repositories WHERE collection = ? AND sweep_key = ?",
+                    (self.collection, sweep_key)
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sweeps (collection, sweep_key, status, started_at, finished_at) "
+                    "VALUES (?, ?, ?, ?, NULL)",
+                    (self.collection, sweep_key, STATUS_IN_PROGRESS, time.time())
+                )
+                self._conn.commit()
+                return {}
+
+            rows = self._conn.execute(
+                "SELECT repository, result FROM sweep_repositories WHERE collection = ? AND sweep_key = ? AND status = ?",
+                (self.collection, sweep_key, STATUS_COMPLETED)
+            ).fetchall()
+
+        completed = {repository: json.loads(result or "{}") for repository, result in rows}
+        if completed:
+            logger.info(f"♻️  Resuming sweep '{sweep_key}': {len(completed)} repositories already completed")
+        return completed
+
+    def complete_repository(self, sweep_key: str, repository: str, result: Dict[str, Any]):
+        """Record a repository of a sweep as fully ingested."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sweep_repositories (collection, sweep_key, repository, status, result, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.collection, sweep_key, repository, STATUS_COMPLETED, json.dumps(result), time.time())
+            )
+            self._conn.commit()
+
+    def finish_sweep(self, sweep_key: str):
+        """Mark a sweep as finished so the next run starts a new one."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE sweeps SET status = ?, finished_at = ? WHERE collection = ? AND sweep_key = ?",
+                (STATUS_COMPLETED, time.time(), self.collection, sweep_key)
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    def get_file_state(self, repository: str, file_path: str, file_sha: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the journal state of a file version.
+
+        Args:
+            repository: Repository ID ('owner/repo')
+            file_path: Path of the file in the repository
+            file_sha: Git blob SHA of the file
+
+        Returns:
+            Dict with 'status' and 'batches_done', or None if this version was never started
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, batches_done FROM files "
+                "WHERE collection = ? AND repository = ? AND file_path = ? AND file_sha = ?",
+                (self.collection, repository, file_path, file_sha)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"status": row[0], "batches_done": row[1]}
+
+    def completed_files(self, repository: str) -> Dict[str, str]:
+        """
+        Get the files of a repository that were fully ingested.
+
+        Returns:
+            Dict mapping file path -> SHA of the ingested version
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_path, file_sha FROM files WHERE collection = ? AND repository = ? AND status = ?",
+                (self.collection, repository, STATUS_COMPLETED)
+            ).fetchall()
+        return dict(rows)
+
+    def start_file(self, repository: str, file_path: str, file_sha: str):
+        """Record that ingestion of a file version started (batch cursor at 0)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (collection, repository, file_path, file_sha, status, batches_done, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 0, ?)",
+                (self.collection, repository, file_path, file_sha, STATUS_IN_PROGRESS, time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM pending_batches WHERE collection = ? AND repository = ? AND file_path = ?",
+                (self.collection, repository, file_path)
+            )
+            self._conn.commit()
+
+    def complete_file(self, repository: str, file_path: str, file_sha: str):
+        """Record that every embedding batch of a file version was stored."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE files SET status = ?, updated_at = ? "
+                "WHERE collection = ? AND repository = ? AND file_path = ? AND file_sha = ?",
+                (STATUS_COMPLETED, time.time(), self.collection, repository, file_path, file_sha)
+            )
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Embedding batches
+    # ------------------------------------------------------------------
+
+    def save_pending_batch(
+        self,
+        repository: str,
+        file_path: str,
+        file_sha: str,
+        batch_index: int,
+        batch_items: List[Dict[str, Any]]
+    ):
+        """
+        Persist an embedded batch before it is written to the vector store.
+
+        Args:
+            repository: Repository ID
+            file_path: Path of the file the batch belongs to
+            file_sha: Git blob SHA of the file
+            batch_index: 0-based index of the batch within the file
+            batch_items: Items with 'content', 'vector' and 'metadata'
+        """
+        if not batch_items:
+            return
+
+        dimension = len(batch_items[0]["vector"])
+        vectors = array("f")
+        for item in batch_items:
+            vectors.extend(item["vector"])
+        items = [{"content": item["content"], "metadata": item["metadata"]} for item in batch_items]
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pending_batches "
+                "(collection, repository, file_path, file_sha, batch_index, items, vectors, dimension) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.collection, repository, file_path, file_sha, batch_index, json.dumps(items), vectors.tobytes(), dimension)
+            )
+            self._conn.commit()
+
+    def batch_stored(
+        self,
+        repository: str,
+        file_path: str,
+        file_sha: str,
+        batch_index: int,
+        advance_cursor: bool = True
+    ):
+        """
+        Drop a pending batch once it is stored and advance the file's batch cursor.
+
+        Args:
+            repository: Repository ID
+            file_path: Path of the file the batch belongs to
+            file_sha: Git blob SHA of the file
+            batch_index: 0-based index of the stored batch
+            advance_cursor: False if an earlier batch of the file failed, so a
+                            resumed run starts again from the failed batch
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM pending_batches WHERE collection = ? AND repository = ? AND file_path = ? AND batch_index = ?",
+                (self.collection, repository, file_path, batch_index)
+            )
+            if advance_cursor:
+                self._conn.execute(
+                    "UPDATE files SET batches_done = MAX(batches_done, ?), updated_at = ? "
+                    "WHERE collection = ? AND repository = ? AND file_path = ? AND file_sha = ?",
+                    (batch_index + 1, time.time(), self.collection, repository, file_path, file_sha)
+                )
+            self._conn.commit()
+
+    def pending_batches(self, repository: str) -> List[Dict[str, Any]]:
+        """
+        Get embedded batches of a repository that were never confirmed as stored.
+
+        Returns:
+            List of dicts with 'file_path', 'file_sha', 'batch_index' and 'items'
+            (each item has 'content', 'vector' and 'metadata')
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_path, file_sha, batch_index, items, vectors, dimension FROM pending_batches "
+                "WHERE collection = ? AND repository = ? ORDER BY file_path, batch_index",
+                (self.collection, repository)
+            ).fetchall()
+
+        batches = []
+        for file_path, file_sha, batch_index, items_json, vector_bytes, dimension in rows:
+            vectors = array("f")
+            vectors.frombytes(vector_bytes)
+            items = json.loads(items_json)
+            for i, item in enumerate(items):
+                item["vector"] = vectors[i * dimension:(i + 1) * dimension].tolist()
+            batches.append({
+                "file_path": file_path,
+                "file_sha": file_sha,
+                "batch_index": batch_index,
+                "items": items
+            })
+        return batches
+
+    # ------------------------------------------------------------------
+
+    def reset(self, repository: Optional[str] = None):
+        """
+        Forget recorded progress of this collection.
+
+        Args:
+            repository: Only forget this repository's files (None = everything)
+        """
+        with self._lock:
+            if repository is None:
+                for table in ("sweeps", "sweep_repositories", "files", "pending_batches"):
+                    self._conn.execute(f"DELETE FROM {table} WHERE collection = ?", (self.collection,))
+            else:
+                for table in ("files", "pending_batches"):
+                    self._conn.execute(
+                        f"DELETE FROM {table} WHERE collection = ? AND repository = ?", (self.collection, repository)
+                    )
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying sqlite connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,299 @@
+"""
+Markdown chunking engine shared by all ingestion paths.
+
+A single pass over a document finds headers, fenced code blocks, tables and
+list items. Together with the boundary index this ranks every
+candidate split offset, strongest first:
+
+1. Header starts
+2. Paragraph ends outside code blocks and tables
+3. List item starts
+4. Line ends outside code blocks and tables
+5. Sentence ends outside code blocks and tables
+6. Line ends inside a code block or table (only when one does not fit in a chunk)
+
+Chunks are computed as (start, end) offsets into the original text, and the
+text is only sliced once per final chunk. Callers differ only in their
+ChunkPolicy: forced section breaks, overlap, and merging of small chunks.
+"""
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .boundary_index import BoundaryIndex, code_points
+
+_ORDERED_ITEM_RE = re.compile(r"\d{1,9}[.)](?=[ \t]|\r?\n|$)")
+_NEWLINE, _CARRIAGE_RETURN, _SPACE, _TAB = (ord(c) for c in "\n\r \t")
+_HASH, _BACKTICK, _TILDE, _PIPE = (ord(c) for c in "#`~|")
+_DASH, _STAR, _PLUS = (ord(c) for c in "-*+")
+_DIGIT_0, _DIGIT_9 = ord("0"), ord("9")
+_NON_SPACE_RE = re.compile(r"\S")
+
+
+@dataclass(frozen=True)
+class ChunkPolicy:
+    """How a source wants its markdown chunked."""
+
+    max_chars: int
+    overlap_chars: int = 0
+    min_chars: int = 0  # Chunks shorter than this are merged into the previous chunk
+    merge_limit: Optional[int] = None  # Largest size of a merged chunk (None = max_chars)
+    section_level: int = 0  # Headers up to this level always start a new chunk (0 = none)
+    search_window: Optional[int] = None  # How far back from max_chars to look for a break (None = max_chars // 2)
+
+
+class MarkdownChunk(NamedTuple):
+    """A chunk as offsets into the source text, with the title of its section."""
+
+    start: int
+    end: int
+    section_title: str
+
+
+class MarkdownStructure(NamedTuple):
+    """Offsets found by scan_markdown()."""
+
+    headers: List[Tuple[int, int, str]]  # (line offset, level, title)
+    blocks: List[Tuple[int, int]]  # (start, end) of fenced code blocks and tables
+    list_items: List[int]  # Line offsets of list items
+
+
+def scan_markdown(text: str, codes: Optional[np.ndarray] = None) -> MarkdownStructure:
+    """
+    Tokenise the block structure of a markdown document.
+
+    Lines are classified with vectorized comparisons on their first characters
+    (after up to 3 spaces of indentation). Python only visits code fence lines,
+    headers (for their titles) and numbered list items. Anything inside a code
+    block is ignored, and an unclosed code fence runs to the end of the document.
+
+    Args:
+        text: Markdown text
+        codes: Code points of the text, if already computed (see code_points())
+
+    Returns:
+        MarkdownStructure with header, block and list item offsets
+    """
+    text_length = len(text)
+    if not text_length:
+        return MarkdownStructure([], [], [])
+    if codes is None:
+        codes = code_points(text)
+
+    line_starts = np.concatenate(([0], np.flatnonzero(codes[:-1] == _NEWLINE) + 1))
+    line_ends = np.append(line_starts[1:], text_length)
+
+    def char_at(offsets: np.ndarray) -> np.ndarray:
+        """Code points at offsets (-1 past the end of the text)."""
+        return np.where(offsets < text_length, codes[np.minimum(offsets, text_length - 1)], -1)
+
+    # Position of the first character of each line after up to 3 spaces
+    first_pos = line_starts
+    for _ in range(3):
+        first_pos = first_pos + (char_at(first_pos) == _SPACE)
+    first = char_at(first_pos)
+    second = char_at(first_pos + 1)
+
+    # Code fences, paired in order: only a bare fence of the same character
+    # and at least the same length closes a block
+    fence_lines = np.flatnonzero(((first == _BACKTICK) | (first == _TILDE)) & (second == first))
+    fence_pos = first_pos[fence_lines]
+    fence_char = first[fence_lines]
+    fence_length = np.zeros(len(fence_lines), dtype=np.int64)
+    run = np.ones(len(fence_lines), dtype=bool)
+    while run.any():
+        run &= char_at(fence_pos + fence_length) == fence_char
+        fence_length += run
+    keep = fence_length >= 3
+    fence_lines, fence_pos, fence_char, fence_length = (
+        fence_lines[keep], fence_pos[keep], fence_char[keep], fence_length[keep]
+    )
+    after = char_at(fence_pos + fence_length)
+    bare = (after == _NEWLINE) | (after == _CARRIAGE_RETURN) | (after == -1)
+
+    fences: List[Tuple[int, int]] = []
+    open_fence = None
+    fence_start = 0
+    for line_start, start, end, char, length, is_bare in zip(
+        line_starts[fence_lines].tolist(),
+        fence_pos.tolist(),
+        line_ends[fence_lines].tolist(),
+        fence_char.tolist(),
+        fence_length.tolist(),
+        bare.tolist()
+    ):
+        if open_fence is None:
+            open_fence = (char, length)
+            fence_start = line_start
+        elif (
+            char == open_fence[0] and length >= open_fence[1]
+            and (is_bare or not text[start + length:end].strip())
+        ):
+            fences.append((fence_start, end))
+            open_fence = None
+    if open_fence is not None:
+        fences.append((fence_start, text_length))
+
+    outside = np.ones(len(line_starts), dtype=bool)
+    if fences:
+        fence_starts = np.array([start for start, _ in fences], dtype=np.int64)
+        fence_ends = np.array([end for _, end in fences], dtype=np.int64)
+        fence = np.searchsorted(fence_starts, line_starts, side="right") - 1
+        outside = ~((fence >= 0) & (line_starts < fence_ends[np.maximum(fence, 0)]))
+
+    # Tables: runs of consecutive lines starting with '|'
+    is_table = (first == _PIPE) & outside
+    previous = np.concatenate(([False], is_table[:-1]))
+    following = np.concatenate((is_table[1:], [False]))
+    tables = list(zip(
+        line_starts[is_table & ~previous].tolist(),
+        line_ends[is_table & ~following].tolist()
+    ))
+
+    # Headers: 1-6 '#' followed by a space or tab
+    hash_lines = np.flatnonzero((first == _HASH) & outside)
+    hash_pos = first_pos[hash_lines]
+    level = np.zeros(len(hash_lines), dtype=np.int64)
+    run = np.ones(len(hash_lines), dtype=bool)
+    for _ in range(7):
+        run &= char_at(hash_pos + level) == _HASH
+        level += run
+    after = char_at(hash_pos + level)
+    is_header = (level <= 6) & ((after == _SPACE) | (after == _TAB))
+    hash_lines, hash_pos, level = hash_lines[is_header], hash_pos[is_header], level[is_header]
+
+    headers: List[Tuple[int, int, str]] = []
+    for line_start, header_level, title_start, end in zip(
+        line_starts[hash_lines].tolist(),
+        level.tolist(),
+        (hash_pos + level).tolist(),
+        line_ends[hash_lines].tolist()
+    ):
+        title = text[title_start:end].strip()
+        if title:
+            headers.append((line_start, header_level, title))
+
+    # List items: '-', '*' or '+' followed by whitespace, or '1.' / '1)' style numbers
+    separated = (second == _SPACE) | (second == _TAB) | (second == _NEWLINE) | (second == _CARRIAGE_RETURN) | (second == -1)
+    is_bullet = ((first == _DASH) | (first == _STAR) | (first == _PLUS)) & separated & outside
+    is_number = (first >= _DIGIT_0) & (first <= _DIGIT_9) & outside
+    list_items = line_starts[is_bullet].tolist()
+    numbered = [
+        line_start
+        for line_start, start in zip(line_starts[is_number].tolist(), first_pos[is_number].tolist())
+        if _ORDERED_ITEM_RE.match(text, start)
+    ]
+    if numbered:
+        list_items = sorted(list_items + numbered)
+
+    return MarkdownStructure(headers, sorted(fences + tables), list_items)
+
+
+def _outside_blocks(offsets: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Drop offsets that fall strictly inside a block (block edges are allowed)."""
+    if not len(starts) or not len(offsets):
+        return offsets
+    block = np.searchsorted(starts, offsets, side="left") - 1
+    inside = (block >= 0) & (offsets < ends[np.maximum(block, 0)])
+    return offsets[~inside]
+
+
+class MarkdownIndex(BoundaryIndex):
+    """Boundary index that ranks markdown structure and avoids splitting code blocks and tables."""
+
+    def __init__(self, text: str):
+        """
+        Build the index: one vectorized pass for line and sentence breaks, one
+        pass for the markdown structure.
+
+        Args:
+            text: Markdown text to index
+        """
+        super().__init__(text)
+        self.structure = scan_markdown(text, self.codes)
+        self.header_offsets = [offset for offset, _, _ in self.structure.headers]
+
+        starts = np.array([start for start, _ in self.structure.blocks], dtype=np.int64)
+        ends = np.array([end for _, end in self.structure.blocks], dtype=np.int64)
+        paragraph_ends, line_ends, sentence_ends = self.offsets
+
+        # Strongest first
+        self.offsets = (
+            np.array(self.header_offsets, dtype=np.int64),
+            _outside_blocks(paragraph_ends, starts, ends),
+            np.array(self.structure.list_items, dtype=np.int64),
+            _outside_blocks(line_ends, starts, ends),
+            _outside_blocks(sentence_ends, starts, ends),
+            line_ends,
+        )
+
+    def section_title(self, offset: int) -> str:
+        """Title of the last header at or before an offset ('' before the first header)."""
+        i = bisect_right(self.header_offsets, offset) - 1
+        return self.structure.headers[i][2] if i >= 0 else ""
+
+
+def chunk_spans(text: str, policy: ChunkPolicy) -> List[MarkdownChunk]:
+    """
+    Compute the chunks of a markdown text under a policy.
+
+    Args:
+        text: Markdown text
+        policy: Chunk sizes, overlap, forced section breaks and merging
+
+    Returns:
+        List of MarkdownChunk offsets (slice and strip them to get the content)
+    """
+    if not _NON_SPACE_RE.search(text):
+        return []
+
+    index = MarkdownIndex(text)
+    search_window = policy.search_window if policy.search_window is not None else policy.max_chars // 2
+
+    # Headers up to the section level always start a new chunk
+    cuts = [0]
+    cuts.extend(
+        offset for offset, level, _ in index.structure.headers
+        if level <= policy.section_level and offset > 0
+    )
+    cuts.append(len(text))
+
+    spans: List[Tuple[int, int]] = []
+    for section_start, section_end in zip(cuts, cuts[1:]):
+        for start, end in index.split_points(
+            policy.max_chars,
+            policy.overlap_chars,
+            search_window,
+            start=section_start,
+            stop=section_end
+        ):
+            if _NON_SPACE_RE.search(text, start, end):
+                spans.append((start, end))
+
+    # Merge small chunks into the previous chunk (adjacent spans stay one slice)
+    if policy.min_chars:
+        merge_limit = policy.merge_limit or policy.max_chars
+        merged: List[Tuple[int, int]] = []
+        for start, end in spans:
+            if merged and end - start < policy.min_chars:
+                previous_start, _ = merged[-1]
+                if end - previous_start <= merge_limit:
+                    merged[-1] = (previous_start, end)
+                    continue
+            merged.append((start, end))
+        spans = merged
+
+    return [MarkdownChunk(start, end, index.section_title(start)) for start, end in spans]
+
+
+def chunk_texts(text: str, policy: ChunkPolicy) -> List[Tuple[str, str]]:
+    """
+    Chunk a markdown text under a policy.
+
+    Returns:
+        List of (stripped chunk content, section title) tuples
+    """
+    return [(text[start:end].strip(), title) for start, end, title in chunk_spans(text, policy)]
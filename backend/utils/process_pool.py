@@ -0,0 +1,251 @@
+"""
+Long-lived process pool for CPU-bound ingestion work.
+
+Each worker is a separate process with its own pipe, so a task that exceeds
+its timeout is stopped for real: the worker is killed and replaced, instead of
+leaving a runaway thread burning CPU and memory in the main process. Workers
+are also recycled after a fixed number of tasks to return memory to the OS.
+
+Tasks must be top-level functions of modules that are cheap to import (e.g.
+``backend.utils.document_processing``), because workers are started with the
+"spawn" method and import them on first use. For the same reason, entry-point
+scripts must keep their work under ``if __name__ == "__main__":``.
+"""
+import atexit
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from multiprocessing.reduction import ForkingPickler
+from typing import Any, Callable, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TASK_TIMEOUT = 30.0  # Seconds per task before the worker is killed
+DEFAULT_MAX_TASKS_PER_WORKER = 200  # Recycle workers to release accumulated memory
+
+
+class TaskTimeoutError(TimeoutError):
+    """Raised when a task exceeds its timeout (the worker has been replaced)."""
+
+
+class WorkerCrashedError(RuntimeError):
+    """Raised when a worker process died while running a task (e.g. killed by the OOM killer)."""
+
+
+def _worker_main(conn):
+    """Worker loop: receive (func, args), send back ('ok', result) or ('error', exception)."""
+    # Ctrl+C is handled by the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+
+        func, args = message
+        try:
+            conn.send(("ok", func(*args)))
+        except Exception as e:
+            try:
+                conn.send(("error", e))
+            except Exception:
+                # Exception not picklable - send its description instead
+                conn.send(("error", RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    """A worker process and the parent's end of its pipe."""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks_done = 0
+
+    def stop(self, kill: bool = False):
+        """Stop the worker (gracefully unless kill is set)."""
+        try:
+            if kill:
+                self.process.kill()
+            else:
+                self.conn.send(None)
+        except Exception:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=5)
+        self.conn.close()
+
+
+class ProcessWorkerPool:
+    """Thread-safe pool of worker processes with hard per-task timeouts."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        task_timeout: float = DEFAULT_TASK_TIMEOUT,
+        max_tasks_per_worker: int = DEFAULT_MAX_TASKS_PER_WORKER
+    ):
+        """
+        Initialize the pool (workers are started on first use).
+
+        Args:
+            max_workers: Number of worker processes (default: CPU count, at most 8)
+            task_timeout: Default seconds per task before the worker is killed
+            max_tasks_per_worker: Tasks after which a worker is replaced
+        """
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.task_timeout = task_timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+        self.tasks_completed = 0
+        self.tasks_timed_out = 0
+        self.workers_recycled = 0
+
+    def _ensure_started(self):
+        """Start the worker processes on first use."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ProcessWorkerPool is shut down")
+            if self._started:
+                return
+            for _ in range(self.max_workers):
+                self._idle.put(_Worker(self._context))
+            self._started = True
+            logger.info(f"⚙️  Started {self.max_workers} CPU worker processes")
+
+    def _replace(self, worker: _Worker, kill: bool):
+        """Stop a worker and put a fresh one in its place."""
+        worker.stop(kill=kill)
+        with self._lock:
+            self.workers_recycled += 1
+        if not self._closed:
+            self._idle.put(_Worker(self._context))
+
+    def _check_in(self, worker: _Worker, reusable: bool, completed: bool):
+        """
+        Give a checked-out worker back to the pool, or replace it.
+
+        Args:
+            worker: Worker returned by run()
+            reusable: Whether the worker is idle and its pipe holds no unread data
+            completed: Whether the worker finished a task
+        """
+        if not reusable:
+            self._replace(worker, kill=True)
+            return
+
+        if completed:
+            worker.tasks_done += 1
+            with self._lock:
+                self.tasks_completed += 1
+        if self._closed:
+            worker.stop()
+        elif worker.tasks_done >= self.max_tasks_per_worker:
+            self._replace(worker, kill=False)
+        else:
+            self._idle.put(worker)
+
+    def run(self, func: Callable, *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run a task in a worker process and wait for its result.
+
+        However run() exits (including on KeyboardInterrupt), the worker goes
+        back to the pool, or is killed and replaced if it may still be busy.
+
+        Args:
+            func: Top-level function to run
+            *args: Picklable arguments
+            timeout: Seconds before the worker is killed (default: task_timeout)
+
+        Returns:
+            The function's return value
+
+        Raises:
+            TaskTimeoutError: If the task did not finish in time
+            WorkerCrashedError: If the worker process died
+            Exception: Whatever the task raised
+        """
+        self._ensure_started()
+        timeout = self.task_timeout if timeout is None else timeout
+        name = getattr(func, "__name__", repr(func))
+        worker = self._idle.get()
+        reusable = False
+        completed = False
+
+        try:
+            try:
+                worker.conn.send((func, args))
+            except (EOFError, OSError) as e:
+                raise WorkerCrashedError(f"Worker process died while running {name}: {e}")
+            except Exception:
+                reusable = True  # The task could not be pickled, so nothing was sent
+                raise
+
+            try:
+                finished = worker.conn.poll(timeout)
+                if finished:
+                    message = worker.conn.recv_bytes()
+            except (EOFError, OSError) as e:
+                raise WorkerCrashedError(f"Worker process died while running {name}: {e}")
+
+            if not finished:
+                with self._lock:
+                    self.tasks_timed_out += 1
+                raise TaskTimeoutError(f"{name} exceeded {timeout:.0f}s - worker process killed")
+
+            # The whole reply has been read: the worker is idle even if it cannot be unpickled
+            reusable = completed = True
+            status, payload = ForkingPickler.loads(message)
+        finally:
+            self._check_in(worker, reusable, completed)
+
+        if status == "error":
+            raise payload
+        return payload
+
+    def shutdown(self):
+        """Stop all idle workers; workers busy in run() are stopped when they return."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+
+_process_pool: Optional[ProcessWorkerPool] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessWorkerPool:
+    """
+    Get the process-wide CPU worker pool.
+
+    Sized by INGESTION_CPU_WORKERS, with the per-task timeout from INGESTION_CPU_TASK_TIMEOUT.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessWorkerPool(
+                max_workers=int(os.getenv("INGESTION_CPU_WORKERS", "0")) or None,
+                task_timeout=float(os.getenv("INGESTION_CPU_TASK_TIMEOUT", str(DEFAULT_TASK_TIMEOUT)))
+            )
+            atexit.register(_process_pool.shutdown)
+        return _process_pool
@@ -0,0 +1,238 @@
+"""
+Vector quantization for local vector stores.
+
+Quantized vectors are used for the first pass of a search (less memory and
+memory bandwidth per scored vector); the best top_k * rescore_factor
+candidates are then rescored with their full-precision vectors, which
+recovers almost all of the recall lost to quantization.
+
+- "float16": half precision, 2 bytes per dimension.
+- "int8": scalar quantization with a per-dimension scale and offset fitted
+  to the data, 1 byte per dimension. Query scores are computed
+  asymmetrically (float32 query against int8 codes), so queries are never
+  quantized.
+
+Milvus-side quantization (FLOAT16_VECTOR fields, IVF_SQ8 / IVF_PQ indexes)
+is configured in db.milvus_schema.
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+QUANTIZATION_NONE = "none"
+QUANTIZATION_FLOAT16 = "float16"
+QUANTIZATION_INT8 = "int8"
+QUANTIZATIONS = (QUANTIZATION_NONE, QUANTIZATION_FLOAT16, QUANTIZATION_INT8)
+
+SCORE_BLOCK_ROWS = 8192  # Rows decoded per scoring step
+
+
+class ScalarQuantizer:
+    """int8 scalar quantizer with a per-dimension scale and offset."""
+
+    def __init__(self, offset: np.ndarray, scale: np.ndarray):
+        self.offset = np.asarray(offset, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+
+    @classmethod
+    def fit(cls, vectors: np.ndarray, quantile: float = 0.001) -> "ScalarQuantizer":
+        """
+        Fit the per-dimension range to the data.
+
+        Args:
+            vectors: float32 training matrix
+            quantile: Share of values clipped at each end of a dimension's range (robust to outliers)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        low = np.quantile(vectors, quantile, axis=0)
+        high = np.quantile(vectors, 1 - quantile, axis=0)
+        scale = np.maximum(high - low, 1e-12) / 255.0
+        return cls(offset=low + 128 * scale, scale=scale)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """int8 codes of float32 vectors."""
+        codes = np.rint((np.asarray(vectors, dtype=np.float32) - self.offset) / self.scale)
+        return np.clip(codes, -128, 127).astype(np.int8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Approximate float32 vectors of int8 codes."""
+        return codes.astype(np.float32) * self.scale + self.offset
+
+    def to_dict(self) -> Dict[str, List[float]]:
+        return {"offset": self.offset.tolist(), "scale": self.scale.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, List[float]]) -> "ScalarQuantizer":
+        return cls(offset=np.asarray(data["offset"]), scale=np.asarray(data["scale"]))
+
+
+def bytes_per_vector(dimension: int, quantization: str) -> int:
+    """Storage of one vector under a quantization."""
+    return dimension * {QUANTIZATION_NONE: 4, QUANTIZATION_FLOAT16: 2, QUANTIZATION_INT8: 1}[quantization]
+
+
+def quantize(vectors: np.ndarray, quantization: str, quantizer: Optional[ScalarQuantizer] = None) -> np.ndarray:
+    """Quantized copy of float32 vectors (int8 needs a fitted quantizer)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if quantization == QUANTIZATION_FLOAT16:
+        return vectors.astype(np.float16)
+    if quantization == QUANTIZATION_INT8:
+        return quantizer.encode(vectors)
+    return vectors
+
+
+def approximate_scores(
+    codes: np.ndarray,
+    query: np.ndarray,
+    quantization: str,
+    metric: str,
+    quantizer: Optional[ScalarQuantizer] = None
+) -> np.ndarray:
+    """
+    Milvus-style scores of a float32 query against quantized rows
+    (similarity for COSINE/IP, squared distance for L2).
+    """
+    query = np.asarray(query, dtype=np.float32)
+    scores = np.empty(len(codes), dtype=np.float32)
+    if quantization == QUANTIZATION_INT8 and metric != "L2":
+        # q . (c * scale + offset) = (q * scale) . c + q . offset
+        scaled_query = query * quantizer.scale
+        bias = float(query @ quantizer.offset)
+        for start in range(0, len(codes), SCORE_BLOCK_ROWS):
+            block = codes[start:start + SCORE_BLOCK_ROWS].astype(np.float32)
+            scores[start:start + len(block)] = block @ scaled_query + bias
+        return scores
+
+    for start in range(0, len(codes), SCORE_BLOCK_ROWS):
+        block = codes[start:start + SCORE_BLOCK_ROWS]
+        block = quantizer.decode(block) if quantization == QUANTIZATION_INT8 else block.astype(np.float32)
+        if metric == "L2":
+            scores[start:start + len(block)] = ((block - query) ** 2).sum(axis=1)
+        else:
+            scores[start:start + len(block)] = block @ query
+    return scores
+
+
+def exact_scores(vectors: np.ndarray, query: np.ndarray, metric: str) -> np.ndarray:
+    """Milvus-style scores of a float32 query against float32 rows."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if metric == "L2":
+        return ((vectors - query) ** 2).sum(axis=1)
+    return vectors @ query
+
+
+def top_positions(scores: np.ndarray, k: int, metric: str) -> np.ndarray:
+    """Positions of the k best scores, best first."""
+    if not len(scores):
+        return np.empty(0, dtype=np.int64)
+    ranked = scores if metric == "L2" else -scores
+    k = min(k, len(scores))
+    best = np.argpartition(ranked, k - 1)[:k]
+    return best[np.argsort(ranked[best])]
+
+
+def search_quantized(
+    codes: np.ndarray,
+    full_vectors: Optional[np.ndarray],
+    query: np.ndarray,
+    k: int,
+    quantization: str,
+    metric: str,
+    quantizer: Optional[ScalarQuantizer] = None,
+    rescore_factor: int = 4
+) -> Any:
+    """
+    Top-k positions and scores of a query: a quantized first pass over all
+    rows, then full-precision rescoring of the best k * rescore_factor.
+
+    Args:
+        codes: Quantized rows
+        full_vectors: float32 rows for rescoring (None or rescore_factor <= 1 to skip rescoring)
+        query: float32 query (normalized for COSINE)
+        k: Results to return
+        quantization: Quantization of codes
+        metric: COSINE, IP or L2
+        quantizer: Fitted quantizer for int8
+        rescore_factor: Candidates rescored per result
+
+    Returns:
+        (positions, scores), best first
+    """
+    scores = approximate_scores(codes, query, quantization, metric, quantizer)
+    if full_vectors is None or rescore_factor <= 1 or quantization == QUANTIZATION_NONE:
+        best = top_positions(scores, k, metric)
+        return best, scores[best]
+
+    candidates = top_positions(scores, k * rescore_factor, metric)
+    candidates = np.sort(candidates)  # Ascending positions read the memory map sequentially
+    rescored = exact_scores(full_vectors[candidates], query, metric)
+    best = top_positions(rescored, k, metric)
+    return candidates[best], rescored[best]
+
+
+def benchmark(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    metric: str = "COSINE",
+    rescore_factors: Sequence[int] = (1, 2, 4, 8),
+    exclude_rows: Optional[Sequence[Optional[int]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Memory, latency and recall@k of each quantization against exact float32 search.
+
+    Args:
+        vectors: float32 corpus (normalized for COSINE)
+        queries: float32 queries (normalized for COSINE)
+        k: Result count recall is measured at
+        metric: COSINE, IP or L2
+        rescore_factors: Rescoring depths to measure for the quantized variants (1 = no rescoring)
+        exclude_rows: Per query, a corpus row to leave out of both result lists (the query's own row) or None
+
+    Returns:
+        One dict per variant: quantization, rescore_factor, bytes_per_vector,
+        memory_mb, p50_ms, p95_ms, recall
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    dimension = vectors.shape[1]
+    exclude_rows = list(exclude_rows) if exclude_rows is not None else [None] * len(queries)
+    depth = k + (1 if any(row is not None for row in exclude_rows) else 0)
+
+    def without_excluded(i, positions):
+        return [p for p in positions.tolist() if p != exclude_rows[i]][:k]
+
+    truth = [
+        set(without_excluded(i, top_positions(exact_scores(vectors, query, metric), depth, metric)))
+        for i, query in enumerate(queries)
+    ]
+
+    variants = [(QUANTIZATION_NONE, 1)]
+    for quantization in (QUANTIZATION_FLOAT16, QUANTIZATION_INT8):
+        variants.extend((quantization, factor) for factor in rescore_factors)
+
+    quantizer = ScalarQuantizer.fit(vectors)
+    encoded = {q: quantize(vectors, q, quantizer) for q in QUANTIZATIONS}
+    results = []
+    for quantization, factor in variants:
+        latencies = []
+        recalls = []
+        for i, query in enumerate(queries):
+            started = time.perf_counter()
+            positions, _ = search_quantized(
+                encoded[quantization], vectors, query, depth, quantization, metric, quantizer, factor
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+            recalls.append(len(truth[i].intersection(without_excluded(i, positions))) / max(len(truth[i]), 1))
+
+        results.append({
+            "quantization": quantization,
+            "rescore_factor": factor,
+            "bytes_per_vector": bytes_per_vector(dimension, quantization),
+            "memory_mb": encoded[quantization].nbytes / 2 ** 20,
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "recall": float(np.mean(recalls)),
+        })
+    return results
@@ -3,6 +3,8 @@ Resource monitoring utilities for preventing memory overload during processing.
 """
 import time
 import os
+import threading
+from contextlib import contextmanager
 from typing import Optional
 
 from .logger import get_logger
@@ -231,3 +233,102 @@ class MemoryMonitor:
             raise_on_timeout=False
         )
 
+
+
+class MemoryGovernor:
+    """
+    Process-wide admission control for parallel workers.
+
+    Workers enter a slot before starting a unit of work (e.g. a repository).
+    A new slot is only granted while system memory is below the threshold and
+    the process RSS is below its budget, so the number of concurrently running
+    workers shrinks automatically when memory gets tight. At least one slot is
+    always granted so processing can make progress.
+    """
+
+    def __init__(
+        self,
+        threshold_percent: float = 90.0,
+        max_rss_mb: Optional[float] = None,
+        check_interval: float = 2.0
+    ):
+        """
+        Initialize memory governor.
+
+        Args:
+            threshold_percent: System memory usage above which no new slots are granted
+            max_rss_mb: Process RSS budget in MB (None = no RSS limit)
+            check_interval: Seconds between memory checks while waiting
+        """
+        self.threshold_percent = threshold_percent
+        self.max_rss_mb = max_rss_mb
+        self.check_interval = check_interval
+        self.active = 0
+        self.peak_active = 0
+        self._condition = threading.Condition()
+
+    def _memory_available(self) -> bool:
+        """Check system memory and process RSS against the limits."""
+        if not check_memory_available(self.threshold_percent):
+            return False
+        if self.max_rss_mb and get_memory_usage_mb() >= self.max_rss_mb:
+            return False
+        return True
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a worker slot.
+
+        Args:
+            timeout: Maximum seconds to wait (None = wait forever)
+
+        Returns:
+            True if a slot was granted, False if the timeout expired
+        """
+        start_time = time.time()
+        logged = False
+
+        with self._condition:
+            while self.active > 0 and not self._memory_available():
+                elapsed = time.time() - start_time
+                if timeout is not None and elapsed > timeout:
+                    return False
+                if not logged:
+                    logger.warning(
+                        f"⚠️  Memory governor holding new work "
+                        f"({self.active} active, [Memory: {get_memory_usage_mb():.1f}MB])"
+                    )
+                    logged = True
+                # Woken early when another worker releases its slot
+                self._condition.wait(timeout=self.check_interval)
+
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+            return True
+
+    def release(self):
+        """Release a worker slot."""
+        with self._condition:
+            self.active = max(0, self.active - 1)
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, operation_name: str = "operation", timeout: Optional[float] = None):
+        """
+        Hold a worker slot for the duration of a monitored operation.
+
+        Args:
+            operation_name: Name of operation being monitored (for logging)
+            timeout: Maximum seconds to wait for the slot
+
+        Raises:
+            RuntimeError if no slot was granted before the timeout
+        """
+        if not self.acquire(timeout=timeout):
+            raise RuntimeError(f"Memory governor timed out waiting to start {operation_name}")
+
+        try:
+            with MemoryMonitor(operation_name, threshold_percent=self.threshold_percent):
+                yield self
+        finally:
+            self.release()
@@ -0,0 +1,26 @@
+"""
+Source types written to the 'source_type' field of every vector.
+
+'source_type' is the partition key of typed Milvus collections (see
+db.milvus_schema), so each kind of content lives in its own partition and a
+search or delete restricted to some source types only touches those
+partitions. Every writer must set it; rows without one land in the ""
+partition and are only found by unrestricted searches.
+"""
+
+from typing import Dict, Tuple
+
+SOURCE_TYPE_DOCS = "github_docs"  # Markdown docs and READMEs from GitHub repositories
+SOURCE_TYPE_IMAGE = "github_image"  # Text extracted from images in GitHub repositories
+SOURCE_TYPE_ISSUE = "github_issue"  # GitHub issues and their comments
+SOURCE_TYPE_WIKI = "wiki_page"  # Wiki pages (value predates this module, see wiki_ingestion)
+SOURCE_TYPE_WIKI_LINKED = "linked_content"  # Pages linked from wiki pages
+SOURCE_TYPE_DIAGRAM = "diagram"  # Diagrams and documents from the diagram processor
+
+# Source types searched for each retrieval intent (None = everything)
+INTENT_SOURCE_TYPES: Dict[str, Tuple[str, ...]] = {
+    "docs": (SOURCE_TYPE_DOCS, SOURCE_TYPE_IMAGE, SOURCE_TYPE_WIKI, SOURCE_TYPE_WIKI_LINKED),
+    "issues": (SOURCE_TYPE_ISSUE,),
+    "wiki": (SOURCE_TYPE_WIKI, SOURCE_TYPE_WIKI_LINKED),
+    "diagrams": (SOURCE_TYPE_DIAGRAM,),
+}
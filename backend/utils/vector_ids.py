@@ -0,0 +1,66 @@
+"""
+Deterministic vector IDs shared by every vector store writer.
+
+A chunk's ID is a 64-bit hash of where it comes from (source, path, chunk
+index) and what it contains, so re-ingesting unchanged content produces the
+same IDs and an upsert overwrites the stored rows instead of adding
+duplicates. Only chunks whose content or position changed get new IDs; the
+rows they replace are the only ones that need deleting.
+
+Hashes use BLAKE2b with an 8-byte digest (stable across processes, unlike the
+built-in hash(), which is salted per process by PYTHONHASHSEED) and are masked
+to 63 bits to fit Milvus' signed INT64 primary key.
+"""
+
+import hashlib
+from typing import Any, Dict
+
+_SEPARATOR = "\x1f"  # Unit separator, cannot occur in paths or repository names
+_INT64_MASK = (1 << 63) - 1
+
+
+def stable_id(*parts: Any) -> int:
+    """
+    Hash any number of parts to a non-negative 63-bit integer.
+
+    Args:
+        parts: Values that identify the record (converted with str())
+
+    Returns:
+        Integer ID, the same in every process and on every run
+    """
+    key = _SEPARATOR.join(str(part) for part in parts).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "big") & _INT64_MASK
+
+
+def content_hash(content: str) -> str:
+    """Hex digest identifying a chunk's content."""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def chunk_id(source: str, path: str, chunk_index: int, content: str) -> int:
+    """
+    Stable ID of one chunk.
+
+    Args:
+        source: Repository or other source the chunk belongs to
+        path: File path or URL of the document within the source
+        chunk_index: Position of the chunk in the document
+        content: Chunk text
+
+    Returns:
+        Integer ID
+    """
+    return stable_id(source, path, chunk_index, content_hash(content))
+
+
+def metadata_chunk_id(content: str, metadata: Dict[str, Any]) -> int:
+    """
+    Stable ID of a chunk from the metadata the ingestion paths attach to it.
+
+    The source is the repository (or the 'source' field), the path is the file
+    path (or the source/document URL).
+    """
+    source = metadata.get("repository") or metadata.get("source") or ""
+    path = metadata.get("file_path") or metadata.get("source_url") or metadata.get("url") or ""
+    return chunk_id(source, path, metadata.get("chunk_index", 0), content)
@@ -4,11 +4,15 @@ Chunks wiki content for embedding.
 """
 
 from typing import List, Dict, Any
-import re
 
 from ..models.wiki_page import WikiPage
 from ..models.wiki_chunk import WikiChunk
 
+try:
+    from utils.markdown_chunking import ChunkPolicy, chunk_texts
+except ImportError:
+    from ...utils.markdown_chunking import ChunkPolicy, chunk_texts
+
 
 class WikiChunkingService:
     """Service for chunking wiki content."""
@@ -30,6 +34,12 @@ class WikiChunkingService:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.min_chunk_size = min_chunk_size
+        self.policy = ChunkPolicy(
+            max_chars=chunk_size,
+            overlap_chars=chunk_overlap,
+            min_chars=chunk_size,  # Pack consecutive sections while they fit
+            section_level=2,
+        )
     
     def chunk_page(self, page: WikiPage) -> List[WikiChunk]:
         """
@@ -143,117 +153,9 @@ class WikiChunkingService:
     def _smart_chunk(self, text: str) -> List[str]:
         """
         Smart chunking that respects markdown structure.
-        
-        Tries to chunk on:
-        1. Headers
-        2. Paragraphs
-        3. Sentences
-        4. Character boundaries (fallback)
-        """
-        chunks = []
-        
-        # Split on major headers first
-        sections = re.split(r'\n(#{1,2}\s+.+?\n)', text)
-        
-        current_chunk = ""
-        
-        for section in sections:
-            # If adding this section exceeds chunk size and we have content
-            if len(current_chunk) + len(section) > self.chunk_size and current_chunk:
-                # Try to split the current chunk further if it's too large
-                if len(current_chunk) > self.chunk_size:
-                    sub_chunks = self._split_large_section(current_chunk)
-                    chunks.extend(sub_chunks)
-                else:
-                    chunks.append(current_chunk)
-                
-                # Start new chunk with overlap
-                if chunks:
-                    overlap_text = self._get_overlap(current_chunk)
-                    current_chunk = overlap_text + section
-                else:
-                    current_chunk = section
-            else:
-                current_chunk += section
-        
-        # Add remaining chunk
-        if current_chunk.strip():
-            if len(current_chunk) > self.chunk_size:
-                sub_chunks = self._split_large_section(current_chunk)
-                chunks.extend(sub_chunks)
-            else:
-                chunks.append(current_chunk)
-        
-        return [c.strip() for c in chunks if c.strip()]
-    
-    def _split_large_section(self, text: str) -> List[str]:
-        """Split a large section into smaller chunks."""
-        chunks = []
-        
-        # Try splitting on paragraphs
-        paragraphs = re.split(r'\n\n+', text)
-        
-        current_chunk = ""
-        
-        for para in paragraphs:
-            if len(current_chunk) + len(para) > self.chunk_size and current_chunk:
-                chunks.append(current_chunk)
-                overlap = self._get_overlap(current_chunk)
-                current_chunk = overlap + para
-            else:
-                if current_chunk:
-                    current_chunk += "\n\n" + para
-                else:
-                    current_chunk = para
-            
-            # If single paragraph is too large, split on sentences
-            if len(current_chunk) > self.chunk_size * 1.5:
-                sentence_chunks = self._split_on_sentences(current_chunk)
-                chunks.extend(sentence_chunks[:-1])
-                current_chunk = sentence_chunks[-1] if sentence_chunks else ""
-        
-        if current_chunk.strip():
-            chunks.append(current_chunk)
-        
-        return chunks
-    
-    def _split_on_sentences(self, text: str) -> List[str]:
-        """Split text on sentence boundaries."""
-        # Simple sentence splitting
-        sentences = re.split(r'([.!?]+\s+)', text)
-        
-        chunks = []
-        current_chunk = ""
-        
-        for i in range(0, len(sentences), 2):
-            sentence = sentences[i]
-            if i + 1 < len(sentences):
-                sentence += sentences[i + 1]
-            
-            if len(current_chunk) + len(sentence) > self.chunk_size and current_chunk:
-                chunks.append(current_chunk)
-                overlap = self._get_overlap(current_chunk)
-                current_chunk = overlap + sentence
-            else:
-                current_chunk += sentence
-        
-        if current_chunk.strip():
-            chunks.append(current_chunk)
-        
-        return chunks
-    
-    def _get_overlap(self, text: str) -> str:
-        """Get overlap text from the end of a chunk."""
-        if len(text) <= self.chunk_overlap:
-            return text
-        
-        # Try to get overlap at a natural boundary
-        overlap_text = text[-self.chunk_overlap:]
-        
-        # Try to start at a sentence boundary
-        sentence_start = overlap_text.find('. ')
-        if sentence_start > 0:
-            overlap_text = overlap_text[sentence_start + 2:]
-        
-        return overlap_text
 
+        Level 1-2 headers start a new chunk, small sections are packed together
+        up to chunk_size, and larger ones are split at paragraph, list, line or
+        sentence boundaries (never inside a code block or table that fits).
+        """
+        return [chunk_text for chunk_text, _ in chunk_texts(text, self.policy)]